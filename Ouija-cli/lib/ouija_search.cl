@@ -37,4 +37,20 @@ __kernel void ouija_search(char8 starting_seed_char8, // Renamed to avoid confli
     }
     // Sync at end of batch to ensure all work-items complete before returning
     barrier(CLK_GLOBAL_MEM_FENCE); // Ensure all work-items in the work-group complete before returning
-}
\ No newline at end of file
+}
+
+// Seed-list mode (--seeds): work item i evaluates the seed whose shortlex id is seed_ids[i]
+__kernel void ouija_evaluate_ids(__global const ulong *seed_ids,
+                                 long num_seeds_for_this_dispatch,
+                                 __constant OuijaConfig *config,
+                                 __global OuijaResult *results) {
+    size_t seed_index = get_global_id(0);
+    if (seed_index >= num_seeds_for_this_dispatch) {
+        return;
+    }
+
+    seed _seed = s_new_id(seed_ids[seed_index]);
+
+    instance inst = i_new(_seed);
+    ouija_filter(&inst, config, &results[seed_index]);
+}
@@ -53,18 +53,45 @@ seed s_new_c8(char8 str_seed) {
     return seed;
 }
 
+// Seed with a shortlex id ("1" is 0, "Z" is 34, "11" is 35): the id + 1 in bijective base 35.
+// Unlike s_skip from the empty seed, this stays right when the length grows.
+seed s_new_id(ulong id) {
+    seed seed = s_new_empty();
+    ulong8 digits = 0;
+    ulong n = id + 1;
+    int len = 0;
+    while (n > 0 && len < 8) {
+        n -= 1;
+        digits[len] = n % NUM_CHARS;
+        n /= NUM_CHARS;
+        len++;
+    }
+    for (int i = 0; i < len; i++) {
+        seed.data[i] = digits[len - 1 - i];
+    }
+    seed.len = len;
+    return seed;
+}
+
 char s_char_at(seed* s, int c) {
     return SEEDCHARS[s->data[c]];
 }
+// Position of a seed among the seeds of its length
 long s_tell(seed* s) {
     long loc = 0;
-    long mult = 0;
     for (int i = 0; i < s->len; i++) {
-        loc += s->data[i]*mult;
-        mult *= NUM_CHARS;
+        loc = loc * NUM_CHARS + s->data[i];
     }
     return loc;
 }
+// Shortlex id of a seed, the inverse of s_new_id (the empty seed is -1)
+long s_id(seed* s) {
+    long id = 0;
+    for (int i = 0; i < s->len; i++) {
+        id = id * NUM_CHARS + s->data[i] + 1;
+    }
+    return id - 1;
+}
 
 
 
@@ -97,24 +124,11 @@ void s_next(seed* s) {
     }
     s->len += carry;
 }
+// Counts through shortlex ids, so the skip borrows correctly when the length grows
+// ("Z" + 1 is "11", and the empty seed + 1 is "1")
 void s_skip(seed* s, long n) {
-    int carry = 0;
-    int i = s->len - 1;
-    int j = 0;
-    ulong8 data = 0;
-    while(n > 0 || carry || j < s->len){
-        int sum = carry + (n % NUM_CHARS);
-        sum += s->data[i * (i >= 0)] * (i >= 0) + -1 * (i < 0); //Branchless equivalent of if(i >= 0) {sum += s->data[i];} else {sum--;}
-        data[j] = sum % NUM_CHARS;
-        carry = sum >= NUM_CHARS;
-        n /= NUM_CHARS;
-        i--;
-        j++;
-    }
-    s->len += (j - s->len) * (s->len <= j);
-    for(int x = 0; x < s->len; x++){
-        s->data[s->len-1-x] = data[x];
-    }
+    long id = s_id(s) + n;
+    *s = id < 0 ? s_new_empty() : s_new_id((ulong)id);
 }
 
 #endif
\ No newline at end of file
@@ -32,25 +32,20 @@ static void s_to_c8_host(const seed_host* s, char* out) {
     for (int i = s->len; i < 8; i++) out[i] = '\0';
 }
 
+// Same counting as s_skip in seed.cl: through shortlex ids ("1" is 0, "11" is 35)
 static void s_skip_host(seed_host* s, int64_t n) {
-    int carry = 0;
-    int i = s->len - 1;
-    int j = 0;
-    uint8_t data[8] = {0};
-    int orig_len = s->len;
-    while (n > 0 || carry || j < orig_len) {
-        int sum = carry + (n % NUM_CHARS);
-        sum += (i >= 0 ? s->data[i] : -1);
-        data[j] = (uint8_t)(sum % NUM_CHARS);
-        carry = (sum >= NUM_CHARS);
-        n /= NUM_CHARS;
-        i--;
-        j++;
-    }
-    s->len = (orig_len <= j) ? j : orig_len;
-    for (int x = 0; x < s->len; x++) {
-        s->data[s->len - 1 - x] = data[x];
+    int64_t id = 0;
+    for (int i = 0; i < s->len; i++) id = id * NUM_CHARS + s->data[i] + 1;
+    id += n - 1;
+    int len = 0;
+    uint8_t digits[8] = {0};
+    for (int64_t rest = id + 1; rest > 0 && len < 8; len++) {
+        rest -= 1;
+        digits[len] = (uint8_t)(rest % NUM_CHARS);
+        rest /= NUM_CHARS;
     }
+    for (int x = 0; x < len; x++) s->data[x] = digits[len - 1 - x];
+    s->len = len;
 }
 
 #endif // SEED_HOST_H
@@ -10,11 +10,18 @@
 #include <inttypes.h>
 
 #define DEFAULT_BATCH_MULTIPLIER 1
+#define DAEMON_LINE_MAX 4096
+#define DAEMON_JOB_FIELDS 6
+#define SEED_POOL_SIZE 2318107019761 // Seeds of 1 to 8 characters; seed-list ids must be below this
 
 // Cross-platform compatibility
 #ifndef _WIN32
     #include <sys/stat.h>
     #define fopen_s(pFile, filename, mode) ((*(pFile) = fopen((filename), (mode))) ? 0 : errno)
+    #define ftell64(fp) ((long long)ftello(fp))
+#else
+    #include <fcntl.h> // For _setmode/_O_BINARY on stdout in binary result mode
+    #define ftell64(fp) _ftelli64(fp)
 #endif
 
 // Helper function to create binary path
@@ -33,6 +40,478 @@ void createBinaryPath(const char *executable_dir, const char *filter_name, char
              executable_dir, PATH_SEPARATOR, PATH_SEPARATOR, filter_name);
 }
 
+// Write one batch of surviving results as a binary frame:
+// a text line "#BIN <count> <record_size>" followed by count packed OuijaHostResult records
+void writeBinaryFrame(FILE *stream, const OuijaHostResult *records, cl_long count)
+{
+    fprintf(stream, "#BIN %" PRId64 " %zu\n", count, sizeof(OuijaHostResult));
+    fwrite(records, sizeof(OuijaHostResult), (size_t)count, stream);
+    fflush(stream);
+}
+
+// Set a starting seed from text: "random" (or anything longer than 8 characters) picks a random 8-character seed
+void parseStartingSeed(const char *text, cl_char8 *seed)
+{
+    static int seeded = 0;
+    if (strcmp(text, "random") == 0 || strlen(text) > 8) {
+        // Seed once, so daemon jobs started within the same second still differ
+        if (!seeded) {
+            srand((unsigned int)time(NULL));
+            seeded = 1;
+        }
+        char seedCharacters[] = "123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ";
+        for (int j = 0; j < 8; j++) {
+            seed->s[j] = seedCharacters[rand() % 35];
+        }
+    } else {
+        int seedLength = (int)strlen(text);
+        for (int j = 0; j < seedLength; j++) {
+            seed->s[j] = text[j];
+        }
+        for (int j = seedLength; j < 8; j++) {
+            seed->s[j] = '\0';
+        }
+    }
+}
+
+// Parse a -c value: a score, "auto" (dynamic, from 1) or "auto:<N>" (dynamic, from N).
+// Returns 1 for the dynamic cutoff.
+int parseCutoff(const char *text, int *cutoff)
+{
+    if (strncmp(text, "auto", 4) == 0 && (text[4] == '\0' || text[4] == ':')) {
+        *cutoff = text[4] == ':' ? atoi(text + 5) : 1;
+        if (*cutoff < 1) *cutoff = 1;
+        return 1;
+    }
+    *cutoff = atoi(text);
+    return 0;
+}
+
+// Load a --config file over the defaults and clamp it to what the kernel supports
+void loadSearchConfig(const char *config_file, OuijaConfig *config)
+{
+    if (config_file != NULL) {
+        if (!load_config_from_json(config_file, config)) {
+            printf_s("Failed to load configuration from %s. Using defaults.\n", config_file);
+        } else {
+            printf_s("Configuration loaded: %d needs, %d wants, max ante %d\n",
+                     config->numNeeds, config->numWants, config->maxSearchAnte);
+        }
+    }
+
+    // Validate config
+    if (config->numNeeds > MAX_DESIRES_HOST) config->numNeeds = MAX_DESIRES_HOST;
+    if (config->numWants > MAX_DESIRES_HOST) config->numWants = MAX_DESIRES_HOST;
+}
+
+// Open a --seeds list: packed little-endian uint64 seed ids (shortlex order, id 0 is "1"); "-" reads stdin.
+// count is set from the file size, or to 0 when it can't be known (pipes)
+FILE *openSeedList(const char *path, cl_long *count)
+{
+    FILE *fp = NULL;
+    *count = 0;
+    if (strcmp(path, "-") == 0) {
+#ifdef _WIN32
+        _setmode(_fileno(stdin), _O_BINARY);
+#endif
+        return stdin;
+    }
+    if (fopen_s(&fp, path, "rb") != 0 || !fp) {
+        return NULL;
+    }
+    if (fseek(fp, 0, SEEK_END) == 0) {
+        long long size = ftell64(fp);
+        if (size > 0) *count = (cl_long)(size / sizeof(cl_ulong));
+        rewind(fp);
+    }
+    return fp;
+}
+
+// Read up to capacity seed ids, dropping ids outside the seed pool
+// Returns the number of ids stored in ids; 0 only at the end of the list
+cl_long readSeedIds(FILE *seed_list, cl_ulong *ids, cl_long capacity, cl_long *skipped)
+{
+    cl_long count = 0;
+    while (count == 0) {
+        size_t read = fread(ids, sizeof(cl_ulong), (size_t)capacity, seed_list);
+        if (read == 0) break;
+        for (size_t i = 0; i < read; i++) {
+            if (ids[i] < SEED_POOL_SIZE) {
+                ids[count++] = ids[i];
+            } else {
+                (*skipped)++;
+            }
+        }
+    }
+    return count;
+}
+
+// Everything a search needs that outlives one search: kept for the whole process in daemon mode
+typedef struct {
+    cl_command_queue queue;
+    cl_kernel kernel;
+    cl_kernel listKernel; // ouija_evaluate_ids, NULL if the cached kernel binary predates it
+    cl_mem configBuf;
+    cl_mem seedIdsBuf; // Seed-list batch on the device...
+    cl_ulong *seedIds; // ...and on the host
+    OuijaHostResult *results;
+    size_t numGroups;
+    cl_long batch_capacity;
+    int binary_mode;
+    FILE *binary_stream;
+    OuijaHostResult *binary_batch;
+} SearchDevice;
+
+// One search over the loaded kernel: header, result lines or frames, a checkpoint per batch and status lines.
+// With a seed_list the seeds come from the list (numSeeds only sizes the progress report) and there are
+// no checkpoints, since the seeds aren't a range.
+void runSearch(SearchDevice *dev, OuijaConfig *config, cl_char8 startingSeed, cl_long numSeeds, FILE *seed_list,
+               int cutoff, int auto_cutoff_mode, cl_long *processed_out, cl_long *found_out)
+{
+    cl_int err;
+    cl_command_queue queue = dev->queue;
+    cl_kernel ssKernel = seed_list ? dev->listKernel : dev->kernel;
+    OuijaHostResult *results = dev->results;
+    size_t numGroups = dev->numGroups;
+    cl_long batch_capacity = dev->batch_capacity;
+    int binary_mode = dev->binary_mode;
+    FILE *binary_stream = dev->binary_stream;
+    OuijaHostResult *binary_batch = dev->binary_batch;
+
+    // The config can change between daemon jobs; the buffer is tiny
+    clEnqueueWriteBuffer(queue, dev->configBuf, CL_TRUE, 0, sizeof(OuijaConfig), config, 0, NULL, NULL);
+
+    // Set static kernel arguments (arguments that don't change per batch)
+    if (seed_list) {
+        clSetKernelArg(ssKernel, 0, sizeof(cl_mem), &dev->seedIdsBuf);
+    } else {
+        clSetKernelArg(ssKernel, 0, sizeof(cl_char8), &startingSeed);
+    }
+    clSetKernelArg(ssKernel, 2, sizeof(cl_mem), &dev->configBuf);
+    clSetKernelArgSVMPointer(ssKernel, 3, results);    // Print CSV header - output headers for the configured wants
+    printf_s("+Seed,Score");
+    if (config->scoreNaturalNegatives) printf_s(",Natural Negative Jokers");
+    if (config->scoreDesiredNegatives) printf_s(",Desired Negative Jokers");
+    
+    // Output headers for configured wants only
+    for (int w = 0; w < config->numWants; w++) {
+        printf_s(",");
+        if (config->Wants[w].jokeredition != RETRY && config->Wants[w].jokeredition != No_Edition) {
+            print_item_host(config->Wants[w].jokeredition);
+            printf_s("_");
+            print_item_host(config->Wants[w].value);
+        } else {
+            print_item_host(config->Wants[w].value);
+        }
+    }
+    printf_s("\n");
+    fflush(stdout);
+
+
+    clock_t start_time = clock();
+    clock_t last_report = start_time;
+    
+    cl_long seeds_remaining = numSeeds;
+    cl_long current_offset = 0;
+    cl_long total_processed = 0;
+    cl_long total_found = 0;
+    cl_long skipped_ids = 0;
+    
+    int first_batch = 1;
+
+    // Start seed as the kernel sees it, for the checkpoint lines (empty without -s)
+    char start_seed_string[9] = {0};
+    for (int j = 0; j < 8 && startingSeed.s[j] != '\0'; j++) {
+        start_seed_string[j] = startingSeed.s[j];
+    }
+    
+    if (seed_list) {
+        printf_s("Evaluating seed list of %" PRId64 " seeds...\n", numSeeds);
+    } else {
+        printf_s("Starting search of %" PRId64 " seeds...\n", numSeeds);
+    }
+    while (seed_list || seeds_remaining > 0) {        
+        // Calculate batch size
+        cl_long batch_size = (seeds_remaining > batch_capacity) ? batch_capacity : seeds_remaining;
+        if (seed_list) {
+            // The list decides the batch: up to batch_capacity ids, copied to the device
+            batch_size = readSeedIds(seed_list, dev->seedIds, batch_capacity, &skipped_ids);
+            if (batch_size == 0) break;
+            clEnqueueWriteBuffer(queue, dev->seedIdsBuf, CL_TRUE, 0, sizeof(cl_ulong) * batch_size,
+                                 dev->seedIds, 0, NULL, NULL);
+        }
+        
+        // Update kernel arguments for this batch
+        clSetKernelArg(ssKernel, 1, sizeof(cl_long), &batch_size);        // num_seeds_for_this_dispatch
+        if (!seed_list) {
+            clSetKernelArg(ssKernel, 4, sizeof(cl_long), &current_offset); // batch_seed_offset (direct value)
+        }
+        
+        // Calculate work sizes
+        size_t global_work_size = ((batch_size + numGroups - 1) / numGroups) * numGroups;
+        size_t local_work_size = numGroups;
+        
+        // Launch kernel
+        err = clEnqueueNDRangeKernel(queue, ssKernel, 1, NULL, 
+                                    &global_work_size, &local_work_size, 0, NULL, NULL);
+        if (err != CL_SUCCESS) {
+            printf_s("Kernel launch failed: %d\n", err);
+            break;
+        }
+        
+        // Wait for completion
+        clFinish(queue);
+        
+        // Map SVM for reading (required for coarse-grain SVM)
+        clEnqueueSVMMap(queue, CL_TRUE, CL_MAP_READ, results, 
+                       sizeof(OuijaHostResult) * batch_size, 0, NULL, NULL);
+        
+        // Process results
+        int batch_high_score = cutoff;
+        cl_long binary_count = 0;
+        for (cl_long i = 0; i < batch_size; i++) {
+            if (results[i].seed[0] == '\0') continue;
+            
+            if (results[i].TotalScore > batch_high_score) {
+                batch_high_score = results[i].TotalScore;
+            }
+            
+            // Skip cutoff scores on first batch in auto mode
+            if (first_batch && auto_cutoff_mode && results[i].TotalScore <= cutoff) {
+                continue;
+            }
+
+            if (results[i].TotalScore >= cutoff) {
+                total_found++;
+                if (binary_mode) {
+                    binary_batch[binary_count++] = results[i];
+                    continue;
+                }
+                printf_s("|%s,%d", results[i].seed, results[i].TotalScore);
+                if (config->scoreNaturalNegatives) printf_s(",%d", results[i].NaturalNegativeJokers);
+                if (config->scoreDesiredNegatives) printf_s(",%d", results[i].DesiredNegativeJokers);
+                // Output configured wants only to match header
+                for (int w = 0; w < config->numWants; w++) {
+                    printf_s(",%d", (int)results[i].ScoreWants[w]);
+                }
+                printf_s("\n");
+            }
+        }
+        if (binary_mode && binary_count > 0) {
+            writeBinaryFrame(binary_stream, binary_batch, binary_count);
+        }
+        fflush(stdout);
+        
+        // Update cutoff in auto mode
+        if (auto_cutoff_mode && batch_high_score > cutoff) {
+            cutoff = batch_high_score;
+            if (first_batch) {
+                printf_s("[AUTO] First batch cutoff set to %d\n", cutoff);
+            }
+        }
+        first_batch = 0;
+        
+        // Unmap SVM
+        clEnqueueSVMUnmap(queue, results, 0, NULL, NULL);
+        
+        // Update counters
+        total_processed += batch_size;
+        current_offset += batch_size;
+        seeds_remaining -= batch_size;
+        if (seeds_remaining < 0) seeds_remaining = 0; // A list of unknown length
+
+        // Checkpoint: every seed before start + offset is done and its results are on stdout.
+        // Resuming with -s <start skipped by offset> -n <seeds - offset> continues exactly here.
+        if (!seed_list) {
+            printf_s("#CKPT %s %" PRId64 " %" PRId64 "\n", start_seed_string, current_offset, numSeeds);
+            fflush(stdout);
+        }
+        
+          // Progress report every quarter second
+        clock_t now = clock();
+        if ((now - last_report) > 250) {            
+            double elapsed = (double)(now - start_time) / CLOCKS_PER_SEC;
+            double rate = total_processed / elapsed;
+            double eta_seconds = seeds_remaining / rate;
+            
+            // Calculate elapsed time components
+            int elapsed_minutes = (int)(elapsed / 60);
+            int elapsed_seconds_remainder = (int)elapsed % 60;
+            
+            // Calculate ETA components
+            int eta_days = (int)(eta_seconds / (60 * 60 * 24));
+            int eta_hours = (int)((eta_seconds - (eta_days * 60 * 60 * 24)) / 3600);
+            int eta_minutes = (int)((eta_seconds - (eta_days * 60 * 60 * 24) - (eta_hours * 3600)) / 60);
+            
+            // Format elapsed time string
+            char elapsed_string[64];
+            if (elapsed_minutes > 0) {
+                snprintf(elapsed_string, sizeof(elapsed_string), "in %d minutes and %d seconds", 
+                         elapsed_minutes, elapsed_seconds_remainder);
+            } else {
+                snprintf(elapsed_string, sizeof(elapsed_string), "in %d seconds", 
+                         elapsed_seconds_remainder);
+            }
+            
+            // Format ETA string  
+            char eta_string[128];
+            if (eta_days >= 1) {
+                snprintf(eta_string, sizeof(eta_string), "(ETA: %d days %d hours)", 
+                         eta_days, eta_hours);
+            } else if (eta_hours >= 1) {
+                snprintf(eta_string, sizeof(eta_string), "(ETA: %d hours %d minutes)", 
+                         eta_hours, eta_minutes);
+            } else if (eta_minutes >= 1) {
+                snprintf(eta_string, sizeof(eta_string), "(ETA: %d minutes %d seconds)",
+                        eta_minutes, (int)eta_seconds % 60);
+            } else {
+                snprintf(eta_string, sizeof(eta_string), "(ETA: %d seconds)",
+                        (int)eta_seconds);
+            }
+            
+            // Calculate rarity percentage
+            double rarity_percent = (total_processed > 0) ? (100.0 * total_found / total_processed) : 0.0;
+            
+            // Format searched count with appropriate units (K/M suffix)
+            char searched_string[32];
+            if (total_processed >= 1000000) {
+                snprintf(searched_string, sizeof(searched_string), "%.1fM", total_processed / 1000000.0);
+            } else if (total_processed >= 1000) {
+                snprintf(searched_string, sizeof(searched_string), "%.1fK", total_processed / 1000.0);
+            } else {
+                snprintf(searched_string, sizeof(searched_string), "%" PRId64, total_processed);
+            }
+              // Enhanced progress reporting with new format
+            printf_s("$Found %" PRId64 " valid seeds of %s searched so far. (%.8f%% Rarity!) %s. %s :clock: %.1fK/s\n",
+                     total_found, searched_string, rarity_percent, elapsed_string, eta_string, rate / 1000.0);
+                    
+            fflush(stdout);
+            last_report = now;
+        }
+    }
+    
+    // Final report
+    if (skipped_ids > 0) {
+        printf_s("Skipped %" PRId64 " seed ids outside the seed pool\n", skipped_ids);
+    }
+    double total_time = (double)(clock() - start_time) / CLOCKS_PER_SEC;
+    printf_s("$Search Complete! Found %" PRId64 " viable out of %" PRId64 " total seeds @%.1f seeds/s\n",
+             total_found, total_processed,
+             (total_time > 0) ? (total_processed / total_time) : 0.0);
+    fflush(stdout);
+    *processed_out = total_processed;
+    *found_out = total_found;
+}
+
+// Daemon mode: keep the context, kernel and buffers loaded and run one search per stdin line
+//   JOB<TAB><id><TAB><config><TAB><start seed><TAB><seeds><TAB><cutoff>   ("-" keeps the default)
+//   QUIT
+// A start seed of "@<path>" evaluates the --seeds list at path instead of a range (not "@-":
+// stdin holds the job lines).
+// A job's output is the usual header, results, checkpoints and status lines between
+// "#JOB <id>" and "#END <id> <seeds searched> <seeds found>"; a rejected job prints
+// "#ERROR <id> <reason>" before its #END. "#READY" is printed once jobs are accepted,
+// followed by the optional features this daemon has ("seeds" for seed-list jobs).
+void runDaemon(SearchDevice *dev, const OuijaConfig *default_config)
+{
+    char line[DAEMON_LINE_MAX];
+    printf_s(dev->listKernel ? "#READY seeds\n" : "#READY\n");
+    fflush(stdout);
+
+    while (fgets(line, sizeof(line), stdin) != NULL) {
+        line[strcspn(line, "\r\n")] = '\0';
+        char *fields[DAEMON_JOB_FIELDS] = {0};
+        int numFields = 0;
+        char *cursor = line;
+        while (numFields < DAEMON_JOB_FIELDS) {
+            fields[numFields++] = cursor;
+            char *tab = strchr(cursor, '\t');
+            if (tab == NULL) break;
+            *tab = '\0';
+            cursor = tab + 1;
+        }
+
+        if (strcmp(fields[0], "QUIT") == 0) break;
+        if (strcmp(fields[0], "JOB") != 0 || numFields < 2) {
+            if (line[0] != '\0') printf_s("Ignoring daemon request: %s\n", line);
+            fflush(stdout);
+            continue;
+        }
+
+        const char *job_id = fields[1];
+        printf_s("#JOB %s\n", job_id);
+        if (numFields < DAEMON_JOB_FIELDS) {
+            printf_s("#ERROR %s expected %d tab-separated fields\n", job_id, DAEMON_JOB_FIELDS);
+            printf_s("#END %s 0 0\n", job_id);
+            fflush(stdout);
+            continue;
+        }
+
+        OuijaConfig config = *default_config;
+        if (strcmp(fields[2], "-") != 0) {
+            memset(&config, 0, sizeof(config));
+            config.maxSearchAnte = 8;
+            loadSearchConfig(fields[2], &config);
+        }
+
+        cl_char8 startingSeed;
+        for (int j = 0; j < 8; j++) {
+            startingSeed.s[j] = '\0';
+        }
+        FILE *seed_list = NULL;
+        cl_long listSeeds = 0;
+        if (fields[3][0] == '@') {
+            if (!dev->listKernel) {
+                printf_s("#ERROR %s seed lists need a kernel rebuilt from source\n", job_id);
+                printf_s("#END %s 0 0\n", job_id);
+                fflush(stdout);
+                continue;
+            }
+            if (strcmp(fields[3] + 1, "-") == 0) {
+                // stdin carries the daemon's job lines; it can't also be a seed list
+                printf_s("#ERROR %s seed lists cannot be read from stdin in daemon mode\n", job_id);
+                printf_s("#END %s 0 0\n", job_id);
+                fflush(stdout);
+                continue;
+            }
+            seed_list = openSeedList(fields[3] + 1, &listSeeds);
+            if (!seed_list) {
+                printf_s("#ERROR %s cannot open seed list %s\n", job_id, fields[3] + 1);
+                printf_s("#END %s 0 0\n", job_id);
+                fflush(stdout);
+                continue;
+            }
+        } else if (strcmp(fields[3], "-") != 0) {
+            parseStartingSeed(fields[3], &startingSeed);
+        }
+
+        cl_long numSeeds = seed_list ? listSeeds : 2318107019761;
+        if (!seed_list && strcmp(fields[4], "-") != 0 && strcmp(fields[4], "all") != 0) {
+            numSeeds = strtoll(fields[4], NULL, 10);
+        }
+
+        int cutoff = 1;
+        int auto_cutoff_mode = 0;
+        if (strcmp(fields[5], "-") != 0) {
+            auto_cutoff_mode = parseCutoff(fields[5], &cutoff);
+        }
+
+        cl_long total_processed = 0, total_found = 0;
+        if (seed_list) {
+            runSearch(dev, &config, startingSeed, numSeeds, seed_list, cutoff, auto_cutoff_mode,
+                      &total_processed, &total_found);
+            if (seed_list != stdin) fclose(seed_list);
+        } else if (numSeeds > 0) {
+            runSearch(dev, &config, startingSeed, numSeeds, NULL, cutoff, auto_cutoff_mode,
+                      &total_processed, &total_found);
+        } else {
+            printf_s("#ERROR %s invalid seed count %s\n", job_id, fields[4]);
+        }
+        printf_s("#END %s %" PRId64 " %" PRId64 "\n", job_id, total_processed, total_found);
+        fflush(stdout);
+    }
+}
+
 int main(int argc, char **argv)
 {
     // Print version
@@ -62,6 +541,16 @@ int main(int argc, char **argv)
     char *filter = "ouija_template";
     char *config_file = NULL;
 
+    // Binary result stream (opt-in); text "|seed,..." lines stay the default
+    int binary_mode = 0;
+    char *binary_out_path = NULL;
+
+    // Daemon mode: stay resident and take search jobs on stdin
+    int daemon_mode = 0;
+
+    // Seed-list mode: evaluate the seed ids in a file or pipe instead of a range
+    char *seed_list_path = NULL;
+
     // --- Argument Parsing Loop ---
     for (int i = 0; i < argc; i++) {
         if (strcmp(argv[i], "-h") == 0) {
@@ -71,11 +560,17 @@ int main(int argc, char **argv)
                     "-s <S>    Sets the starting seed to S. Defaults to empty seed. Use \"random\" for a random starting seed.\n"
                     "-n <N>    Sets the number of seeds to search to N. Defaults to full seed pool.\n"
                     "-c <C>    Sets the cutoff score for filtering results. Use 'auto' for dynamic cutoff. Defaults to 1.\n"
+                    "          'auto:<N>' starts the dynamic cutoff at N instead of 1.\n"
                     "-p <P>    Sets the platform ID of the CL device being used to P. Defaults to 0.\n"
                     "-d <D>    Sets the device ID of the CL device being used to D. Defaults to 0.\n"
                     "-g <G>    Sets the number of thread groups to G. Defaults to 16.\n"
                     "-b <B>    Sets batch multiplier to B. Higher values process more seeds per batch. Defaults to 100.\n"
                     "--config <JSON>  Load configuration from a JSON file.\n"
+                    "--binary         Write results as framed binary OuijaHostResult records on stdout.\n"
+                    "--binary-out <P> Write binary result frames to file or named pipe P instead of stdout.\n"
+                    "--daemon         Stay loaded and run search jobs read from stdin (see runDaemon).\n"
+                    "--seeds <P>      Evaluate the seeds listed in file or pipe P (\"-\" for stdin) instead of\n"
+                    "                 -s/-n: packed little-endian uint64 seed ids in shortlex order (\"1\" is 0).\n"
                     "--list_devices   Lists information about the detected CL devices.\n");
             return 0;
         }
@@ -83,6 +578,21 @@ int main(int argc, char **argv)
             config_file = argv[i + 1];
             i++;
         }
+        if (strcmp(argv[i], "--binary") == 0) {
+            binary_mode = 1;
+        }
+        if (strcmp(argv[i], "--daemon") == 0) {
+            daemon_mode = 1;
+        }
+        if (strcmp(argv[i], "--seeds") == 0 && i + 1 < argc) {
+            seed_list_path = argv[i + 1];
+            i++;
+        }
+        if (strcmp(argv[i], "--binary-out") == 0 && i + 1 < argc) {
+            binary_mode = 1;
+            binary_out_path = argv[i + 1];
+            i++;
+        }
         if (strcmp(argv[i], "-b") == 0 && i + 1 < argc) {
             batchMultiplier = (cl_uint)atoi(argv[i + 1]);
             i++;
@@ -108,33 +618,16 @@ int main(int argc, char **argv)
             i++;
         }
         if (strcmp(argv[i], "-c") == 0 && i + 1 < argc) {
-            if (strcmp(argv[i + 1], "auto") == 0) {
-                auto_cutoff_mode = 1;
-                cutoff = 1;
-                printf_s("Cutoff set to AUTO (dynamic)\n");
+            auto_cutoff_mode = parseCutoff(argv[i + 1], &cutoff);
+            if (auto_cutoff_mode) {
+                printf_s("Cutoff set to AUTO (dynamic) from %d\n", cutoff);
             } else {
-                cutoff = atoi(argv[i + 1]);
-                auto_cutoff_mode = 0;
                 printf_s("Cutoff set to %d\n", cutoff);
             }
             i++;
         }
         if (strcmp(argv[i], "-s") == 0 && i + 1 < argc) {
-            if (strcmp(argv[i + 1], "random") == 0 || strlen(argv[i + 1]) > 8) {
-                srand((unsigned int)time(NULL));
-                char seedCharacters[] = "123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ";
-                for (int j = 0; j < 8; j++) {
-                    startingSeed.s[j] = seedCharacters[rand() % 35];
-                }
-            } else {
-                int seedLength = (int)strlen(argv[i + 1]);
-                for (int j = 0; j < seedLength; j++) {
-                    startingSeed.s[j] = argv[i + 1][j];
-                }
-                for (int j = seedLength; j < 8; j++) {
-                    startingSeed.s[j] = '\0';
-                }
-            }
+            parseStartingSeed(argv[i + 1], &startingSeed);
             // Print the seed
             char seedStr[9] = {0};
             for (int j = 0; j < 8 && startingSeed.s[j] != '\0'; j++) {
@@ -192,19 +685,8 @@ int main(int argc, char **argv)
         }
     }
 
-    // Load configuration if specified
-    if (config_file != NULL) {
-        if (!load_config_from_json(config_file, &config)) {
-            printf_s("Failed to load configuration from %s. Using defaults.\n", config_file);
-        } else {
-            printf_s("Configuration loaded: %d needs, %d wants, max ante %d\n",
-                     config.numNeeds, config.numWants, config.maxSearchAnte);
-        }
-    }
-
-    // Validate config
-    if (config.numNeeds > MAX_DESIRES_HOST) config.numNeeds = MAX_DESIRES_HOST;
-    if (config.numWants > MAX_DESIRES_HOST) config.numWants = MAX_DESIRES_HOST;
+    // Load configuration if specified (the default for daemon jobs that don't name one)
+    loadSearchConfig(config_file, &config);
 
     // --- OpenCL Setup ---
     cl_int err;
@@ -377,6 +859,23 @@ int main(int argc, char **argv)
         return 1;
     }
 
+    // Seed-list kernel; a kernel binary cached before it existed doesn't have it
+    cl_kernel listKernel = clCreateKernel(ssKernelProgram, "ouija_evaluate_ids", &err);
+    if (err != CL_SUCCESS) {
+        listKernel = NULL;
+        if (seed_list_path != NULL) {
+            printf_s("Error: This kernel has no seed-list support. Delete %s to rebuild it from source.\n",
+                     binary_path);
+            clReleaseKernel(ssKernel);
+            clReleaseProgram(ssKernelProgram);
+            clReleaseCommandQueue(queue);
+            clReleaseContext(ctx);
+            free(devices);
+            free(platforms);
+            return 1;
+        }
+    }
+
     // Check work group size
     size_t max_work_group_size;
     clGetKernelWorkGroupInfo(ssKernel, device, CL_KERNEL_WORK_GROUP_SIZE, 
@@ -398,7 +897,6 @@ int main(int argc, char **argv)
 
     // Config buffer (small, read-only, so traditional buffer is fine)
     cl_mem configBuf = clCreateBuffer(ctx, CL_MEM_READ_ONLY, sizeof(OuijaConfig), NULL, &err);
-    clEnqueueWriteBuffer(queue, configBuf, CL_TRUE, 0, sizeof(OuijaConfig), &config, 0, NULL, NULL);
     OuijaHostResult* results = (OuijaHostResult*)clSVMAlloc(ctx, CL_MEM_READ_WRITE, 
                                                            sizeof(OuijaHostResult) * batch_capacity, 0);
     if (!results) {
@@ -414,182 +912,72 @@ int main(int argc, char **argv)
         return 1;
     }
 
-    // Set static kernel arguments (arguments that don't change per batch)
-    clSetKernelArg(ssKernel, 0, sizeof(cl_char8), &startingSeed);
-    clSetKernelArg(ssKernel, 2, sizeof(cl_mem), &configBuf);
-    clSetKernelArgSVMPointer(ssKernel, 3, results);    // Print CSV header - output headers for the configured wants
-    printf_s("+Seed,Score");
-    if (config.scoreNaturalNegatives) printf_s(",Natural Negative Jokers");
-    if (config.scoreDesiredNegatives) printf_s(",Desired Negative Jokers");
-    
-    // Output headers for configured wants only
-    for (int w = 0; w < config.numWants; w++) {
-        printf_s(",");
-        if (config.Wants[w].jokeredition != RETRY && config.Wants[w].jokeredition != No_Edition) {
-            print_item_host(config.Wants[w].jokeredition);
-            printf_s("_");
-            print_item_host(config.Wants[w].value);
-        } else {
-            print_item_host(config.Wants[w].value);
-        }
+    // Seed-list batches: ids are copied in per batch, so a plain read-only buffer will do
+    cl_mem seedIdsBuf = NULL;
+    cl_ulong *seedIds = NULL;
+    if (listKernel) {
+        seedIdsBuf = clCreateBuffer(ctx, CL_MEM_READ_ONLY, sizeof(cl_ulong) * batch_capacity, NULL, &err);
+        seedIds = (cl_ulong*)malloc(sizeof(cl_ulong) * batch_capacity);
     }
-    printf_s("\n");
-    fflush(stdout);
-
 
-    clock_t start_time = clock();
-    clock_t last_report = start_time;
-    
-    cl_long seeds_remaining = numSeeds;
-    cl_long current_offset = 0;
-    cl_long total_processed = 0;
-    cl_long total_found = 0;
-    
-    int first_batch = 1;
-    
-    printf_s("Starting search of %" PRId64 " seeds...\n", numSeeds);
-    while (seeds_remaining > 0) {        
-        // Calculate batch size
-        cl_long batch_size = (seeds_remaining > batch_capacity) ? batch_capacity : seeds_remaining;
-        
-        // Update kernel arguments for this batch
-        clSetKernelArg(ssKernel, 1, sizeof(cl_long), &batch_size);        // num_seeds_for_this_dispatch
-        clSetKernelArg(ssKernel, 4, sizeof(cl_long), &current_offset);    // batch_seed_offset (direct value)
-        
-        // Calculate work sizes
-        size_t global_work_size = ((batch_size + numGroups - 1) / numGroups) * numGroups;
-        size_t local_work_size = numGroups;
-        
-        // Launch kernel
-        err = clEnqueueNDRangeKernel(queue, ssKernel, 1, NULL, 
-                                    &global_work_size, &local_work_size, 0, NULL, NULL);
-        if (err != CL_SUCCESS) {
-            printf_s("Kernel launch failed: %d\n", err);
-            break;
-        }
-        
-        // Wait for completion
-        clFinish(queue);
-        
-        // Map SVM for reading (required for coarse-grain SVM)
-        clEnqueueSVMMap(queue, CL_TRUE, CL_MAP_READ, results, 
-                       sizeof(OuijaHostResult) * batch_size, 0, NULL, NULL);
-        
-        // Process results
-        int batch_high_score = cutoff;
-        for (cl_long i = 0; i < batch_size; i++) {
-            if (results[i].seed[0] == '\0') continue;
-            
-            if (results[i].TotalScore > batch_high_score) {
-                batch_high_score = results[i].TotalScore;
-            }
-            
-            // Skip cutoff scores on first batch in auto mode
-            if (first_batch && auto_cutoff_mode && results[i].TotalScore <= cutoff) {
-                continue;
-            }
-
-            if (results[i].TotalScore >= cutoff) {
-                total_found++;
-                printf_s("|%s,%d", results[i].seed, results[i].TotalScore);
-                if (config.scoreNaturalNegatives) printf_s(",%d", results[i].NaturalNegativeJokers);
-                if (config.scoreDesiredNegatives) printf_s(",%d", results[i].DesiredNegativeJokers);
-                // Output configured wants only to match header
-                for (int w = 0; w < config.numWants; w++) {
-                    printf_s(",%d", (int)results[i].ScoreWants[w]);
-                }
-                printf_s("\n");
-            }
-        }
-        fflush(stdout);
-        
-        // Update cutoff in auto mode
-        if (auto_cutoff_mode && batch_high_score > cutoff) {
-            cutoff = batch_high_score;
-            if (first_batch) {
-                printf_s("[AUTO] First batch cutoff set to %d\n", cutoff);
-            }
-        }
-        first_batch = 0;
-        
-        // Unmap SVM
-        clEnqueueSVMUnmap(queue, results, 0, NULL, NULL);
-        
-        // Update counters
-        total_processed += batch_size;
-        current_offset += batch_size;
-        seeds_remaining -= batch_size;
-        
-          // Progress report every quarter second
-        clock_t now = clock();
-        if ((now - last_report) > 250) {            
-            double elapsed = (double)(now - start_time) / CLOCKS_PER_SEC;
-            double rate = total_processed / elapsed;
-            double eta_seconds = seeds_remaining / rate;
-            
-            // Calculate elapsed time components
-            int elapsed_minutes = (int)(elapsed / 60);
-            int elapsed_seconds_remainder = (int)elapsed % 60;
-            
-            // Calculate ETA components
-            int eta_days = (int)(eta_seconds / (60 * 60 * 24));
-            int eta_hours = (int)((eta_seconds - (eta_days * 60 * 60 * 24)) / 3600);
-            int eta_minutes = (int)((eta_seconds - (eta_days * 60 * 60 * 24) - (eta_hours * 3600)) / 60);
-            
-            // Format elapsed time string
-            char elapsed_string[64];
-            if (elapsed_minutes > 0) {
-                snprintf(elapsed_string, sizeof(elapsed_string), "in %d minutes and %d seconds", 
-                         elapsed_minutes, elapsed_seconds_remainder);
-            } else {
-                snprintf(elapsed_string, sizeof(elapsed_string), "in %d seconds", 
-                         elapsed_seconds_remainder);
-            }
-            
-            // Format ETA string  
-            char eta_string[128];
-            if (eta_days >= 1) {
-                snprintf(eta_string, sizeof(eta_string), "(ETA: %d days %d hours)", 
-                         eta_days, eta_hours);
-            } else if (eta_hours >= 1) {
-                snprintf(eta_string, sizeof(eta_string), "(ETA: %d hours %d minutes)", 
-                         eta_hours, eta_minutes);
-            } else if (eta_minutes >= 1) {
-                snprintf(eta_string, sizeof(eta_string), "(ETA: %d minutes %d seconds)",
-                        eta_minutes, (int)eta_seconds % 60);
-            } else {
-                snprintf(eta_string, sizeof(eta_string), "(ETA: %d seconds)",
-                        (int)eta_seconds);
-            }
-            
-            // Calculate rarity percentage
-            double rarity_percent = (total_processed > 0) ? (100.0 * total_found / total_processed) : 0.0;
-            
-            // Format searched count with appropriate units (K/M suffix)
-            char searched_string[32];
-            if (total_processed >= 1000000) {
-                snprintf(searched_string, sizeof(searched_string), "%.1fM", total_processed / 1000000.0);
-            } else if (total_processed >= 1000) {
-                snprintf(searched_string, sizeof(searched_string), "%.1fK", total_processed / 1000.0);
-            } else {
-                snprintf(searched_string, sizeof(searched_string), "%" PRId64, total_processed);
+    // Open the binary result stream and a host buffer to compact survivors into
+    FILE *binary_stream = NULL;
+    OuijaHostResult *binary_batch = NULL;
+    if (binary_mode) {
+        if (binary_out_path != NULL) {
+            if (fopen_s(&binary_stream, binary_out_path, "wb") != 0 || !binary_stream) {
+                printf_s("Error: Cannot open binary output %s\n", binary_out_path);
+                clSVMFree(ctx, results);
+                clReleaseKernel(ssKernel);
+                clReleaseProgram(ssKernelProgram);
+                clReleaseMemObject(configBuf);
+                clReleaseCommandQueue(queue);
+                clReleaseContext(ctx);
+                free(devices);
+                free(platforms);
+                return 1;
             }
-              // Enhanced progress reporting with new format
-            printf_s("$Found %" PRId64 " valid seeds of %s searched so far. (%.8f%% Rarity!) %s. %s :clock: %.1fK/s\n",
-                     total_found, searched_string, rarity_percent, elapsed_string, eta_string, rate / 1000.0);
-                    
+        } else {
             fflush(stdout);
-            last_report = now;
+#ifdef _WIN32
+            // Stop the CRT from turning 0x0A bytes in the records into \r\n
+            _setmode(_fileno(stdout), _O_BINARY);
+#endif
+            binary_stream = stdout;
         }
+        binary_batch = (OuijaHostResult*)malloc(sizeof(OuijaHostResult) * batch_capacity);
+        printf_s("Binary result mode: %zu-byte records\n", sizeof(OuijaHostResult));
     }
-    
-    // Final report
-    double total_time = (double)(clock() - start_time) / CLOCKS_PER_SEC;
-    printf_s("$Search Complete! Found %" PRId64 " viable out of %" PRId64 " total seeds @%.1f seeds/s\n",
-             total_found, total_processed,
-             (total_time > 0) ? (total_processed / total_time) : 0.0);
-    fflush(stdout);
+
+    SearchDevice dev = {queue, ssKernel, listKernel, configBuf, seedIdsBuf, seedIds, results, numGroups,
+                        batch_capacity, binary_mode, binary_stream, binary_batch};
+    int exit_code = 0;
+    if (daemon_mode) {
+        runDaemon(&dev, &config);
+    } else if (seed_list_path != NULL) {
+        // -s and -n don't apply: the list names every seed
+        cl_long listSeeds, total_processed, total_found;
+        FILE *seed_list = openSeedList(seed_list_path, &listSeeds);
+        if (seed_list) {
+            runSearch(&dev, &config, startingSeed, listSeeds, seed_list, cutoff, auto_cutoff_mode,
+                      &total_processed, &total_found);
+            if (seed_list != stdin) fclose(seed_list);
+        } else {
+            printf_s("Error: Cannot open seed list %s\n", seed_list_path);
+            exit_code = 1;
+        }
+    } else {
+        cl_long total_processed, total_found;
+        runSearch(&dev, &config, startingSeed, numSeeds, NULL, cutoff, auto_cutoff_mode,
+                  &total_processed, &total_found);
+    }
+
       // --- Cleanup ---
+    if (seedIds) free(seedIds);
+    if (seedIdsBuf) clReleaseMemObject(seedIdsBuf);
+    if (listKernel) clReleaseKernel(listKernel);
+    if (binary_batch) free(binary_batch);
+    if (binary_stream && binary_stream != stdout) fclose(binary_stream);
     clSVMFree(ctx, results);
     clReleaseMemObject(configBuf);
     clReleaseKernel(ssKernel);
@@ -599,5 +987,5 @@ int main(int argc, char **argv)
     free(devices);
     free(platforms);
     
-    return 0;
+    return exit_code;
 }
\ No newline at end of file
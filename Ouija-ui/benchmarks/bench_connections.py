@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""
+Results refresh connection benchmark
+
+Compares one results table refresh the way the widget used to do it (read
+user.ouija.conf, build a new DatabaseModel, connect to the file, query) with
+reading through the long-lived database model and the shared connection
+manager, and reports how many times the database file was opened. Also times
+an idle refresh, which only checks the change token and skips the query.
+
+Usage (from the Ouija-ui directory):
+    python benchmarks/bench_connections.py [rows]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import make_batch  # noqa: E402
+from controllers.database_controller import DatabaseController  # noqa: E402
+from models.connection_manager import connection_manager  # noqa: E402
+from models.database_model import DatabaseModel  # noqa: E402
+
+COLUMNS = ["Seed", "Score", "Perkeo", "Yorick"]
+REFRESHES = 50
+
+
+def legacy_refresh(db_dir, conf_path):
+    """One refresh as the widget did it: settings file, new model, connect, query"""
+    with open(conf_path, "r") as f:
+        config_path = json.load(f).get("last_config_path")
+    db_model = DatabaseModel()
+    db_model.DB_DIR = db_dir
+    if db_model.connect(config_path) and db_model.table_exists():
+        db_model.get_dataframe()
+    db_model.close()
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    with tempfile.TemporaryDirectory() as db_dir:
+        config_path = os.path.join(db_dir, "bench.ouija.json")
+        conf_path = os.path.join(db_dir, "user.ouija.conf")
+        with open(conf_path, "w") as f:
+            json.dump({"last_config_path": config_path}, f)
+
+        db_model = DatabaseModel()
+        db_model.DB_DIR = db_dir
+        db_model.connect(config_path)
+        db_model.prepare_results_table(COLUMNS)
+        writer = db_model.writer_cursor()
+        for start in range(0, count, 5000):
+            db_model._bulk_upsert(writer, COLUMNS, make_batch(start, 5000))
+        writer.close()
+
+        # Before: nothing else holds the file, so every refresh opens it again
+        db_model.close()
+        opens = connection_manager.opens
+        begin = time.perf_counter()
+        for _ in range(REFRESHES):
+            legacy_refresh(db_dir, conf_path)
+        legacy_ms = (time.perf_counter() - begin) / REFRESHES * 1000
+        legacy_opens = connection_manager.opens - opens
+
+        # After: the controller's model stays connected, refreshes borrow it
+        controller = DatabaseController(db_model)
+        db_model.connect(config_path)
+        opens = connection_manager.opens
+        begin = time.perf_counter()
+        for _ in range(REFRESHES):
+            controller.get_results_data(config_path)
+        shared_ms = (time.perf_counter() - begin) / REFRESHES * 1000
+        shared_opens = connection_manager.opens - opens
+
+        # Idle: nothing written since the last refresh, so only the token is read
+        seen_token = controller.get_change_token(config_path)
+        begin = time.perf_counter()
+        for _ in range(REFRESHES):
+            if controller.get_change_token(config_path) != seen_token:
+                controller.get_results_data(config_path)
+        idle_ms = (time.perf_counter() - begin) / REFRESHES * 1000
+        controller.close()
+
+    print(f"Table rows: {count}, refreshes: {REFRESHES}")
+    print(f"new DatabaseModel per refresh (before): {legacy_ms:8.2f} ms/refresh, {legacy_opens} file opens")
+    print(f"shared model and connection (after):    {shared_ms:8.3f} ms/refresh, {shared_opens} file opens")
+    print(f"idle refresh, change token unchanged:   {idle_ms:8.3f} ms/refresh")
+
+
+if __name__ == "__main__":
+    main()
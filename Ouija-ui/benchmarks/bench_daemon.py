@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+"""
+Back-to-back search benchmark for the resident Ouija-CLI (--daemon)
+
+Runs a fake Ouija-CLI that sleeps for a fixed setup time (standing in for
+platform enumeration, context creation, the kernel load and SVM allocation)
+and then searches at a fixed rate, and times a series of short searches like
+the steps of a fun search:
+  - a new process per search (SearchModel.use_cli_daemon = False)
+  - one resident CLI taking each search as a request
+  - a fake CLI without --daemon (not listed in its -h), which runs processes
+and checks that every search stored all of its results.
+
+Usage (from the Ouija-ui directory):
+    python benchmarks/bench_daemon.py [searches] [setup_seconds]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import probe_cli, write_fake_cli  # noqa: E402
+from models.database_model import DatabaseModel  # noqa: E402
+from models.search_model import SearchModel  # noqa: E402
+from models.seed_codec import encode_seed, skip_seed  # noqa: E402
+
+RESULT_EVERY = 97
+SEEDS_PER_SEARCH = 200000
+RATE = 20000000  # Seeds per second once set up
+
+FAKE_CLI = '''#!{python}
+import os, sys, time
+if "-h" in sys.argv:
+    # Answered before any setup or imports, like the real CLI's argument loop
+    print("--daemon         Stay loaded" if os.environ.get("FAKE_CLI_DAEMON") == "1" else "--config <JSON>")
+    sys.exit(0)
+sys.path.insert(0, {root!r})
+from models.seed_codec import decode_seed, encode_seed
+
+def search(start, count, cutoff):
+    print("+Seed,Score,Perkeo")
+    first = encode_seed(start)
+    time.sleep(count / {rate})
+    lines = ["|%s,%d,%d" % (decode_seed(i), 1 + i % 40, i % 3)
+             for i in range(first + (-first) % {every}, first + count, {every})]
+    sys.stdout.write("\\n".join(lines + ["#CKPT %s %d %d" % (start, count, count), "$Search Complete!"]) + "\\n")
+    sys.stdout.flush()
+    return count, len(lines)
+
+args = sys.argv[1:]
+time.sleep(float(os.environ["FAKE_CLI_SETUP_SECONDS"]))
+if "--daemon" in args and os.environ.get("FAKE_CLI_DAEMON") == "1":
+    print("#READY", flush=True)
+    for line in sys.stdin:
+        fields = line.rstrip("\\n").split("\\t")
+        if fields[0] == "QUIT":
+            break
+        print("#JOB " + fields[1])
+        done, found = search(fields[3], int(fields[4]), fields[5])
+        print("#END %s %d %d" % (fields[1], done, found), flush=True)
+else:
+    # Like an older CLI: unknown flags are ignored, no -s/-n searches everything from the first seed
+    options = {{flag: value for flag, value in zip(args, args[1:]) if flag in ("-s", "-n", "-c")}}
+    search(options.get("-s", "1"), int(options.get("-n", 10 ** 9)), options.get("-c"))
+'''
+
+
+def expected_results(first_id, count):
+    """Number of ids in [first_id, first_id + count) the fake CLI reports"""
+    return (first_id + count - 1) // RESULT_EVERY - (first_id - 1) // RESULT_EVERY
+
+
+def run(db_dir, cli_path, name, searches, use_daemon, daemon_supported=True):
+    """Run searches one after another on a fresh database and return the timings"""
+    os.environ["FAKE_CLI_DAEMON"] = "1" if daemon_supported else "0"
+    db_model = DatabaseModel()
+    db_model.DB_DIR = db_dir
+    db_model.connect(os.path.join(db_dir, f"{name}.ouija.json"))
+
+    model = SearchModel()
+    model._get_cli_path = lambda: cli_path
+    probe_cli(model)
+    model.use_cli_daemon = use_daemon
+    finished = threading.Event()
+    model.set_callbacks(console_callback=lambda message, **kwargs: None,
+                        process_finished_callback=finished.set)
+
+    seeds = [skip_seed("11111111", i * SEEDS_PER_SEARCH) for i in range(searches)]
+    times = []
+    started = time.perf_counter()
+    for seed in seeds:
+        finished.clear()
+        search_started = time.perf_counter()
+        assert model.start_search("bench", seed, "32", str(SEEDS_PER_SEARCH), db_model, "1", None,
+                                  "bench_template"), "search did not start"
+        finished.wait(60)
+        times.append(time.perf_counter() - search_started)
+    elapsed = time.perf_counter() - started
+
+    with db_model.reader_cursor() as cursor:
+        stored = cursor.execute('SELECT COUNT(DISTINCT "Seed") FROM results').fetchone()[0]
+    expected = sum(expected_results(encode_seed(seed), SEEDS_PER_SEARCH) for seed in seeds)
+    model.shutdown()
+    db_model.close()
+    return {"elapsed": elapsed, "first": times[0], "rest": sum(times[1:]) / max(len(times) - 1, 1),
+            "complete": stored == expected, "stored": stored}
+
+
+def report(label, result, baseline=None):
+    """Print one line of measurements"""
+    speedup = f" ({baseline['elapsed'] / result['elapsed']:.1f}x)" if baseline else ""
+    print(f"{label:<24} total {result['elapsed']:6.2f}s{speedup:<8} first {result['first'] * 1000:7.1f}ms  "
+          f"later {result['rest'] * 1000:7.1f}ms/search  "
+          f"results {'ok' if result['complete'] else 'MISSING'} ({result['stored']})")
+
+
+def main():
+    searches = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    setup = float(sys.argv[2]) if len(sys.argv) > 2 else 0.5
+    os.environ["FAKE_CLI_SETUP_SECONDS"] = str(setup)
+    with tempfile.TemporaryDirectory() as db_dir:
+        cli_path = write_fake_cli(db_dir, FAKE_CLI, rate=RATE, every=RESULT_EVERY)
+        print(f"{searches} searches of {SEEDS_PER_SEARCH:,} seeds, {setup:.2f}s CLI setup")
+        processes = run(db_dir, cli_path, "processes", searches, use_daemon=False)
+        report("process per search", processes)
+        report("resident CLI", run(db_dir, cli_path, "daemon", searches, use_daemon=True), processes)
+        report("no --daemon (fallback)", run(db_dir, cli_path, "fallback", searches, use_daemon=True,
+                                              daemon_supported=False), processes)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""
+Duplicate suppression micro-benchmark
+
+Upserts the same results twice, as a restarted or overlapping search would,
+and compares the cost of the second pass with screening disabled (every row
+goes through INSERT OR REPLACE) versus enabled (unchanged rows are dropped
+before DuckDB sees them).
+
+Usage (from the Ouija-ui directory):
+    python benchmarks/bench_dedupe.py [rows]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import make_batch  # noqa: E402
+from models.database_model import DatabaseModel  # noqa: E402
+from models.result_schema import SEED_ID_COLUMN  # noqa: E402
+
+COLUMNS = ["Seed", "Score", "Perkeo", "Yorick"]
+
+
+class _NoScreening:
+    """Stand-in for SeenResults that lets every row through
+
+    Without the set nothing is known about what is stored, so every row is
+    treated as possibly replacing one (its old values are read for the histograms).
+    """
+
+    duplicates_avoided = 0
+
+    def screen(self, conn, columns, batch):
+        return batch, batch[SEED_ID_COLUMN].to_numpy(), None
+
+    def stored(self, keys):
+        return np.ones(len(keys), dtype=bool)
+
+    def add(self, keys, values):
+        pass
+
+
+def replay_seconds(count, batch_size, screening):
+    """Upsert count rows, then time upserting them again"""
+    batches = [make_batch(start, batch_size) for start in range(0, count, batch_size)]
+    with tempfile.TemporaryDirectory() as db_dir:
+        db_model = DatabaseModel()
+        db_model.DB_DIR = db_dir
+        db_model.connect(os.path.join(db_dir, "bench.ouija.json"))
+        db_model.prepare_results_table(COLUMNS)
+        if not screening:
+            db_model.seen_results = _NoScreening()
+        writer = db_model.writer_cursor()
+        for batch in batches:
+            db_model._bulk_upsert(writer, COLUMNS, batch)
+
+        begin = time.perf_counter()
+        for batch in batches:
+            db_model._bulk_upsert(writer, COLUMNS, batch)
+        elapsed = time.perf_counter() - begin
+        avoided = db_model.seen_results.duplicates_avoided
+        db_model.close()
+    return elapsed, avoided
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500000
+    batch_size = 5000
+    before, _ = replay_seconds(count, batch_size, screening=False)
+    after, avoided = replay_seconds(count, batch_size, screening=True)
+    print(f"Re-emitted rows: {count}")
+    print(f"replay with INSERT OR REPLACE only (before): {before:6.2f}s ({count / before / 1000:7.1f}K rows/s)")
+    print(f"replay with seen-row screening (after):      {after:6.2f}s ({count / after / 1000:7.1f}K rows/s)")
+    print(f"duplicates avoided: {avoided}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+"""
+Results export benchmark
+
+Exports the full results table by loading it into pandas and writing it
+from Python (before) versus streaming it with DuckDB COPY (after), for CSV,
+Parquet and newline-delimited JSON.
+
+Usage (from the Ouija-ui directory):
+    python benchmarks/bench_export.py [rows]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import make_batch  # noqa: E402
+from models.database_model import DatabaseModel  # noqa: E402
+
+COLUMNS = ["Seed", "Score", "Perkeo", "Yorick"]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000000
+    with tempfile.TemporaryDirectory() as db_dir:
+        db_model = DatabaseModel()
+        db_model.DB_DIR = db_dir
+        db_model.connect(os.path.join(db_dir, "bench.ouija.json"))
+        db_model.prepare_results_table(COLUMNS)
+        writer = db_model.writer_cursor()
+        for start in range(0, count, 20000):
+            db_model._bulk_upsert(writer, COLUMNS, make_batch(start, 20000))
+        writer.close()
+
+        # Before: the whole sorted table through pandas
+        begin = time.perf_counter()
+        frame = db_model._query_sorted("Score", True, count)
+        frame.to_csv(os.path.join(db_dir, "pandas.csv"), index=False)
+        pandas_seconds = time.perf_counter() - begin
+        del frame
+
+        print(f"Table rows: {count}")
+        print(f"csv via pandas (before):      {pandas_seconds:6.2f}s")
+        for export_format in ("csv", "parquet", "json"):
+            path = os.path.join(db_dir, f"export.{export_format}")
+            begin = time.perf_counter()
+            job = db_model.start_export(path, export_format)
+            job.wait()
+            seconds = time.perf_counter() - begin
+            size_mb = os.path.getsize(path) / (1 << 20)
+            print(f"{export_format:<7} via COPY (after):     {seconds:6.2f}s, "
+                  f"{job.rows} rows, {size_mb:.1f} MB")
+        db_model.close()
+
+
+if __name__ == "__main__":
+    main()
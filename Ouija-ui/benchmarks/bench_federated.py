@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""
+Federated results benchmark
+
+Builds several configs' results databases with overlapping seeds, then compares
+finding the seeds that several configs share by opening each database in turn
+(the only way before) with FederatedResults: the first query (attaching every
+file), repeat queries (nothing changed, so nothing is re-read) and a query after
+one file was written to.
+
+Usage (from the Ouija-ui directory):
+    python benchmarks/bench_federated.py [configs] [rows per config]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.connection_manager import connection_manager  # noqa: E402
+from models.federated_results import FederatedResults  # noqa: E402
+from models.result_schema import create_results_schema  # noqa: E402
+from models.seed_codec import LENGTH_OFFSETS, decode_seeds  # noqa: E402
+
+REPEATS = 10
+LIMIT = 1000  # Seeds shown, like the results table
+SEED_POOL = 5000000  # Configs draw from a shared pool so their seeds overlap
+
+
+def build_databases(db_dir, configs, rows):
+    """One packed results database per config"""
+    rng = np.random.default_rng(1)
+    paths = []
+    for index in range(configs):
+        path = os.path.join(db_dir, f"config{index}.ouija.duckdb")
+        ids = np.unique(rng.integers(0, SEED_POOL, rows).astype(np.uint64) + np.uint64(LENGTH_OFFSETS[8]))
+        frame = pd.DataFrame({"SeedId": ids, "Score": (ids % 41).astype(np.uint16), "Egg": (ids % 3).astype(np.uint8)})
+        conn = duckdb.connect(path)
+        create_results_schema(conn, ['"Score" USMALLINT', '"Egg" UTINYINT'])
+        conn.register("_frame", frame)
+        conn.execute('INSERT INTO result_rows SELECT * FROM _frame')
+        conn.close()
+        paths.append(path)
+    return paths
+
+
+def shared_seeds_one_at_a_time(paths, min_score):
+    """Open every database, pull its good rows, and join them in pandas"""
+    frames = []
+    for path in paths:
+        conn = duckdb.connect(path, read_only=True)
+        frame = conn.execute('SELECT "SeedId", "Score" FROM result_rows WHERE "Score" >= ?', [min_score]).fetch_df()
+        conn.close()
+        frames.append(frame.assign(config=os.path.basename(path)))
+    rows = pd.concat(frames)
+    grouped = rows.groupby("SeedId")["Score"].agg(["count", "sum"])
+    grouped = grouped[grouped["count"] >= 2].sort_values(["count", "sum"], ascending=False).head(LIMIT)
+    return pd.DataFrame({"Seed": decode_seeds(grouped.index.to_numpy()), "Configs": grouped["count"].to_numpy()})
+
+
+def main():
+    configs = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    rows = int(sys.argv[2]) if len(sys.argv) > 2 else 500000
+    min_score = 20
+
+    with tempfile.TemporaryDirectory() as db_dir:
+        paths = build_databases(db_dir, configs, rows)
+
+        begin = time.perf_counter()
+        for _ in range(REPEATS):
+            before = shared_seeds_one_at_a_time(paths, min_score)
+        one_at_a_time = (time.perf_counter() - begin) / REPEATS
+
+        federated = FederatedResults(db_dir)
+        begin = time.perf_counter()
+        after = federated.seeds_across(min_score=min_score, limit=LIMIT)
+        first = time.perf_counter() - begin
+
+        begin = time.perf_counter()
+        for _ in range(REPEATS):
+            federated.seeds_across(min_score=min_score, limit=LIMIT)
+        cached = (time.perf_counter() - begin) / REPEATS
+
+        begin = time.perf_counter()
+        catalog = federated.catalog()
+        catalog_time = time.perf_counter() - begin
+
+        # Write to one file through the app's connection manager (which has the
+        # federated layer detach it first); only that file is attached again
+        conn = connection_manager.acquire(paths[0])
+        conn.execute('UPDATE result_rows SET "Score" = "Score" WHERE "SeedId" = (SELECT min("SeedId") FROM result_rows)')
+        connection_manager.release(paths[0])
+        reads = federated.reads
+        begin = time.perf_counter()
+        federated.seeds_across(min_score=min_score, limit=LIMIT)
+        changed = time.perf_counter() - begin
+        reread = federated.reads - reads
+        federated.close()
+
+    print(f"Configs: {configs}, rows per config: {rows}, seeds in {sum(e['rows'] for e in catalog)} rows total")
+    same = (before["Configs"].to_numpy() == after["Configs"].to_numpy()).all()
+    print(f"Top {LIMIT} seeds with score >= {min_score} in 2+ configs (same counts: {same})")
+    print(f"{'open each database in turn':34}{one_at_a_time * 1000:10.1f} ms")
+    print(f"{'federated, first query':34}{first * 1000:10.1f} ms")
+    print(f"{'federated, nothing changed':34}{cached * 1000:10.1f} ms")
+    print(f"{'catalog, nothing changed':34}{catalog_time * 1000:10.1f} ms")
+    print(f"{'federated, one file changed':34}{changed * 1000:10.1f} ms  ({reread} file re-read)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python
+"""
+Score histogram benchmark
+
+Fills a results database through the bulk upsert path, which keeps the score
+and per-want histograms current, and reports what the bookkeeping adds to each
+batch. Then compares answering "how are scores distributed / how many rows are
+at or above X" with an ad-hoc GROUP BY over the whole table (the only way
+before) against reading the maintained histograms.
+
+Usage (from the Ouija-ui directory):
+    python benchmarks/bench_histogram.py [rows]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import make_random_batch  # noqa: E402
+from models.connection_manager import connection_manager  # noqa: E402
+from models.database_model import DatabaseModel  # noqa: E402
+
+COLUMNS = ["Seed", "Score", "Natural Negative Jokers", "Desired Negative Jokers", "Perkeo", "Blueprint"]
+BATCH_SIZE = 5000
+REPEATS = 20
+
+
+def group_by_scan(db_model):
+    """Score histogram, per-want histograms and rows at or above each score from result_rows"""
+    with db_model.reader_cursor() as cursor:
+        for col in COLUMNS[1:]:
+            cursor.execute(f'SELECT "{col}", COUNT(*) FROM result_rows GROUP BY 1 ORDER BY 1').fetchall()
+        cursor.execute('SELECT "Score", SUM(COUNT(*)) OVER (ORDER BY "Score" DESC) '
+                       'FROM result_rows GROUP BY 1').fetchall()
+
+
+def maintained(db_model):
+    """The same answers from the histogram tables"""
+    for col in COLUMNS[1:]:
+        db_model.get_histogram(col)
+    db_model.get_score_cutoffs()
+
+
+def timed(function, *args):
+    """Average seconds per call over REPEATS calls"""
+    begin = time.perf_counter()
+    for _ in range(REPEATS):
+        function(*args)
+    return (time.perf_counter() - begin) / REPEATS
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2000000
+    if rows < 1:
+        sys.exit("rows must be at least 1")
+    batch_size = min(BATCH_SIZE, rows)  # Fewer rows than a batch are ingested as one smaller batch
+    rng = np.random.default_rng(1)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        config_path = os.path.join(work_dir, "bench.ouija.json")
+        with open(config_path, "w") as f:
+            json.dump({"name": "bench", "filter_config": {}}, f)
+        db_model = DatabaseModel()
+        db_model.DB_DIR = work_dir
+        db_model.connect(config_path)
+        db_model.prepare_results_table(COLUMNS)
+        writer = db_model.writer_cursor()
+
+        # Time the histogram bookkeeping separately from the rest of each upsert
+        stats = db_model.result_stats
+        update = stats.update
+        counting = []
+
+        def timed_update(*args, **kwargs):
+            start = time.perf_counter()
+            update(*args, **kwargs)
+            counting.append(time.perf_counter() - start)
+
+        stats.update = timed_update
+        begin = time.perf_counter()
+        for start in range(0, rows, batch_size):
+            batch = make_random_batch(rng, min(batch_size, rows - start), COLUMNS)
+            db_model.insert_result_frame(COLUMNS, batch, conn=writer)
+        ingest_seconds = time.perf_counter() - begin
+
+        scan = timed(group_by_scan, db_model)
+        read = timed(maintained, db_model)
+        above = timed(db_model.count_results_at_or_above, 50)
+        cutoffs = db_model.get_score_cutoffs()
+        with db_model.reader_cursor() as cursor:
+            exact = cursor.execute('SELECT COUNT(*) FROM result_rows WHERE "Score" >= 50').fetchone()[0]
+        counted = db_model.count_results_at_or_above(50)
+        stored = db_model.count_results()
+
+        writer.close()
+        db_model.close()
+        connection_manager.close_all()
+
+    per_batch = np.array(counting) * 1000
+    print(f"Rows: {stored} in {len(counting)} batches of {batch_size}, ingest {rows / ingest_seconds:,.0f} rows/s")
+    print(f"Histogram bookkeeping per batch: p50 {np.percentile(per_batch, 50):.2f} ms, "
+          f"p99 {np.percentile(per_batch, 99):.2f} ms "
+          f"({per_batch.sum() / 1000 / ingest_seconds * 100:.1f}% of ingest time)")
+    print(f"{'GROUP BY over result_rows':34}{scan * 1000:10.2f} ms")
+    print(f"{'maintained histograms':34}{read * 1000:10.2f} ms")
+    print(f"{'rows at or above 50':34}{above * 1000:10.2f} ms  ({counted} counted, {exact} in the table)")
+    print(f"Score buckets: {len(cutoffs)}")
+
+
+if __name__ == "__main__":
+    main()
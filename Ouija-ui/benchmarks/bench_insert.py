@@ -0,0 +1,79 @@
+#!/usr/bin/env python
+"""
+Insert micro-benchmark for DatabaseModel
+
+Measures rows/s for the row-by-row insert_result path with a cold schema cache
+(what every insert used to cost: table_exists + PRAGMA table_info + commit) and
+with a warm cache (no catalog access), plus the bulk insert_results path.
+
+Usage (from the Ouija-ui directory):
+    python benchmarks/bench_insert.py [rows]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.database_model import DatabaseModel  # noqa: E402
+from models.seed_codec import LENGTH_OFFSETS, decode_seed  # noqa: E402
+
+COLUMNS = ["Seed", "Score", "Natural Negative Jokers", "Desired Negative Jokers", "Perkeo", "Yorick"]
+
+
+def make_rows(count, offset=0):
+    """Generate fake result rows shaped like CLI output"""
+    return [[decode_seed(LENGTH_OFFSETS[8] + i + offset), i % 40, 0, i % 2, i % 3, i % 5] for i in range(count)]
+
+
+def open_model(db_dir, name):
+    """Connect a DatabaseModel to a fresh database in db_dir"""
+    db_model = DatabaseModel()
+    db_model.DB_DIR = db_dir
+    db_model.connect(os.path.join(db_dir, f"{name}.ouija.json"))
+    db_model.create_table(COLUMNS)
+    return db_model
+
+
+def bench_row_by_row(db_model, rows, cold_cache):
+    """Insert rows one at a time, optionally forcing a catalog lookup per row"""
+    start = time.perf_counter()
+    for row in rows:
+        if cold_cache:
+            db_model._invalidate_schema_cache()
+        db_model.insert_result(COLUMNS, row)
+    return len(rows) / (time.perf_counter() - start)
+
+
+def bench_bulk(db_model, rows, batch_size=5000):
+    """Insert rows in bulk batches"""
+    start = time.perf_counter()
+    for i in range(0, len(rows), batch_size):
+        db_model.insert_results(COLUMNS, rows[i:i + batch_size])
+    return len(rows) / (time.perf_counter() - start)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    with tempfile.TemporaryDirectory() as db_dir:
+        cold = open_model(db_dir, "cold")
+        cold_rate = bench_row_by_row(cold, make_rows(count), cold_cache=True)
+        cold.close()
+
+        warm = open_model(db_dir, "warm")
+        warm_rate = bench_row_by_row(warm, make_rows(count), cold_cache=False)
+        warm.close()
+
+        bulk = open_model(db_dir, "bulk")
+        bulk_rate = bench_bulk(bulk, make_rows(count * 10))
+        bulk.close()
+
+    print(f"insert_result, schema cache cold (before): {cold_rate:10.0f} rows/s")
+    print(f"insert_result, schema cache warm (after):  {warm_rate:10.0f} rows/s  ({warm_rate / cold_rate:.1f}x)")
+    print(f"insert_results, 5000-row batches:           {bulk_rate:10.0f} rows/s  ({bulk_rate / cold_rate:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""
+Results paging micro-benchmark
+
+Times reading deep pages of the results table with LIMIT/OFFSET (before)
+versus the keyset queries ResultsPager uses (after), and how often paging
+forward is served by the background prefetch.
+
+Usage (from the Ouija-ui directory):
+    python benchmarks/bench_paging.py [rows]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import make_batch  # noqa: E402
+from models.database_model import DatabaseModel  # noqa: E402
+from models.results_pager import ResultsPager  # noqa: E402
+
+COLUMNS = ["Seed", "Score", "Perkeo", "Yorick"]
+PAGE_SIZE = 1000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    with tempfile.TemporaryDirectory() as db_dir:
+        db_model = DatabaseModel()
+        db_model.DB_DIR = db_dir
+        db_model.connect(os.path.join(db_dir, "bench.ouija.json"))
+        db_model.prepare_results_table(COLUMNS)
+        writer = db_model.writer_cursor()
+        for start in range(0, count, 10000):
+            db_model._bulk_upsert(writer, COLUMNS, make_batch(start, 10000))
+        writer.close()
+
+        # Before: OFFSET has to produce and skip every row above the page
+        deep_page = count // PAGE_SIZE - 1
+        begin = time.perf_counter()
+        db_model.conn.execute(
+            f'SELECT * FROM result_rows ORDER BY "Score" DESC, "SeedId" ASC '
+            f'LIMIT {PAGE_SIZE} OFFSET {deep_page * PAGE_SIZE}'
+        ).fetch_df()
+        offset_ms = (time.perf_counter() - begin) * 1000
+
+        # After: page forward the way the UI does, with a pause between clicks
+        pager = ResultsPager(db_model, page_size=PAGE_SIZE)
+        pages = min(50, deep_page)
+        page_seconds = 0.0
+        for index in range(pages):
+            begin = time.perf_counter()
+            pager.get_page(index)
+            page_seconds += time.perf_counter() - begin
+            time.sleep(0.3)  # Time between clicks
+        last = pager.get_page(pages - 1)
+        begin = time.perf_counter()
+        db_model.query_results_after((int(last["Score"].iloc[-1]), str(last["Seed"].iloc[-1])), PAGE_SIZE)
+        keyset_ms = (time.perf_counter() - begin) * 1000
+        pager.close()
+        db_model.close()
+
+    print(f"Table rows: {count}")
+    print(f"page {deep_page + 1} via LIMIT/OFFSET (before):   {offset_ms:8.2f} ms")
+    print(f"next page via keyset query (after):     {keyset_ms:8.2f} ms")
+    print(f"paging forward {pages} pages in the UI:      {page_seconds / pages * 1000:8.2f} ms/page "
+          f"({pager.cache_hits} prefetched, {pager.fetches} queries)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""
+Result parsing micro-benchmark
+
+Compares the per-line path (readline + DatabaseModel.process_csv_line) with the
+chunked path (CliStreamSplitter + parse_result_block on 64 KiB reads batched the
+way the ingest writer batches them).
+
+Usage (from the Ouija-ui directory):
+    python benchmarks/bench_parse.py [lines]
+"""
+
+import io
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.cli_stream import CliStreamSplitter, parse_result_block  # noqa: E402
+from models.database_model import DatabaseModel  # noqa: E402
+from models.seed_codec import LENGTH_OFFSETS, decode_seeds  # noqa: E402
+
+COLUMNS = ["Seed", "Score", "Natural Negative Jokers", "Desired Negative Jokers", "Perkeo", "Yorick", "Blueprint"]
+
+
+def make_stream(count):
+    """Generate fake CLI stdout: header, result lines and a status line every 100K results"""
+    lines = [("+" + ",".join(COLUMNS) + "\n").encode()]
+    seeds = decode_seeds(np.arange(count) + LENGTH_OFFSETS[8])
+    for i in range(count):
+        lines.append(b"|%s,%d,0,%d,%d,%d,%d\n" % (seeds[i].encode(), i % 40, i % 2, i % 3, i % 5, i % 7))
+        if i % 100000 == 0:
+            lines.append(b"$Searching :clock: 1M seeds/s\n")
+    return b"".join(lines)
+
+
+def bench_per_line(data):
+    """Parse the stream one readline() at a time"""
+    with tempfile.TemporaryDirectory() as db_dir:
+        db_model = DatabaseModel()
+        db_model.DB_DIR = db_dir
+        db_model.connect(os.path.join(db_dir, "bench.ouija.json"))
+        stream = io.TextIOWrapper(io.BytesIO(data), encoding="utf-8", errors="ignore")
+        start = time.perf_counter()
+        rows = 0
+        for line in stream:
+            if line.startswith("|"):
+                db_model.process_csv_line(line)
+                rows += 1
+        elapsed = time.perf_counter() - start
+        db_model.close()
+    return rows, elapsed
+
+
+def bench_chunked(data, chunk_size=1 << 16, batch_rows=5000):
+    """Split 64 KiB reads in bulk and parse result blocks once per batch"""
+    splitter = CliStreamSplitter()
+    start = time.perf_counter()
+    rows = 0
+    pending, pending_rows = [], 0
+    for offset in range(0, len(data) + 1, chunk_size):
+        chunk = data[offset:offset + chunk_size]
+        for event in (splitter.feed(chunk) if chunk else splitter.finish()):
+            if event[0] == "results":
+                pending.append(event[1])
+                pending_rows += event[1].count(b"\n")
+        if pending_rows >= batch_rows or not chunk:
+            if pending:
+                rows += len(parse_result_block(b"".join(pending), COLUMNS))
+            pending, pending_rows = [], 0
+    return rows, time.perf_counter() - start
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    data = make_stream(count)
+
+    old_rows, old_seconds = bench_per_line(data)
+    new_rows, new_seconds = bench_chunked(data)
+
+    old_rate = old_rows / old_seconds
+    new_rate = new_rows / new_seconds
+    print(f"readline + process_csv_line (before): {old_rate:10.0f} lines/s")
+    print(f"CliStreamSplitter + parse_result_block: {new_rate:10.0f} lines/s  ({new_rate / old_rate:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python
+"""
+Results refresh micro-benchmark
+
+Measures what one results table refresh costs: the ORDER BY Score DESC, Seed
+LIMIT 1000 query over the whole table (before) versus reading the in-memory
+top results kept current by the ingest path (after), plus the per-batch cost
+of keeping that top-K up to date. Also compares how a reader that already
+shows the top-K catches up after each batch: full snapshot plus DataFrame
+comparison versus applying only the rows that entered the top-K.
+
+Usage (from the Ouija-ui directory):
+    python benchmarks/bench_refresh.py [rows]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import make_batch  # noqa: E402
+from models.database_model import DatabaseModel  # noqa: E402
+from models.top_results import apply_top_delta  # noqa: E402
+
+COLUMNS = ["Seed", "Score", "Perkeo", "Yorick"]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    batch_size = 5000
+    with tempfile.TemporaryDirectory() as db_dir:
+        db_model = DatabaseModel()
+        db_model.DB_DIR = db_dir
+        db_model.connect(os.path.join(db_dir, "bench.ouija.json"))
+        db_model.prepare_results_table(COLUMNS)
+        writer = db_model.writer_cursor()
+
+        # Fill the table without maintaining the top-K, then load it once
+        db_model.top_results.invalidate()
+        for start in range(0, count, batch_size):
+            db_model._bulk_upsert(writer, COLUMNS, make_batch(start, batch_size))
+        db_model._load_top_results()
+
+        # Time the merge on its own, and a reader catching up after each batch
+        merge_seconds = snapshot_seconds = delta_seconds = 0.0
+        top_results = db_model.top_results
+        shown = top_results.snapshot()
+        version, _, _ = top_results.changes_since(None)
+        for start in range(count, count + 50 * batch_size, batch_size):
+            batch = make_batch(start, batch_size)
+            begin = time.perf_counter()
+            top_results.update(batch)
+            merge_seconds += time.perf_counter() - begin
+
+            begin = time.perf_counter()
+            snapshot = top_results.snapshot()
+            snapshot.equals(shown)
+            snapshot_seconds += time.perf_counter() - begin
+
+            begin = time.perf_counter()
+            version, rows, _ = top_results.changes_since(version)
+            shown = apply_top_delta(shown, rows, top_results.capacity)
+            delta_seconds += time.perf_counter() - begin
+
+        refreshes = 50
+        begin = time.perf_counter()
+        for _ in range(refreshes):
+            db_model._query_sorted("Score", True, db_model.TOP_RESULTS_LIMIT)
+        query_ms = (time.perf_counter() - begin) / refreshes * 1000
+
+        begin = time.perf_counter()
+        for _ in range(refreshes):
+            db_model.get_dataframe()
+        memory_ms = (time.perf_counter() - begin) / refreshes * 1000
+        db_model.close()
+
+    print(f"Table rows: {count}")
+    print(f"refresh via ORDER BY ... LIMIT 1000 (before): {query_ms:8.2f} ms")
+    print(f"refresh via in-memory top results (after):    {memory_ms:8.3f} ms")
+    print(f"top-K merge per {batch_size}-row batch:          {merge_seconds / 50 * 1000:8.2f} ms")
+    print(f"reader catch-up via full snapshot + equals:   {snapshot_seconds / 50 * 1000:8.3f} ms")
+    print(f"reader catch-up via top-K delta:              {delta_seconds / 50 * 1000:8.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
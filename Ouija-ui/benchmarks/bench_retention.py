@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+"""
+Result retention benchmark
+
+Fills a results database, then applies a keep-top-N retention policy while a
+writer thread keeps upserting batches (like a running search). Reports how long
+pruning took, the longest time a pruning batch held the writer lock, the
+writer's batch latency with and without the pruner running, and the file size
+before and after.
+
+Usage (from the Ouija-ui directory):
+    python benchmarks/bench_retention.py [rows] [keep_top]
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import make_random_batch  # noqa: E402
+from models.connection_manager import connection_manager  # noqa: E402
+from models.database_model import DatabaseModel  # noqa: E402
+from models.result_retention import RetentionPolicy  # noqa: E402
+
+COLUMNS = ["Seed", "Score", "Natural Negative Jokers", "Desired Negative Jokers", "Perkeo"]
+BATCH_SIZE = 10000
+WRITER_BATCH = 5000
+
+
+def time_writes(db_model, writer, rng, keep_going):
+    """Upsert writer batches until keep_going() is False; returns each batch's seconds"""
+    latencies = []
+    while keep_going():
+        start = time.perf_counter()
+        db_model.insert_result_frame(COLUMNS, make_random_batch(rng, WRITER_BATCH, COLUMNS), conn=writer)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2000000
+    keep_top = int(sys.argv[2]) if len(sys.argv) > 2 else 200000
+    rng = np.random.default_rng(1)
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        config_path = os.path.join(work_dir, "bench.ouija.json")
+        with open(config_path, "w") as f:
+            json.dump({"name": "bench", "filter_config": {}}, f)
+        db_model = DatabaseModel()
+        db_model.DB_DIR = work_dir
+        db_model.connect(config_path)
+        db_model.prepare_results_table(COLUMNS)
+        writer = db_model.writer_cursor()
+        for _ in range(rows // BATCH_SIZE):
+            db_model.insert_result_frame(COLUMNS, make_random_batch(rng, BATCH_SIZE, COLUMNS), conn=writer)
+        writer.execute("CHECKPOINT")
+        size_before = os.path.getsize(db_model.current_db_path)
+
+        # Writer latency with nothing else going on
+        deadline = time.monotonic() + 3.0
+        baseline = time_writes(db_model, writer, rng, lambda: time.monotonic() < deadline)
+
+        # Writer latency while the pruner works through the table
+        begin = time.perf_counter()
+        done = threading.Event()
+        pruning = []
+        thread = threading.Thread(target=lambda: pruning.extend(
+            time_writes(db_model, writer, rng, lambda: not done.is_set())))
+        thread.start()
+        db_model.set_retention(RetentionPolicy(keep_top=keep_top))
+        db_model.pruner.wait_idle()
+        prune_seconds = time.perf_counter() - begin
+        done.set()
+        thread.join()
+        db_model.pruner.request(force=True)  # Rows the writer added meanwhile
+        db_model.pruner.wait_idle()
+
+        stats = db_model.pruner.stats()
+        remaining = db_model.count_results()
+        size_after = os.path.getsize(db_model.current_db_path)
+        writer.close()
+        db_model.stop_pruner()
+        db_model.close()
+        connection_manager.close_all()
+
+    def percentile(values, q):
+        return np.percentile(values, q) * 1000 if values else 0.0
+
+    print(f"Rows: {rows}, keep top {keep_top}, {stats['rows_pruned']} pruned "
+          f"in {stats['batches']} batches, {remaining} left")
+    print(f"Pruning took {prune_seconds:.1f}s, longest batch {stats['max_batch_seconds'] * 1000:.0f} ms")
+    print(f"{'writer batch latency':24}{'p50':>10}{'p99':>10}{'max':>10}")
+    for label, values in (("idle", baseline), ("while pruning", pruning)):
+        print(f"{label:24}{percentile(values, 50):8.0f}ms{percentile(values, 99):8.0f}ms"
+              f"{(max(values) * 1000 if values else 0.0):8.0f}ms")
+    print(f"File size: {size_before / (1 << 20):.1f} MB -> {size_after / (1 << 20):.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+"""
+Compact schema benchmark
+
+Builds a results database with the old schema (Seed VARCHAR key, INTEGER
+columns and a Score index), migrates it with models.result_schema, and reports
+the file size, a full-column scan and the top-1000 query before and after.
+
+Usage (from the Ouija-ui directory):
+    python benchmarks/bench_schema.py [rows]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import duckdb
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.result_schema import compact_database_file, format_report, results_query, scan_seconds  # noqa: E402
+
+WANT_COLUMNS = ["Natural Negative Jokers", "Desired Negative Jokers", "Perkeo", "Yorick", "Triboulet", "Canio"]
+
+
+def build_old_database(db_path, count):
+    """Create a results table the way the app did before the compact schema"""
+    conn = duckdb.connect(db_path)
+    columns_def = ['"Seed" VARCHAR PRIMARY KEY', '"Score" INTEGER'] + [f'"{col}" INTEGER' for col in WANT_COLUMNS]
+    conn.execute(f"CREATE TABLE results ({', '.join(columns_def)})")
+    conn.execute('CREATE INDEX idx_score ON results ("Score")')
+    wants = ", ".join([f"((range * {7 + i}) % {2 + i})::INTEGER" for i in range(len(WANT_COLUMNS))])
+    conn.execute(
+        # Hex digits with Z for 0 are valid, unique 8-character seeds
+        f"INSERT INTO results SELECT replace(printf('%08X', range), '0', 'Z'), ((range * 7919) % 61)::INTEGER, {wants} "
+        f"FROM range({count})"
+    )
+    conn.close()
+
+
+def time_top_query(db_path, query):
+    """Time the results table's top-1000 query"""
+    conn = duckdb.connect(db_path)
+    begin = time.perf_counter()
+    for _ in range(10):
+        conn.execute(query).fetch_df()
+    seconds = (time.perf_counter() - begin) / 10
+    conn.close()
+    return seconds
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000000
+    with tempfile.TemporaryDirectory() as db_dir:
+        db_path = os.path.join(db_dir, "bench.ouija.duckdb")
+        build_old_database(db_path, count)
+        top_before = time_top_query(db_path, 'SELECT * FROM results ORDER BY "Score" DESC, "Seed" ASC LIMIT 1000')
+        scan_before = scan_seconds(db_path)
+        report = compact_database_file(db_path)
+        report.update(scan_seconds_before=scan_before, scan_seconds_after=scan_seconds(db_path))
+        top_after = time_top_query(db_path, results_query(order_by='"Score" DESC, "SeedId" ASC', limit=1000))
+
+    print(format_report(report))
+    print(f"top-1000 query: {top_before * 1000:.1f} ms -> {top_after * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
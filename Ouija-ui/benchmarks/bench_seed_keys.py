@@ -0,0 +1,115 @@
+#!/usr/bin/env python
+"""
+Seed key benchmark
+
+Upserts the same results into a table keyed on Seed VARCHAR (before) and one
+keyed on the packed seed id (after, encoding included), then times re-upserting
+every row, point lookups and a seed range query on both.
+
+Usage (from the Ouija-ui directory):
+    python benchmarks/bench_seed_keys.py [rows]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from models.result_schema import create_results_schema, rows_query, seed_strings  # noqa: E402
+from models.seed_codec import SEED_COUNT, decode_seeds, encode_seeds, seed_range  # noqa: E402
+
+BATCH_SIZE = 10000
+LOOKUPS = 2000
+RANGE = ("AAAA1111", "AAAZZZZZ")
+
+
+def make_batches(count):
+    """Random 8-character seeds (like --random searches) with deterministic values"""
+    rng = np.random.default_rng(1)
+    ids = rng.integers(SEED_COUNT - 35 ** 8, SEED_COUNT, count, dtype=np.uint64)
+    seeds = decode_seeds(ids)
+    frame = pd.DataFrame({"Seed": seeds, "Score": (ids % 61).astype(np.int64), "Perkeo": (ids % 3).astype(np.int64)})
+    return [frame.iloc[start:start + BATCH_SIZE] for start in range(0, count, BATCH_SIZE)]
+
+
+def upsert_strings(conn, batches):
+    """INSERT OR REPLACE keyed on Seed strings"""
+    begin = time.perf_counter()
+    for batch in batches:
+        conn.register("_batch", batch)
+        conn.execute('INSERT OR REPLACE INTO results SELECT "Seed", "Score", "Perkeo" FROM _batch')
+        conn.unregister("_batch")
+    return time.perf_counter() - begin
+
+
+def upsert_packed(conn, batches):
+    """INSERT OR REPLACE keyed on packed seed ids, encoding each batch first"""
+    begin = time.perf_counter()
+    for batch in batches:
+        packed = pd.DataFrame({"SeedId": encode_seeds(batch["Seed"])[0],
+                               "Score": batch["Score"].to_numpy(), "Perkeo": batch["Perkeo"].to_numpy()})
+        conn.register("_batch", packed)
+        conn.execute('INSERT OR REPLACE INTO result_rows SELECT "SeedId", "Score", "Perkeo" FROM _batch')
+        conn.unregister("_batch")
+    return time.perf_counter() - begin
+
+
+def time_queries(conn, query, params, convert=lambda frame: frame):
+    """Average seconds per query (fetched as a DataFrame) over a list of parameter lists"""
+    begin = time.perf_counter()
+    for values in params:
+        convert(conn.execute(query, values).fetch_df())
+    return (time.perf_counter() - begin) / len(params)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 2000000
+    batches = make_batches(count)
+    probes = pd.concat(batches)["Seed"].sample(LOOKUPS, random_state=1).tolist()
+    low, high = seed_range(*RANGE)
+
+    with tempfile.TemporaryDirectory() as db_dir:
+        before = duckdb.connect(os.path.join(db_dir, "strings.duckdb"))
+        before.execute('CREATE TABLE results ("Seed" VARCHAR PRIMARY KEY, "Score" USMALLINT, "Perkeo" UTINYINT)')
+        after = duckdb.connect(os.path.join(db_dir, "packed.duckdb"))
+        create_results_schema(after, ['"Score" USMALLINT', '"Perkeo" UTINYINT'])
+
+        insert_before = upsert_strings(before, batches)
+        insert_after = upsert_packed(after, batches)
+        replace_before = upsert_strings(before, batches)
+        replace_after = upsert_packed(after, batches)
+
+        lookup_before = time_queries(before, 'SELECT * FROM results WHERE "Seed" = ?', [[s] for s in probes])
+        lookup_after = time_queries(after, rows_query('"SeedId" = ?::UBIGINT'),
+                                    [[int(i)] for i in encode_seeds(probes)[0]], seed_strings)
+
+        range_before = time_queries(
+            before, 'SELECT * FROM results WHERE "Seed" BETWEEN ? AND ? ORDER BY "Seed"', [list(RANGE)] * 20)
+        range_query = rows_query('"SeedId" BETWEEN ?::UBIGINT AND ?::UBIGINT', '"SeedId"')
+        range_after = time_queries(after, range_query, [[low, high]] * 20, seed_strings)
+        matches = seed_strings(after.execute(range_query, [low, high]).fetch_df())
+
+        for conn in (before, after):
+            conn.execute("CHECKPOINT")
+            conn.close()
+        size_before = os.path.getsize(os.path.join(db_dir, "strings.duckdb"))
+        size_after = os.path.getsize(os.path.join(db_dir, "packed.duckdb"))
+
+    print(f"Rows: {count} in batches of {BATCH_SIZE}")
+    print(f"{'':24}{'Seed VARCHAR':>14}{'packed SeedId':>15}")
+    print(f"{'insert':24}{count / insert_before / 1000:11.1f}K/s{count / insert_after / 1000:12.1f}K/s")
+    print(f"{'re-upsert every row':24}{count / replace_before / 1000:11.1f}K/s{count / replace_after / 1000:12.1f}K/s")
+    print(f"{'point lookup':24}{lookup_before * 1000:11.2f} ms{lookup_after * 1000:12.2f} ms")
+    print(f"{'range ' + '..'.join(RANGE):24}{range_before * 1000:11.2f} ms{range_after * 1000:12.2f} ms"
+          f"  ({len(matches)} rows)")
+    print(f"{'file size':24}{size_before / (1 << 20):11.1f} MB{size_after / (1 << 20):12.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
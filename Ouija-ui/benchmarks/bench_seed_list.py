@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+"""
+Seed-list benchmark for SearchModel.start_seed_list_search
+
+Runs a fake Ouija-CLI that sleeps for a fixed setup time, searches at a fixed
+rate and reports every 97th seed id, either over a -s/-n range or over the ids
+in a --seeds list (also as "@path" daemon requests). It evaluates the same
+scattered seeds (many short runs, like the padded words of a fun search):
+  - one range search per run, a process each
+  - one range search per run on the resident CLI
+  - one seed list, as a process and on a warmed-up resident CLI
+checks that every run stored the same results, and times building and writing
+a large list.
+
+Usage (from the Ouija-ui directory):
+    python benchmarks/bench_seed_list.py [runs] [setup_seconds]
+"""
+
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import probe_cli, write_fake_cli  # noqa: E402
+from models.database_model import DatabaseModel  # noqa: E402
+from models.search_model import SearchModel  # noqa: E402
+from models.seed_codec import LENGTH_OFFSETS, decode_seed, decode_seeds  # noqa: E402
+from models.seed_lists import seed_list_ids, write_seed_list  # noqa: E402
+
+RESULT_EVERY = 97
+RUN_SEEDS = 35 ** 2  # Seeds per run, like a word padded with two characters
+RATE = 20000000  # Seeds per second once set up
+
+FAKE_CLI = '''#!{python}
+import os, sys, time
+if "-h" in sys.argv:
+    # Answered before any setup or imports, like the real CLI's argument loop
+    print("--daemon         Stay loaded")
+    sys.exit(0)
+import numpy as np
+sys.path.insert(0, {root!r})
+from models.seed_codec import decode_seeds, encode_seed
+
+def report(ids):
+    time.sleep(len(ids) / {rate})
+    hits = ids[ids % {every} == 0]
+    return ["|%s,%d,%d" % (seed, 1 + int(i) % 40, int(i) % 3) for seed, i in zip(decode_seeds(hits), hits)]
+
+def search(start, count, seed_list=None):
+    print("+Seed,Score,Perkeo")
+    if seed_list:
+        ids = np.fromfile(seed_list, dtype="<u8")
+        lines = report(ids)
+    else:
+        first = encode_seed(start)
+        ids = np.arange(first, first + count, dtype=np.uint64)
+        lines = report(ids) + ["#CKPT %s %d %d" % (start, count, count)]
+    sys.stdout.write("\\n".join(lines + ["$Search Complete!"]) + "\\n")
+    sys.stdout.flush()
+    return len(ids), len([line for line in lines if line.startswith("|")])
+
+args = sys.argv[1:]
+time.sleep(float(os.environ["FAKE_CLI_SETUP_SECONDS"]))
+if "--daemon" in args:
+    print("#READY seeds", flush=True)
+    for line in sys.stdin:
+        fields = line.rstrip("\\n").split("\\t")
+        if fields[0] == "QUIT":
+            break
+        print("#JOB " + fields[1])
+        if fields[3].startswith("@"):
+            done, found = search(None, 0, fields[3][1:])
+        else:
+            done, found = search(fields[3], int(fields[4]))
+        print("#END %s %d %d" % (fields[1], done, found), flush=True)
+else:
+    options = dict(zip(args, args[1:]))
+    search(options.get("-s", "1"), int(options.get("-n", 0)), options.get("--seeds"))
+'''
+
+
+def run_starts(runs):
+    """First seed id of each run, spread over the 7-character seeds"""
+    rng = np.random.default_rng(7)
+    return np.sort(rng.choice(np.arange(LENGTH_OFFSETS[7], LENGTH_OFFSETS[8] - RUN_SEEDS, RUN_SEEDS * 4,
+                                        dtype=np.uint64), runs, replace=False))
+
+
+def run(db_dir, cli_path, name, starts, as_list, use_daemon):
+    """Evaluate every run on a fresh database and return the timings"""
+    db_model = DatabaseModel()
+    db_model.DB_DIR = db_dir
+    db_model.connect(os.path.join(db_dir, f"{name}.ouija.json"))
+
+    model = SearchModel()
+    model._get_cli_path = lambda: cli_path
+    probe_cli(model)
+    model.use_cli_daemon = use_daemon
+    finished = threading.Event()
+    model.set_callbacks(console_callback=lambda message, **kwargs: None,
+                        process_finished_callback=finished.set)
+
+    def wait_for(started):
+        assert started, "search did not start"
+        finished.wait(120)
+        finished.clear()
+
+    if as_list and use_daemon:
+        # A list only goes to a daemon that is up; warm one with a one-seed search
+        wait_for(model.start_search("bench", "1", "32", "1", db_model, "1", None, "bench_template"))
+        model.cli_daemon._ready.wait(60)
+
+    started = time.perf_counter()
+    if as_list:
+        ids = (starts[:, None] + np.arange(RUN_SEEDS, dtype=np.uint64)).ravel()
+        wait_for(model.start_seed_list_search("bench", ids, "32", db_model, "1", None, "bench_template"))
+    else:
+        for start in starts:
+            wait_for(model.start_search("bench", decode_seed(int(start)), "32", str(RUN_SEEDS), db_model, "1",
+                                        None, "bench_template"))
+    elapsed = time.perf_counter() - started
+
+    with db_model.reader_cursor() as cursor:
+        stored = {row[0] for row in cursor.execute('SELECT "Seed" FROM results').fetchall()}
+    stored.discard("1")  # The warm-up seed
+    model.shutdown()
+    db_model.close()
+    return {"elapsed": elapsed, "stored": stored}
+
+
+def report(label, result, expected, baseline=None):
+    """Print one line of measurements"""
+    speedup = f" ({baseline['elapsed'] / result['elapsed']:.1f}x)" if baseline else ""
+    print(f"{label:<28} {result['elapsed']:7.2f}s{speedup:<8} "
+          f"results {'ok' if result['stored'] == expected else 'MISMATCH'} ({len(result['stored'])})")
+
+
+def bench_writer(count):
+    """Time turning seed strings into a list and writing ids through the memory map"""
+    rng = np.random.default_rng(11)
+    ids = rng.integers(0, LENGTH_OFFSETS[9], count, dtype=np.uint64)
+    seeds = decode_seeds(ids[:1000000])
+    started = time.perf_counter()
+    seed_list_ids(seeds)
+    encoded = time.perf_counter() - started
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bench.seeds")
+        started = time.perf_counter()
+        unique, _ = seed_list_ids(ids)
+        written = write_seed_list(path, unique)
+        elapsed = time.perf_counter() - started
+        size = os.path.getsize(path)
+    print(f"encode 1,000,000 seed strings: {encoded:.2f}s; sort + write {written:,} ids "
+          f"({size / 1e6:.0f} MB): {elapsed:.2f}s ({size / 1e6 / elapsed:.0f} MB/s)")
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    setup = float(sys.argv[2]) if len(sys.argv) > 2 else 0.5
+    os.environ["FAKE_CLI_SETUP_SECONDS"] = str(setup)
+    starts = run_starts(runs)
+    ids = (starts[:, None] + np.arange(RUN_SEEDS, dtype=np.uint64)).ravel()
+    expected = set(decode_seeds(ids[ids % RESULT_EVERY == 0]))
+    with tempfile.TemporaryDirectory() as db_dir:
+        cli_path = write_fake_cli(db_dir, FAKE_CLI, rate=RATE, every=RESULT_EVERY)
+        print(f"{runs} runs of {RUN_SEEDS:,} seeds ({len(ids):,} seeds), {setup:.2f}s CLI setup")
+        processes = run(db_dir, cli_path, "ranges", starts, as_list=False, use_daemon=False)
+        report("range per run, processes", processes, expected)
+        report("range per run, resident CLI", run(db_dir, cli_path, "ranges_daemon", starts, False, True),
+               expected, processes)
+        report("one seed list, process", run(db_dir, cli_path, "list", starts, True, False), expected, processes)
+        report("one seed list, resident CLI", run(db_dir, cli_path, "list_daemon", starts, True, True),
+               expected, processes)
+    bench_writer(10000000)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+"""
+Sharding benchmark for SearchModel.start_sharded_search
+
+Runs a fake Ouija-CLI that searches at a fixed rate per device (-d) and prints a
+result for every 997th seed id plus a #CKPT line per batch, then measures:
+  - throughput with 1, 2 and 4 equally fast devices
+  - one fast and one slow device, with and without work stealing
+and checks that every expected result reached the database and that the
+filter's coverage index holds the whole range.
+
+Usage (from the Ouija-ui directory):
+    python benchmarks/bench_shards.py [seeds] [seeds_per_second]
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.common import probe_cli, write_fake_cli  # noqa: E402
+from models.database_model import DatabaseModel  # noqa: E402
+from models.search_model import SearchModel  # noqa: E402
+from models.seed_codec import LENGTH_OFFSETS  # noqa: E402
+
+RESULT_EVERY = 997
+BATCH = 250000
+CONFIG_HASH = "benchshards0"
+TEMPLATE = "bench_template"
+
+FAKE_CLI = '''#!{python}
+import os, sys, time
+sys.path.insert(0, {root!r})
+from models.seed_codec import decode_seed, encode_seed
+
+args = dict(zip(sys.argv[1::2], sys.argv[2::2]))
+rates = dict(part.split("=") for part in os.environ["FAKE_CLI_RATES"].split(","))
+rate = float(rates[args.get("-d", "0")])
+start = args["-s"]
+first, count = encode_seed(start), int(args["-n"])
+print("+Seed,Score,Perkeo", flush=True)
+done = 0
+while done < count:
+    batch = min({batch}, count - done)
+    time.sleep(batch / rate)
+    low = first + done
+    lines = ["|%s,%d,%d" % (decode_seed(i), i % 40, i % 3)
+             for i in range(low + (-low) % {every}, low + batch, {every})]
+    done += batch
+    sys.stdout.write("\\n".join(lines + ["#CKPT %s %d %d" % (start, done, count)]) + "\\n")
+    sys.stdout.flush()
+'''
+
+
+def expected_results(first_id, count):
+    """Number of ids in [first_id, first_id + count) the fake CLI reports"""
+    return (first_id + count - 1) // RESULT_EVERY - (first_id - 1) // RESULT_EVERY
+
+
+def run(db_dir, cli_path, name, rates, seeds, steal=True):
+    """Run one sharded search on a fresh database and return its measurements"""
+    os.environ["FAKE_CLI_RATES"] = ",".join(f"{device}={rate}" for device, rate in enumerate(rates))
+    db_model = DatabaseModel()
+    db_model.DB_DIR = db_dir
+    db_model.connect(os.path.join(db_dir, f"{name}.ouija.json"))
+
+    model = SearchModel()
+    model._get_cli_path = lambda: cli_path
+    probe_cli(model)
+    model.set_callbacks(console_callback=lambda message, **kwargs: None)
+    model.shard_min_steal_seconds = 0.5 if steal else float("inf")
+    model.shard_min_steal_seeds = BATCH
+
+    first_id = LENGTH_OFFSETS[8]
+    started = time.perf_counter()
+    ok = model.start_sharded_search(
+        "bench", "11111111", "32", str(seeds), db_model, None, None, TEMPLATE,
+        devices=[(0, device) for device in range(len(rates))], config_hash=CONFIG_HASH)
+    assert ok, "no shard started"
+    model.scheduler.wait()
+    elapsed = time.perf_counter() - started
+    model.ingest_writer.sync()
+
+    stats = model.scheduler.stats()
+    with db_model.reader_cursor() as cursor:
+        stored = cursor.execute('SELECT COUNT(DISTINCT "Seed") FROM results').fetchone()[0]
+    coverage = db_model.get_search_coverage(CONFIG_HASH, TEMPLATE)
+    model.shutdown()
+    db_model.close()
+    return {
+        "elapsed": elapsed,
+        "seeds_per_second": seeds / elapsed,
+        "steals": stats["steals"],
+        "shards": stats["shards"],
+        "complete": stored == expected_results(first_id, seeds),
+        "stored": stored,
+        "covered": coverage["ranges"] == 1 and coverage["seeds_covered"] >= seeds,
+    }
+
+
+def report(label, result, baseline=None):
+    """Print one line of measurements"""
+    speedup = f", {result['seeds_per_second'] / baseline:.2f}x" if baseline else ""
+    print(f"{label:<28} {result['elapsed']:6.2f}s {result['seeds_per_second'] / 1e6:7.2f}M seeds/s{speedup}  "
+          f"shards {result['shards']:>2} steals {result['steals']:>2}  "
+          f"results {'ok' if result['complete'] else 'MISSING'} ({result['stored']})  "
+          f"coverage {'ok' if result['covered'] else 'INCOMPLETE'}")
+
+
+def main():
+    seeds = int(sys.argv[1]) if len(sys.argv) > 1 else 20000000
+    rate = float(sys.argv[2]) if len(sys.argv) > 2 else 5000000
+    with tempfile.TemporaryDirectory() as db_dir:
+        cli_path = write_fake_cli(db_dir, FAKE_CLI, batch=BATCH, every=RESULT_EVERY)
+        print(f"{seeds:,} seeds, {rate / 1e6:.1f}M seeds/s per fake device")
+
+        baseline = None
+        for devices in (1, 2, 4):
+            result = run(db_dir, cli_path, f"scale{devices}", [rate] * devices, seeds)
+            baseline = baseline or result["seeds_per_second"]
+            report(f"{devices} device(s)", result, baseline)
+
+        # Ideal for a 4:1 pair is 1.25x one fast device; an even split stalls on the slow one
+        fast = run(db_dir, cli_path, "fast", [rate], seeds)
+        report("1 fast device", fast)
+        for steal in (False, True):
+            result = run(db_dir, cli_path, f"mixed{int(steal)}", [rate, rate / 4], seeds, steal=steal)
+            report(f"fast + slow, stealing {'on' if steal else 'off'}", result, fast["seeds_per_second"])
+
+
+if __name__ == "__main__":
+    main()
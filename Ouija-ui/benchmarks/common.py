@@ -0,0 +1,85 @@
+"""
+Benchmark helpers - Fake results and fake CLI scripts shared by the bench_*.py scripts
+
+Import after the bench script has put the Ouija-ui directory on sys.path:
+    from benchmarks.common import make_batch  # noqa: E402
+"""
+
+import os
+import stat
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from models.seed_codec import LENGTH_OFFSETS, NUM_CHARS, decode_seeds
+
+UI_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Exclusive upper bound of the random values make_random_batch() gives each want
+RANDOM_WANT_VALUES = {
+    "Natural Negative Jokers": 3,
+    "Desired Negative Jokers": 3,
+    "Perkeo": 2,
+    "Blueprint": 2,
+}
+
+
+def make_batch(start, count):
+    """Generate a batch of fake results with deterministic scores
+
+    Seeds are the 8-character seeds from 11111111 on, offset by start; the
+    columns are Seed, Score, Perkeo and Yorick.
+    """
+    ids = np.arange(start, start + count)
+    return pd.DataFrame({
+        "Seed": decode_seeds(ids + LENGTH_OFFSETS[8]),  # 8-character seeds from 11111111
+        "Score": (ids * 7919) % 61,
+        "Perkeo": ids % 3,
+        "Yorick": ids % 5,
+    })
+
+
+def make_random_batch(rng, count, columns):
+    """Random 8-character seeds with CLI-like values
+
+    Args:
+        rng (numpy.random.Generator): Source of the seeds and values
+        count (int): Number of rows
+        columns (list): Seed, Score and want columns (see RANDOM_WANT_VALUES)
+
+    Returns:
+        DataFrame: One row per seed, in the order of columns
+    """
+    ids = rng.integers(0, NUM_CHARS ** 8, count).astype(np.uint64) + np.uint64(LENGTH_OFFSETS[8])
+    frame = {"Seed": decode_seeds(ids), "Score": rng.integers(0, 60, count)}
+    for column in columns[2:]:
+        frame[column] = rng.integers(0, RANDOM_WANT_VALUES.get(column, 2), count)
+    return pd.DataFrame(frame)
+
+
+def write_fake_cli(directory, script, **values):
+    """Write a fake CLI script and make it executable
+
+    Args:
+        directory (str): Where to write fake_ouija_cli.py
+        script (str): Script template; {python} and {root} (the Ouija-ui
+                      directory) are filled in along with values
+
+    Returns:
+        str: Path of the script
+    """
+    path = os.path.join(directory, "fake_ouija_cli.py")
+    with open(path, "w") as f:
+        f.write(script.format(python=sys.executable, root=UI_ROOT, **values))
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    return path
+
+
+def probe_cli(model, timeout=30.0):
+    """Check the CLI for --daemon the way the application does at startup, and wait for the answer"""
+    model.probe_cli()
+    deadline = time.monotonic() + timeout
+    while model.cli_daemon_supported is None and time.monotonic() < deadline:
+        time.sleep(0.01)
@@ -33,7 +33,9 @@ class ApplicationController:
             results_callback=self.search_controller._on_search_results,
             console_callback=self.search_controller._on_console_output,
             process_finished_callback=self._on_search_completed,
+            ingest_stats_callback=self.search_controller._on_ingest_stats,
         )
+        search_model.probe_cli()  # Learn whether the CLI has --daemon before the first search
 
     def register_view(self, view):
         """Register the main view for all controllers"""
@@ -137,6 +139,31 @@ class ApplicationController:
         result = self.search_controller.run_search(starting_seed=starting_seed)
         return result.success
 
+    def resume_search(self):
+        """Resume the current config's last unfinished search"""
+        if self.search_model.has_active_searches() or self.fun_search_controller.is_fun_search_active():
+            return False
+        result = self.search_controller.resume_search()
+        return result.success
+
+    def rescore_results(self):
+        """Evaluate the stored seeds again with the current config"""
+        if self.search_model.has_active_searches() or self.fun_search_controller.is_fun_search_active():
+            return False
+        result = self.search_controller.rescore_results()
+        if not result and self.current_view:
+            self.current_view.set_status(result.error)
+        return result.success
+
+    def evaluate_seed_file(self, file_path):
+        """Evaluate the seeds listed in a file with the current config"""
+        if self.search_model.has_active_searches() or self.fun_search_controller.is_fun_search_active():
+            return False
+        result = self.search_controller.evaluate_seed_file(file_path)
+        if not result and self.current_view:
+            self.current_view.set_status(result.error)
+        return result.success
+
     def stop_search(self):
         """Stop all active search processes"""
         # Stop both regular and fun searches
@@ -229,6 +256,17 @@ class ApplicationController:
         result = self.config_controller.set_score_desired_negatives(value)
         return result.success
 
+    def get_retention(self):
+        """Get the stored results limit of the current config"""
+        return self.config_controller.get_retention()
+
+    def set_retention(self, keep_top=None, min_score=None):
+        """Set the stored results limit of the current config and prune its database"""
+        result = self.config_controller.set_retention(keep_top, min_score)
+        if result.success:
+            self.database_controller.apply_retention(result.data)
+        return result.success
+
     # === Cleanup ===
     def cleanup(self):
         """Clean up resources before application exit"""
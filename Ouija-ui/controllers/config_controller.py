@@ -2,6 +2,7 @@
 Configuration Controller - Handles configuration management operations
 """
 
+from models.result_retention import RetentionPolicy
 from utils.result import Result
 
 
@@ -190,6 +191,8 @@ class ConfigController:
             "cutoff": "cutoff",
             "gpu_batch": "gpu_batch",
             "template": "template",
+            "search_devices": "search_devices",
+            "processes_per_device": "processes_per_device",
             "score_natural_negatives": "score_natural_negatives",
             "score_desired_negatives": "score_desired_negatives"
         }
@@ -217,6 +220,8 @@ class ConfigController:
             "cutoff": "cutoff",
             "gpu_batch": "gpu_batch",
             "template": "template",
+            "search_devices": "search_devices",
+            "processes_per_device": "processes_per_device",
             "score_natural_negatives": "score_natural_negatives",
             "score_desired_negatives": "score_desired_negatives"
         }
@@ -252,3 +257,28 @@ class ConfigController:
         self.config_model.score_desired_negatives = value
         self.config_model.config_modified = True
         return Result.success(value)
+
+    # Result retention
+    def get_retention(self):
+        """Get the stored results limit of the current config"""
+        return self.config_model.retention
+
+    def set_retention(self, keep_top=None, min_score=None):
+        """Set the stored results limit of the current config
+
+        Args:
+            keep_top: Keep only the best N results (None: no limit)
+            min_score: Drop results scoring below this (None: no limit)
+
+        Returns:
+            Result: The new RetentionPolicy, or error details
+        """
+        try:
+            policy = RetentionPolicy(keep_top, min_score)
+        except (TypeError, ValueError):
+            return Result.error("Retention limits must be whole numbers")
+        if (policy.keep_top or 0) < 0 or (policy.min_score or 0) < 0:
+            return Result.error("Retention limits can't be negative")
+        self.config_model.retention = policy
+        self.config_model.config_modified = True
+        return Result.success(policy)
@@ -6,6 +6,10 @@ import json
 import os
 import threading
 
+from models.connection_manager import connection_manager
+from models.federated_results import FederatedResults
+from models.results_pager import ResultsPager
+from models.search_coverage import config_file_hash
 from utils.result import Result
 
 
@@ -15,6 +19,9 @@ class DatabaseController:
     def __init__(self, database_model):
         self.database_model = database_model
         self.current_view = None
+        self._refreshed_token = None  # Change token of the last results pushed to the view
+        self.results_pager = ResultsPager(database_model, page_size=database_model.TOP_RESULTS_LIMIT)
+        self.federated_results = FederatedResults(database_model.DB_DIR)
 
         # Set up callback for database table reset to refresh UI
         self.database_model.on_results_table_reset = self.refresh_results
@@ -45,10 +52,18 @@ class DatabaseController:
         except Exception as e:
             return Result.error(f"Database connection error: {str(e)}")
 
-    def refresh_results(self):
-        """Refresh results from the database when new results are received."""
+    def refresh_results(self, force=False):
+        """Refresh results from the database when new results are received.
+
+        Args:
+            force (bool): Query even if nothing was written since the last refresh
+        """
         try:
+            token = self.database_model.change_token
+            if not force and token == self._refreshed_token:
+                return  # Nothing written since the view was last updated
             print("DEBUG: refresh_results called.")
+            self._refreshed_token = token
             df = self.database_model.get_dataframe()
             if df is not None:
                 print(f"DEBUG: Retrieved dataframe with {len(df)} rows.")
@@ -64,6 +79,314 @@ class DatabaseController:
             if self.current_view:
                 self.current_view.write_to_console(f"Error refreshing results: {str(e)}\n")
 
+    def get_change_token(self, config_path=None):
+        """Get a token that changes whenever the results may have changed
+
+        Args:
+            config_path (str, optional): Config whose database should be watched
+
+        Returns:
+            int: Change token, or None if the database is unavailable
+        """
+        if config_path and not self.database_model.connect(config_path):
+            return None
+        return self.database_model.change_token
+
+    def get_results_data(self, config_path=None):
+        """Get the rows shown in the results table
+
+        Uses the shared database model, so periodic refreshes neither reopen the
+        database file nor re-read settings from disk.
+
+        Args:
+            config_path (str, optional): Config whose database should be read; the
+                model only reconnects if it maps to a different database file
+
+        Returns:
+            pandas.DataFrame: Results, or None if no results table is available
+        """
+        try:
+            if config_path and not self.database_model.connect(config_path):
+                return None
+            if not self.is_ready():
+                return None
+            return self.database_model.get_dataframe()
+        except Exception as e:
+            print(f"Error getting results data: {e}")
+            return None
+
+    def get_results_delta(self, config_path=None, since_version=None):
+        """Get the results rows that changed since the caller's last fetch
+
+        Args:
+            config_path (str, optional): Config whose database should be read
+            since_version (int, optional): Version from the caller's previous fetch
+
+        Returns:
+            tuple: (version, rows, is_delta), see DatabaseModel.get_results_delta()
+        """
+        try:
+            if config_path and not self.database_model.connect(config_path):
+                return None, None, False
+            return self.database_model.get_results_delta(since_version)
+        except Exception as e:
+            print(f"Error getting results delta: {e}")
+            return None, None, False
+
+    def get_results_page(self, config_path=None, page_index=0):
+        """Get one page of results for browsing past the top results
+
+        Args:
+            config_path (str, optional): Config whose database should be read
+            page_index (int): Zero-based page number
+
+        Returns:
+            tuple: (rows, page_count, total_rows); rows is None if no results table is available
+        """
+        try:
+            if config_path and not self.database_model.connect(config_path):
+                return None, 1, 0
+            if not self.is_ready():
+                return None, 1, 0
+            rows = self.results_pager.get_page(page_index)
+            return rows, self.results_pager.page_count(), self.results_pager.total_rows()
+        except Exception as e:
+            print(f"Error getting results page: {e}")
+            return None, 1, 0
+
+    def get_results_page_count(self, config_path=None):
+        """Get how many pages of results there are
+
+        Args:
+            config_path (str, optional): Config whose database should be read
+
+        Returns:
+            tuple: (page_count, total_rows)
+        """
+        try:
+            if config_path and not self.database_model.connect(config_path):
+                return 1, 0
+            if not self.is_ready():
+                return 1, 0
+            return self.results_pager.page_count(), self.results_pager.total_rows()
+        except Exception as e:
+            print(f"Error counting results pages: {e}")
+            return 1, 0
+
+    def get_results_in_seed_range(self, first_seed, last_seed, config_path=None, limit=1000):
+        """Get the stored results for a run of consecutive seeds (e.g. AAAA to AAAZ)
+
+        Args:
+            first_seed (str): First seed of the run
+            last_seed (str): Last seed of the run (inclusive)
+            config_path (str, optional): Config whose database should be read
+            limit (int): Maximum number of rows
+
+        Returns:
+            Result: Success with a DataFrame of the rows, or error details
+        """
+        try:
+            if config_path and not self.database_model.connect(config_path):
+                return Result.error("Failed to connect to database")
+            rows = self.database_model.query_seed_range(first_seed, last_seed, limit)
+            if rows is None:
+                return Result.error("No results table available")
+            return Result.success(rows)
+        except ValueError as e:
+            return Result.error(f"Invalid seed range: {str(e)}")
+        except Exception as e:
+            return Result.error(f"Error querying seed range: {str(e)}")
+
+    def get_schema_versions(self, config_path=None):
+        """Get the results schema versions (one per CLI header) stored for a config
+
+        Args:
+            config_path (str, optional): Config whose database should be read
+
+        Returns:
+            Result: Success with a list of version dicts (current first), or error details
+        """
+        try:
+            if config_path and not self.database_model.connect(config_path):
+                return Result.error("Failed to connect to database")
+            return Result.success(self.database_model.get_schema_versions())
+        except Exception as e:
+            return Result.error(f"Error listing schema versions: {str(e)}")
+
+    def get_all_versions_results(self, config_path=None, sort_column="Score", descending=True, limit=1000):
+        """Get results from every schema version, with Wants a version lacks as NULL
+
+        Args:
+            config_path (str, optional): Config whose database should be read
+            sort_column (str): Column to sort by
+            descending (bool): Sort in descending order
+            limit (int): Maximum number of rows
+
+        Returns:
+            Result: Success with a DataFrame (Seed, SchemaVersion, value columns), or error details
+        """
+        try:
+            if config_path and not self.database_model.connect(config_path):
+                return Result.error("Failed to connect to database")
+            rows = self.database_model.query_all_versions(sort_column, descending, limit)
+            if rows is None:
+                return Result.error("No results table available")
+            return Result.success(rows)
+        except Exception as e:
+            return Result.error(f"Error querying all schema versions: {str(e)}")
+
+    def get_score_histogram(self, column="Score", config_path=None):
+        """Get the number of stored results per value of the score or a want column
+
+        Args:
+            column (str): "Score" or a want column
+            config_path (str, optional): Config whose database should be read
+
+        Returns:
+            Result: Success with a DataFrame (Value, Rows), or error details
+        """
+        try:
+            if config_path and not self.database_model.connect(config_path):
+                return Result.error("Failed to connect to database")
+            histogram = self.database_model.get_histogram(column)
+            if histogram is None:
+                return Result.error("No histogram available")
+            return Result.success(histogram)
+        except Exception as e:
+            return Result.error(f"Error reading histogram: {str(e)}")
+
+    def get_score_cutoffs(self, config_path=None, max_rows=None):
+        """Get how many results each score cutoff would keep
+
+        Args:
+            config_path (str, optional): Config whose database should be read
+            max_rows (int, optional): Also suggest the lowest cutoff keeping at most this many rows
+
+        Returns:
+            Result: Success with a dict (cutoffs DataFrame of Score, Rows, Rows At Or
+                    Above; suggested cutoff or None), or error details
+        """
+        try:
+            if config_path and not self.database_model.connect(config_path):
+                return Result.error("Failed to connect to database")
+            cutoffs = self.database_model.get_score_cutoffs()
+            if cutoffs is None:
+                return Result.error("No histogram available")
+            suggested = self.database_model.suggest_cutoff(max_rows) if max_rows is not None else None
+            return Result.success({"cutoffs": cutoffs, "suggested": suggested})
+        except Exception as e:
+            return Result.error(f"Error reading score cutoffs: {str(e)}")
+
+    def get_search_checkpoints(self, config_path=None):
+        """Get how far each search of a config got, and the -s / -n that resume it
+
+        Args:
+            config_path (str, optional): Config whose database should be read
+
+        Returns:
+            Result: Success with a list of checkpoint dicts (most recent first), or error details
+        """
+        try:
+            if config_path and not self.database_model.connect(config_path):
+                return Result.error("Failed to connect to database")
+            return Result.success(self.database_model.get_search_checkpoints())
+        except Exception as e:
+            return Result.error(f"Error reading search checkpoints: {str(e)}")
+
+    def get_search_coverage(self, config_path, template=None):
+        """Get how much of the seed space a config's filter has searched
+
+        Args:
+            config_path (str): Config whose filter and database should be used
+            template (str, optional): Filter template the searches ran with
+
+        Returns:
+            Result: Success with a dict (ranges, seeds_covered, seed_space,
+                    percent_covered, largest_gap), or error details
+        """
+        try:
+            if not self.database_model.connect(config_path):
+                return Result.error("Failed to connect to database")
+            hash_value = config_file_hash(config_path)
+            if hash_value is None:
+                return Result.error(f"Cannot read config {config_path}")
+            return Result.success(self.database_model.get_search_coverage(hash_value, template))
+        except Exception as e:
+            return Result.error(f"Error reading search coverage: {str(e)}")
+
+    def get_results_catalog(self):
+        """Get row counts and max scores of every config's database
+
+        Returns:
+            Result: Success with a list of catalog dicts, or error details
+        """
+        try:
+            return Result.success(self.federated_results.catalog())
+        except Exception as e:
+            return Result.error(f"Error reading results catalog: {str(e)}")
+
+    def get_cross_config_results(self, configs=None, min_score=0, min_configs=2, limit=1000):
+        """Get seeds that several configs found, best combined score first
+
+        Args:
+            configs (list, optional): Config names to compare (default: all)
+            min_score (int): Only count results scoring at least this much
+            min_configs (int): Minimum number of configs a seed must appear in
+            limit (int): Maximum number of seeds
+
+        Returns:
+            Result: Success with a DataFrame (Seed, Configs, Total Score, Min Score
+                    and a score column per config), or error details
+        """
+        try:
+            return Result.success(self.federated_results.seeds_across(configs, min_score, min_configs, limit))
+        except Exception as e:
+            return Result.error(f"Error querying results across configs: {str(e)}")
+
+    def query_all_results(self, sql, params=None):
+        """Run a read-only SQL query over every config's results
+
+        Each config's rows are <config>.results (and <config>.result_rows);
+        all_results has config, SeedId, Score and Seed for all of them.
+
+        Returns:
+            Result: Success with a DataFrame, or error details
+        """
+        try:
+            return Result.success(self.federated_results.query(sql, params))
+        except Exception as e:
+            return Result.error(f"Error querying results: {str(e)}")
+
+    def apply_retention(self, policy, config_path=None):
+        """Apply a config's retention policy to its database right away
+
+        The policy is also read from the config file on every connect, so this is
+        only needed after changing it in the UI.
+
+        Args:
+            policy (RetentionPolicy): Results to keep
+            config_path (str, optional): Config whose database should be pruned
+
+        Returns:
+            Result: Success/failure with error details
+        """
+        try:
+            if config_path and not self.database_model.connect(config_path):
+                return Result.error("Failed to connect to database")
+            self.database_model.set_retention(policy)
+            return Result.success(policy.describe())
+        except Exception as e:
+            return Result.error(f"Error applying retention: {str(e)}")
+
+    def get_retention_stats(self):
+        """Get the background pruner's counters
+
+        Returns:
+            Result: Success with a stats dict (empty if nothing was pruned yet)
+        """
+        pruner = self.database_model.pruner
+        return Result.success(pruner.stats() if pruner is not None else {})
+
     def delete_all_results(self):
         """Delete all results from the database
         
@@ -103,7 +426,7 @@ class DatabaseController:
         """
         try:
             # Ensure database is connected
-            config_path = getattr(self.database_model, "loaded_config_path", None)
+            config_path = self.database_model.current_config_path
             if not config_path:
                 return Result.error("No configuration loaded")
 
@@ -113,6 +436,8 @@ class DatabaseController:
             # Export based on format
             if export_format.lower() == "csv":
                 success = self.database_model.export_to_csv(file_path, limit)
+            elif export_format.lower() == "parquet":
+                success = self.database_model.export_to_parquet(file_path, limit)
             elif export_format.lower() == "excel":
                 success = self.database_model.export_to_excel(file_path, limit)
             elif export_format.lower() == "json":
@@ -128,6 +453,33 @@ class DatabaseController:
         except Exception as e:
             return Result.error(f"Error exporting results: {str(e)}")
 
+    def start_export(self, file_path, config_path=None, export_format=None, sort_column="Score",
+                     descending=True, min_score=None, on_done=None):
+        """Start streaming the full results table to a file in the background
+
+        Args:
+            file_path (str): Path where the file will be saved
+            config_path (str, optional): Config whose results should be exported
+            export_format (str, optional): "csv", "parquet" or "json"; default from the extension
+            sort_column (str, optional): Column to sort by, None for storage order
+            descending (bool): Sort in descending order
+            min_score (int, optional): Only export results with at least this score
+            on_done (callable, optional): Called with the ExportJob when it finishes (worker thread)
+
+        Returns:
+            Result: The running ExportJob, or error details
+        """
+        try:
+            if config_path and not self.database_model.connect(config_path):
+                return Result.error("Failed to connect to database")
+            job = self.database_model.start_export(
+                file_path, export_format, sort_column, descending, min_score, on_done=on_done)
+            if job is None:
+                return Result.error("No results to export")
+            return Result.success(job)
+        except Exception as e:
+            return Result.error(f"Error exporting results: {str(e)}")
+
     def get_export_info(self):
         """Get information about exportable data
         
@@ -135,7 +487,7 @@ class DatabaseController:
             Result: Export statistics and info
         """
         try:
-            config_path = getattr(self.database_model, "loaded_config_path", None)
+            config_path = self.database_model.current_config_path
             if config_path and self.database_model.connect(config_path):
                 stats = self.database_model.get_export_stats()
                 return Result.success(stats)
@@ -147,7 +499,11 @@ class DatabaseController:
     def close(self):
         """Close database connections"""
         try:
+            self.results_pager.close()
+            self.federated_results.close()
+            self.database_model.stop_pruner()
             self.database_model.close()
+            connection_manager.close_all()
             return Result.success("Database connection closed")
         except Exception as e:
             return Result.error(f"Error closing database: {str(e)}")
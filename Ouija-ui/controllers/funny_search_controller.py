@@ -2,12 +2,19 @@
 Fun Search Controller - Handles specialized fun/prank seed searches
 """
 
+import numpy as np
+
+from models.seed_codec import NUM_CHARS, encode_seed
+from models.seed_lists import seed_list_ids
 from utils.result import Result
 
 
 class FunSearchController:
     """Controller for fun and prank seed searches"""
 
+    # Paddings with at most this many right characters cover few seeds each; they run together as one seed list
+    LIST_MAX_RIGHT_PAD = 3
+
     def __init__(self, search_model, config_controller, database_controller):
         self.search_model = search_model
         self.config_controller = config_controller
@@ -17,6 +24,7 @@ class FunSearchController:
         self.fun_search_category = None
         self.fun_search_words = []
         self.fun_search_current_word_index = 0
+        self.fun_search_list_ids = None  # Seeds of the short paddings, evaluated as one list
         self.auto_refresh_timer_id = None
         self.auto_refresh_interval_ms = 2000
         self.completion_message_shown = False  # Flag to prevent duplicate "Search Complete" messages
@@ -56,6 +64,14 @@ class FunSearchController:
             # Generate all valid seeds for each word with padding
             fun_seeds = self._generate_fun_seeds(fun_words[category])
 
+            # One list run for the short paddings instead of a launch each; it goes last so
+            # the range searches have warmed up the resident CLI
+            short = [entry for entry in fun_seeds if entry[1] <= self.LIST_MAX_RIGHT_PAD]
+            self.fun_search_list_ids = self._fun_seed_list(short) if short else None
+            fun_seeds = [entry for entry in fun_seeds if entry[1] > self.LIST_MAX_RIGHT_PAD]
+            if short:
+                fun_seeds.append((f"{len(short)} short paddings ({len(self.fun_search_list_ids):,} seeds)", None))
+
             # Reset completion state for new search
             self.fun_search_category = category
             self.fun_search_words = fun_seeds
@@ -102,6 +118,20 @@ class FunSearchController:
         # Remove duplicates
         return list(dict.fromkeys(fun_seeds))
 
+    def _fun_seed_list(self, fun_seeds):
+        """Every seed the given paddings' range searches would cover
+
+        Args:
+            fun_seeds (list): (seed, right_pad_count) tuples; each covers NUM_CHARS ** right_pad_count seeds
+
+        Returns:
+            numpy.ndarray: Distinct seed ids (uint64)
+        """
+        return seed_list_ids(np.concatenate([
+            np.uint64(encode_seed(seed)) + np.arange(NUM_CHARS ** right, dtype=np.uint64)
+            for seed, right in fun_seeds
+        ]))[0]
+
     def _run_next_fun_seed_search(self):
         """Run the next fun seed search in the sequence
         
@@ -114,8 +144,11 @@ class FunSearchController:
 
             search_term, right_pad_count = self.fun_search_words[self.fun_search_current_word_index]
 
-            # Set n_value based on right_pad_count
-            n_value = 35 ** right_pad_count if right_pad_count > 0 else 35
+            # Set n_value based on right_pad_count (None marks the seed list of short paddings)
+            if right_pad_count is None:
+                n_value = len(self.fun_search_list_ids)
+            else:
+                n_value = 35 ** right_pad_count if right_pad_count > 0 else 35
 
             if self.current_view:
                 self.current_view.write_to_console(f"    🔍 Searching: {search_term} (n={n_value})\n", color="blue")            
@@ -137,6 +170,18 @@ class FunSearchController:
                 import os
                 db_config_path = os.path.join(self.config_controller.config_model.CONFIG_DIR, f"{config_name}.ouija.json")
                 self.database_controller.database_model.connect(db_config_path)
+            if right_pad_count is None:
+                return self.search_model.start_seed_list_search(
+                    config_name_for_cli=config_name,
+                    seeds=self.fun_search_list_ids,
+                    thread_groups=self.config_controller.get_setting("thread_groups"),
+                    db_model=self.database_controller.database_model,
+                    cutoff=self.config_controller.get_setting("cutoff"),
+                    gpu_batch=self.config_controller.get_setting("gpu_batch"),
+                    template=self.config_controller.get_setting("template"),
+                    binary_results=self.config_controller.get_setting("binary_results", False),
+                    label=f"{config_name} fun seeds",
+                )
             success = self.search_model.start_search(
                 config_name_for_cli=config_name,
                 starting_seed=search_term,
@@ -146,6 +191,7 @@ class FunSearchController:
                 cutoff=self.config_controller.get_setting("cutoff"),
                 gpu_batch=self.config_controller.get_setting("gpu_batch"),
                 template=self.config_controller.get_setting("template"),
+                binary_results=self.config_controller.get_setting("binary_results", False),
             )
             return success
         except Exception as e:
@@ -231,6 +277,7 @@ class FunSearchController:
         self.fun_search_category = None
         self.fun_search_words = []
         self.fun_search_current_word_index = 0
+        self.fun_search_list_ids = None
         self._stop_auto_refresh()
 
         return Result.success("Fun search stopped")
@@ -265,6 +312,7 @@ class FunSearchController:
         self.fun_search_category = None
         self.fun_search_words = []
         self.fun_search_current_word_index = 0
+        self.fun_search_list_ids = None
         
         # Kill timers
         if self.auto_refresh_timer_id:
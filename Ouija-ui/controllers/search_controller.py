@@ -2,6 +2,8 @@
 Search Controller - Handles search operations and process management
 """
 
+from models.search_coverage import config_file_hash
+from models.seed_lists import load_seed_file
 from utils.result import Result
 import os
 import tkinter as tk
@@ -32,21 +34,123 @@ class SearchController:
         """Register the main view for callbacks"""
         self.current_view = view
 
-    def run_search(self, starting_seed=None):
+    def run_search(self, starting_seed=None, resume=False):
         """Start the search process
         
         Args:
             starting_seed (int, optional): The seed value to initialize the search. Defaults to None.
+                "gap" starts at the largest seed range this filter hasn't searched yet.
+            resume (bool): Continue the config's last unfinished search at its next seed instead
         
         Returns:
             Result: Success/failure with error details
         """
         if self.search_model.has_active_searches():
+            if resume:
+                return Result.error("A search is already running")
             return self.stop_search()
 
         # Reset completion flag for new search
         self.search_completed = False
 
+        connected = self._connect_config()
+        if not connected:
+            return connected
+        config_name, db_config_path = connected.data
+
+        checkpoint = None
+        if resume:
+            checkpoint = self.database_controller.database_model.get_resume_checkpoint()
+            if checkpoint is None:
+                if self.current_view:
+                    self.current_view.set_status(f"No unfinished search to resume for {config_name}.")
+                return Result.error(f"No unfinished search to resume for {config_name}")
+            if self.current_view:
+                self.current_view.write_to_console(
+                    f"Resuming search from {checkpoint['first_seed'] or 'the first seed'}: "
+                    f"{checkpoint['offset']:,} of {checkpoint['seeds']:,} seeds done, "
+                    f"continuing at {checkpoint['next_seed']}\n", color="white")
+
+        # Pass the starting_seed to the search model if provided
+        if starting_seed is not None:
+            self.search_model.set_seed(starting_seed)
+        else:
+            starting_seed = self.config_controller.get_setting("starting_seed")
+
+        # Coverage is kept per filter and template, so an edited filter starts over
+        template = self.config_controller.get_setting("template")
+        config_hash = config_file_hash(db_config_path)
+        number_of_seeds = self.config_controller.get_setting("number_of_seeds")
+        coverage = self.database_controller.get_search_coverage(db_config_path, template)
+        if coverage and coverage.data["ranges"] and self.current_view:
+            self.current_view.write_to_console(
+                f"This filter has searched {coverage.data['seeds_covered']:,} seeds so far "
+                f"({coverage.data['percent_covered']:.4g}% of all seeds)\n", color="white")
+        if not checkpoint and str(starting_seed).strip().lower() == "gap":
+            requested = self.search_model.SEED_COUNT_MAP.get(number_of_seeds, number_of_seeds)
+            gap = self.database_controller.database_model.pick_search_gap(
+                config_hash, template, int(requested) if str(requested).isdigit() else None)
+            if gap is None:
+                if self.current_view:
+                    self.current_view.set_status(f"Every seed has been searched for {config_name}.")
+                return Result.error(f"No unsearched seeds left for {config_name}")
+            starting_seed, seeds = gap
+            number_of_seeds = str(seeds)
+            if self.current_view:
+                self.current_view.write_to_console(
+                    f"Searching the largest unsearched range: {seeds:,} seeds from {starting_seed}\n",
+                    color="white")
+
+        # Shard the range over several devices/processes when more than one is configured
+        devices = self._search_devices()
+        processes_per_device = int(self.config_controller.get_setting("processes_per_device", 1) or 1)
+        if not checkpoint and len(devices or [None]) * processes_per_device > 1:
+            success = self.search_model.start_sharded_search(
+                config_name_for_cli=config_name,
+                starting_seed=starting_seed,
+                thread_groups=self.config_controller.get_setting("thread_groups"),
+                number_of_seeds=number_of_seeds,
+                db_model=self.database_controller.database_model,
+                cutoff=self.config_controller.get_setting("cutoff"),
+                gpu_batch=self.config_controller.get_setting("gpu_batch"),
+                template=template,
+                devices=devices,
+                processes_per_device=processes_per_device,
+                binary_results=self.config_controller.get_setting("binary_results", False),
+                config_hash=config_hash
+            )
+        else:
+            # Start the search, passing the config_name to be used by the CLI
+            success = self.search_model.start_search(
+                config_name_for_cli=config_name, # Pass the name for the CLI
+                starting_seed=starting_seed,  # Use the prioritized starting_seed
+                thread_groups=self.config_controller.get_setting("thread_groups"),
+                number_of_seeds=number_of_seeds,
+                db_model=self.database_controller.database_model,
+                cutoff=self.config_controller.get_setting("cutoff"),
+                gpu_batch=self.config_controller.get_setting("gpu_batch"),
+                template=template,
+                binary_results=self.config_controller.get_setting("binary_results", False),
+                resume=checkpoint,
+                config_hash=config_hash
+            )
+
+        if success:
+            if self.current_view:
+                self.current_view.set_search_running(True)
+                self.current_view.set_status("Search started...")
+            return Result.success("Search started")
+        else:
+            if self.current_view:
+                self.current_view.set_search_running(False)
+            return Result.error("Failed to start search")
+
+    def _connect_config(self):
+        """Resolve the loaded config's CLI name and connect its database
+
+        Returns:
+            Result: (config name, config path for the database) on success
+        """
         # Use the config name instead of a full path
         config_name = self.config_controller.config_model.config_name
         if not config_name:
@@ -73,34 +177,114 @@ class SearchController:
             if self.current_view:
                 self.current_view.set_status(f"Error: Failed to connect to database for {config_name}.")
             return Result.error(f"Failed to connect to database for {config_name}")
+        return Result.success((config_name, db_config_path))
 
-        # Pass the starting_seed to the search model if provided
-        if starting_seed is not None:
-            self.search_model.set_seed(starting_seed)
-        else:
-            starting_seed = self.config_controller.get_setting("starting_seed")
+    def run_seed_list(self, seeds, description="seed list"):
+        """Evaluate an explicit list of seeds with the current config in one CLI run
+
+        Args:
+            seeds: Seed strings or an integer numpy array of seed ids
+            description: What the seeds are, for the console and status bar
 
-        # Start the search, passing the config_name to be used by the CLI
-        success = self.search_model.start_search(
-            config_name_for_cli=config_name, # Pass the name for the CLI
-            starting_seed=starting_seed,  # Use the prioritized starting_seed
+        Returns:
+            Result: Success/failure with error details
+        """
+        if self.search_model.has_active_searches():
+            return Result.error("A search is already running")
+        self.search_completed = False
+
+        connected = self._connect_config()
+        if not connected:
+            return connected
+        config_name, _ = connected.data
+
+        success = self.search_model.start_seed_list_search(
+            config_name_for_cli=config_name,
+            seeds=seeds,
             thread_groups=self.config_controller.get_setting("thread_groups"),
-            number_of_seeds=self.config_controller.get_setting("number_of_seeds"),
             db_model=self.database_controller.database_model,
             cutoff=self.config_controller.get_setting("cutoff"),
             gpu_batch=self.config_controller.get_setting("gpu_batch"),
-            template=self.config_controller.get_setting("template")
+            template=self.config_controller.get_setting("template"),
+            binary_results=self.config_controller.get_setting("binary_results", False),
+            label=f"{config_name} {description}",
         )
-
         if success:
             if self.current_view:
                 self.current_view.set_search_running(True)
-                self.current_view.set_status("Search started...")
-            return Result.success("Search started")
-        else:
-            if self.current_view:
-                self.current_view.set_search_running(False)
-            return Result.error("Failed to start search")
+                self.current_view.set_status(f"Evaluating {description}...")
+            return Result.success(f"Evaluating {description}")
+        if self.current_view:
+            self.current_view.set_search_running(False)
+        return Result.error(f"Failed to evaluate {description}")
+
+    def rescore_results(self, min_score=None):
+        """Evaluate every stored seed again, e.g. after the filter was edited
+
+        Rows are replaced by seed as they come back; seeds the filter no longer
+        accepts keep their old rows.
+
+        Args:
+            min_score: Only re-score seeds stored with at least this Score
+
+        Returns:
+            Result: Success/failure with error details
+        """
+        connected = self._connect_config()
+        if not connected:
+            return connected
+        seed_ids = self.database_controller.database_model.get_stored_seed_ids(min_score)
+        if len(seed_ids) == 0:
+            return Result.error("No stored seeds to re-score")
+        return self.run_seed_list(seed_ids, f"{len(seed_ids):,} stored seeds")
+
+    def evaluate_seed_file(self, file_path):
+        """Evaluate the seeds in an imported file (a packed .seeds list, or text/CSV with a seed per line)
+
+        Returns:
+            Result: Success/failure with error details
+        """
+        try:
+            seed_ids, invalid = load_seed_file(file_path)
+        except OSError as e:
+            return Result.error(f"Cannot read seed list: {e}")
+        if invalid and self.current_view:
+            self.current_view.write_to_console(f"Skipping {invalid:,} invalid seeds in {file_path}\n", color="white")
+        if len(seed_ids) == 0:
+            return Result.error(f"No valid seeds in {file_path}")
+        return self.run_seed_list(seed_ids, f"{len(seed_ids):,} seeds from {os.path.basename(file_path)}")
+
+    def _search_devices(self):
+        """Devices to shard a search over, from the "search_devices" setting
+
+        "" runs on the CLI's default device, "all" on every device the CLI lists,
+        otherwise a comma-separated list of "platform:device" (or just device ids on platform 0).
+
+        Returns:
+            list: (platform, device) pairs, or None for the CLI's default device
+        """
+        setting = str(self.config_controller.get_setting("search_devices", "") or "").strip().lower()
+        if not setting:
+            return None
+        if setting == "all":
+            devices = [(d["platform"], d["device"]) for d in self.search_model.list_devices()]
+            return devices or None
+        devices = []
+        for part in setting.split(","):
+            platform, _, device = part.strip().rpartition(":")
+            try:
+                devices.append((int(platform or 0), int(device)))
+            except ValueError:
+                print(f"Ignoring invalid search device: {part.strip()!r}")
+        return devices or None
+
+    def resume_search(self):
+        """Continue the current config's last unfinished search at the exact next seed
+
+        Returns:
+            Result: Success/failure with error details
+        """
+        return self.run_search(resume=True)
 
     def stop_search(self):
         """Stop all active search processes
@@ -123,6 +307,30 @@ class SearchController:
                 self.current_view.set_status(f"Error stopping search: {str(e)}")
             return Result.error(f"Error stopping search: {str(e)}")
 
+    def stop_job(self, job_id):
+        """Stop a single search job, leaving any other running jobs alone
+
+        Args:
+            job_id (int): Id of the job to stop
+
+        Returns:
+            Result: Success/failure with error details
+        """
+        try:
+            if self.search_model.stop_search(job_id):
+                return Result.success(f"Job {job_id} stopped")
+            return Result.error(f"Failed to stop job {job_id}")
+        except Exception as e:
+            return Result.error(f"Error stopping job {job_id}: {str(e)}")
+
+    def get_jobs(self):
+        """Get status, exit codes, timings and throughput of all search jobs
+
+        Returns:
+            Result: Success with a list of job stats dicts
+        """
+        return Result.success(self.search_model.get_jobs())
+
     def _on_search_results(self, header_columns, result_rows):
         """Callback for when search results are available"""
         if self.current_view:
@@ -161,6 +369,16 @@ class SearchController:
             self.current_view.write_to_console(line, color=message_color)
 
 
+    def _on_ingest_stats(self, stats):
+        """Callback with ingest writer queue depth and stall/drop counters"""
+        if not self.current_view:
+            return
+        text = (f"📥 Q {stats['queue_depth']}/{stats['queue_max']}"
+                f" | stalls {stats['stalls']} | drops {stats['drops']}"
+                f" | dups {stats['duplicates_avoided']}"
+                f" | {stats['rows_per_second'] / 1000.0:.1f}K rows/s")
+        self.current_view.set_ingest_stats(text)
+
     def _handle_status_message(self, line):
         """Handle status message formatting"""
         status_message = line[7:].strip()  # Remove "STATUS:" prefix
@@ -234,8 +452,9 @@ class SearchController:
 
     def cleanup(self):
         """Clean up search resources"""
-        # Stop any active searches
-        self.search_model.stop_all_searches()
+        # Stop any active searches, commit anything still queued for the database
+        # and stop the CLI supervisor loop
+        self.search_model.shutdown()
 
         # Cancel any pending updates
         if self.update_timer_id and self.current_view:
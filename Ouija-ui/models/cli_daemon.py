@@ -0,0 +1,265 @@
+"""
+CLI Daemon - One resident Ouija-CLI process that runs searches back to back without reloading the kernel
+"""
+
+import subprocess
+import threading
+import time
+
+from models.cli_stream import CliStreamSplitter
+from models.cli_supervisor import CliJob
+
+# Ouija-CLI --daemon protocol: one tab-separated request per stdin line, output framed by markers
+READY_MARKER = "#READY"
+JOB_MARKER = "#JOB "
+END_MARKER = "#END "
+ERROR_MARKER = "#ERROR "
+HEADER_MARKER = "+Seed,"
+
+
+class CliDaemon:
+    """Runs search requests one at a time on a resident `Ouija-CLI --daemon` process
+
+    The process keeps its OpenCL context, kernel and result buffers, so only the
+    first request pays for platform setup and the kernel load. Each request is a
+    "JOB <id> <config> <start seed> <seeds> <cutoff>" line on stdin; the output
+    between "#JOB <id>" and "#END <id> ..." goes to the request's
+    SearchOutputHandler as if it came from a process of its own, and the request
+    gets a CliJob record so it reports like one.
+
+    A request can be submitted before the daemon is ready; it waits in the pipe.
+    A CLI without --daemon starts an ordinary search instead, which shows as a
+    result header before "#READY": the daemon is then marked unsupported,
+    stopped, and its pending request is handed to on_unsupported. A running
+    request can only be interrupted by stopping the daemon.
+    """
+
+    def __init__(self, supervisor, command_parts, label="Ouija-CLI daemon", on_unsupported=None, stdout_busy=None,
+                 **popen_kwargs):
+        """Initialize the daemon (not started yet)
+
+        Args:
+            supervisor: CliSupervisor that runs the process
+            command_parts: Command line, including --daemon
+            label: Display name of the daemon process
+            on_unsupported: Optional callable(request, handler) for a request the CLI couldn't take
+            stdout_busy: Optional callable() that is True while request handlers may block, see
+                         CliSupervisor.launch()
+            **popen_kwargs: Extra subprocess arguments (cwd, startupinfo, ...)
+        """
+        self.supervisor = supervisor
+        self.command_parts = list(command_parts)
+        self.label = label
+        self.on_unsupported = on_unsupported
+        self.stdout_busy = stdout_busy
+        self.popen_kwargs = popen_kwargs
+        self.job = None
+        self.unsupported = False
+        self.requests_run = 0
+        self.features = set()  # Optional features listed on the "#READY" line, e.g. "seeds"
+        self._splitter = CliStreamSplitter()
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._request = None  # (CliJob, handler) of the running request
+        self._request_failed = False  # The running request printed #ERROR
+        self._requests = []  # Every request's CliJob, oldest first
+
+    def start(self):
+        """Launch the daemon process without waiting for its setup
+
+        Returns:
+            CliJob: The daemon process's job
+        """
+        self.job = self.supervisor.launch(
+            self.command_parts, self._on_stdout, self._on_stderr, self._on_exit,
+            label=self.label, stdout_busy=self.stdout_busy, stdin=subprocess.PIPE, **self.popen_kwargs)
+        return self.job
+
+    def is_alive(self):
+        """Whether the process is running and can take requests"""
+        return self.job is not None and self.job.is_running and not self.unsupported
+
+    def is_ready(self):
+        """Whether setup has finished (kernel loaded, buffers allocated)"""
+        return self._ready.is_set()
+
+    def supports(self, feature):
+        """Whether the ready daemon listed a feature (False while it's still setting up)"""
+        return self.is_ready() and feature in self.features
+
+    def is_busy(self):
+        """Whether a request is running or waiting for the daemon"""
+        with self._lock:
+            return self._request is not None
+
+    def current_request(self):
+        """CliJob of the running request, or None"""
+        with self._lock:
+            return self._request[0] if self._request else None
+
+    def requests(self):
+        """Every request's CliJob, oldest first"""
+        with self._lock:
+            return list(self._requests)
+
+    def submit(self, config, starting_seed, seeds, cutoff, handler, label=None, command_parts=None):
+        """Run one search on the daemon
+
+        Args:
+            config: --config value for the request
+            starting_seed: -s value ("random" or a seed; None for the empty seed), or "@<path>" for
+                           a --seeds list (needs supports("seeds"))
+            seeds: -n value (None for all seeds)
+            cutoff: -c value ("auto" or a score; None for the default)
+            handler: SearchOutputHandler that receives the request's output and exit
+            label: Display name of the request
+            command_parts: The command a process of its own would run (for the record and on_unsupported)
+
+        Returns:
+            CliJob: Record of the request
+
+        Raises:
+            RuntimeError: If the daemon isn't running or is busy with another request
+            ValueError: If a value contains a tab or newline
+        """
+        values = ["-" if value in (None, "") else str(value) for value in (config, starting_seed, seeds, cutoff)]
+        if any("\t" in value or "\n" in value for value in values):
+            raise ValueError("Daemon request values can't contain tabs or newlines")
+        with self._lock:
+            if not self.is_alive():
+                raise RuntimeError("Ouija-CLI daemon is not running")
+            if self._request is not None:
+                raise RuntimeError("Ouija-CLI daemon is busy")
+            request = CliJob(self.supervisor.reserve_job_id(), command_parts or ["JOB"] + values, label)
+            request.pid = self.job.pid
+            request.status = "running"
+            self._request = (request, handler)
+            self._request_failed = False
+            self._requests.append(request)
+        try:
+            line = "\t".join(["JOB", str(request.job_id)] + values) + "\n"
+            self.supervisor.write(self.job.job_id, line.encode("utf-8"))
+        except Exception:
+            with self._lock:
+                self._request = None
+            self._close_request(request, "failed", 1)
+            request.finished.set()
+            raise
+        return request
+
+    def stop(self, timeout=3.0):
+        """Stop the daemon process, and with it any running request
+
+        Returns:
+            bool: True if the process is no longer running
+        """
+        return self.job is None or self.supervisor.stop(self.job.job_id, timeout)
+
+    def close(self, timeout=3.0):
+        """Ask an idle daemon to exit, stopping it if it doesn't (or is busy)"""
+        if self.job is None or not self.job.is_running:
+            return
+        if not self.is_busy():
+            try:
+                self.supervisor.write(self.job.job_id, b"QUIT\n")
+                if self.job.wait(timeout):
+                    return
+            except Exception:
+                pass
+        self.stop(timeout)
+
+    # === Supervisor handlers ===
+    def _on_stdout(self, job, chunk):
+        """Route the daemon's output to the running request's handler (supervisor worker thread)"""
+        events = self._splitter.feed(chunk) if chunk else self._splitter.finish()
+        forward = []
+        for event in events:
+            if event[0] == "line":
+                line = event[1]
+                if line.startswith(READY_MARKER):
+                    self.features = set(line.split()[1:])
+                    self._ready.set()
+                    continue
+                if line.startswith(JOB_MARKER):
+                    continue
+                if line.startswith(ERROR_MARKER):
+                    self._request_failed = True  # Still shown on the console
+                if line.startswith(END_MARKER):
+                    self._forward(forward)
+                    forward = []
+                    self._end_request()
+                    continue
+                if not self._ready.is_set():
+                    if line.startswith(HEADER_MARKER) and not self.unsupported:
+                        # An older CLI ignored --daemon and started a search of its own
+                        self.unsupported = True
+                        self.supervisor.request_stop(job.job_id)
+                    elif line.strip():
+                        print(f"Ouija-CLI daemon: {line.rstrip()}")
+                    continue
+            forward.append(event)
+        self._forward(forward)
+
+    def _forward(self, events):
+        """Pass events to the running request's handler"""
+        with self._lock:
+            current = self._request
+        if not events or current is None or not self._ready.is_set():
+            return
+        request, handler = current
+        handler.handle_events(request, events)
+
+    def _on_stderr(self, job, line):
+        """Show stderr as the running request's (loop thread)"""
+        with self._lock:
+            current = self._request
+        if current:
+            current[1].on_stderr(current[0], line)
+        else:
+            print(f"Ouija-CLI daemon error: {line.rstrip()}")
+
+    def _end_request(self):
+        """Finish the running request on its #END line and report it from a worker thread"""
+        with self._lock:
+            current, self._request = self._request, None
+            failed = self._request_failed
+        if current is None:
+            return
+        request, handler = current
+        self._close_request(request, "failed" if failed else "exited", 1 if failed else 0)
+        self.requests_run += 1
+        # on_exit waits for the ingest writer; keep it off the loop thread
+        threading.Thread(target=self._report_exit, args=(request, handler), daemon=True,
+                         name="OuijaCliDaemonExit").start()
+
+    def _on_exit(self, job):
+        """The daemon process exited: finish or hand off its pending request (worker thread)"""
+        with self._lock:
+            current, self._request = self._request, None
+        if current is None:
+            return
+        request, handler = current
+        if self.unsupported and self.on_unsupported:
+            self._close_request(request, "failed", job.returncode)
+            request.finished.set()
+            self.on_unsupported(request, handler)
+            return
+        self._close_request(request, "stopped" if job.stop_requested else "failed", job.returncode)
+        self._report_exit(request, handler)
+
+    @staticmethod
+    def _close_request(request, status, returncode):
+        """Record how a request ended"""
+        request.status = status
+        request.returncode = returncode
+        request.end_time = time.time()
+
+    @staticmethod
+    def _report_exit(request, handler):
+        """Run the request handler's exit logic, then mark the request finished"""
+        try:
+            handler.on_exit(request)
+        except Exception as e:
+            print(f"Error in CLI daemon exit handler: {e}")
+        finally:
+            request.finished.set()
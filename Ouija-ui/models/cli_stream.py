@@ -0,0 +1,169 @@
+"""
+CLI Stream - Splits raw Ouija-CLI stdout into result blocks, text lines and binary frames
+"""
+
+import csv
+import io
+
+import numpy as np
+import pandas as pd
+
+from models.result_codec import FRAME_MARKER, parse_frame_header
+
+RESULT_PREFIX = ord("|")
+NEWLINE = ord("\n")
+
+
+class CliStreamSplitter:
+    """Incrementally splits CLI stdout bytes without a Python call per line
+
+    feed() takes whatever the pipe returned and yields events in stream order:
+
+        ("results", block)            - consecutive '|...' lines, '|' stripped, newline terminated
+        ("line", text)                - any other complete line ('+Seed,...', '$...', messages)
+        ("frame", count, size, data)  - a complete '#BIN <count> <size>' binary frame
+
+    Partial lines and partial frames are kept until the next feed() or finish().
+    """
+
+    def __init__(self):
+        """Initialize the splitter"""
+        self._pending = b""
+        self._frame = None  # (count, record_size) while waiting for a frame payload
+
+    def feed(self, data):
+        """Split a chunk of stdout
+
+        Args:
+            data: Bytes read from the pipe
+
+        Returns:
+            list: Events completed by this chunk
+        """
+        buf = self._pending + data if self._pending else data
+        events = []
+        pos = 0
+        while True:
+            if self._frame is not None:
+                count, record_size = self._frame
+                end = pos + count * record_size
+                if len(buf) < end:
+                    break
+                events.append(("frame", count, record_size, buf[pos:end]))
+                self._frame = None
+                pos = end
+                continue
+
+            marker = self._find_frame_marker(buf, pos)
+            if marker == -1:
+                last_newline = buf.rfind(b"\n", pos)
+                if last_newline != -1:
+                    self._split_lines(buf[pos:last_newline + 1], events)
+                    pos = last_newline + 1
+                break
+
+            self._split_lines(buf[pos:marker], events)
+            header_end = buf.find(b"\n", marker)
+            if header_end == -1:
+                pos = marker
+                break
+            self._frame = parse_frame_header(buf[marker:header_end])
+            pos = header_end + 1
+
+        self._pending = buf[pos:]
+        return events
+
+    def finish(self):
+        """Flush a trailing line without a newline once the stream has ended
+
+        Returns:
+            list: Remaining events (an incomplete frame is dropped)
+        """
+        events = []
+        if self._pending and self._frame is None:
+            self._split_lines(self._pending + b"\n", events)
+        self._pending = b""
+        self._frame = None
+        return events
+
+    @staticmethod
+    def _find_frame_marker(buf, pos):
+        """Find the next frame header that starts a line at or after pos"""
+        if buf.startswith(FRAME_MARKER, pos):
+            return pos
+        index = buf.find(b"\n" + FRAME_MARKER, pos)
+        return index + 1 if index != -1 else -1
+
+    @staticmethod
+    def _split_lines(data, events):
+        """Split complete lines into result blocks and other lines, keeping their order"""
+        if not data:
+            return
+        arr = np.frombuffer(data, dtype=np.uint8)
+        newlines = np.flatnonzero(arr == NEWLINE)
+        starts = np.empty(len(newlines), dtype=np.int64)
+        starts[0] = 0
+        starts[1:] = newlines[:-1] + 1
+        others = np.flatnonzero(arr[starts] != RESULT_PREFIX)
+
+        block_start = 0
+        for index in others.tolist():
+            line_start = int(starts[index])
+            line_end = int(newlines[index]) + 1
+            if line_start > block_start:
+                events.append(("results", _strip_prefix(data[block_start:line_start])))
+            events.append(("line", data[line_start:line_end].decode("utf-8", errors="ignore")))
+            block_start = line_end
+        if block_start < len(data):
+            events.append(("results", _strip_prefix(data[block_start:])))
+
+
+def _strip_prefix(block):
+    """Drop the leading '|' of every line in a block of result lines"""
+    return block[1:].replace(b"\n|", b"\n")
+
+
+def parse_result_block(block, columns):
+    """Parse a block of result lines into a DataFrame laid out like the CLI header
+
+    Keeps the semantics of DatabaseModel.process_csv_line: Seed stays a string,
+    every other field becomes an integer (decimals are truncated, unparsable
+    fields become 0) and short rows are padded with 0.
+
+    Args:
+        block: Newline separated 'seed,score,...' lines with the '|' prefix removed
+        columns: CLI header columns (Seed first)
+
+    Returns:
+        pandas.DataFrame: One column per header entry
+    """
+    num_columns = len(columns)
+    try:
+        frame = _read_block(block, num_columns, usecols=range(num_columns))
+    except pd.errors.ParserError:
+        # The C parser checks usecols against the widest row, so a block where
+        # every row is shorter than the header fails; read it at its own width
+        width = max(line.count(b",") for line in block.split(b"\n")) + 1
+        frame = _read_block(block, width).reindex(columns=range(num_columns))
+    for i in range(1, num_columns):
+        values = frame[i]
+        if values.dtype.kind != "i":
+            values = pd.to_numeric(values, errors="coerce").fillna(0)
+            frame[i] = np.trunc(values).astype(np.int64)
+    frame.columns = list(columns)
+    return frame
+
+
+def _read_block(block, num_columns, usecols=None):
+    """Read result lines into numbered columns, keeping Seed a string"""
+    return pd.read_csv(
+        io.BytesIO(block),
+        header=None,
+        names=list(range(num_columns)),
+        usecols=usecols,
+        dtype={0: object},
+        na_filter=False,  # Seeds like "NAN" or "NULL" must stay strings
+        quoting=csv.QUOTE_NONE,
+        skipinitialspace=True,
+        engine="c",
+    )
@@ -0,0 +1,379 @@
+"""
+CLI Supervisor - Launches, tracks and stops Ouija-CLI jobs on a single asyncio event loop thread
+"""
+
+import asyncio
+import itertools
+import threading
+import time
+
+
+class CliJob:
+    """One Ouija-CLI process started by the supervisor"""
+
+    def __init__(self, job_id, command_parts, label=None):
+        """Initialize the job record
+
+        Args:
+            job_id: Supervisor-assigned id
+            command_parts: Command line as a list
+            label: Optional display name (e.g. the config name)
+        """
+        self.job_id = job_id
+        self.command_parts = list(command_parts)
+        self.label = label or f"job {job_id}"
+        self.process = None
+        self.pid = None
+        self.status = "starting"  # starting, running, exited, failed, stopped
+        self.returncode = None
+        self.start_time = time.time()
+        self.end_time = None
+        self.stop_requested = False
+        self.finished = threading.Event()  # Set once on_exit has returned
+
+        # Throughput, updated by the output handlers
+        self.bytes_read = 0
+        self.rows = 0
+
+    @property
+    def is_running(self):
+        """Whether the process has not finished yet"""
+        return self.status in ("starting", "running")
+
+    @property
+    def duration(self):
+        """Seconds since launch, or the total run time once finished"""
+        return (self.end_time or time.time()) - self.start_time
+
+    def wait(self, timeout=None):
+        """Block until the job has exited and its exit handler has run
+
+        Returns:
+            bool: True if the job finished before the timeout
+        """
+        return self.finished.wait(timeout)
+
+    def rows_per_second(self):
+        """Average result rows per second over the job's lifetime"""
+        duration = self.duration
+        return self.rows / duration if duration > 0 else 0.0
+
+    def stats(self):
+        """Get a summary of the job
+
+        Returns:
+            dict: Id, label, pid, status, exit code, timings and throughput
+        """
+        return {
+            "job_id": self.job_id,
+            "label": self.label,
+            "pid": self.pid,
+            "status": self.status,
+            "returncode": self.returncode,
+            "start_time": self.start_time,
+            "end_time": self.end_time,
+            "duration": self.duration,
+            "bytes_read": self.bytes_read,
+            "rows": self.rows,
+            "rows_per_second": self.rows_per_second(),
+        }
+
+    def format_stats(self):
+        """Format the job summary for the console"""
+        if self.is_running:
+            state = f"running for {self.duration:.1f}s"
+        elif self.status == "stopped":
+            state = f"stopped after {self.duration:.1f}s"
+        else:
+            state = f"exited with code {self.returncode} after {self.duration:.1f}s"
+        return (f"Job {self.job_id} ({self.label}) {state}, {self.rows} rows "
+                f"@ {self.rows_per_second() / 1000.0:.1f}K rows/s")
+
+
+class CliSupervisor:
+    """Owns one background event loop that runs and reads every CLI job
+
+    stdout and stderr of each job are read concurrently with non-blocking
+    asyncio streams, so a chatty stderr can't fill its pipe while stdout is being
+    read, and any number of jobs share the one loop thread. Both pipes are read
+    until EOF before on_exit runs, so output written just before the process
+    exits is never lost. Jobs are stopped individually by id; nothing else on
+    the machine is touched.
+
+    Handlers (all receive the CliJob first):
+        on_stdout(job, chunk): Called with each raw stdout chunk, then once with b""
+            at EOF, one call at a time per job. It runs on the loop thread while the
+            launch's stdout_busy() is False and on a worker thread otherwise, so it
+            may block (ingest backpressure): that pauses reading this job's stdout
+            only, and the loop keeps serving every other job, launch and stop.
+        on_stderr(job, line): Called on the loop thread with each decoded stderr line.
+        on_exit(job): Called on a worker thread after both pipes are drained and
+            the job's exit code and timings are final.
+    """
+
+    def __init__(self, read_chunk_size=1 << 16, stream_limit=1 << 20):
+        """Initialize the supervisor
+
+        Args:
+            read_chunk_size: Maximum bytes per stdout read
+            stream_limit: asyncio StreamReader buffer limit (also the longest stderr line)
+        """
+        self.read_chunk_size = read_chunk_size
+        self.stream_limit = stream_limit
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._jobs = {}  # job_id -> CliJob
+
+    def start(self):
+        """Start the event loop thread if it isn't running yet"""
+        with self._lock:
+            if self._thread and self._thread.is_alive():
+                return
+            # On Windows the default (Proactor) loop is the one that supports pipes
+            self._loop = asyncio.new_event_loop()
+            self._thread = threading.Thread(target=self._run_loop, daemon=True, name="OuijaCliSupervisor")
+            self._thread.start()
+
+    def _run_loop(self):
+        """Event loop thread body"""
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    # === Job control (any thread) ===
+    def launch(self, command_parts, on_stdout, on_stderr, on_exit, label=None, timeout=10.0, stdout_busy=None,
+               **popen_kwargs):
+        """Launch a job and start pumping its pipes
+
+        Args:
+            command_parts: Command line as a list
+            on_stdout: Handler for raw stdout chunks
+            on_stderr: Handler for stderr lines
+            on_exit: Handler called once the job has finished
+            label: Optional display name for the job
+            timeout: Seconds to wait for the launch to succeed
+            stdout_busy: Optional callable() that is True while on_stdout may block; without
+                         it every stdout chunk is handled on a worker thread
+            **popen_kwargs: Extra subprocess arguments (cwd, startupinfo, ...)
+
+        Returns:
+            CliJob: The running job
+
+        Raises:
+            Whatever the launch raised (e.g. FileNotFoundError)
+        """
+        self.start()
+        job = CliJob(next(self._ids), command_parts, label)
+        with self._lock:
+            self._jobs[job.job_id] = job
+        future = asyncio.run_coroutine_threadsafe(
+            self._launch(job, on_stdout, on_stderr, on_exit, stdout_busy, popen_kwargs), self._loop
+        )
+        try:
+            future.result(timeout)
+        except Exception:
+            job.status = "failed"
+            job.end_time = time.time()
+            job.finished.set()
+            with self._lock:
+                self._jobs.pop(job.job_id, None)
+            raise
+        return job
+
+    def stop(self, job_id, timeout=3.0, force=False):
+        """Stop one job: terminate it, then kill it if it hasn't exited after timeout
+
+        Args:
+            job_id: Id returned by launch()
+            timeout: Seconds to wait between terminate and kill (and for the exit)
+            force: Kill immediately instead of terminating first
+
+        Returns:
+            bool: True if the job is no longer running
+        """
+        job = self.get_job(job_id)
+        if job is None:
+            return False
+        if not job.is_running:
+            return True
+        future = asyncio.run_coroutine_threadsafe(self._stop(job, timeout, force), self._loop)
+        try:
+            future.result(timeout * 2 + 1.0)
+        except Exception as e:
+            print(f"Error stopping job {job_id}: {e}")
+        return job.process is not None and job.process.returncode is not None
+
+    def request_stop(self, job_id, timeout=3.0):
+        """Start stopping one job without waiting for it (safe from output handlers)
+
+        Returns:
+            bool: True if a stop was scheduled
+        """
+        job = self.get_job(job_id)
+        if job is None or not job.is_running:
+            return False
+        job.stop_requested = True
+        asyncio.run_coroutine_threadsafe(self._stop(job, timeout, False), self._loop)
+        return True
+
+    def write(self, job_id, data, timeout=5.0):
+        """Write to a job's stdin (launched with stdin=subprocess.PIPE); not from the loop thread
+
+        Raises:
+            RuntimeError: If the job isn't running
+        """
+        job = self.get_job(job_id)
+        if job is None or not job.is_running or job.process is None or job.process.stdin is None:
+            raise RuntimeError(f"Job {job_id} is not running with a stdin pipe")
+        asyncio.run_coroutine_threadsafe(self._write(job, data), self._loop).result(timeout)
+
+    def reserve_job_id(self):
+        """Take a job id for a record that isn't a process of its own (e.g. a daemon request)"""
+        return next(self._ids)
+
+    def cancel(self, job_id):
+        """Kill one job right away"""
+        return self.stop(job_id, timeout=1.0, force=True)
+
+    def stop_all(self, timeout=3.0):
+        """Stop every running job
+
+        Returns:
+            bool: True if all jobs are no longer running
+        """
+        jobs = self.running_jobs()
+        if not jobs:
+            return True
+        # Stop them concurrently so N jobs take one timeout, not N
+        future = asyncio.run_coroutine_threadsafe(self._stop_many(jobs, timeout), self._loop)
+        try:
+            future.result(timeout * 2 + 1.0)
+        except Exception as e:
+            print(f"Error stopping jobs: {e}")
+        return all(job.process is not None and job.process.returncode is not None for job in jobs)
+
+    def get_job(self, job_id):
+        """Get a job by id, or None"""
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def jobs(self):
+        """All jobs launched so far, oldest first"""
+        with self._lock:
+            return list(self._jobs.values())
+
+    def running_jobs(self):
+        """Jobs whose process has not finished yet"""
+        return [job for job in self.jobs() if job.is_running]
+
+    def forget_finished(self):
+        """Drop finished jobs from the registry"""
+        with self._lock:
+            self._jobs = {job_id: job for job_id, job in self._jobs.items() if job.is_running}
+
+    # === Event loop side ===
+    async def _launch(self, job, on_stdout, on_stderr, on_exit, stdout_busy, popen_kwargs):
+        """Create the process on the loop and schedule its pump task"""
+        job.process = await asyncio.create_subprocess_exec(
+            *job.command_parts,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            limit=self.stream_limit,
+            **popen_kwargs,
+        )
+        job.pid = job.process.pid
+        job.status = "running"
+        self._loop.create_task(self._pump(job, on_stdout, on_stderr, on_exit, stdout_busy))
+
+    async def _pump(self, job, on_stdout, on_stderr, on_exit, stdout_busy):
+        """Drain both pipes to EOF, then record the exit and report it"""
+        await asyncio.gather(
+            self._read_stdout(job, on_stdout, stdout_busy),
+            self._read_stderr(job, on_stderr),
+        )
+        job.returncode = await job.process.wait()
+        job.end_time = time.time()
+        if job.stop_requested:
+            job.status = "stopped"
+        else:
+            job.status = "exited" if job.returncode == 0 else "failed"
+        # Exit handling may wait on the ingest writer; keep it off the loop thread
+        try:
+            await self._loop.run_in_executor(None, self._call, on_exit, job)
+        finally:
+            job.finished.set()
+
+    async def _stop(self, job, timeout, force):
+        """Terminate (or kill) one process and wait for it to exit"""
+        job.stop_requested = True
+        process = job.process
+        if process is None or process.returncode is not None:
+            return
+        try:
+            if force:
+                process.kill()
+            else:
+                process.terminate()
+            await asyncio.wait_for(process.wait(), timeout)
+        except asyncio.TimeoutError:
+            process.kill()
+            await asyncio.wait_for(process.wait(), timeout)
+        except ProcessLookupError:
+            pass  # Already gone
+
+    async def _write(self, job, data):
+        """Write to a process's stdin and wait until the pipe accepted it"""
+        job.process.stdin.write(data)
+        await job.process.stdin.drain()
+
+    async def _stop_many(self, jobs, timeout):
+        """Stop several jobs at once"""
+        await asyncio.gather(*[self._stop(job, timeout, False) for job in jobs], return_exceptions=True)
+
+    async def _read_stdout(self, job, on_stdout, stdout_busy):
+        """Forward stdout in large chunks until EOF"""
+        stream = job.process.stdout
+        while True:
+            chunk = await stream.read(self.read_chunk_size)
+            job.bytes_read += len(chunk)
+            if stdout_busy is None or stdout_busy():
+                # The handler may wait on a full ingest queue; only this job's reads wait with it
+                await self._loop.run_in_executor(None, self._call, on_stdout, job, chunk)
+            else:
+                self._call(on_stdout, job, chunk)
+            if not chunk:
+                return
+
+    async def _read_stderr(self, job, on_stderr):
+        """Forward stderr line by line until EOF"""
+        stream = job.process.stderr
+        while True:
+            try:
+                line = await stream.readline()
+            except ValueError:
+                # Line longer than the stream limit; asyncio discards it, keep reading
+                continue
+            if not line:
+                return
+            self._call(on_stderr, job, line.decode("utf-8", errors="ignore"))
+
+    @staticmethod
+    def _call(handler, *args):
+        """Run a handler without letting its errors stop the pipe from draining"""
+        try:
+            handler(*args)
+        except Exception as e:
+            print(f"Error in CLI output handler: {e}")
+
+    def shutdown(self, timeout=3.0):
+        """Stop all jobs, let their exit handlers finish, then stop the event loop thread"""
+        if self._thread and self._thread.is_alive():
+            self.stop_all(timeout)
+            for job in self.jobs():
+                job.wait(timeout)
+        with self._lock:
+            if self._loop and self._thread and self._thread.is_alive():
+                self._loop.call_soon_threadsafe(self._loop.stop)
+                self._thread.join(timeout=2.0)
+            self._thread = None
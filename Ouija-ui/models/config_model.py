@@ -5,6 +5,8 @@ Config Model - Handles configuration data for Ouija seed finder
 import json
 import os
 
+from models.result_retention import RetentionPolicy
+
 
 class ConfigModel:
     """Model for handling configuration data and files"""
@@ -31,9 +33,14 @@ class ConfigModel:
         self.cutoff = "1"
         self.gpu_batch = "16"  # Default GPU batch size
         self.template = "ouija_template"  # Default template filter
+        self.binary_results = False  # Opt-in binary result stream from Ouija-CLI
+        self.search_devices = ""  # "" (CLI default device), "all" or "platform:device,..." to shard over
+        self.processes_per_device = 1  # CLI processes per device when sharding
         # --- Negative joker scoring flags ---
         self.score_natural_negatives = False
         self.score_desired_negatives = False
+        # --- Stored results limit (top N / minimum score), enforced by the database pruner ---
+        self.retention = RetentionPolicy()
 
         # Create config directory if it doesn't exist
         os.makedirs(self.CONFIG_DIR, exist_ok=True)
@@ -65,6 +72,12 @@ class ConfigModel:
                     self.gpu_batch = conf["gpu_batch_size"]
                 if conf.get("template"):  # Load template
                     self.template = conf["template"]
+                if "binary_results" in conf:
+                    self.binary_results = bool(conf["binary_results"])
+                if "search_devices" in conf:
+                    self.search_devices = str(conf["search_devices"] or "")
+                if conf.get("processes_per_device"):
+                    self.processes_per_device = int(conf["processes_per_device"])
                 if conf.get("last_config_path"):
                     # Try to load the config file - don't check if it exists first
                     self.load_config_from_path(conf["last_config_path"])
@@ -85,6 +98,9 @@ class ConfigModel:
             "cutoff": self.cutoff,  # Save cutoff
             "gpu_batch_size": self.gpu_batch,  # Save GPU batch size
             "template": self.template,  # Save template
+            "binary_results": self.binary_results,
+            "search_devices": self.search_devices,
+            "processes_per_device": self.processes_per_device,
         }
 
         try:
@@ -158,6 +174,9 @@ class ConfigModel:
             self.score_natural_negatives = filter_config.get("scoreNaturalNegatives", True)
             self.score_desired_negatives = filter_config.get("scoreDesiredNegatives", True)
 
+            # Load the result retention policy (outside filter_config, the CLI never reads it)
+            self.retention = RetentionPolicy.from_config(config)
+
             # Update state tracking
             self.loaded_config_path = actual_file_path
             self.config_loaded_from_file = True
@@ -200,6 +219,8 @@ class ConfigModel:
                 "scoreDesiredNegatives": self.score_desired_negatives,
             },
         }
+        if self.retention.is_active:
+            config["retention"] = self.retention.to_config()
 
         # If no path provided, use the loaded path or generate a new one
         if not file_path:
@@ -293,6 +314,9 @@ class ConfigModel:
             "cutoff": "cutoff",
             "gpu_batch": "gpu_batch",
             "template": "template",
+            "binary_results": "binary_results",
+            "search_devices": "search_devices",
+            "processes_per_device": "processes_per_device",
             "score_natural_negatives": "score_natural_negatives",
             "score_desired_negatives": "score_desired_negatives",
         }
@@ -314,6 +338,9 @@ class ConfigModel:
             "cutoff": "cutoff",
             "gpu_batch": "gpu_batch",
             "template": "template",
+            "binary_results": "binary_results",
+            "search_devices": "search_devices",
+            "processes_per_device": "processes_per_device",
             "score_natural_negatives": "score_natural_negatives",
             "score_desired_negatives": "score_desired_negatives",
         }
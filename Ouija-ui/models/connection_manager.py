@@ -0,0 +1,187 @@
+"""
+Connection Manager - One shared DuckDB connection per database file for the whole process
+"""
+
+import os
+import threading
+from contextlib import contextmanager
+
+import duckdb
+
+
+class ConnectionManager:
+    """Process-wide registry of open database files
+
+    Opening a DuckDB file is expensive (file open, WAL replay, catalog load), so
+    every DatabaseModel connected to the same file shares one connection. The
+    connection is reference counted: acquire() opens it on first use, release()
+    closes it once the last holder lets go.
+
+    Readers and writer threads never use the shared connection object directly
+    from another thread; they take a cursor(), which is cheap and shares the
+    database and its catalog with the connection.
+
+    DuckDB lets only one database in the process have a file attached. Anything
+    else that attaches database files (the federated query layer) registers a
+    release hook, which is called before a file is opened here so it can detach
+    it; while that happens the file already counts as open.
+    """
+
+    def __init__(self):
+        """Initialize an empty registry"""
+        self._lock = threading.Lock()
+        self._connections = {}  # normalized path -> [connection, holders]
+        self._opening = set()  # normalized paths between release hooks and connect
+        self._release_hooks = []
+
+        # Counters for checking connections are actually reused
+        self.opens = 0
+        self.closes = 0
+        self.cursors = 0
+
+    @staticmethod
+    def _key(db_path):
+        """Normalize a path so different spellings of one file share a connection"""
+        return os.path.normcase(os.path.abspath(db_path))
+
+    def add_release_hook(self, hook):
+        """Register a callback that lets go of a file (hook(db_path)) before it's opened here"""
+        with self._lock:
+            self._release_hooks.append(hook)
+
+    def remove_release_hook(self, hook):
+        """Unregister a callback added with add_release_hook()"""
+        with self._lock:
+            if hook in self._release_hooks:
+                self._release_hooks.remove(hook)
+
+    def acquire(self, db_path, before_open=None):
+        """Get the shared connection for a database file, opening it if needed
+
+        Args:
+            db_path: Path to the .duckdb file
+            before_open: Optional callback(db_path) run right before the file is
+                         opened (e.g. a migration); skipped if it is already open
+
+        Returns:
+            DuckDBPyConnection: The shared connection; pair with release()
+        """
+        key = self._key(db_path)
+        with self._lock:
+            entry = self._connections.get(key)
+            if entry is not None:
+                entry[1] += 1
+                return entry[0]
+            self._opening.add(key)
+            hooks = list(self._release_hooks)
+
+        # Hooks may wait on their own locks, so they run without holding ours
+        try:
+            for hook in hooks:
+                try:
+                    hook(db_path)
+                except Exception as e:
+                    print(f"Error releasing {db_path} before opening it: {e}")
+            if before_open:
+                before_open(db_path)
+            with self._lock:
+                entry = self._connections.get(key)
+                if entry is None:
+                    entry = [duckdb.connect(db_path), 0]
+                    self._connections[key] = entry
+                    self.opens += 1
+                entry[1] += 1
+                return entry[0]
+        finally:
+            with self._lock:
+                self._opening.discard(key)
+
+    def release(self, db_path):
+        """Drop one hold on a database file; the last release closes it"""
+        key = self._key(db_path)
+        with self._lock:
+            entry = self._connections.get(key)
+            if entry is None:
+                return
+            entry[1] -= 1
+            if entry[1] > 0:
+                return
+            del self._connections[key]
+        self._close(entry[0])
+
+    def close_database(self, db_path):
+        """Close a database file regardless of holders (e.g. before deleting it)"""
+        with self._lock:
+            entry = self._connections.pop(self._key(db_path), None)
+        if entry is not None:
+            self._close(entry[0])
+
+    def _close(self, connection):
+        """Close a connection, counting it"""
+        try:
+            connection.close()
+        except Exception as e:
+            print(f"Error closing database connection: {e}")
+        with self._lock:
+            self.closes += 1
+
+    def cursor(self, db_path):
+        """Open a cursor on an already acquired database file
+
+        Returns:
+            DuckDBPyConnection: New cursor, or None if the file isn't open
+        """
+        if not db_path:
+            return None
+        with self._lock:
+            entry = self._connections.get(self._key(db_path))
+            if entry is None:
+                return None
+            self.cursors += 1
+            return entry[0].cursor()
+
+    @contextmanager
+    def borrow_cursor(self, db_path):
+        """Cursor for the duration of a with block, closed afterwards
+
+        Yields:
+            DuckDBPyConnection: Cursor, or None if the file isn't open
+        """
+        cursor = self.cursor(db_path)
+        try:
+            yield cursor
+        finally:
+            if cursor is not None:
+                cursor.close()
+
+    def is_open(self, db_path):
+        """Whether a database file currently has (or is getting) a shared connection"""
+        with self._lock:
+            key = self._key(db_path)
+            return key in self._connections or key in self._opening
+
+    def stats(self):
+        """Get the connection counters
+
+        Returns:
+            dict: Open files, total opens/closes and cursors handed out
+        """
+        with self._lock:
+            return {
+                "open_databases": len(self._connections),
+                "opens": self.opens,
+                "closes": self.closes,
+                "cursors": self.cursors,
+            }
+
+    def close_all(self):
+        """Close every open database file (application exit)"""
+        with self._lock:
+            entries = list(self._connections.values())
+            self._connections.clear()
+        for connection, _ in entries:
+            self._close(connection)
+
+
+# Shared by every DatabaseModel in the process
+connection_manager = ConnectionManager()
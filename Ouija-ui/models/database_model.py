@@ -2,17 +2,39 @@
 Database Model - Handles database interactions for Ouija seed finder
 """
 
+import itertools
 import os
 import sys
 import threading
+from contextlib import contextmanager
 from pathlib import Path
 
 import duckdb
+import numpy as np
 import pandas as pd
 
+from models.connection_manager import connection_manager
+from models.result_export import ExportJob, build_copy_statement, export_format_for_path
+from models.result_retention import ResultPruner, RetentionPolicy, load_retention_policy
+from models.result_schema import (RESULT_ROWS_TABLE, SEED_ID_COLUMN, compact_database_file, compact_type,
+                                   create_results_schema, drop_results_schema, format_report, order_column,
+                                   rows_query, seed_strings, widen_for_batch)
+from models.result_stats import (ResultStats, cutoff_for_rows, read_histogram, read_score_cutoffs,
+                                 rows_at_or_above)
+from models.result_versions import (VERSION_COLUMN, activate_version, all_versions_query, drop_versions,
+                                    header_version, load_versions)
+from models.search_checkpoints import drop_checkpoints, load_checkpoints, save_checkpoints
+from models.search_coverage import drop_coverage, load_ranges, pick_gap, record_checkpoints, summarize
+from models.seed_codec import encode_seed, encode_seeds, seed_range
+from models.seen_results import SeenResults
+from models.top_results import TopResults
+
 
 class DatabaseModel:
-    """Model for handling database operations with DuckDB"""    
+    """Model for handling database operations with DuckDB"""
+
+    TOP_RESULTS_LIMIT = 1000  # Rows shown in the results table
+
     def __init__(self):
         """Initialize the database model"""
         self.connection = None
@@ -23,8 +45,41 @@ class DatabaseModel:
         self.conn = None
         self.header_columns = None
         self.on_results_table_reset = None  # Callback for UI refresh after table reset
+        self.on_before_close = None  # Callback letting the ingest writer commit before the file is released
         self.db_lock = threading.RLock()
 
+        # Schema cache so steady-state inserts never touch the catalog.
+        # None means "unknown, ask DuckDB"; see _invalidate_schema_cache() for what resets it.
+        self._table_exists_cache = None
+        self._known_columns = None
+
+        # CLI header -> table its rows go to: result_rows for the current schema
+        # version, result_rows_<version> for an earlier header still being written
+        self._write_tables = {}
+
+        # Best results kept in memory by the ingest path, so refreshes don't re-sort the table
+        self.top_results = TopResults(self.TOP_RESULTS_LIMIT)
+
+        # Stored rows, so re-emitted seeds with unchanged rows skip the upsert
+        self.seen_results = SeenResults()
+
+        # Score and per-want histograms, updated with each upserted batch
+        self.result_stats = ResultStats()
+
+        # Held around each bulk INSERT and each pruning batch, never for longer
+        self.write_lock = threading.Lock()
+
+        # Per-config limit on stored results (config "retention"), applied by a background pruner
+        self.retention = RetentionPolicy()
+        self.pruner = None
+        # Batches upserted while the pruner copies survivors (None: not logging, False: can't replay)
+        self._row_log = None
+
+        # Bumped by every write, schema change and (re)connect; readers that saw
+        # the same token can skip their query
+        self._change_counter = itertools.count(1)
+        self.change_token = 0
+
         # Determine the correct database directory based on runtime context
         self.DB_DIR = self._get_database_directory()
         
@@ -74,6 +129,8 @@ class DatabaseModel:
         Returns:
             bool: True if connection successful, False otherwise
         """
+        if self.connection and self.current_db_path != self.get_db_path_from_config(config_path):
+            self._before_close()
         with self.db_lock:
             try:
                 db_path = self.get_db_path_from_config(config_path)
@@ -82,10 +139,11 @@ class DatabaseModel:
                 if self.current_db_path == db_path and self.connection:
                     return True                # Close existing connection if switching databases
                 if self.connection:
-                    self.close()
+                    self._close_connection()
 
-                # Connect to the database
-                self.connection = duckdb.connect(db_path)
+                # Share the process-wide connection for this file instead of opening it again;
+                # databases from before the compact schema are rewritten first if nobody has them open
+                self.connection = connection_manager.acquire(db_path, before_open=self._compact_database)
                 self.conn = self.connection  # Set alias
                 self.current_db_path = db_path  # Set current path
                 self.current_config_path = config_path  # Store config path for reconnection
@@ -94,39 +152,176 @@ class DatabaseModel:
                 # Reset schema tracking when connecting to any database
                 self._schema_established = False
                 self.header_columns = None  # Reset header columns too!
+                self._invalidate_schema_cache()
 
                 # Create the results table if it doesn't exist
                 self.create_results_table()
+
+                # Seed the in-memory top results from the database
+                self.top_results.invalidate()
+                self._load_top_results()
+                self.seen_results.reset()  # Loaded lazily by the first upsert
+                self.result_stats.reset()
+                self.set_retention(load_retention_policy(config_path))
                 return True
             except Exception as e:
                 print(f"Error connecting to database: {e}")
+                if self.connection:
+                    connection_manager.release(db_path)
                 self.connection = None
                 self.conn = None
                 self.current_db_path = None
                 self.current_config_path = None
                 return False
 
+    def _compact_database(self, db_path):
+        """Migrate a database file to the compact results schema if it needs it"""
+        try:
+            report = compact_database_file(db_path)
+            if report:
+                print(f"Compacted results database: {format_report(report)}")
+        except Exception as e:
+            # The original file is left untouched; try again next time
+            print(f"Could not compact {db_path}: {e}")
+
+    def set_retention(self, policy):
+        """Apply a retention policy to the current database
+
+        Args:
+            policy: RetentionPolicy of the connected config
+        """
+        changed = policy != self.retention
+        if policy.keeps_more_than(self.retention):
+            # Seeds the old policy pruned count as stored in seen_results; they're wanted again
+            self.seen_results.reset()
+        self.retention = policy
+        if changed:
+            print(f"Result retention: {policy.describe()}")
+        if policy.is_active:
+            if self.pruner is None or not self.pruner.is_alive():
+                self.pruner = ResultPruner(self)
+                self.pruner.start()
+            self.pruner.request(force=changed)
+
+    def results_pruned(self, policy, removed):
+        """Called by the pruner after it removed rows from the current database"""
+        # Pruned seeds stay in seen_results, so re-emitted ones are skipped too
+        if policy.min_score is not None or (policy.keep_top or 0) < self.top_results.capacity:
+            self.top_results.invalidate()
+        with self.reader_cursor() as cursor:
+            if cursor is not None:
+                self.result_stats.invalidate(cursor)
+        self._bump_change_token()
+
+    def stop_pruner(self):
+        """Stop the background pruner (application exit)"""
+        if self.pruner is not None:
+            self.pruner.stop()
+            self.pruner = None
+
     def close(self):
         """Close the current database connection"""
+        if self.connection:
+            self._before_close()
+        with self.db_lock:
+            self._close_connection()
+
+    def _before_close(self):
+        """Let the ingest writer commit rows queued for the current database
+
+        Runs without db_lock held; the writer takes it to commit.
+        """
+        if not self.on_before_close:
+            return
+        try:
+            self.on_before_close()
+        except Exception as e:
+            print(f"Error committing pending results before closing: {e}")
+
+    def _close_connection(self):
+        """Release the current connection without waiting for the ingest writer"""
         with self.db_lock:
             if self.connection:
-                self.connection.close()
+                self.result_stats.flush(self.connection)
+                connection_manager.release(self.current_db_path)
                 self.connection = None
             if self.conn:
                 self.conn = None
             self.current_db_path = None
             self.current_config_path = None
+            self._bump_change_token()
+
+    def _bump_change_token(self):
+        """Record that what readers would see may have changed"""
+        # next() on itertools.count is atomic, so writer threads need no lock here
+        self.change_token = next(self._change_counter)
+
+    def _invalidate_schema_cache(self):
+        """Forget cached table existence and columns
+
+        Called by create_table, delete_all_results, connect to a different file
+        and schema version switches - the only operations that change the schema.
+        """
+        self._table_exists_cache = None
+        self._known_columns = None
+        self._write_tables = {}
+        self._spoil_row_log()
+        self._bump_change_token()
+
+    # === Row log (the pruner's survivor copy) ===
+    def start_row_log(self):
+        """Start keeping every batch upserted into the results table (write_lock held)
+
+        The pruner copies the rows it keeps without the lock, then catches up on
+        what was written meanwhile with take_row_log() and write_logged_rows().
+        """
+        self._row_log = []
+
+    def stop_row_log(self):
+        """Stop keeping upserted batches"""
+        self._row_log = None
+
+    def take_row_log(self):
+        """Batches logged since start_row_log() or the last take; logging goes on (write_lock held)
+
+        Returns:
+            list: (columns, batch) pairs, or None if the results table changed other than
+                  by bulk upserts, so the log doesn't hold everything that was written
+        """
+        log = self._row_log
+        if not isinstance(log, list):
+            return None
+        self._row_log = []
+        return log
+
+    def write_logged_rows(self, conn, log, table):
+        """Upsert batches from take_row_log() into a table shaped like the results table"""
+        for columns, batch in log:
+            self._insert_batch(conn, columns, batch, table)
+
+    def _log_rows(self, columns, batch):
+        """Keep an upserted batch if the row log is on (write_lock held)"""
+        if isinstance(self._row_log, list):
+            self._row_log.append((columns, batch))
+
+    def _spoil_row_log(self):
+        """The results table changed in a way the row log can't replay"""
+        if self._row_log is not None:
+            self._row_log = False
 
     def table_exists(self):
         """Check if the results table exists in the current database"""
         with self.db_lock:
             if not self.conn:
                 return False
+            if self._table_exists_cache is not None:
+                return self._table_exists_cache
             try:
                 result = self.conn.execute(
-                    "SELECT COUNT(*) FROM information_schema.tables WHERE table_name = 'results'"
+                    f"SELECT COUNT(*) FROM information_schema.tables WHERE table_name = '{RESULT_ROWS_TABLE}'"
                 ).fetchone()
-                return result is not None and result[0] > 0
+                self._table_exists_cache = result is not None and result[0] > 0
+                return self._table_exists_cache
             except Exception:
                 return False
 
@@ -139,23 +334,11 @@ class DatabaseModel:
                 table_was_created = False
                 if not self.table_exists():
                     try:
-                        self.conn.execute(
-                            """
-                            CREATE TABLE results
-                            (
-                                Seed  TEXT PRIMARY KEY,
-                                Score INTEGER
-                            )
-                            """
-                        )
-                        # Create an index on Score column for faster sorting
-                        self.conn.execute(
-                            'CREATE INDEX IF NOT EXISTS idx_score ON results ("Score");'
-                        )
-                        self.conn.execute(
-                            'CREATE INDEX IF NOT EXISTS idx_seed ON results ("Seed");'
-                        )
+                        # Sorting scans the table either way, so there are no secondary
+                        # indexes; they would also block ALTER COLUMN
+                        create_results_schema(self.conn, [f'"Score" {compact_type("Score")}'])
                         table_was_created = True
+                        self._invalidate_schema_cache()
                     except Exception as e:
                         # Ignore "column already exists" errors which can happen during race conditions
                         error_msg = str(e).lower()
@@ -179,23 +362,35 @@ class DatabaseModel:
             try:
                 if force_delete_file:
                     print("DEBUG: Deleting database file.")
-                    # Close the connection and delete the database file
-                    self.connection.close()
+                    # Close the connection (for every holder) and delete the database file
+                    connection_manager.close_database(self.current_db_path)
                     os.remove(self.current_db_path)
                     self.connection = None
+                    self.conn = None
                     self.current_db_path = None
+                    self._invalidate_schema_cache()
+                    self.top_results.invalidate()
+                    self.seen_results.reset()
                     print("DEBUG: Database file deleted due to column changes.")
                     return True
 
                 # Drop the results table entirely
                 print("DEBUG: Dropping results table.")
                 cursor = self.connection.cursor()
-                cursor.execute("DROP TABLE IF EXISTS results;")
+                drop_results_schema(cursor)
+                drop_versions(cursor)
+                # Resuming would skip the seeds whose results were just deleted
+                drop_checkpoints(cursor)
+                drop_coverage(cursor)
+                self.result_stats.invalidate(cursor, recheck=True)
                 self.connection.commit()
 
                 # Reset schema tracking
                 self._schema_established = False
                 self.header_columns = None
+                self._invalidate_schema_cache()
+                self.top_results.clear()
+                self.seen_results.clear()
 
                 print("DEBUG: Results table dropped and schema reset.")
                 return True
@@ -231,17 +426,13 @@ class DatabaseModel:
                     if self.header_columns is None:
                         self.header_columns = normalized_headers  # Normalize headers
                         print("DEBUG: Initializing headers and creating table.")
-                        self.create_table(self.header_columns)
+                        self.prepare_results_table(self.header_columns)
                     elif self.header_columns != normalized_headers:
-                        print("DEBUG: Header columns have changed. Recreating table with new schema.")
+                        print("DEBUG: Header columns have changed. Switching to their schema version.")
                         self.header_columns = normalized_headers  # Update header columns
 
-                        # Drop and recreate the table with the updated schema
-                        cursor = self.connection.cursor()
-                        cursor.execute("DROP TABLE IF EXISTS results;")
-                        self.connection.commit()
-                        self.create_table(self.header_columns)
-                        print("DEBUG: Table recreated with new schema.")
+                        # Earlier results are archived under their own version, not dropped
+                        self.prepare_results_table(self.header_columns)
                     else:
                         print("DEBUG: Header columns match. No action needed.")
                 elif csv_line.startswith("|"):
@@ -292,29 +483,238 @@ class DatabaseModel:
 
             try:
                 # Ensure the table exists and has the right columns
-                if not self.table_exists():
-                    self.create_table(columns)
-
-                self.ensure_columns_exist(columns)
+                if not self.prepare_results_table(columns):
+                    return False
 
-                # Use Seed column as the unique key for upsert
+                # The packed seed is the unique key for upsert
                 seed_value = values[0] if values else None
                 if not seed_value:
                     return False
+                values = [encode_seed(seed_value)] + list(values[1:])
 
                 # Create column names and placeholder values for the SQL statement
-                column_names = ", ".join([f'"{col}"' for col in columns])
+                column_names = ", ".join([f'"{SEED_ID_COLUMN}"'] + [f'"{col}"' for col in columns[1:]])
                 placeholders = ", ".join(["?"] * len(values))
 
                 # Insert or replace the row
-                query = f"INSERT OR REPLACE INTO results ({column_names}) VALUES ({placeholders})"
+                query = f"INSERT OR REPLACE INTO {RESULT_ROWS_TABLE} ({column_names}) VALUES ({placeholders})"
                 self.conn.execute(query, values)
+                self._spoil_row_log()
+                # Row-by-row path is rare; let the next read reload the in-memory copies
+                self.top_results.invalidate()
+                self.seen_results.reset()
+                self.result_stats.invalidate(self.conn)
+                self._bump_change_token()
 
                 return True
             except Exception as e:
                 print(f"Error upserting result: {e}")
                 return False
 
+    def insert_results(self, columns, rows, conn=None):
+        """Bulk upsert many result rows in a single statement
+
+        Args:
+            columns: Column names matching the CLI header (Seed first)
+            rows: List of value lists as returned by process_csv_line
+            conn: Optional writer cursor from writer_cursor(). Writes through it skip
+                  db_lock and assume prepare_results_table() already ran for columns.
+
+        Returns:
+            int: Number of rows written, 0 on failure
+        """
+        if not rows:
+            return 0
+
+        return self.insert_result_frame(columns, pd.DataFrame(rows, columns=columns), conn=conn)
+
+    def insert_result_frame(self, columns, frame, conn=None):
+        """Bulk upsert a DataFrame of results whose columns follow the CLI header
+
+        Args:
+            columns: Column names matching the CLI header (Seed first)
+            frame: pandas.DataFrame with those columns
+            conn: Optional writer cursor, see insert_results()
+
+        Returns:
+            int: Number of rows written, 0 on failure
+        """
+        if frame is None or frame.empty:
+            return 0
+
+        if conn is not None:
+            return self._bulk_upsert(conn, columns, frame)
+
+        with self.db_lock:
+            if not self.conn:
+                return 0
+
+            if not self.prepare_results_table(columns):
+                return 0
+            return self._bulk_upsert(self.conn, columns, frame)
+
+    def _bulk_upsert(self, conn, columns, batch):
+        """Upsert a DataFrame batch through the given connection or cursor"""
+        try:
+            # Hand the whole batch to DuckDB as one columnar scan, keyed on packed seeds
+            batch = batch[batch["Seed"] != ""]
+            seed_ids, valid = encode_seeds(batch["Seed"])
+            if not valid.all():
+                print(f"Skipping {int((~valid).sum())} results with malformed seeds")
+                batch, seed_ids = batch[valid], seed_ids[valid]
+            batch = batch.assign(**{SEED_ID_COLUMN: seed_ids})
+            # A seed may repeat inside one batch; the last occurrence wins like row-by-row upserts did
+            batch = batch.drop_duplicates(subset=SEED_ID_COLUMN, keep="last")
+            if batch.empty:
+                return 0
+
+            # Rows already stored unchanged, or below the retention minimum, count as
+            # written without touching DuckDB
+            accepted = len(batch)
+            if self.retention.min_score is not None and "Score" in batch.columns:
+                batch = batch[batch["Score"] >= self.retention.min_score]
+            table = self._write_tables.get(tuple(columns), RESULT_ROWS_TABLE)
+            if table != RESULT_ROWS_TABLE:
+                # A search started before the header changed: its rows join their own version
+                with self.write_lock:
+                    self._insert_batch(conn, columns, batch, table)
+                self._bump_change_token()
+                return accepted
+            batch, seed_ids, row_hashes = self.seen_results.screen(conn, columns, batch)
+            if batch.empty:
+                return accepted
+            replaced = self.seen_results.stored(seed_ids)
+
+            with self.write_lock:
+                # Changed rows replace stored ones; the histograms need what they were
+                previous = self._stored_rows(conn, seed_ids[replaced]) if replaced.any() else None
+                self.result_stats.prepare(conn)
+                try:
+                    self._insert_batch(conn, columns, batch)
+                except duckdb.ConversionException:
+                    # A value doesn't fit the compact column type; widen it and retry once
+                    if not widen_for_batch(conn, batch, columns):
+                        raise
+                    self._insert_batch(conn, columns, batch)
+                self._log_rows(columns, batch)
+                self.result_stats.update(conn, columns, batch, previous)
+
+            self.seen_results.add(seed_ids, row_hashes)
+            self.top_results.update(batch.drop(columns=SEED_ID_COLUMN))
+            self._bump_change_token()
+            if self.retention.keep_top is not None:
+                self.pruner.request()
+            return accepted
+        except Exception as e:
+            print(f"Error bulk upserting {len(batch)} results: {e}")
+            return 0
+
+    @staticmethod
+    def _stored_rows(conn, seed_ids):
+        """Read the stored rows of some seed ids (pandas.DataFrame with SeedId)"""
+        return conn.execute(rows_query(f'"{SEED_ID_COLUMN}" IN (SELECT UNNEST(?::UBIGINT[]))'),
+                            [seed_ids.tolist()]).fetch_df()
+
+    @staticmethod
+    def _insert_batch(conn, columns, batch, table=RESULT_ROWS_TABLE):
+        """Run the INSERT OR REPLACE for a DataFrame batch with a SeedId column"""
+        column_names = ", ".join([f'"{SEED_ID_COLUMN}"'] + [f'"{col}"' for col in columns[1:]])
+        conn.register("_ingest_batch", batch)
+        try:
+            conn.execute(
+                f"INSERT OR REPLACE INTO {table} ({column_names}) "
+                f"SELECT {column_names} FROM _ingest_batch"
+            )
+        finally:
+            conn.unregister("_ingest_batch")
+
+    def writer_cursor(self):
+        """Open a separate cursor on the current database for a dedicated writer thread
+
+        Returns:
+            DuckDBPyConnection: Cursor sharing the database, or None if not connected
+        """
+        with self.db_lock:
+            if not self.connection:
+                return None
+            return connection_manager.cursor(self.current_db_path)
+
+    @contextmanager
+    def reader_cursor(self):
+        """Borrow a cursor on the current database for a read-only query
+
+        Yields:
+            DuckDBPyConnection: Cursor closed when the block exits, or None if not connected
+        """
+        with connection_manager.borrow_cursor(self.current_db_path) as cursor:
+            yield cursor
+
+    def prepare_results_table(self, columns, activate=True):
+        """Make sure a CLI header's rows have a table to go to
+
+        A header with other value columns than the results table (a Want added
+        or removed) gets its own schema version; the table's rows are archived
+        under theirs instead of being dropped.
+
+        Args:
+            columns: CLI header columns (Seed first)
+            activate: Make the header's version the current one. False (flushing
+                      rows of a header seen before) writes them to their archived
+                      version if a newer header has taken over result_rows.
+
+        Returns:
+            bool: True if the table is ready for inserts
+        """
+        with self.db_lock:
+            if not self.conn:
+                return False
+            try:
+                if self._results_table_for(columns, activate) != RESULT_ROWS_TABLE:
+                    return True
+            except Exception as e:
+                print(f"Error switching results schema version: {e}")
+                return False
+            if not self.table_exists():
+                self.create_table(columns)
+            return self.ensure_columns_exist(columns)
+
+    def _results_table_for(self, columns, activate=True):
+        """Table a CLI header's rows go to, switching result_rows to its version if needed"""
+        key = tuple(columns)
+        table = self._write_tables.get(key)
+        if table is not None and (table == RESULT_ROWS_TABLE or not activate):
+            return table
+        if not activate:
+            version = header_version(columns)
+            for entry in load_versions(self.conn):
+                if entry["version"] == version and entry["table"] != RESULT_ROWS_TABLE:
+                    self._write_tables[key] = entry["table"]
+                    return entry["table"]
+
+        columns_def = [f'"{col}" {compact_type(col)}' for col in columns if col != "Seed"]
+        with self.write_lock:
+            switched = activate_version(self.conn, columns, columns_def)
+            if switched:
+                # Write the version catalog out now, ahead of the rows that follow;
+                # a block of it left at the end of the file would keep pruning from
+                # ever making the file shorter
+                try:
+                    self.conn.execute("CHECKPOINT")
+                except Exception as e:
+                    print(f"Could not checkpoint after switching schema version: {e}")
+        if switched:
+            print(f"Results schema version {switched}: {', '.join(columns[1:])}")
+            self._invalidate_schema_cache()
+            self.top_results.invalidate()
+            self.seen_results.reset()
+            self.result_stats.invalidate(self.conn, recheck=True)
+            if self.pruner is not None:
+                self.pruner.request(force=True)
+            if self.on_results_table_reset:
+                self.on_results_table_reset()
+        self._write_tables[key] = RESULT_ROWS_TABLE
+        return RESULT_ROWS_TABLE
+
     def create_table(self, columns):
         """Create the results table with the given columns if it doesn't exist."""
         with self.db_lock:
@@ -328,26 +728,13 @@ class DatabaseModel:
                     return True
 
                 # Create the table with a strict schema:
-                # - Seed is VARCHAR PRIMARY KEY
-                # - All other columns are INTEGER
-                columns_def = []
-                for col in columns:
-                    if col == "Seed":
-                        columns_def.append(f'"{col}" VARCHAR PRIMARY KEY')
-                    else:
-                        columns_def.append(f'"{col}" INTEGER')
+                # - The packed seed (SeedId UBIGINT) is the primary key; the results view spells it out
+                # - Other columns use the OuijaResult field widths (USMALLINT score, UTINYINT counts)
+                columns_def = [f'"{col}" {compact_type(col)}' for col in columns if col != "Seed"]
 
                 # Create the table
-                self.conn.execute(f"CREATE TABLE results ({', '.join(columns_def)});")
-
-                # Create an index on the Score column for faster sorting
-                if "Score" in columns:
-                    try:
-                        self.conn.execute(
-                            'CREATE INDEX IF NOT EXISTS idx_score ON results ("Score");'
-                        )
-                    except Exception:
-                        pass
+                create_results_schema(self.conn, columns_def)
+                self._invalidate_schema_cache()
 
                 return True
             except Exception as e:
@@ -363,10 +750,15 @@ class DatabaseModel:
                 print("[DB] No connection when ensuring columns exist.")
                 return False
 
+            # Steady state: every column is already known, skip the catalog entirely
+            if self._known_columns is not None and all(
+                    col in self._known_columns for col in columns):
+                return True
+
             try:
                 # Get current table schema
                 try:
-                    existing_cols = self.conn.execute("PRAGMA table_info(results)").fetchall()
+                    existing_cols = self.conn.execute(f"PRAGMA table_info({RESULT_ROWS_TABLE})").fetchall()
                 except Exception as e:
                     print(f"Error fetching table info: {e}")
                     # Attempt to reset connection if possible
@@ -374,7 +766,7 @@ class DatabaseModel:
                         if self.current_db_path:
                             print("[DB] Attempting to reconnect due to failed PRAGMA table_info.")
                             self.connect(self.current_db_path)
-                            existing_cols = self.conn.execute("PRAGMA table_info(results)").fetchall()
+                            existing_cols = self.conn.execute(f"PRAGMA table_info({RESULT_ROWS_TABLE})").fetchall()
                         else:
                             return False
                     except Exception as reconnect_error:
@@ -383,13 +775,15 @@ class DatabaseModel:
                 existing_col_names = [col[1] for col in existing_cols]
 
                 # Add any missing columns
+                added = False
                 for col in columns:
                     if col not in existing_col_names and col != "Seed":
                         try:
                             # Use IF NOT EXISTS to handle race conditions gracefully
                             self.conn.execute(
-                                f'ALTER TABLE results ADD COLUMN IF NOT EXISTS "{col}" INTEGER DEFAULT 0'
+                                f'ALTER TABLE {RESULT_ROWS_TABLE} ADD COLUMN IF NOT EXISTS "{col}" {compact_type(col)} DEFAULT 0'
                             )
+                            added = True
                         except Exception as col_error:
                             error_msg = str(col_error).lower()
                             # Ignore "already exists" errors - they're harmless race conditions
@@ -400,6 +794,11 @@ class DatabaseModel:
                         existing_col_names.append(col)
 
                 self.conn.commit()  # Commit after all column additions
+                if added:
+                    self.result_stats.invalidate(self.conn)  # Stored rows got the new columns' default
+                self._bump_change_token()
+                self._known_columns = set(existing_col_names)
+                self._known_columns.add("Seed")
                 return True
             except Exception as e:
                 print(f"Error ensuring columns exist: {e}")
@@ -409,6 +808,9 @@ class DatabaseModel:
     def query_results(self, sort_column="Score", descending=True, limit=1000):
         """Query results from the database, optionally sorted and limited
 
+        The default ordering (Score descending) up to TOP_RESULTS_LIMIT rows is
+        served from the in-memory top results without querying DuckDB.
+
         Args:
             sort_column: Column to sort by (default: "Score")
             descending: Sort in descending order (default: True)
@@ -418,22 +820,429 @@ class DatabaseModel:
             if not self.conn or not self.table_exists():
                 return None
 
-            try:  # Query with optional sorting, limited to top 1000 results by default
+            if sort_column == "Score" and descending and limit <= self.top_results.capacity:
+                top = self.top_results.snapshot(limit)
+                if top is None:
+                    self._load_top_results()
+                    top = self.top_results.snapshot(limit)
+                if top is not None:
+                    return top
+
+            return self._query_sorted(sort_column, descending, limit)
+
+    def query_results_after(self, after_key=None, limit=1000):
+        """Query one page of results in Score DESC, seed ASC order (keyset pagination)
+
+        Args:
+            after_key: (Score, Seed) of the last row of the previous page, None for the first page
+            limit: Maximum number of rows to return (default: 1000)
+
+        Returns:
+            pandas.DataFrame: Rows ranked right after after_key, or None on error
+        """
+        if after_key is None:
+            return self.query_results(limit=limit)
+        if not self.conn or not self.table_exists():
+            return None
+        score, seed = after_key
+        try:
+            # Own cursor, so paging never waits on db_lock
+            with self.reader_cursor() as cursor:
+                return seed_strings(cursor.execute(
+                    rows_query(f'"Score" < ? OR ("Score" = ? AND "{SEED_ID_COLUMN}" > ?::UBIGINT)',
+                               f'"Score" DESC, "{SEED_ID_COLUMN}" ASC', limit),
+                    [score, score, encode_seed(seed)],
+                ).fetch_df())
+        except Exception as e:
+            print(f"Error querying results page: {e}")
+            return None
+
+    def query_seed_range(self, first_seed, last_seed, limit=1000):
+        """Query the stored results for a run of consecutive seeds, e.g. AAAA to AAAZ
+
+        Seeds are stored packed in enumeration order, so this is an integer range scan.
+
+        Args:
+            first_seed: First seed of the run
+            last_seed: Last seed of the run (inclusive)
+            limit: Maximum number of rows to return (default: 1000)
+
+        Returns:
+            pandas.DataFrame: Matching rows in seed order, or None on error
+
+        Raises:
+            ValueError: For a malformed seed
+        """
+        low, high = seed_range(first_seed, last_seed)
+        if not self.conn or not self.table_exists():
+            return None
+        try:
+            with self.reader_cursor() as cursor:
+                return seed_strings(cursor.execute(
+                    rows_query(f'"{SEED_ID_COLUMN}" BETWEEN ?::UBIGINT AND ?::UBIGINT',
+                               f'"{SEED_ID_COLUMN}" ASC', limit),
+                    [low, high],
+                ).fetch_df())
+        except Exception as e:
+            print(f"Error querying seed range: {e}")
+            return None
+
+    def get_stored_seed_ids(self, min_score=None, all_versions=True):
+        """Ids of the stored seeds, e.g. to evaluate them again with an edited filter
+
+        Args:
+            min_score: Only seeds stored with at least this Score
+            all_versions: Include seeds only stored under retired schema versions
+
+        Returns:
+            numpy.ndarray: Distinct seed ids (uint64) in seed order; empty if there are none
+        """
+        if not self.conn or not self.table_exists():
+            return np.empty(0, dtype=np.uint64)
+        try:
+            with self.reader_cursor() as cursor:
+                tables = [entry["table"] for entry in load_versions(cursor)] if all_versions else []
+                tables = tables or [RESULT_ROWS_TABLE]
+                where = ' WHERE "Score" >= ?' if min_score is not None else ""
+                union = " UNION ".join(f'SELECT "{SEED_ID_COLUMN}" FROM {table}{where}' for table in tables)
+                params = [int(min_score)] * len(tables) if min_score is not None else []
+                ids = cursor.execute(f"{union} ORDER BY 1", params).fetchnumpy()[SEED_ID_COLUMN]
+                return np.asarray(ids, dtype=np.uint64)
+        except Exception as e:
+            print(f"Error reading stored seed ids: {e}")
+            return np.empty(0, dtype=np.uint64)
+
+    def count_results(self):
+        """Count the rows in the results table
+
+        Returns:
+            int: Number of stored results (0 if there is no table)
+        """
+        if not self.conn or not self.table_exists():
+            return 0
+        try:
+            with self.reader_cursor() as cursor:
+                return cursor.execute(f"SELECT COUNT(*) FROM {RESULT_ROWS_TABLE}").fetchone()[0]
+        except Exception as e:
+            print(f"Error counting results: {e}")
+            return 0
+
+    def get_schema_versions(self):
+        """List the results schema versions stored in the current database
+
+        Returns:
+            list: Dicts with version, columns (value columns), table, created,
+                  retired (None for the current version) and rows; current first
+        """
+        if not self.conn:
+            return []
+        try:
+            with self.reader_cursor() as cursor:
+                versions = load_versions(cursor)
+                for entry in versions:
+                    entry["rows"] = cursor.execute(f"SELECT COUNT(*) FROM {entry['table']}").fetchone()[0]
+                return versions
+        except Exception as e:
+            print(f"Error listing schema versions: {e}")
+            return []
+
+    def query_all_versions(self, sort_column="Score", descending=True, limit=1000):
+        """Query the results of every schema version together
+
+        Columns are matched by name; a Want column a version doesn't have is NULL
+        in its rows. A seed stored under several versions appears once for each.
+
+        Args:
+            sort_column: Column to sort by (default: "Score")
+            descending: Sort in descending order (default: True)
+            limit: Maximum number of results to return (default: 1000)
+
+        Returns:
+            pandas.DataFrame: Seed, SchemaVersion and the value columns, or None
+        """
+        if not self.conn:
+            return None
+        try:
+            with self.reader_cursor() as cursor:
+                union = all_versions_query(cursor)
+                if union is None:
+                    return None
                 direction = "DESC" if descending else "ASC"
-                # Sort by primary column first, then by Seed to prevent results from getting jumbled up on refresh
-                result = self.conn.execute(
-                    f'SELECT * FROM results ORDER BY "{sort_column}" {direction}, "Seed" ASC LIMIT {limit}'
-                )
-                return result.fetch_df() if result else None
-            except Exception:
-                # Silent failure, just return None
-                return None
+                order_by = (f'"{order_column(sort_column)}" {direction} NULLS LAST, '
+                            f'"{SEED_ID_COLUMN}" ASC, "{VERSION_COLUMN}" ASC')
+                return seed_strings(cursor.execute(
+                    f"SELECT * FROM ({union}) ORDER BY {order_by} LIMIT {int(limit)}").fetch_df())
+        except Exception as e:
+            print(f"Error querying all schema versions: {e}")
+            return None
+
+    def _histograms_ready(self, cursor):
+        """Make sure the histograms are current, rebuilding them (one scan) if needed"""
+        if self.result_stats.ready and self.result_stats.ensure(cursor):
+            return True
+        # Block writers while counting, so no batch is counted twice or missed
+        with self.write_lock:
+            return self.result_stats.ensure(cursor)
+
+    def get_histogram(self, column="Score"):
+        """Get the number of stored results per value of a column
+
+        Args:
+            column: "Score" or a want column
+
+        Returns:
+            pandas.DataFrame: Value, Rows in value order, or None if unavailable
+        """
+        if not self.conn or not self.table_exists():
+            return None
+        try:
+            with self.reader_cursor() as cursor:
+                if not self._histograms_ready(cursor):
+                    return None
+                return read_histogram(cursor, column)
+        except Exception as e:
+            print(f"Error reading histogram: {e}")
+            return None
+
+    def get_score_cutoffs(self):
+        """Get the number of stored results at or above each score
+
+        Returns:
+            pandas.DataFrame: Score, Rows, Rows At Or Above (best score first), or None
+        """
+        if not self.conn or not self.table_exists():
+            return None
+        try:
+            with self.reader_cursor() as cursor:
+                if not self._histograms_ready(cursor):
+                    return None
+                return read_score_cutoffs(cursor)
+        except Exception as e:
+            print(f"Error reading score cutoffs: {e}")
+            return None
+
+    def count_results_at_or_above(self, score):
+        """Count the stored results scoring at least score, without scanning them
+
+        Returns:
+            int: Number of results (0 if unavailable)
+        """
+        if not self.conn or not self.table_exists():
+            return 0
+        try:
+            with self.reader_cursor() as cursor:
+                if not self._histograms_ready(cursor):
+                    return 0
+                return rows_at_or_above(cursor, score)
+        except Exception as e:
+            print(f"Error counting results above {score}: {e}")
+            return 0
+
+    def suggest_cutoff(self, max_rows):
+        """Lowest score whose results at or above it number at most max_rows
+
+        Returns:
+            int: Suggested cutoff score, or None if unavailable
+        """
+        if not self.conn or not self.table_exists():
+            return None
+        try:
+            with self.reader_cursor() as cursor:
+                if not self._histograms_ready(cursor):
+                    return None
+                return cutoff_for_rows(cursor, max_rows)
+        except Exception as e:
+            print(f"Error suggesting a cutoff: {e}")
+            return None
+
+    def auto_cutoff_floor(self):
+        """Lowest score a new result needs to get into the results table's top rows
+
+        Read from the histograms only while they are current, so the caller (the
+        UI thread starting a search) never waits on a rebuild scan.
+
+        Returns:
+            int: Score, or None if unknown or the table isn't full yet
+        """
+        if not self.conn or not self.result_stats.ready:
+            return None
+        try:
+            with self.reader_cursor() as cursor:
+                if rows_at_or_above(cursor, 0) < self.TOP_RESULTS_LIMIT:
+                    return None
+                return cutoff_for_rows(cursor, self.TOP_RESULTS_LIMIT)
+        except Exception as e:
+            print(f"Error reading the auto cutoff floor: {e}")
+            return None
+
+    def save_search_checkpoints(self, checkpoints, conn=None):
+        """Record how far searches of the current config got, and what they covered
+
+        Args:
+            checkpoints: Dicts from SearchRun.checkpoint()
+            conn: Optional writer cursor, see insert_results()
+
+        Returns:
+            bool: True if the checkpoints were saved
+        """
+        if not checkpoints:
+            return True
+        try:
+            if conn is not None:
+                save_checkpoints(conn, checkpoints)
+                record_checkpoints(conn, checkpoints)
+                return True
+            with self.db_lock:
+                if not self.conn:
+                    return False
+                save_checkpoints(self.conn, checkpoints)
+                record_checkpoints(self.conn, checkpoints)
+                return True
+        except Exception as e:
+            print(f"Error saving search checkpoints: {e}")
+            return False
+
+    def get_search_checkpoints(self):
+        """List the checkpoints of every search of the current config
+
+        Returns:
+            list: Dicts from load_checkpoints(), most recently updated first
+        """
+        if not self.conn:
+            return []
+        try:
+            with self.reader_cursor() as cursor:
+                return load_checkpoints(cursor)
+        except Exception as e:
+            print(f"Error reading search checkpoints: {e}")
+            return []
+
+    def get_resume_checkpoint(self):
+        """Checkpoint of the most recently updated search that can be resumed
+
+        Returns:
+            dict: Checkpoint with next_seed and remaining, or None if there is nothing to resume
+        """
+        return next((c for c in self.get_search_checkpoints() if c["next_seed"] is not None), None)
+
+    def get_search_coverage(self, config_hash, template=None):
+        """Get how much of the seed space a filter has searched in the current database
+
+        Args:
+            config_hash: config_hash() of the filter
+            template: Filter template the searches ran with
+
+        Returns:
+            dict: ranges, seeds_covered, seed_space, percent_covered and largest_gap
+        """
+        ranges = []
+        if self.conn:
+            try:
+                with self.reader_cursor() as cursor:
+                    ranges = load_ranges(cursor, config_hash, template)
+            except Exception as e:
+                print(f"Error reading search coverage: {e}")
+        return summarize(ranges)
+
+    def pick_search_gap(self, config_hash, template=None, seeds=None):
+        """Pick a start seed in the largest range a filter hasn't searched yet
+
+        Args:
+            config_hash: config_hash() of the filter
+            template: Filter template the searches ran with
+            seeds: Seeds the next run wants to search (None: the whole gap)
+
+        Returns:
+            tuple: (start seed, seed count capped at the gap), or None if everything was searched
+        """
+        ranges = []
+        if self.conn:
+            try:
+                with self.reader_cursor() as cursor:
+                    ranges = load_ranges(cursor, config_hash, template)
+            except Exception as e:
+                print(f"Error reading search coverage: {e}")
+        return pick_gap(ranges, seeds)
+
+    def _query_sorted(self, sort_column, descending, limit):
+        """Run the sorted, limited query against DuckDB"""
+        try:  # Query with optional sorting, limited to top 1000 results by default
+            direction = "DESC" if descending else "ASC"
+            # Sort by primary column first, then by seed to prevent results from getting jumbled up on refresh
+            order_by = f'"{order_column(sort_column)}" {direction}, "{SEED_ID_COLUMN}" ASC'
+            with self.reader_cursor() as cursor:
+                result = cursor.execute(rows_query(order_by=order_by, limit=limit))
+                return seed_strings(result.fetch_df()) if result else None
+        except Exception:
+            # Silent failure, just return None
+            return None
+
+    def _load_top_results(self):
+        """(Re)load the in-memory top results from the database"""
+        with self.db_lock:
+            self.top_results.begin_load()
+            frame = None
+            if self.conn and self.table_exists():
+                frame = self._query_sorted("Score", True, self.top_results.capacity)
+            self.top_results.finish_load(frame)
+
+    def get_results_delta(self, since_version=None):
+        """Get the changes to the top results since a reader's last fetch
+
+        Args:
+            since_version: Version returned by the reader's previous call, or None
+
+        Returns:
+            tuple: (version, rows, is_delta) as returned by TopResults.changes_since();
+                   rows is None if there is no results table
+        """
+        with self.db_lock:
+            if not self.conn or not self.table_exists():
+                return None, None, False
+            version, rows, is_delta = self.top_results.changes_since(since_version)
+            if rows is None:
+                self._load_top_results()
+                version, rows, is_delta = self.top_results.changes_since(since_version)
+            return version, rows, is_delta
 
     def get_dataframe(self):
         """Get results as a pandas DataFrame"""
         with self.db_lock:
             return self.query_results()
 
+    def start_export(self, file_path, export_format=None, sort_column="Score", descending=True,
+                     min_score=None, limit=None, on_done=None):
+        """Export the results table on a worker thread with DuckDB COPY
+
+        Args:
+            file_path: Path where the file will be saved
+            export_format: "csv", "parquet" or "json" (default: from the file extension)
+            sort_column: Column to sort by, or None for storage order
+            descending: Sort in descending order
+            min_score: Only export results with at least this score (None for all)
+            limit: Maximum number of rows to export (None for all)
+            on_done: Optional callback receiving the ExportJob when it finishes (worker thread)
+
+        Returns:
+            ExportJob: The running export, or None if there is nothing to export
+
+        Raises:
+            ValueError: For an unknown export format
+        """
+        if not self.conn or not self.table_exists():
+            return None
+        export_format = export_format or export_format_for_path(file_path)
+        statement = build_copy_statement(file_path, export_format, sort_column, descending, min_score, limit)
+        return ExportJob(file_path, export_format, statement).start(self, on_done)
+
+    def _export(self, file_path, export_format, limit):
+        """Run an export to completion on the calling thread"""
+        job = self.start_export(file_path, export_format, limit=limit)
+        if job is None:
+            return False
+        job.wait()
+        return job.status == "done" and job.rows > 0
+
     def export_to_csv(self, file_path, limit=None):
         """Export results to CSV file
         
@@ -444,16 +1253,19 @@ class DatabaseModel:
         Returns:
             bool: True if successful, False otherwise
         """
-        with self.db_lock:
-            try:
-                df = self.query_results(limit=limit or 10000)  # Default to 10k if no limit
-                if df is not None and not df.empty:
-                    df.to_csv(file_path, index=False)
-                    return True
-                return False
-            except Exception as e:
-                print(f"Error exporting to CSV: {e}")
-                return False
+        return self._export(file_path, "csv", limit)
+
+    def export_to_parquet(self, file_path, limit=None):
+        """Export results to Parquet file
+
+        Args:
+            file_path: Path where Parquet file will be saved
+            limit: Maximum number of rows to export (None for all)
+
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        return self._export(file_path, "parquet", limit)
 
     def export_to_excel(self, file_path, limit=None):
         """Export results to Excel file
@@ -479,7 +1291,7 @@ class DatabaseModel:
                 return False
 
     def export_to_json(self, file_path, limit=None):
-        """Export results to JSON file
+        """Export results to newline-delimited JSON file
         
         Args:
             file_path: Path where JSON file will be saved
@@ -488,16 +1300,7 @@ class DatabaseModel:
         Returns:
             bool: True if successful, False otherwise
         """
-        with self.db_lock:
-            try:
-                df = self.query_results(limit=limit or 10000)  # Default to 10k if no limit
-                if df is not None and not df.empty:
-                    df.to_json(file_path, orient='records', indent=2)
-                    return True
-                return False
-            except Exception as e:
-                print(f"Error exporting to JSON: {e}")
-                return False
+        return self._export(file_path, "json", limit)
 
     def get_export_stats(self):
         """Get statistics about exportable data
@@ -510,11 +1313,12 @@ class DatabaseModel:
                 if not self.conn or not self.table_exists():
                     return {"total_rows": 0, "columns": []}
 
-                # Get row count
-                row_count = self.conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+                with self.reader_cursor() as cursor:
+                    # Get row count
+                    row_count = cursor.execute(f"SELECT COUNT(*) FROM {RESULT_ROWS_TABLE}").fetchone()[0]
 
-                # Get column names
-                columns = self.conn.execute("PRAGMA table_info(results)").fetchall()
+                    # Get column names
+                    columns = cursor.execute("PRAGMA table_info(results)").fetchall()
                 column_names = [col[1] for col in columns]
 
                 return {
@@ -0,0 +1,356 @@
+"""
+Federated Results - Read-only queries across every config's results database
+"""
+
+import glob
+import os
+import threading
+
+import duckdb
+import pandas as pd
+
+from models.connection_manager import connection_manager
+from models.result_schema import RESULT_ROWS_TABLE, RESULTS_VIEW, SEED_ID_COLUMN, VALID_SEED_PATTERN, seed_strings
+from models.seed_codec import create_seed_macros
+
+# Union of every config's results: config, SeedId, Score, Seed
+ALL_RESULTS_VIEW = "all_results"
+
+# Catalog names DuckDB reserves for itself
+RESERVED_ALIASES = {"memory", "system", "temp", "main"}
+
+
+def config_name_for_path(db_path):
+    """Config name behind a database file (egg.ouija.duckdb -> egg)"""
+    name = os.path.basename(db_path)
+    for suffix in (".ouija.duckdb", ".duckdb"):
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def file_signature(db_path):
+    """(size, mtime) of a database file and its WAL; changes whenever DuckDB writes it"""
+    signature = []
+    for path in (db_path, db_path + ".wal"):
+        try:
+            stat = os.stat(path)
+            signature.append((stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            signature.append(None)
+    return tuple(signature)
+
+
+def _quote(identifier):
+    """Quote an SQL identifier"""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _literal(value):
+    """Quote an SQL string literal"""
+    return "'" + value.replace("'", "''") + "'"
+
+
+class FederatedResults:
+    """Every results database in a directory behind one read-only DuckDB connection
+
+    Each <config>.ouija.duckdb file is ATTACHed READ_ONLY under its config name,
+    so its rows can be queried as <config>.result_rows or <config>.results, and
+    all_results unions config, SeedId, Score and Seed across every config.
+
+    DuckDB allows a file to be attached by only one database in the process, so
+    files the app has open for writing are read through the app's shared
+    connection instead and copied into an in-memory schema of the same name. In
+    turn the attached files are detached whenever the app is about to open one
+    (ConnectionManager release hook).
+
+    refresh() runs before every query but only re-reads files whose size or
+    mtime (including the WAL) changed since the last refresh; the per-database
+    catalog (row count, max score, columns) is cached the same way.
+    """
+
+    def __init__(self, db_dir):
+        """Initialize the query layer; nothing is attached until the first query
+
+        Args:
+            db_dir: Directory holding the .duckdb files (DatabaseModel.DB_DIR)
+        """
+        self.db_dir = db_dir
+        self._lock = threading.RLock()
+        self._conn = None
+        self._sources = {}  # normalized path -> {"alias", "signature", "kind", "entry"}
+        self._stale = True  # Rebuild all_results on the next refresh
+        connection_manager.add_release_hook(self.release)
+
+        # Counters
+        self.refreshes = 0
+        self.reads = 0  # Files (re)attached or copied
+
+    def refresh(self):
+        """Bring the attached set up to date with the files in db_dir
+
+        Returns:
+            bool: True if any database was added, removed or re-read
+        """
+        with self._lock:
+            if self._conn is None:
+                self._conn = duckdb.connect()
+                create_seed_macros(self._conn)
+            self.refreshes += 1
+            paths = {}
+            for db_path in sorted(glob.glob(os.path.join(self.db_dir, "*.duckdb"))):
+                paths[os.path.normcase(os.path.abspath(db_path))] = db_path
+
+            changed = False
+            for key in list(self._sources):
+                if key not in paths:
+                    self._drop(key)
+                    changed = True
+            for key, db_path in paths.items():
+                signature = file_signature(db_path)
+                source = self._sources.get(key)
+                is_open = connection_manager.is_open(db_path)
+                kind = "copy" if is_open else "attach"
+                if source is not None and source["signature"] == signature and source["kind"] == kind:
+                    continue
+                if source is not None:
+                    self._drop(key)
+                try:
+                    self._read(key, db_path, signature, kind)
+                except Exception as e:
+                    # Locked by another process, corrupt, mid-write: leave it out until it changes
+                    # (a copy that failed is retried, the file may just have been closed)
+                    print(f"Federated results: skipping {os.path.basename(db_path)} ({e})")
+                    self._sources[key] = {"alias": None, "signature": signature,
+                                          "kind": kind if kind == "attach" else None,
+                                          "entry": self._entry(db_path, None, error=str(e))}
+                changed = True
+
+            if changed or self._stale:
+                self._build_view()
+            return changed
+
+    def release(self, db_path):
+        """Detach a file so it can be opened for writing (ConnectionManager release hook)"""
+        key = os.path.normcase(os.path.abspath(db_path))
+        with self._lock:
+            source = self._sources.get(key)
+            if source is not None and source["kind"] == "attach":
+                self._drop(key)
+                self._build_view()
+
+    def catalog(self):
+        """Get row counts and max scores per database
+
+        Returns:
+            list: One dict per database file (config, database_path, rows,
+                  max_score, columns, source and error), by config name
+        """
+        with self._lock:
+            self.refresh()
+            return sorted([dict(source["entry"]) for source in self._sources.values()],
+                          key=lambda entry: entry["config"])
+
+    def configs(self):
+        """Names of the configs whose results can be queried"""
+        return [entry["config"] for entry in self.catalog() if entry["error"] is None]
+
+    def query(self, sql, params=None):
+        """Run a read-only query over the attached databases and all_results
+
+        SeedId columns in the result are replaced by their Seed strings.
+
+        Returns:
+            pandas.DataFrame: Query result
+        """
+        with self._lock:
+            self.refresh()
+            frame = self._conn.execute(sql, params or []).fetch_df()
+        if SEED_ID_COLUMN in frame.columns and "Seed" not in frame.columns:
+            frame = seed_strings(frame)
+        return frame
+
+    def seeds_across(self, configs=None, min_score=0, min_configs=2, limit=1000):
+        """Seeds found by several configs, best combined score first
+
+        Args:
+            configs: Config names to join (default: every config)
+            min_score: Only count a config's result if it scores at least this much
+            min_configs: Minimum number of configs a seed must appear in
+            limit: Maximum number of seeds
+
+        Returns:
+            pandas.DataFrame: Seed, Configs, Total Score, Min Score and one score
+                              column per config (NULL where it didn't find the seed)
+        """
+        with self._lock:
+            self.refresh()
+            available = list(self._aliases_by_config())
+            configs = [name for name in (configs or available) if name in available]
+            if not configs:
+                return self._empty_across(configs)
+            # Rank on the grouped totals first, then spread only the top seeds out per config
+            seed_id = f'"{SEED_ID_COLUMN}"'
+            where = f'r.config IN ({", ".join([_literal(name) for name in configs])}) AND r."Score" >= ?'
+            per_config = ", ".join([f'MAX(r."Score") FILTER (WHERE r.config = {_literal(name)}) AS {_quote(name)}'
+                                    for name in configs])
+            order = f'"Configs" DESC, "Total Score" DESC, {seed_id} ASC'
+            sql = (
+                f'WITH top AS (SELECT r.{seed_id}, COUNT(*) AS "Configs", '
+                f'CAST(SUM(r."Score") AS BIGINT) AS "Total Score", MIN(r."Score") AS "Min Score" '
+                f'FROM {ALL_RESULTS_VIEW} r WHERE {where} GROUP BY r.{seed_id} HAVING COUNT(*) >= ? '
+                f'ORDER BY {order} LIMIT {int(limit)}) '
+                f'SELECT top.{seed_id}, any_value(top."Configs") AS "Configs", '
+                f'any_value(top."Total Score") AS "Total Score", any_value(top."Min Score") AS "Min Score", '
+                f'{per_config} FROM top JOIN {ALL_RESULTS_VIEW} r ON r.{seed_id} = top.{seed_id} '
+                f'WHERE {where} GROUP BY top.{seed_id} ORDER BY {order}'
+            )
+            params = [int(min_score), int(min_configs), int(min_score)]
+            frame = self._conn.execute(sql, params).fetch_df()
+        return seed_strings(frame)
+
+    def close(self):
+        """Detach everything and stop listening for files being opened"""
+        connection_manager.remove_release_hook(self.release)
+        with self._lock:
+            if self._conn is not None:
+                try:
+                    self._conn.close()
+                except Exception as e:
+                    print(f"Error closing federated results: {e}")
+            self._conn = None
+            self._sources.clear()
+            self._stale = True
+
+    def _read(self, key, db_path, signature, kind):
+        """Attach (or, if the app has it open, copy) one database; caller holds the lock"""
+        alias = self._alias_for(config_name_for_path(db_path))
+        entry = self._entry(db_path, alias)
+        entry["source"] = kind
+        source = {"alias": alias, "signature": signature, "kind": kind, "entry": entry, "rows_source": None}
+        if kind == "attach":
+            self._conn.execute(f"ATTACH {_literal(db_path)} AS {_quote(alias)} (READ_ONLY)")
+        # Registered before reading so a failure below still detaches it
+        self._sources[key] = source
+        self.reads += 1
+        try:
+            if kind == "attach":
+                source["rows_source"] = self._rows_source(self._conn, alias)
+            else:
+                source["rows_source"] = self._copy_open(db_path, alias)
+            if source["rows_source"] is not None:
+                entry["rows"], entry["max_score"] = self._conn.execute(
+                    f'SELECT COUNT(*), MAX("Score") FROM ({source["rows_source"]})').fetchone()
+                entry["columns"] = self._columns(alias, kind)
+        except Exception:
+            self._drop(key)
+            raise
+
+    def _copy_open(self, db_path, alias):
+        """Copy a database the app has open into an in-memory schema; caller holds the lock"""
+        with connection_manager.borrow_cursor(db_path) as cursor:
+            if cursor is None:
+                raise RuntimeError("database was closed while reading it")
+            tables = {row[0] for row in cursor.execute(
+                "SELECT table_name FROM information_schema.tables WHERE table_schema = current_schema()").fetchall()}
+            if RESULT_ROWS_TABLE not in tables:
+                return None
+            frame = cursor.execute(f"SELECT * FROM {RESULT_ROWS_TABLE}").fetch_df()
+        schema = _quote(alias)
+        self._conn.execute(f"CREATE SCHEMA IF NOT EXISTS {schema}")
+        self._conn.register("_federated_copy", frame)
+        try:
+            self._conn.execute(f"CREATE OR REPLACE TABLE {schema}.{RESULT_ROWS_TABLE} AS "
+                               f"SELECT * FROM _federated_copy")
+        finally:
+            self._conn.unregister("_federated_copy")
+        self._conn.execute(f'CREATE OR REPLACE VIEW {schema}.{RESULTS_VIEW} AS '
+                           f'SELECT ouija_seed("{SEED_ID_COLUMN}") AS "Seed", * EXCLUDE ("{SEED_ID_COLUMN}") '
+                           f'FROM {schema}.{RESULT_ROWS_TABLE}')
+        return f'SELECT "{SEED_ID_COLUMN}", "Score" FROM {schema}.{RESULT_ROWS_TABLE}'
+
+    def _columns(self, alias, kind):
+        """Result columns (Seed first) of an attached or copied database"""
+        where = f"table_catalog = {_literal(alias)}" if kind == "attach" else f"table_schema = {_literal(alias)}"
+        rows = self._conn.execute(
+            f"SELECT table_name, column_name FROM information_schema.columns WHERE {where} "
+            f"AND table_name IN ('{RESULT_ROWS_TABLE}', '{RESULTS_VIEW}') ORDER BY ordinal_position").fetchall()
+        table = RESULT_ROWS_TABLE if any(name == RESULT_ROWS_TABLE for name, _ in rows) else RESULTS_VIEW
+        return ["Seed"] + [column for name, column in rows
+                           if name == table and column not in ("Seed", SEED_ID_COLUMN)]
+
+    @staticmethod
+    def _rows_source(conn, alias):
+        """SELECT of SeedId and Score for an attached database, or None if it has no results"""
+        tables = dict(conn.execute(
+            "SELECT table_name, table_type FROM information_schema.tables "
+            f"WHERE table_catalog = {_literal(alias)}").fetchall())
+        catalog = _quote(alias)
+        if RESULT_ROWS_TABLE in tables:
+            return f'SELECT "{SEED_ID_COLUMN}", "Score" FROM {catalog}.{RESULT_ROWS_TABLE}'
+        if tables.get(RESULTS_VIEW) == "BASE TABLE":
+            # Not migrated yet (the app does that when it opens the file); pack seeds on the fly
+            return (f'SELECT ouija_seed_id(upper("Seed")) AS "{SEED_ID_COLUMN}", "Score" '
+                    f'FROM {catalog}.{RESULTS_VIEW} '
+                    f"WHERE regexp_full_match(upper(\"Seed\"), '{VALID_SEED_PATTERN}')")
+        return None
+
+    def _alias_for(self, config):
+        """Catalog/schema name for a config, unique among the current sources"""
+        alias = config if config.lower() not in RESERVED_ALIASES else f"{config}_results"
+        taken = {source["alias"] for source in self._sources.values() if source["alias"]}
+        base, suffix = alias, 2
+        while alias in taken:
+            alias, suffix = f"{base}_{suffix}", suffix + 1
+        return alias
+
+    def _drop(self, key):
+        """Detach or drop one source; caller holds the lock"""
+        source = self._sources.pop(key, None)
+        self._stale = True
+        if source is None or source["alias"] is None or self._conn is None:
+            return
+        try:
+            if source["kind"] == "attach":
+                self._conn.execute(f"DETACH {_quote(source['alias'])}")
+            else:
+                self._conn.execute(f"DROP SCHEMA IF EXISTS {_quote(source['alias'])} CASCADE")
+        except Exception as e:
+            print(f"Federated results: error dropping {source['alias']}: {e}")
+
+    def _aliases_by_config(self):
+        """Config name -> alias of every readable source; caller holds the lock"""
+        return {source["entry"]["config"]: source["alias"] for source in self._sources.values()
+                if source.get("rows_source")}
+
+    def _build_view(self):
+        """(Re)create all_results over the current sources; caller holds the lock"""
+        parts = [f"SELECT {_literal(source['entry']['config'])} AS config, * FROM ({source['rows_source']})"
+                 for source in sorted(self._sources.values(), key=lambda s: s["entry"]["config"])
+                 if source.get("rows_source")]
+        if not parts:
+            parts = [f'SELECT NULL::VARCHAR AS config, NULL::UBIGINT AS "{SEED_ID_COLUMN}", '
+                     f'NULL::USMALLINT AS "Score" WHERE false']
+        union = " UNION ALL ".join(parts)
+        self._conn.execute(f'CREATE OR REPLACE VIEW {ALL_RESULTS_VIEW} AS '
+                           f'SELECT *, ouija_seed("{SEED_ID_COLUMN}") AS "Seed" FROM ({union})')
+        self._stale = False
+
+    @staticmethod
+    def _entry(db_path, alias, error=None):
+        """Blank catalog entry for a database file"""
+        return {
+            "config": config_name_for_path(db_path),
+            "alias": alias,
+            "database_path": db_path,
+            "rows": 0,
+            "max_score": None,
+            "columns": [],
+            "source": None,
+            "error": error,
+        }
+
+    @staticmethod
+    def _empty_across(configs):
+        """Empty seeds_across() result"""
+        return pd.DataFrame(columns=["Seed", "Configs", "Total Score", "Min Score"] + list(configs))
@@ -0,0 +1,74 @@
+"""
+Result Codec - Decodes binary OuijaHostResult frames written by Ouija-CLI --binary
+"""
+
+import numpy as np
+import pandas as pd
+
+# Must match MAX_DESIRES_HOST in Ouija-cli/lib/ouija_host_result.h
+MAX_DESIRES_HOST = 32
+
+# Mirrors OuijaHostResult in Ouija-cli/lib/ouija_host_result.h (46 bytes, little-endian)
+OUIJA_HOST_RESULT_DTYPE = np.dtype([
+    ("seed", "S9"),                        # Bytes 0-8
+    ("padding", "u1"),                     # Byte 9
+    ("TotalScore", "<u2"),                 # Bytes 10-11
+    ("NaturalNegativeJokers", "u1"),       # Byte 12
+    ("DesiredNegativeJokers", "u1"),       # Byte 13
+    ("ScoreWants", "u1", (MAX_DESIRES_HOST,)),  # Bytes 14 onwards
+])
+
+RECORD_SIZE = OUIJA_HOST_RESULT_DTYPE.itemsize
+
+# Frame header line written before each batch: b"#BIN <count> <record_size>\n"
+FRAME_MARKER = b"#BIN "
+
+# CLI header names for the optional negative joker counters
+NATURAL_NEGATIVES_COLUMN = "Natural Negative Jokers"
+DESIRED_NEGATIVES_COLUMN = "Desired Negative Jokers"
+
+
+def parse_frame_header(line):
+    """Parse a '#BIN <count> <record_size>' frame header line
+
+    Returns:
+        tuple: (record count, record size) or None if the line is not a frame header
+    """
+    if not line.startswith(FRAME_MARKER):
+        return None
+    try:
+        count, record_size = line[len(FRAME_MARKER):].split()
+        return int(count), int(record_size)
+    except ValueError:
+        return None
+
+
+def decode_results(payload, columns):
+    """Decode a frame payload into a DataFrame laid out like the CLI header
+
+    Args:
+        payload: Raw bytes holding packed OuijaHostResult records
+        columns: CLI header columns (Seed, Score, optional negative counters, wants...)
+
+    Returns:
+        pandas.DataFrame: One column per header entry; Seed as str, the rest as integers
+    """
+    records = np.frombuffer(payload, dtype=OUIJA_HOST_RESULT_DTYPE)
+    data = {}
+    want_index = 0
+    for i, col in enumerate(columns):
+        if i == 0:
+            data[col] = records["seed"].astype(str)
+        elif i == 1:
+            data[col] = records["TotalScore"].astype(np.int32)
+        elif col == NATURAL_NEGATIVES_COLUMN:
+            data[col] = records["NaturalNegativeJokers"].astype(np.int32)
+        elif col == DESIRED_NEGATIVES_COLUMN:
+            data[col] = records["DesiredNegativeJokers"].astype(np.int32)
+        else:
+            if want_index < MAX_DESIRES_HOST:
+                data[col] = records["ScoreWants"][:, want_index].astype(np.int32)
+            else:
+                data[col] = np.zeros(len(records), dtype=np.int32)
+            want_index += 1
+    return pd.DataFrame(data, columns=list(columns))
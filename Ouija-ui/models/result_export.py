@@ -0,0 +1,213 @@
+"""
+Result Export - Streams the results table to CSV, Parquet or JSON with DuckDB COPY
+"""
+
+import threading
+import time
+
+from models.result_schema import SEED_ID_COLUMN, order_column, results_query
+
+# COPY options per export format; rows never pass through Python
+EXPORT_FORMATS = {
+    "csv": "FORMAT CSV, HEADER",
+    # DuckDB writes min/max/null-count statistics for every column chunk
+    "parquet": "FORMAT PARQUET, COMPRESSION ZSTD",
+    # Newline-delimited JSON, one object per result
+    "json": "FORMAT JSON",
+}
+
+# File extensions that pick a format when none is given
+EXPORT_EXTENSIONS = {
+    ".csv": "csv",
+    ".parquet": "parquet",
+    ".json": "json",
+    ".jsonl": "json",
+    ".ndjson": "json",
+}
+
+
+def export_format_for_path(file_path, default="csv"):
+    """Guess the export format from a file name
+
+    Args:
+        file_path: Target file path
+        default: Format to use for unknown extensions
+
+    Returns:
+        str: One of EXPORT_FORMATS
+    """
+    lowered = file_path.lower()
+    for extension, export_format in EXPORT_EXTENSIONS.items():
+        if lowered.endswith(extension):
+            return export_format
+    return default
+
+
+def build_copy_statement(file_path, export_format="csv", sort_column="Score", descending=True,
+                         min_score=None, limit=None):
+    """Build the COPY ... TO statement for an export
+
+    Args:
+        file_path: Target file path
+        export_format: "csv", "parquet" or "json"
+        sort_column: Column to sort by, or None to export in storage order (fastest)
+        descending: Sort in descending order
+        min_score: Only export results with at least this score (None for all)
+        limit: Maximum number of rows (None for all)
+
+    Returns:
+        str: SQL statement
+
+    Raises:
+        ValueError: For an unknown export format
+    """
+    options = EXPORT_FORMATS.get(export_format.lower())
+    if options is None:
+        raise ValueError(f"Unsupported export format: {export_format}")
+
+    where = f'"Score" >= {int(min_score)}' if min_score is not None else None
+    order_by = None
+    if sort_column:
+        direction = "DESC" if descending else "ASC"
+        # The packed seed breaks ties so exports match the results table order
+        order_by = f'"{order_column(sort_column)}" {direction}, "{SEED_ID_COLUMN}" ASC'
+    query = results_query(where, order_by, limit)
+
+    target = file_path.replace("'", "''")
+    return f"COPY ({query}) TO '{target}' ({options})"
+
+
+class ExportJob:
+    """One export running on a worker thread"""
+
+    def __init__(self, file_path, export_format, statement):
+        """Initialize the job
+
+        Args:
+            file_path: Target file path
+            export_format: Format being written
+            statement: COPY statement to run
+        """
+        self.file_path = file_path
+        self.export_format = export_format
+        self.statement = statement
+        self.status = "running"  # running, done, failed, cancelled
+        self.rows = 0
+        self.error = None
+        self.start_time = time.time()
+        self.end_time = None
+        self.finished = threading.Event()
+        self._cursor = None
+        self._cancel_requested = False
+
+    @property
+    def is_running(self):
+        """Whether the export has not finished yet"""
+        return not self.finished.is_set()
+
+    @property
+    def duration(self):
+        """Seconds since the export started, or its total run time once finished"""
+        return (self.end_time or time.time()) - self.start_time
+
+    def progress(self):
+        """Percentage done as reported by DuckDB (0-100), or None if unknown"""
+        if self.status == "done":
+            return 100.0
+        cursor = self._cursor
+        if cursor is None or not self.is_running:
+            return None
+        try:
+            value = cursor.query_progress()
+        except Exception:
+            return None
+        return value if value >= 0 else None
+
+    def cancel(self):
+        """Interrupt the export; the partially written file is left to the caller"""
+        self._cancel_requested = True
+        cursor = self._cursor
+        if cursor is not None and self.is_running:
+            try:
+                cursor.interrupt()
+            except Exception as e:
+                print(f"Error cancelling export: {e}")
+
+    def wait(self, timeout=None):
+        """Block until the export has finished
+
+        Returns:
+            bool: True if the export finished before the timeout
+        """
+        return self.finished.wait(timeout)
+
+    def run(self, cursor, on_done=None):
+        """Run the COPY on the calling thread (ExportJob.start() runs it on a worker)
+
+        Args:
+            cursor: Cursor owned by this export
+            on_done: Optional callback receiving the job when it finishes
+        """
+        self._cursor = cursor
+        try:
+            if self._cancel_requested:
+                raise InterruptedError("Export cancelled")
+            # Progress is only tracked when the progress bar is enabled; never print it
+            cursor.execute("SET enable_progress_bar = true")
+            cursor.execute("SET enable_progress_bar_print = false")
+            result = cursor.execute(self.statement).fetchone()
+            self.rows = int(result[0]) if result else 0
+            self.status = "done"
+        except Exception as e:
+            if self._cancel_requested:
+                self.status = "cancelled"
+            else:
+                self.status = "failed"
+                self.error = str(e)
+                print(f"Error exporting results to {self.file_path}: {e}")
+        finally:
+            self.end_time = time.time()
+            self._cursor = None
+            self.finished.set()
+        if on_done:
+            try:
+                on_done(self)
+            except Exception as e:
+                print(f"Error in export callback: {e}")
+
+    def start(self, db_model, on_done=None):
+        """Run the export on a daemon worker thread with its own cursor
+
+        Args:
+            db_model: Connected DatabaseModel to export from
+            on_done: Optional callback receiving the job when it finishes (worker thread)
+
+        Returns:
+            ExportJob: self
+        """
+        def worker():
+            with db_model.reader_cursor() as cursor:
+                if cursor is None:
+                    self.status = "failed"
+                    self.error = "Database is not connected"
+                    self.end_time = time.time()
+                    self.finished.set()
+                    if on_done:
+                        on_done(self)
+                    return
+                self.run(cursor, on_done)
+
+        threading.Thread(target=worker, daemon=True, name="OuijaExport").start()
+        return self
+
+    def format_status(self):
+        """Format the job state for the status bar"""
+        if self.status == "done":
+            return f"Exported {self.rows:,} results to {self.file_path} in {self.duration:.1f}s"
+        if self.status == "cancelled":
+            return "Export cancelled"
+        if self.status == "failed":
+            return f"Export failed: {self.error}"
+        progress = self.progress()
+        percent = f" {progress:.0f}%" if progress is not None else ""
+        return f"Exporting {self.export_format.upper()}{percent} ({self.duration:.1f}s)..."
@@ -0,0 +1,480 @@
+"""
+Result Ingest - Buffers parsed CLI result rows and writes them to the database in bulk
+"""
+
+import queue
+import threading
+import time
+
+import pandas as pd
+
+from models.cli_stream import parse_result_block
+
+
+class ResultIngestBuffer:
+    """Collects CLI result batches and flushes them as one bulk upsert
+
+    Text result blocks stay raw bytes until the flush, so a whole batch is parsed
+    with a single parse_result_block call. A flush happens when the buffer holds
+    max_rows rows or when max_interval_ms has passed since the last flush,
+    whichever comes first.
+    """
+
+    def __init__(self, db_model, columns, max_rows=5000, max_interval_ms=250, conn=None):
+        """Initialize the ingest buffer
+
+        Args:
+            db_model: DatabaseModel used for the bulk writes
+            columns: Column names from the CLI header (Seed first)
+            max_rows: Flush once this many rows are buffered
+            max_interval_ms: Flush once this much time has passed since the last flush
+            conn: Optional writer cursor; writes through it bypass db_model.db_lock
+        """
+        self.db_model = db_model
+        self.conn = conn
+        self.columns = list(columns)
+        self.max_rows = max_rows
+        self.max_interval = max_interval_ms / 1000.0
+        self._parts = []  # ("block", [bytes, ...]) or ("frame", DataFrame) in arrival order
+        self._pending_rows = 0
+        self._lock = threading.Lock()
+        self._last_flush_time = time.monotonic()
+
+        # Throughput tracking
+        self.rows_written = 0
+        self.rows_failed = 0
+        self.flush_count = 0
+        self.write_seconds = 0.0
+        self._first_row_time = None
+
+    def add_block(self, block):
+        """Buffer a block of '|'-stripped result lines"""
+        self._add("block", block, block.count(b"\n"))
+
+    def add_frame(self, frame):
+        """Buffer an already-columnar batch (e.g. a decoded binary frame)"""
+        self._add("frame", frame, len(frame))
+
+    def _add(self, kind, data, rows):
+        """Append one part to the buffer; the owner flushes once should_flush() says so"""
+        with self._lock:
+            if self._first_row_time is None:
+                self._first_row_time = time.monotonic()
+            if kind == "block" and self._parts and self._parts[-1][0] == "block":
+                # Adjacent text blocks are parsed together
+                self._parts[-1][1].append(data)
+            else:
+                self._parts.append((kind, [data] if kind == "block" else data))
+            self._pending_rows += rows
+
+    def should_flush(self):
+        """Check whether the buffer has reached its row or time limit"""
+        if not self._parts:
+            return False
+        if self._pending_rows >= self.max_rows:
+            return True
+        return (time.monotonic() - self._last_flush_time) >= self.max_interval
+
+    def flush(self):
+        """Parse and write everything buffered as one batch
+
+        Returns:
+            int: Number of rows written
+        """
+        with self._lock:
+            parts, self._parts = self._parts, []
+            rows, self._pending_rows = self._pending_rows, 0
+            self._last_flush_time = time.monotonic()
+        if not parts or not self.db_model:
+            return 0
+
+        start = time.perf_counter()
+        try:
+            frames = [
+                parse_result_block(b"".join(data), self.columns) if kind == "block" else data
+                for kind, data in parts
+            ]
+            batch = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+            written = self.db_model.insert_result_frame(self.columns, batch, conn=self.conn)
+        except Exception as e:
+            print(f"Error parsing {rows} results: {e}")
+            written = 0
+        if written == 0:
+            self.rows_failed += rows
+        self.write_seconds += time.perf_counter() - start
+        self.rows_written += written
+        self.flush_count += 1
+        return written
+
+    def close(self):
+        """Flush anything still in the buffer"""
+        return self.flush()
+
+    def discard(self):
+        """Throw away buffered rows without writing them
+
+        Returns:
+            int: Number of rows discarded
+        """
+        with self._lock:
+            rows, self._pending_rows = self._pending_rows, 0
+            self._parts = []
+        return rows
+
+    @property
+    def pending(self):
+        """Number of rows waiting for the next flush"""
+        return self._pending_rows
+
+    def rows_per_second(self):
+        """Ingest throughput since the first buffered row"""
+        if self._first_row_time is None:
+            return 0.0
+        elapsed = time.monotonic() - self._first_row_time
+        return self.rows_written / elapsed if elapsed > 0 else 0.0
+
+    def stats(self):
+        """Get a summary of the ingest throughput
+
+        Returns:
+            dict: Rows written, flush count and rows/s (wall clock and DB-only)
+        """
+        return {
+            "rows_written": self.rows_written,
+            "flushes": self.flush_count,
+            "pending": self.pending,
+            "rows_per_second": self.rows_per_second(),
+            "db_rows_per_second": (self.rows_written / self.write_seconds) if self.write_seconds > 0 else 0.0,
+        }
+
+    def format_stats(self):
+        """Format the throughput summary for the console"""
+        stats = self.stats()
+        return (f"Ingested {stats['rows_written']} rows in {stats['flushes']} batches "
+                f"@ {stats['rows_per_second']:.0f} rows/s "
+                f"(DB writes {stats['db_rows_per_second']:.0f} rows/s)")
+
+
+class IngestWriter(threading.Thread):
+    """Single writer stage that owns the DuckDB write cursor
+
+    CLI reader threads only drain their pipes and submit_block() raw result blocks
+    into a bounded queue. This thread parses them, batches them through a ResultIngestBuffer
+    and commits each batch with its own cursor, so neither the readers nor the UI
+    thread wait on DatabaseModel.db_lock for steady-state inserts.
+
+    When the queue is full, submitting blocks (counted as a stall) instead of dropping
+    results; rows are only dropped if the writer has stopped or a batch fails to write.
+
+    Search checkpoints travel through the same queue and are only saved once every
+    row queued before them has been committed, so resuming never skips a result.
+
+    Queued rows are keyed by the database they were submitted for. Before the model
+    closes or switches its database, release() commits them through the old cursor;
+    rows that still arrive for a database that is no longer open count as drops.
+    """
+
+    CHECKPOINT_INTERVAL = 1.0  # Save search checkpoints at most once a second
+
+    def __init__(self, db_model, max_queue=20000, batch_rows=5000, flush_ms=250,
+                 stats_callback=None, stats_interval_ms=1000):
+        """Initialize the writer thread
+
+        Args:
+            db_model: DatabaseModel to write into
+            max_queue: Maximum number of queued items before readers stall
+            batch_rows: Flush every N rows
+            flush_ms: Flush every T milliseconds
+            stats_callback: Optional callable receiving stats() periodically
+            stats_interval_ms: How often stats_callback is called
+        """
+        super().__init__(daemon=True, name="OuijaIngestWriter")
+        self.db_model = db_model
+        self.queue = queue.Queue(maxsize=max_queue)
+        self.max_queue = max_queue
+        self.batch_rows = batch_rows
+        self.flush_ms = flush_ms
+        self.stats_callback = stats_callback
+        self.stats_interval = stats_interval_ms / 1000.0
+
+        self._running = True
+        self._conn = None
+        self._conn_db_path = None
+        self._buffers = {}  # (database path, header tuple) -> ResultIngestBuffer
+        self._released_rows = 0  # Rows written by buffers of databases since released
+        self._checkpoints = []  # (flush counts to wait for, checkpoint) in arrival order
+        self._last_checkpoint_save = 0.0
+
+        # Counters shown in the status bar
+        self.stalls = 0
+        self.stall_seconds = 0.0
+        self.drops = 0
+        self.max_depth_seen = 0
+        self.recent_rows_per_second = 0.0
+
+    # === Reader side ===
+    def submit_header(self, columns):
+        """Queue a CLI header so the table is prepared before its rows arrive"""
+        self._put(("header", self._buffer_key(columns), None))
+
+    def submit_block(self, columns, block):
+        """Queue a block of '|'-stripped result lines (bytes) for the given header"""
+        self._put(("block", self._buffer_key(columns), block))
+
+    def submit_frame(self, columns, frame):
+        """Queue a decoded batch (pandas.DataFrame) for the given header"""
+        self._put(("frame", self._buffer_key(columns), frame))
+
+    def _buffer_key(self, columns):
+        """Key rows by the database that is open when they are submitted"""
+        return self.db_model.current_db_path, tuple(columns)
+
+    def submit_checkpoint(self, checkpoint):
+        """Queue a search checkpoint (dict from SearchRun.checkpoint()) behind the rows before it"""
+        self._put(("checkpoint", None, checkpoint))
+
+    def sync(self, timeout=None):
+        """Block until everything queued so far has been written
+
+        Returns:
+            bool: True if the writer caught up before the timeout
+        """
+        done = threading.Event()
+        self._put(("sync", None, done))
+        return done.wait(timeout)
+
+    def release(self, timeout=None):
+        """Commit everything queued for the current database and close the writer cursor
+
+        Set as DatabaseModel.on_before_close, so rows reach the database they were
+        searched for instead of the next one opened.
+
+        Returns:
+            bool: True if the writer caught up before the timeout
+        """
+        done = threading.Event()
+        self._put(("release", None, done))
+        return done.wait(timeout)
+
+    def stop(self, timeout=5.0):
+        """Flush everything queued and stop the thread"""
+        if self.is_alive():
+            self.sync(timeout)
+        self._running = False
+        self.join(timeout)
+
+    def congested(self):
+        """Whether the queue is at least half full, so a submit may soon stall its caller"""
+        return self.max_queue > 0 and self.queue.qsize() * 2 >= self.max_queue
+
+    def _put(self, item):
+        """Put an item on the queue, stalling the caller while the queue is full"""
+        if not self._running or not self.is_alive():
+            if item[0] in ("block", "frame"):
+                self.drops += self._item_rows(item)
+            elif item[0] in ("sync", "release"):
+                item[2].set()
+            return
+        try:
+            self.queue.put_nowait(item)
+        except queue.Full:
+            self.stalls += 1
+            start = time.monotonic()
+            while self._running and self.is_alive():
+                try:
+                    self.queue.put(item, timeout=0.5)
+                    break
+                except queue.Full:
+                    continue
+            else:
+                if item[0] in ("block", "frame"):
+                    self.drops += self._item_rows(item)
+                elif item[0] in ("sync", "release"):
+                    item[2].set()
+            self.stall_seconds += time.monotonic() - start
+        self.max_depth_seen = max(self.max_depth_seen, self.queue.qsize())
+
+    @staticmethod
+    def _item_rows(item):
+        """Number of result rows carried by a queue item"""
+        return len(item[2]) if item[0] == "frame" else item[2].count(b"\n")
+
+    # === Writer side ===
+    def run(self):
+        """Drain the queue, batching rows into bulk upserts"""
+        last_stats = time.monotonic()
+        last_rows = 0
+        while self._running:
+            try:
+                kind, columns, payload = self.queue.get(timeout=self.flush_ms / 1000.0)
+                self._handle(kind, columns, payload)
+            except queue.Empty:
+                pass
+            except Exception as e:
+                print(f"Error in ingest writer: {e}")
+
+            for buffer in list(self._buffers.values()):
+                if buffer.should_flush():
+                    self._flush(buffer)
+
+            now = time.monotonic()
+            if self._checkpoints and (now - self._last_checkpoint_save) >= self.CHECKPOINT_INTERVAL:
+                self._save_checkpoints()
+            if (now - last_stats) >= self.stats_interval:
+                rows = self.rows_written()
+                self.recent_rows_per_second = (rows - last_rows) / (now - last_stats)
+                last_rows, last_stats = rows, now
+                self._report_stats()
+
+        self._flush_all()
+        self._save_checkpoints()
+        self._report_stats()
+
+    def _report_stats(self):
+        """Send the current counters to the stats callback"""
+        if not self.stats_callback:
+            return
+        try:
+            self.stats_callback(self.stats())
+        except Exception as e:
+            print(f"Error in ingest stats callback: {e}")
+
+    def _handle(self, kind, key, payload):
+        """Process one queued item"""
+        if kind in ("block", "frame", "header") and key[0] != self.db_model.current_db_path:
+            # Submitted for a database that has been closed since
+            if kind != "header":
+                self.drops += self._item_rows((kind, key, payload))
+            return
+        if kind == "block":
+            buffer = self._buffers.get(key) or self._open_buffer(key)
+            buffer.add_block(payload)
+        elif kind == "frame":
+            buffer = self._buffers.get(key) or self._open_buffer(key)
+            buffer.add_frame(payload)
+        elif kind == "header":
+            # Another process with the same header keeps sharing the open buffer
+            if key not in self._buffers:
+                self._open_buffer(key)
+        elif kind == "checkpoint":
+            # Saved once each buffer holding earlier rows has flushed them
+            waiting = {key: buffer.flush_count for key, buffer in self._buffers.items() if buffer.pending}
+            self._checkpoints.append((waiting, payload))
+        elif kind == "sync":
+            self._flush_all()
+            self._save_checkpoints()
+            payload.set()
+        elif kind == "release":
+            self._flush_all()
+            self._save_checkpoints()
+            self._drop_database_state()
+            payload.set()
+
+    def _open_buffer(self, key):
+        """Prepare the table for a header and create its row buffer"""
+        columns = key[1]
+        self.db_model.prepare_results_table(list(columns))
+        buffer = ResultIngestBuffer(
+            self.db_model, columns,
+            max_rows=self.batch_rows,
+            max_interval_ms=self.flush_ms,
+            conn=self._writer_conn(),
+        )
+        self._buffers[key] = buffer
+        return buffer
+
+    def _writer_conn(self):
+        """Get the writer cursor, reopening it if the model switched databases"""
+        if self._conn is None or self._conn_db_path != self.db_model.current_db_path:
+            if self._conn is not None:
+                # The model switched without release(); rows buffered for the old file can't follow
+                self._drop_database_state()
+            self._conn = self.db_model.writer_cursor()
+            self._conn_db_path = self.db_model.current_db_path
+        return self._conn
+
+    def _drop_database_state(self):
+        """Close the writer cursor and forget the buffers and checkpoints of its database"""
+        for buffer in self._buffers.values():
+            self.drops += buffer.discard()
+            self._released_rows += buffer.rows_written
+        self._buffers = {}
+        self._checkpoints = []
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception as e:
+                print(f"Error closing ingest writer cursor: {e}")
+        self._conn = None
+        self._conn_db_path = None
+
+    def _flush(self, buffer):
+        """Flush one buffer through the current writer cursor"""
+        if not buffer.pending:
+            return
+        buffer.conn = self._writer_conn()
+        if buffer.pending == 0:
+            return  # Discarded because the model switched databases
+        if buffer.conn is None:
+            # Database was closed underneath us; nothing can take these rows
+            self.drops += buffer.discard()
+            return
+        # Cheap once the schema cache is warm; recreates the table after "Delete Everything".
+        # A newer header may have taken over the table; this one's rows then go to its version.
+        self.db_model.prepare_results_table(list(buffer.columns), activate=False)
+        failed_before = buffer.rows_failed
+        buffer.flush()
+        self.drops += buffer.rows_failed - failed_before
+
+    def _save_checkpoints(self):
+        """Save the newest committed checkpoint of each search"""
+        ready, waiting_checkpoints = {}, []
+        for waiting, checkpoint in self._checkpoints:
+            if all(self._buffers[key].flush_count > count for key, count in waiting.items()):
+                ready[(checkpoint["first_seed"], checkpoint["seeds"])] = checkpoint
+            else:
+                waiting_checkpoints.append((waiting, checkpoint))
+        self._checkpoints = waiting_checkpoints
+        self._last_checkpoint_save = time.monotonic()
+        if self._conn is not None and self._conn_db_path != self.db_model.current_db_path:
+            # Their rows went to a database the model switched away from without release()
+            self._drop_database_state()
+            return
+        conn = self._writer_conn() if ready else None
+        if conn is not None:
+            self.db_model.save_search_checkpoints(list(ready.values()), conn=conn)
+
+    def _flush_all(self):
+        """Flush every open buffer"""
+        for buffer in list(self._buffers.values()):
+            self._flush(buffer)
+
+    def rows_written(self):
+        """Total rows committed by this writer"""
+        return self._released_rows + sum(b.rows_written for b in list(self._buffers.values()))
+
+    def stats(self):
+        """Get writer counters for the status bar
+
+        Returns:
+            dict: Queue depth, stall/drop counters and rows/s
+        """
+        return {
+            "queue_depth": self.queue.qsize(),
+            "queue_max": self.max_queue,
+            "max_depth_seen": self.max_depth_seen,
+            "stalls": self.stalls,
+            "stall_seconds": self.stall_seconds,
+            "drops": self.drops,
+            "rows_written": self.rows_written(),
+            "rows_per_second": self.recent_rows_per_second,
+            "duplicates_avoided": self.db_model.seen_results.duplicates_avoided,
+        }
+
+    def format_stats(self):
+        """Format writer counters for the status bar"""
+        stats = self.stats()
+        return (f"Q {stats['queue_depth']}/{stats['queue_max']} | "
+                f"stalls {stats['stalls']} | drops {stats['drops']} | "
+                f"dups skipped {stats['duplicates_avoided']} | "
+                f"{stats['rows_per_second'] / 1000.0:.1f}K rows/s")
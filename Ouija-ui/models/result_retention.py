@@ -0,0 +1,425 @@
+"""
+Result Retention - Per-config limits on stored results, enforced by a background pruner
+"""
+
+import json
+import threading
+import time
+
+from models.result_schema import (RESULT_ROWS_TABLE, RESULTS_VIEW_SQL, SEED_ID_COLUMN, mostly_wasted,
+                                  rebuild_results_table, table_definition)
+
+
+class RetentionPolicy:
+    """Which results a config keeps: the best keep_top rows and/or rows scoring at least min_score
+
+    Stored in the config file as "retention": {"keepTop": N, "minScore": S};
+    either key may be left out and no key means keep everything.
+    """
+
+    def __init__(self, keep_top=None, min_score=None):
+        """Initialize the policy
+
+        Args:
+            keep_top: Keep only this many rows, best Score first (None: no limit)
+            min_score: Drop rows scoring below this (None: no limit)
+        """
+        self.keep_top = int(keep_top) if keep_top not in (None, "", 0) else None
+        self.min_score = int(min_score) if min_score not in (None, "") else None
+
+    @property
+    def is_active(self):
+        """Whether the policy removes anything at all"""
+        return self.keep_top is not None or self.min_score is not None
+
+    @classmethod
+    def from_config(cls, config):
+        """Read the policy from a loaded config dict"""
+        retention = (config or {}).get("retention") or {}
+        return cls(retention.get("keepTop"), retention.get("minScore"))
+
+    def to_config(self):
+        """Policy as stored in the config file, or None if it keeps everything"""
+        if not self.is_active:
+            return None
+        retention = {}
+        if self.keep_top is not None:
+            retention["keepTop"] = self.keep_top
+        if self.min_score is not None:
+            retention["minScore"] = self.min_score
+        return retention
+
+    def keeps_more_than(self, other):
+        """Whether this policy keeps rows that other would remove"""
+        if not other.is_active:
+            return False
+        more_rows = other.keep_top is not None and (self.keep_top is None or self.keep_top > other.keep_top)
+        lower_score = other.min_score is not None and (self.min_score is None or self.min_score < other.min_score)
+        return more_rows or lower_score
+
+    def describe(self):
+        """Human-readable summary for the console"""
+        parts = []
+        if self.keep_top is not None:
+            parts.append(f"top {self.keep_top:,} results")
+        if self.min_score is not None:
+            parts.append(f"score >= {self.min_score}")
+        return "keep " + " and ".join(parts) if parts else "keep everything"
+
+    def __eq__(self, other):
+        return (isinstance(other, RetentionPolicy) and self.keep_top == other.keep_top
+                and self.min_score == other.min_score)
+
+    def __repr__(self):
+        return f"RetentionPolicy(keep_top={self.keep_top}, min_score={self.min_score})"
+
+
+def load_retention_policy(config_path):
+    """Read the retention policy of a config file
+
+    Returns:
+        RetentionPolicy: The config's policy; keeps everything if the file can't be read
+    """
+    if not config_path:
+        return RetentionPolicy()
+    try:
+        with open(config_path, "r") as f:
+            return RetentionPolicy.from_config(json.load(f))
+    except (OSError, ValueError):
+        return RetentionPolicy()
+
+
+def prune_condition(conn, policy):
+    """WHERE clause matching the rows a policy removes right now
+
+    keep_top keeps the rows the results table shows first (Score DESC, SeedId ASC),
+    so its cut is a (Score, SeedId) boundary found from per-score row counts.
+
+    Returns:
+        str: SQL condition, or None if nothing needs removing
+    """
+    conditions = []
+    if policy.min_score is not None:
+        conditions.append(f'"Score" < {policy.min_score}')
+    if policy.keep_top is not None:
+        counts = conn.execute(
+            f'SELECT "Score", COUNT(*) FROM {RESULT_ROWS_TABLE} GROUP BY "Score" ORDER BY "Score" DESC'
+        ).fetchall()
+        kept = 0
+        for score, count in counts:
+            if policy.min_score is not None and score < policy.min_score:
+                break
+            if kept + count > policy.keep_top:
+                # Part of this score survives; the cut falls at the n-th seed id
+                offset = policy.keep_top - kept
+                if offset == 0:
+                    conditions.append(f'"Score" <= {score}')
+                else:
+                    last_kept = conn.execute(
+                        f'SELECT "{SEED_ID_COLUMN}" FROM {RESULT_ROWS_TABLE} WHERE "Score" = {score} '
+                        f'ORDER BY "{SEED_ID_COLUMN}" LIMIT 1 OFFSET {offset - 1}').fetchone()[0]
+                    conditions.append(f'("Score" < {score} OR ("Score" = {score} AND "{SEED_ID_COLUMN}" > {last_kept}))')
+                break
+            kept += count
+    return " OR ".join(conditions) if conditions else None
+
+
+class ResultPruner(threading.Thread):
+    """Background thread applying a DatabaseModel's retention policy
+
+    Wakes up when asked to (after writes or a policy change) or every
+    check_interval seconds, and removes what the policy no longer keeps. Rows
+    are deleted one rowid window at a time, each DELETE holding
+    DatabaseModel.write_lock for about batch_seconds, so the ingest writer only
+    ever waits that long. When most rows go and few remain, the survivors are
+    copied into a fresh table instead, which is far cheaper than deleting: the
+    copy reads a snapshot without the lock, and only replaying the batches
+    written meanwhile and swapping the tables hold it.
+
+    DuckDB never shrinks a file by deleting rows: a pass ends with a CHECKPOINT
+    and, for small tables, an in-place rewrite so the file is cut short; larger
+    ones are rewritten the next time the file is opened (needs_compaction()).
+
+    keep_top is enforced once the table holds slack more rows than it keeps, so
+    the pruner doesn't run after every batch.
+    """
+
+    MIN_WINDOW = 1000
+    MAX_WINDOW = 1000000
+    CATCH_UP_ROUNDS = 3  # Rounds of logged batches written into a survivor copy before the swap
+
+    def __init__(self, db_model, batch_rows=20000, batch_seconds=0.05, rebuild_rows=250000,
+                 check_interval=30.0, slack=0.1, pause=0.01):
+        """Initialize the pruner thread
+
+        Args:
+            db_model: DatabaseModel whose retention policy is applied
+            batch_rows: Rowids covered by the first DELETE batch
+            batch_seconds: Lock time each later batch is sized for
+            rebuild_rows: Most surviving rows copied into a fresh table rather than deleted
+                          around, and largest table rewritten in place to shrink the file
+            check_interval: Seconds between checks when nobody asks
+            slack: Fraction of keep_top the table may grow past before pruning
+            pause: Seconds between batches, letting writers in
+        """
+        super().__init__(daemon=True, name="OuijaResultPruner")
+        self.db_model = db_model
+        self.batch_rows = batch_rows
+        self.batch_seconds = batch_seconds
+        self.rebuild_rows = rebuild_rows
+        self.check_interval = check_interval
+        self.slack = slack
+        self.pause = pause
+        self._wake = threading.Event()
+        self._idle = threading.Event()
+        self._idle.set()
+        self._running = True
+        self._force = False  # Next pass ignores slack (the policy just changed)
+        self._checked_token = None  # change_token of the last pass that found nothing to do
+
+        # Counters
+        self.passes = 0
+        self.rows_pruned = 0
+        self.batches = 0
+        self.prune_seconds = 0.0
+        self.max_batch_seconds = 0.0
+        self.last_error = None
+
+    def request(self, force=False):
+        """Ask for a check as soon as possible
+
+        Args:
+            force: Prune down to keep_top exactly, even within the slack
+        """
+        if force:
+            self._force = True
+            self._checked_token = None
+        self._wake.set()
+
+    def wait_idle(self, timeout=None):
+        """Block until requested passes have finished
+
+        Returns:
+            bool: True if the pruner went idle before the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._wake.is_set() or not self._idle.is_set():
+            remaining = None if deadline is None else deadline - time.monotonic()
+            if remaining is not None and remaining <= 0:
+                return False
+            self._idle.wait(0.05 if remaining is None else min(0.05, remaining))
+        return True
+
+    def stop(self, timeout=5.0):
+        """Stop the thread after the batch in progress"""
+        self._running = False
+        self._wake.set()
+        if self.is_alive():
+            self.join(timeout)
+
+    def run(self):
+        """Check the policy whenever asked or every check_interval seconds"""
+        while self._running:
+            self._wake.wait(self.check_interval)
+            self._idle.clear()
+            self._wake.clear()
+            try:
+                if self._running:
+                    self.prune()
+            except Exception as e:
+                self.last_error = str(e)
+                print(f"Error pruning results: {e}")
+            finally:
+                self._idle.set()
+
+    def prune(self):
+        """Remove everything the current policy doesn't keep
+
+        Returns:
+            int: Number of rows removed
+        """
+        policy = self.db_model.retention
+        token = self.db_model.change_token
+        force, self._force = self._force, False
+        if not policy.is_active or (token == self._checked_token and not force):
+            return 0
+        db_path = self.db_model.current_db_path
+        conn = self.db_model.writer_cursor()
+        if conn is None:
+            return 0
+        start = time.perf_counter()
+        removed = 0
+        try:
+            if not self._over_limit(conn, policy, 0 if force else self.slack):
+                self._checked_token = token
+                return 0
+            condition = prune_condition(conn, policy)
+            if condition:
+                rows, doomed = conn.execute(
+                    f"SELECT COUNT(*), COUNT(*) FILTER (WHERE {condition}) FROM {RESULT_ROWS_TABLE}").fetchone()
+                removed = None
+                if rows - doomed <= self.rebuild_rows and doomed >= rows - doomed:
+                    # Most rows go and the rest is small: copying the survivors beats deleting
+                    removed = self._copy_survivors(conn, condition)
+                if removed is None:
+                    removed = self._delete_batches(conn, condition, db_path)
+            if removed:
+                # Before shrinking: results_pruned() drops tables that would otherwise
+                # be rewritten behind the rows and keep the file from getting shorter
+                self.db_model.results_pruned(policy, removed)
+                self._shrink(conn)
+                print(f"Pruned {removed:,} results ({policy.describe()}) "
+                      f"in {time.perf_counter() - start:.1f}s")
+            self._checked_token = self.db_model.change_token
+        finally:
+            conn.close()
+            self.passes += 1
+            self.rows_pruned += removed
+            self.prune_seconds += time.perf_counter() - start
+        return removed
+
+    def _copy_survivors(self, conn, condition):
+        """Replace the results table with a copy of the rows condition doesn't match
+
+        The copy reads a snapshot taken under the lock. The batches the ingest
+        writer upserts meanwhile are logged by the DatabaseModel and written into
+        the copy without the lock too, a few rounds until few are left; only the
+        last of them and the swap hold the lock.
+
+        Returns:
+            int: Number of rows removed, or None if the table changed in a way the
+                 copy can't follow (nothing is changed then)
+        """
+        rebuilt = f"{RESULT_ROWS_TABLE}_rebuild"
+        columns_sql = table_definition(conn, RESULT_ROWS_TABLE)
+        with self.db_model.write_lock:
+            self.db_model.start_row_log()
+            conn.execute("BEGIN TRANSACTION")
+            try:
+                # The first statement fixes the snapshot; every later write is logged
+                conn.execute(f"DROP TABLE IF EXISTS {rebuilt}")
+                conn.execute(f"CREATE TABLE {rebuilt} ({columns_sql})")
+            except Exception:
+                conn.execute("ROLLBACK")
+                self.db_model.stop_row_log()
+                raise
+        try:
+            conn.execute(f"INSERT INTO {rebuilt} SELECT * FROM {RESULT_ROWS_TABLE} WHERE NOT ({condition}) "
+                         f'ORDER BY "{SEED_ID_COLUMN}"')
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            self.db_model.stop_row_log()
+            raise
+        try:
+            for _ in range(self.CATCH_UP_ROUNDS):
+                with self.db_model.write_lock:
+                    log = self.db_model.take_row_log()
+                if not log:
+                    break
+                self.db_model.write_logged_rows(conn, log, rebuilt)
+                conn.execute(f"DELETE FROM {rebuilt} WHERE {condition}")
+        except Exception:
+            self.db_model.stop_row_log()
+            conn.execute(f"DROP TABLE IF EXISTS {rebuilt}")
+            raise
+
+        removed = None
+        with self.db_model.write_lock:
+            batch_start = time.perf_counter()
+            conn.execute("BEGIN TRANSACTION")
+            try:
+                log = self.db_model.take_row_log()
+                if log is not None and table_definition(conn, RESULT_ROWS_TABLE) == columns_sql:
+                    if log:
+                        self.db_model.write_logged_rows(conn, log, rebuilt)
+                        conn.execute(f"DELETE FROM {rebuilt} WHERE {condition}")
+                    rows = conn.execute(f"SELECT COUNT(*) FROM {RESULT_ROWS_TABLE}").fetchone()[0]
+                    kept = conn.execute(f"SELECT COUNT(*) FROM {rebuilt}").fetchone()[0]
+                    conn.execute(f"DROP TABLE {RESULT_ROWS_TABLE}")
+                    conn.execute(f"ALTER TABLE {rebuilt} RENAME TO {RESULT_ROWS_TABLE}")
+                    conn.execute(RESULTS_VIEW_SQL)
+                    removed = rows - kept
+                else:
+                    conn.execute(f"DROP TABLE {rebuilt}")
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            finally:
+                self.db_model.stop_row_log()
+        self._count_batch(time.perf_counter() - batch_start)
+        return removed
+
+    def _delete_batches(self, conn, condition, db_path):
+        """DELETE matching rows one rowid window at a time, sized to batch_seconds
+
+        Returns:
+            int: Number of rows deleted
+        """
+        removed = 0
+        last_rowid = conn.execute(f"SELECT MAX(rowid) FROM {RESULT_ROWS_TABLE}").fetchone()[0]
+        low, window = 0, self.batch_rows
+        while last_rowid is not None and low <= last_rowid and self._running \
+                and self.db_model.current_db_path == db_path:
+            with self.db_model.write_lock:
+                batch_start = time.perf_counter()
+                removed += conn.execute(
+                    f"DELETE FROM {RESULT_ROWS_TABLE} WHERE rowid >= {low} AND rowid < {low + window} "
+                    f"AND ({condition})").fetchone()[0]
+            elapsed = time.perf_counter() - batch_start
+            self._count_batch(elapsed)
+            low += window
+            # Aim the next window at batch_seconds of lock time
+            scale = min(2.0, max(0.5, self.batch_seconds / max(elapsed, 1e-4)))
+            window = min(self.MAX_WINDOW, max(self.MIN_WINDOW, int(window * scale)))
+            time.sleep(self.pause)
+        return removed
+
+    def _shrink(self, conn):
+        """CHECKPOINT, then rewrite a small, mostly empty table so the file gets shorter"""
+        with self.db_model.write_lock:
+            conn.execute("CHECKPOINT")
+        # Freed blocks are only cut off the end of the file; a rewrite moves the
+        # rows into the free space at the front, the next CHECKPOINT truncates
+        for _ in range(2):
+            if not mostly_wasted(conn):
+                break
+            rows = conn.execute(f"SELECT COUNT(*) FROM {RESULT_ROWS_TABLE}").fetchone()[0]
+            if rows > self.rebuild_rows:
+                break  # Rewritten on the next open instead (needs_compaction())
+            with self.db_model.write_lock:
+                batch_start = time.perf_counter()
+                rebuild_results_table(conn)
+                conn.execute("CHECKPOINT")
+            self._count_batch(time.perf_counter() - batch_start)
+
+    def _count_batch(self, seconds):
+        """Record one stretch of holding the write lock"""
+        self.batches += 1
+        self.max_batch_seconds = max(self.max_batch_seconds, seconds)
+
+    def _over_limit(self, conn, policy, slack):
+        """Cheap check whether a pass would remove anything worth a pass"""
+        if policy.min_score is not None and conn.execute(
+                f'SELECT 1 FROM {RESULT_ROWS_TABLE} WHERE "Score" < {policy.min_score} LIMIT 1').fetchone():
+            return True
+        if policy.keep_top is not None:
+            rows = conn.execute(f"SELECT COUNT(*) FROM {RESULT_ROWS_TABLE}").fetchone()[0]
+            return rows > policy.keep_top * (1 + slack)
+        return False
+
+    def stats(self):
+        """Get the pruning counters
+
+        Returns:
+            dict: Passes, batches, rows removed and timings
+        """
+        return {
+            "passes": self.passes,
+            "batches": self.batches,
+            "rows_pruned": self.rows_pruned,
+            "prune_seconds": self.prune_seconds,
+            "max_batch_seconds": self.max_batch_seconds,
+            "last_error": self.last_error,
+        }
@@ -0,0 +1,505 @@
+"""
+Result Schema - Compact results table keyed on packed seed ids, and migration of older databases
+"""
+
+import os
+import sys
+import time
+
+import duckdb
+import pandas as pd
+
+from models.seed_codec import MAX_SEED_LENGTH, SEED_CHARS, create_seed_macros, decode_seed, decode_seeds
+
+# Rows are stored keyed on the packed seed id; the results view spells the seed out
+RESULT_ROWS_TABLE = "result_rows"
+RESULTS_VIEW = "results"
+SEED_ID_COLUMN = "SeedId"
+SEED_COLUMN_SQL = f'ouija_seed("{SEED_ID_COLUMN}") AS "Seed"'
+RESULTS_VIEW_SQL = (f'CREATE OR REPLACE VIEW {RESULTS_VIEW} AS '
+                    f'SELECT {SEED_COLUMN_SQL}, * EXCLUDE ("{SEED_ID_COLUMN}") FROM {RESULT_ROWS_TABLE}')
+VALID_SEED_PATTERN = f"[{SEED_CHARS}]{{1,{MAX_SEED_LENGTH}}}"
+
+# seed_strings() decodes fewer rows than this one at a time
+SCALAR_DECODE_ROWS = 32
+
+# Integer types from narrowest to widest: (name, min, max)
+INTEGER_TYPES = [
+    ("UTINYINT", 0, 255),
+    ("USMALLINT", 0, 65535),
+    ("INTEGER", -2 ** 31, 2 ** 31 - 1),
+    ("BIGINT", -2 ** 63, 2 ** 63 - 1),
+]
+INTEGER_TYPE_NAMES = [name for name, _, _ in INTEGER_TYPES]
+
+# Rewrite a file on open once this many 256 KB blocks (and half of it) are free,
+# or this many rows (and more than are left) were deleted
+FREE_BLOCKS_TO_COMPACT = 16
+DELETED_ROWS_TO_COMPACT = 100000
+
+
+def compact_type(column):
+    """Column type matching the OuijaResult field behind a CLI header column
+
+    TotalScore is a ushort; the negative joker counters and every ScoreWants
+    entry are uchars.
+
+    Args:
+        column: CLI header column name (not Seed)
+
+    Returns:
+        str: DuckDB type name
+    """
+    return "USMALLINT" if column == "Score" else "UTINYINT"
+
+
+def fitting_type(minimum, maximum, at_least="UTINYINT"):
+    """Narrowest integer type that holds a value range
+
+    Args:
+        minimum: Smallest value (None if the column is all NULL)
+        maximum: Largest value (None if the column is all NULL)
+        at_least: Never return a type narrower than this one
+
+    Returns:
+        str: DuckDB type name
+    """
+    start = INTEGER_TYPE_NAMES.index(at_least) if at_least in INTEGER_TYPE_NAMES else 0
+    for name, low, high in INTEGER_TYPES[start:]:
+        if minimum is None or (low <= minimum and maximum <= high):
+            return name
+    return "BIGINT"
+
+
+def column_types(conn, table=RESULT_ROWS_TABLE):
+    """Get the results table's column types
+
+    Returns:
+        dict: Column name -> DuckDB type name, in table order
+    """
+    return {row[1]: row[2] for row in conn.execute(f"PRAGMA table_info({table})").fetchall()}
+
+
+def create_results_schema(conn, columns_def):
+    """Create the seed macros, the result_rows table and the results view
+
+    Args:
+        conn: Connection or cursor on the database
+        columns_def: Column definitions of the value columns (everything but the seed)
+    """
+    create_seed_macros(conn)
+    columns_sql = ", ".join([f'"{SEED_ID_COLUMN}" UBIGINT PRIMARY KEY'] + list(columns_def))
+    conn.execute(f"CREATE TABLE IF NOT EXISTS {RESULT_ROWS_TABLE} ({columns_sql})")
+    conn.execute(RESULTS_VIEW_SQL)
+
+
+def table_definition(conn, table):
+    """Column definitions of a table, with its primary key and defaults
+
+    Returns:
+        str: Comma-separated definitions for CREATE TABLE
+    """
+    columns = conn.execute(f"PRAGMA table_info({table})").fetchall()
+    return ", ".join([
+        f'"{name}" {col_type}' + (" PRIMARY KEY" if primary_key else "")
+        + (f" DEFAULT {default}" if default is not None else "")
+        for _, name, col_type, _, default, primary_key in columns
+    ])
+
+
+def rebuild_results_table(conn, where=None):
+    """Rewrite result_rows in place, keeping only the rows matching where
+
+    Deleted rows keep their space until the table is rewritten; after this and a
+    CHECKPOINT the file shrinks. Rows are written in seed id order, so seed range
+    queries skip more of the table. Runs as one transaction on conn.
+
+    Args:
+        conn: Connection or cursor on the database (not inside a transaction)
+        where: SQL condition of the rows to keep (None: all)
+
+    Returns:
+        int: Number of rows kept
+    """
+    rebuilt = f"{RESULT_ROWS_TABLE}_rebuild"
+    columns_sql = table_definition(conn, RESULT_ROWS_TABLE)
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        conn.execute(f"DROP TABLE IF EXISTS {rebuilt}")
+        conn.execute(f"CREATE TABLE {rebuilt} ({columns_sql})")
+        kept = conn.execute(
+            f"INSERT INTO {rebuilt} SELECT * FROM {RESULT_ROWS_TABLE}"
+            + (f" WHERE {where}" if where else "") + f' ORDER BY "{SEED_ID_COLUMN}"'
+        ).fetchone()[0]
+        conn.execute(f"DROP TABLE {RESULT_ROWS_TABLE}")
+        conn.execute(f"ALTER TABLE {rebuilt} RENAME TO {RESULT_ROWS_TABLE}")
+        conn.execute(RESULTS_VIEW_SQL)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return kept
+
+
+def drop_results_schema(conn):
+    """Drop the results view and table (and a results table from before packed seeds)"""
+    kinds = dict(conn.execute(
+        "SELECT table_name, table_type FROM information_schema.tables "
+        f"WHERE table_schema = current_schema() AND table_name IN ('{RESULTS_VIEW}', '{RESULT_ROWS_TABLE}')"
+    ).fetchall())
+    if kinds.get(RESULTS_VIEW) == "VIEW":
+        conn.execute(f"DROP VIEW {RESULTS_VIEW}")
+    elif RESULTS_VIEW in kinds:
+        conn.execute(f"DROP TABLE {RESULTS_VIEW}")
+    conn.execute(f"DROP TABLE IF EXISTS {RESULT_ROWS_TABLE}")
+
+
+def order_column(column):
+    """Stored column to sort by for a results column (seeds sort by their id)"""
+    return SEED_ID_COLUMN if column == "Seed" else column
+
+
+def rows_query(where=None, order_by=None, limit=None):
+    """Build a SELECT over result_rows; pass the fetched frame through seed_strings()
+
+    Args:
+        where: Optional SQL condition on result_rows columns (SeedId, not Seed).
+               Compare SeedId with ?::UBIGINT parameters; an untyped Python int
+               makes DuckDB widen the column and scan instead of using the key.
+        order_by: Optional ORDER BY list on result_rows columns
+        limit: Optional maximum number of rows
+
+    Returns:
+        str: SQL query returning SeedId followed by the value columns
+    """
+    query = f"SELECT * FROM {RESULT_ROWS_TABLE}"
+    if where:
+        query += f" WHERE {where}"
+    if order_by:
+        query += f" ORDER BY {order_by}"
+    if limit is not None:
+        query += f" LIMIT {int(limit)}"
+    return query
+
+
+def results_query(where=None, order_by=None, limit=None):
+    """Build a SELECT shaped like the results view for DuckDB to consume (e.g. COPY)
+
+    Filtering, sorting and the limit run on result_rows, so ouija_seed() only
+    spells out the rows actually returned. Expanding the macro costs a few
+    milliseconds of planning, so queries whose rows come back to Python use
+    rows_query() and seed_strings() instead.
+
+    Args:
+        where: Optional SQL condition, see rows_query()
+        order_by: Optional ORDER BY list on result_rows columns
+        limit: Optional maximum number of rows
+
+    Returns:
+        str: SQL query returning Seed followed by the value columns
+    """
+    query = f'SELECT {SEED_COLUMN_SQL}, * EXCLUDE ("{SEED_ID_COLUMN}") FROM ({rows_query(where, order_by, limit)})'
+    if order_by:
+        query += f" ORDER BY {order_by}"
+    return query
+
+
+def seed_strings(frame):
+    """Turn a frame read with rows_query() into the results view's shape
+
+    The SeedId column is replaced in place, so a point lookup doesn't pay for
+    copying the frame; pass a frame nothing else holds (e.g. from fetch_df()).
+
+    Args:
+        frame: pandas.DataFrame with a SeedId column
+
+    Returns:
+        pandas.DataFrame: Seed (str) followed by the value columns
+    """
+    if frame is None or SEED_ID_COLUMN not in frame.columns:
+        return frame
+    ids = frame[SEED_ID_COLUMN].to_numpy()
+    # The vectorized decode has a fixed cost that dominates a handful of rows
+    seeds = [decode_seed(int(seed_id)) for seed_id in ids] if len(ids) < SCALAR_DECODE_ROWS else decode_seeds(ids)
+    frame[SEED_ID_COLUMN] = pd.array(seeds, dtype="str")
+    frame.columns = ["Seed" if col == SEED_ID_COLUMN else col for col in frame.columns]
+    if frame.columns[0] != "Seed":
+        frame = frame[["Seed"] + [col for col in frame.columns if col != "Seed"]]
+    return frame
+
+
+def widen_for_batch(conn, batch, columns):
+    """Widen integer columns whose current type can't hold a batch's values
+
+    The compact types match the kernel's field widths, so this only fires if a
+    CLI ever reports something wider; the column is then altered in place.
+
+    Args:
+        conn: Connection or cursor on the database
+        batch: pandas.DataFrame about to be inserted
+        columns: CLI header columns of the batch (Seed first)
+
+    Returns:
+        list: Names of the columns that were widened
+    """
+    types = column_types(conn)
+    widened = []
+    for col in columns[1:]:
+        current = types.get(col)
+        if current not in INTEGER_TYPE_NAMES or col not in batch.columns or batch[col].empty:
+            continue
+        minimum, maximum = int(batch[col].min()), int(batch[col].max())
+        wider = fitting_type(minimum, maximum, at_least=current)
+        if wider != current:
+            conn.execute(f'ALTER TABLE {RESULT_ROWS_TABLE} ALTER COLUMN "{col}" TYPE {wider}')
+            widened.append(col)
+            print(f"Results column {col} widened from {current} to {wider}")
+    return widened
+
+
+def has_seed_strings(conn):
+    """Whether the database still stores results in a results table keyed on Seed strings"""
+    return conn.execute(
+        "SELECT COUNT(*) FROM information_schema.tables "
+        f"WHERE table_name = '{RESULTS_VIEW}' AND table_type = 'BASE TABLE'"
+    ).fetchone()[0] > 0
+
+
+def needs_compaction(conn):
+    """Whether the results still use an older schema, or the file is mostly wasted space
+
+    Returns:
+        bool: True if results are keyed on Seed strings, a secondary index exists,
+              a column is wider than its data needs or most of the file is free
+              blocks or deleted rows
+    """
+    if has_seed_strings(conn):
+        return True
+    if mostly_wasted(conn):
+        return True  # Pruned heavily; deleting rows never shrinks the file
+    try:
+        types = column_types(conn)
+    except Exception:
+        return False  # No results table
+    if not types:
+        return False
+    # The old schema always indexed Score; secondary indexes block ALTER COLUMN
+    # and don't speed up ORDER BY in DuckDB
+    indexes = conn.execute(
+        f"SELECT COUNT(*) FROM duckdb_indexes() WHERE table_name = '{RESULT_ROWS_TABLE}'"
+    ).fetchone()[0]
+    if indexes:
+        return True
+    wide = [col for col, col_type in types.items()
+            if col != SEED_ID_COLUMN and col_type in INTEGER_TYPE_NAMES
+            and INTEGER_TYPE_NAMES.index(col_type) > INTEGER_TYPE_NAMES.index(compact_type(col))]
+    if not wide:
+        return False
+    # Columns widened for real data stay wide
+    ranges = _value_ranges(conn, wide)
+    return any(fitting_type(*ranges[col], at_least=compact_type(col)) != types[col] for col in wide)
+
+
+def mostly_wasted(conn):
+    """Whether most of the file is free blocks or most stored rows are deleted
+
+    DuckDB keeps deleted rows in their row groups and only reuses free blocks,
+    so after heavy pruning only a rewrite gives the space back.
+    """
+    try:
+        total, free = conn.execute(
+            "SELECT total_blocks, free_blocks FROM pragma_database_size() "
+            "WHERE database_name = current_database()").fetchone()
+        stored = conn.execute(
+            "SELECT estimated_size FROM duckdb_tables() "
+            f"WHERE database_name = current_database() AND table_name = '{RESULT_ROWS_TABLE}'").fetchone()
+        live = conn.execute(f"SELECT COUNT(*) FROM {RESULT_ROWS_TABLE}").fetchone()[0] if stored else 0
+    except Exception:
+        return False
+    deleted = stored[0] - live if stored else 0
+    return (free >= FREE_BLOCKS_TO_COMPACT and free * 2 >= total) or (
+        deleted >= DELETED_ROWS_TO_COMPACT and deleted >= live)
+
+
+def _value_ranges(conn, columns, table=RESULT_ROWS_TABLE):
+    """Get (min, max) of each column in one scan"""
+    if not columns:
+        return {}
+    aggregates = ", ".join([f'MIN("{col}"), MAX("{col}")' for col in columns])
+    values = conn.execute(f"SELECT {aggregates} FROM {table}").fetchone()
+    return {col: (values[2 * i], values[2 * i + 1]) for i, col in enumerate(columns)}
+
+
+def _scan_seconds(conn, types, table=RESULT_ROWS_TABLE, repeats=3):
+    """Time a full scan touching every result value column
+
+    Counts the rows per value of each column, the scan behind the histograms
+    and retention; SUM() is not representative, as DuckDB widens UTINYINT and
+    USMALLINT values before adding them up. The best of a few warm runs is
+    taken so a freshly opened file isn't measured cold.
+    """
+    columns = [col for col in types if col not in ("Seed", SEED_ID_COLUMN)]
+    queries = [f'SELECT "{col}", COUNT(*) FROM {table} GROUP BY "{col}"' for col in columns] or \
+        [f"SELECT COUNT(*) FROM {table}"]
+    best = None
+    for _ in range(repeats + 1):
+        begin = time.perf_counter()
+        for query in queries:
+            conn.execute(query).fetchall()
+        elapsed = time.perf_counter() - begin
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def scan_seconds(db_path):
+    """Time a full scan of a database file's results, whichever schema they use (see _scan_seconds)"""
+    conn = duckdb.connect(db_path)
+    try:
+        source = RESULTS_VIEW if has_seed_strings(conn) else RESULT_ROWS_TABLE
+        return _scan_seconds(conn, column_types(conn, source), source)
+    finally:
+        conn.close()
+
+
+def compact_database_file(db_path):
+    """Rewrite a database file with the compact results schema
+
+    The rows are copied into a new file keyed on packed seed ids, with column
+    types sized to the data (at least the OuijaResult field widths) and without
+    secondary indexes; archived schema versions are copied as they are. The new
+    file replaces the old one only once the copy is complete. Rows whose seed
+    can't be packed (never written by the CLI) are left behind and counted, as
+    are seeds stored twice in different case, which merge into one row. The
+    caller must make sure nothing has the file open. Nothing is timed here, as
+    this runs while the app opens the database; main() reports scan times.
+
+    Args:
+        db_path: Path to the .duckdb file
+
+    Returns:
+        dict: Row and size report, or None if the file was already compact
+    """
+    if not os.path.exists(db_path):
+        return None
+    conn = duckdb.connect(db_path)
+    try:
+        if not needs_compaction(conn):
+            return None
+        if has_seed_strings(conn):
+            source, seed_key = RESULTS_VIEW, "Seed"
+        else:
+            source, seed_key = RESULT_ROWS_TABLE, SEED_ID_COLUMN
+        types = column_types(conn, source)
+        if seed_key == "Seed":
+            # Only well-formed seeds can be packed; the CLI never writes anything else
+            valid = f"""coalesce(regexp_full_match(upper("Seed"), '{VALID_SEED_PATTERN}'), false)"""
+            rows, malformed = conn.execute(
+                f"SELECT COUNT(*), COUNT(*) FILTER (WHERE NOT {valid}) FROM {source}").fetchone()
+        else:
+            rows = conn.execute(f"SELECT COUNT(*) FROM {source}").fetchone()[0]
+            malformed = 0
+
+        # Size each column to its data, never below the kernel's field width
+        value_columns = [col for col in types if col.lower() != seed_key.lower()]
+        ranges = _value_ranges(conn, value_columns, source)
+        columns_def = []
+        for col in value_columns:
+            minimum, maximum = ranges.get(col, (None, None))
+            columns_def.append(f'"{col}" {fitting_type(minimum, maximum, at_least=compact_type(col))}')
+
+        compact_path = db_path + ".compact"
+        if os.path.exists(compact_path):
+            os.remove(compact_path)
+        target = compact_path.replace("'", "''")
+        original = '"' + conn.execute("SELECT current_database()").fetchone()[0].replace('"', '""') + '"'
+        conn.execute(f"ATTACH '{target}' AS compact")
+        conn.execute("USE compact")
+        create_results_schema(conn, columns_def)
+        value_names = ", ".join([f'"{col}"' for col in value_columns])
+        if seed_key == "Seed":
+            seed_id, condition = 'ouija_seed_id(upper("Seed"))', f"WHERE {valid}"
+        else:
+            seed_id, condition = f'"{SEED_ID_COLUMN}"', ""
+        conn.execute(
+            f'INSERT OR REPLACE INTO {RESULT_ROWS_TABLE} ("{SEED_ID_COLUMN}", {value_names}) '
+            f"SELECT {seed_id}, {value_names} FROM {original}.{source} {condition}"
+        )
+        kept = conn.execute(f"SELECT COUNT(*) FROM {RESULT_ROWS_TABLE}").fetchone()[0]
+        # Results of earlier CLI headers are copied over as they are
+        from models.result_versions import copy_versions
+        copy_versions(conn, original, "compact")
+        conn.execute(f"USE {original}")
+        conn.execute("CHECKPOINT compact")
+        conn.execute("DETACH compact")
+    finally:
+        conn.close()
+
+    bytes_before = os.path.getsize(db_path)
+    os.replace(compact_path, db_path)
+    bytes_after = os.path.getsize(db_path)
+
+    return {
+        "database_path": db_path,
+        "rows": rows,
+        "rows_malformed": malformed,
+        "rows_merged": rows - malformed - kept,
+        "bytes_before": bytes_before,
+        "bytes_after": bytes_after,
+    }
+
+
+def format_report(report):
+    """Format a compact_database_file() report for the console
+
+    Scan times are included when the report has scan_seconds_before/after (see main()).
+    """
+    before_mb = report["bytes_before"] / (1 << 20)
+    after_mb = report["bytes_after"] / (1 << 20)
+    ratio = report["bytes_before"] / report["bytes_after"] if report["bytes_after"] else 0.0
+    text = f"{os.path.basename(report['database_path'])}: {report['rows']} rows"
+    if report["rows_malformed"]:
+        text += f", {report['rows_malformed']} malformed seeds dropped"
+    if report["rows_merged"]:
+        text += f", {report['rows_merged']} case duplicates merged"
+    text += f", {before_mb:.1f} MB -> {after_mb:.1f} MB ({ratio:.1f}x smaller)"
+    if "scan_seconds_after" in report:
+        text += (f", scan {report['scan_seconds_before'] * 1000:.1f} ms -> "
+                 f"{report['scan_seconds_after'] * 1000:.1f} ms")
+    return text
+
+
+def main():
+    """Compact every database in a directory (default: the app's ouija_database)
+
+    Usage (from the Ouija-ui directory, with the app closed):
+        python -m models.result_schema [database_dir]
+    """
+    if len(sys.argv) > 1:
+        db_dir = sys.argv[1]
+    else:
+        from models.database_model import DatabaseModel
+        db_dir = DatabaseModel().DB_DIR
+    for name in sorted(os.listdir(db_dir)):
+        if not name.endswith(".duckdb"):
+            continue
+        path = os.path.join(db_dir, name)
+        try:
+            conn = duckdb.connect(path)
+            try:
+                outdated = needs_compaction(conn)
+            finally:
+                conn.close()
+            if not outdated:
+                print(f"{name}: already compact")
+                continue
+            scan_before = scan_seconds(path)
+            report = compact_database_file(path)
+            report.update(scan_seconds_before=scan_before, scan_seconds_after=scan_seconds(path))
+        except Exception as e:
+            print(f"{name}: migration failed: {e}")
+            continue
+        print(format_report(report))
+
+
+if __name__ == "__main__":
+    main()
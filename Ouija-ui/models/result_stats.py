@@ -0,0 +1,308 @@
+"""
+Result Stats - Score and per-want histograms kept current by the ingest path
+"""
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from models.result_schema import RESULT_ROWS_TABLE, SEED_ID_COLUMN, column_types
+
+# Row counts per (column, value) of result_rows. Batches append their counts
+# (negative for rows they replaced), so a value can have several rows; readers
+# sum them and the table is folded back to one row per value now and then.
+HISTOGRAM_TABLE = "result_histogram"
+HISTOGRAM_SCHEMA_SQL = (f'CREATE TABLE IF NOT EXISTS {HISTOGRAM_TABLE} '
+                        f'("Column" VARCHAR, "Value" BIGINT, "Rows" BIGINT)')
+SCORE_CUTOFFS_VIEW = "result_score_cutoffs"
+SCORE_CUTOFFS_VIEW_SQL = (f'CREATE OR REPLACE VIEW {SCORE_CUTOFFS_VIEW} AS '
+                          f'SELECT "Score", "Rows", SUM("Rows") OVER (ORDER BY "Score" DESC)::BIGINT '
+                          f'AS "Rows At Or Above" FROM ('
+                          f'SELECT "Value" AS "Score", SUM("Rows")::BIGINT AS "Rows" FROM {HISTOGRAM_TABLE} '
+                          f'WHERE "Column" = \'Score\' GROUP BY "Value" HAVING SUM("Rows") > 0)')
+
+
+def histogram_deltas(frame, columns, sign=1):
+    """Count the rows of a frame per (column, value)
+
+    Args:
+        frame: pandas.DataFrame with the value columns
+        columns: CLI header columns to count (Seed first; the seed isn't counted)
+        sign: 1 for rows being added, -1 for rows being removed
+
+    Returns:
+        pandas.DataFrame: Column, Value, Rows
+    """
+    names, values, rows = [], [], []
+    for col in columns[1:]:
+        if col not in frame.columns or col == SEED_ID_COLUMN:
+            continue
+        data = frame[col].to_numpy()
+        if data.dtype.kind not in "iu":
+            data = pd.to_numeric(frame[col], errors="coerce").dropna().to_numpy()
+        if len(data) == 0:
+            continue
+        # Values are small counters and scores, so counting is a bincount
+        data = data.astype(np.int64)
+        low = int(data.min())
+        counts = np.bincount(data - low)
+        present = np.flatnonzero(counts)
+        names.append(np.full(len(present), col, dtype=object))
+        values.append(present + low)
+        rows.append(counts[present] * sign)
+    if not names:
+        return pd.DataFrame({"Column": pd.Series(dtype=object), "Value": pd.Series(dtype="int64"),
+                             "Rows": pd.Series(dtype="int64")})
+    return pd.DataFrame({"Column": np.concatenate(names), "Value": np.concatenate(values),
+                         "Rows": np.concatenate(rows)})
+
+
+class ResultStats:
+    """Histograms of result_rows, stored next to it and updated with each upserted batch
+
+    Each batch's counts are added up in memory and appended to the histogram
+    table at most every FLUSH_SECONDS (and before every read), so counting
+    costs the ingest path a bincount per column rather than a statement per
+    batch. Every FOLD_FLUSHES appends the table is folded back to one row per
+    value.
+
+    The histogram table is either current or missing: anything that changes rows
+    without going through update() (pruning, a schema version switch, the
+    row-by-row path) drops it with invalidate(), and the next read rebuilds it
+    with one scan. Until then batches skip the bookkeeping. A table left behind
+    by a crash before the last flush is caught on open by comparing its total
+    with the table's row count. Callers serialize update() and ensure() with the
+    writes to result_rows (DatabaseModel.write_lock).
+    """
+
+    FLUSH_SECONDS = 1.0
+    FOLD_FLUSHES = 64
+
+    def __init__(self):
+        """Initialize with the histogram state unknown"""
+        self._lock = threading.Lock()
+        self._ready = None  # None: not checked yet; False: missing, rebuilt on the next read
+        self._pending = []  # Batch counts not yet appended to the table
+        self._last_flush = time.monotonic()
+        self._flushes = 0  # Appends since the table was last folded
+
+        # Counters
+        self.batches_counted = 0
+        self.rebuilds = 0
+
+    @property
+    def ready(self):
+        """Whether the histograms are known to be current"""
+        return self._ready is True
+
+    def reset(self):
+        """Forget the state (connected to another database)"""
+        with self._lock:
+            self._ready = None
+            self._pending = []
+
+    def invalidate(self, conn, recheck=False):
+        """Drop the histograms after rows changed behind update()'s back
+
+        Args:
+            conn: Connection or cursor on the database
+            recheck: The table was just replaced; if the new one is empty the next
+                     batch starts counting again instead of waiting for a read
+        """
+        with self._lock:
+            self._pending = []
+            if self._ready is not False:
+                try:
+                    conn.execute(f"DROP VIEW IF EXISTS {SCORE_CUTOFFS_VIEW}")
+                    conn.execute(f"DROP TABLE IF EXISTS {HISTOGRAM_TABLE}")
+                except Exception as e:
+                    print(f"Result stats: could not drop histograms ({e})")
+            self._ready = None if recheck else False
+
+    def prepare(self, conn):
+        """Check the histograms before a batch is written (an empty table starts them)
+
+        Returns:
+            bool: True if the batch should be counted with update()
+        """
+        with self._lock:
+            return self._check(conn)
+
+    def update(self, conn, columns, added, removed=None):
+        """Count an upserted batch; prepare() must have run before it was written
+
+        Args:
+            conn: Connection or cursor the batch was written through
+            columns: CLI header columns of the batch (Seed first)
+            added: pandas.DataFrame of the rows written
+            removed: Optional pandas.DataFrame of the stored rows they replaced
+        """
+        with self._lock:
+            if self._ready is not True:
+                return
+            self._pending.append(histogram_deltas(added, columns))
+            if removed is not None and not removed.empty:
+                self._pending.append(histogram_deltas(removed, columns, -1))
+            self.batches_counted += 1
+            if time.monotonic() - self._last_flush >= self.FLUSH_SECONDS:
+                self._flush(conn)
+
+    def flush(self, conn):
+        """Append the counts of batches since the last flush (before closing)"""
+        with self._lock:
+            if self._ready is True:
+                self._flush(conn)
+
+    def ensure(self, conn):
+        """Flush, or rebuild the histograms from result_rows if they are missing
+
+        Returns:
+            bool: True if the histograms are current
+        """
+        with self._lock:
+            if self._check(conn):
+                self._flush(conn)
+                return self._ready
+            try:
+                self._rebuild(conn)
+                return True
+            except Exception as e:
+                print(f"Result stats: could not rebuild histograms ({e})")
+                return False
+
+    def _flush(self, conn):
+        """Append pending counts, folding the table now and then; caller holds the lock"""
+        self._last_flush = time.monotonic()
+        if not self._pending:
+            return
+        deltas = pd.concat(self._pending, ignore_index=True)
+        self._pending = []
+        deltas = deltas.groupby(["Column", "Value"], as_index=False, sort=False)["Rows"].sum()
+        deltas = deltas[deltas["Rows"] != 0]
+        conn.register("_histogram_deltas", deltas)
+        try:
+            conn.execute(f'INSERT INTO {HISTOGRAM_TABLE} SELECT "Column", "Value", "Rows" FROM _histogram_deltas')
+            self._flushes += 1
+            if self._flushes >= self.FOLD_FLUSHES:
+                self._fold(conn)
+        except Exception as e:
+            # Counting must never cost a batch; rebuild from the table instead
+            print(f"Result stats: could not record counts ({e}); rebuilding on next read")
+            conn.execute(f"DROP TABLE IF EXISTS {HISTOGRAM_TABLE}")
+            self._ready = False
+        finally:
+            conn.unregister("_histogram_deltas")
+
+    def _fold(self, conn):
+        """Rewrite the histogram table with one row per value; caller holds the lock"""
+        totals = conn.execute(
+            f'SELECT "Column", "Value", SUM("Rows")::BIGINT AS "Rows" FROM {HISTOGRAM_TABLE} '
+            f'GROUP BY "Column", "Value" HAVING SUM("Rows") <> 0').fetch_df()
+        conn.register("_histogram_totals", totals)
+        conn.execute("BEGIN TRANSACTION")
+        try:
+            conn.execute(f"DELETE FROM {HISTOGRAM_TABLE}")
+            conn.execute(f"INSERT INTO {HISTOGRAM_TABLE} SELECT * FROM _histogram_totals")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.unregister("_histogram_totals")
+        self._flushes = 0
+
+    def _check(self, conn):
+        """Whether the histogram table is current; caller holds the lock"""
+        if self._ready is None:
+            tables = {row[0] for row in conn.execute(
+                "SELECT table_name FROM information_schema.tables "
+                "WHERE table_catalog = current_database() AND table_schema = current_schema()").fetchall()}
+            if RESULT_ROWS_TABLE not in tables:
+                self._ready = False
+            elif HISTOGRAM_TABLE in tables:
+                # Every column counts every row; a table a crash left behind doesn't
+                counted = conn.execute(
+                    f'SELECT MAX("Total") FROM (SELECT SUM("Rows") AS "Total" FROM {HISTOGRAM_TABLE} '
+                    f'GROUP BY "Column")').fetchone()[0] or 0
+                stored = conn.execute(f"SELECT COUNT(*) FROM {RESULT_ROWS_TABLE}").fetchone()[0]
+                self._ready = counted == stored
+                if not self._ready:
+                    conn.execute(f"DROP TABLE {HISTOGRAM_TABLE}")
+            elif conn.execute(f"SELECT COUNT(*) FROM (SELECT 1 FROM {RESULT_ROWS_TABLE} LIMIT 1)").fetchone()[0] == 0:
+                # Nothing stored yet: start counting from zero
+                conn.execute(HISTOGRAM_SCHEMA_SQL)
+                conn.execute(SCORE_CUTOFFS_VIEW_SQL)
+                self._ready = True
+            else:
+                self._ready = False
+        return self._ready
+
+    def _rebuild(self, conn):
+        """Count every stored row, one GROUP BY per column; caller holds the lock"""
+        value_columns = [col for col in column_types(conn) if col != SEED_ID_COLUMN]
+        self._pending = []  # Already in the table being counted
+        conn.execute("BEGIN TRANSACTION")
+        try:
+            conn.execute(f"DROP TABLE IF EXISTS {HISTOGRAM_TABLE}")
+            conn.execute(HISTOGRAM_SCHEMA_SQL)
+            for col in value_columns:
+                name = col.replace("'", "''")
+                conn.execute(
+                    f'INSERT INTO {HISTOGRAM_TABLE} SELECT \'{name}\', "{col}", COUNT(*) '
+                    f'FROM {RESULT_ROWS_TABLE} WHERE "{col}" IS NOT NULL GROUP BY "{col}"')
+            conn.execute(SCORE_CUTOFFS_VIEW_SQL)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._ready = True
+        self._flushes = 0
+        self.rebuilds += 1
+
+    def stats(self):
+        """Get the bookkeeping counters
+
+        Returns:
+            dict: Batches counted incrementally, full rebuilds and whether the histograms are current
+        """
+        return {"batches_counted": self.batches_counted, "rebuilds": self.rebuilds, "ready": bool(self._ready)}
+
+
+def read_histogram(conn, column="Score"):
+    """Rows per value of a results column
+
+    Returns:
+        pandas.DataFrame: Value, Rows in value order (values with no rows left out)
+    """
+    return conn.execute(
+        f'SELECT "Value", SUM("Rows")::BIGINT AS "Rows" FROM {HISTOGRAM_TABLE} WHERE "Column" = ? '
+        f'GROUP BY "Value" HAVING SUM("Rows") > 0 ORDER BY "Value"', [column]).fetch_df()
+
+
+def read_score_cutoffs(conn):
+    """Rows per score with the number of rows at or above it
+
+    Returns:
+        pandas.DataFrame: Score, Rows, Rows At Or Above; best score first
+    """
+    return conn.execute(f'SELECT * FROM {SCORE_CUTOFFS_VIEW} ORDER BY "Score" DESC').fetch_df()
+
+
+def rows_at_or_above(conn, score):
+    """Number of stored results scoring at least score"""
+    return conn.execute(
+        f'SELECT COALESCE(SUM("Rows"), 0)::BIGINT FROM {HISTOGRAM_TABLE} '
+        f'WHERE "Column" = \'Score\' AND "Value" >= ?', [int(score)]).fetchone()[0]
+
+
+def cutoff_for_rows(conn, rows):
+    """Lowest score that keeps at most rows results at or above it
+
+    Returns:
+        int: Score, or None if even the best score has more results than that
+    """
+    row = conn.execute(
+        f'SELECT MIN("Score") FROM {SCORE_CUTOFFS_VIEW} WHERE "Rows At Or Above" <= ?', [int(rows)]).fetchone()
+    return row[0] if row else None
@@ -0,0 +1,233 @@
+"""
+Result Versions - Results of earlier CLI headers kept in archived tables instead of being dropped
+"""
+
+import hashlib
+
+from models.result_schema import (RESULT_ROWS_TABLE, RESULTS_VIEW_SQL, SEED_COLUMN_SQL, SEED_ID_COLUMN,
+                                   create_results_schema, table_definition)
+
+# One row per schema version: the header's value columns and the table holding its rows.
+# result_rows always holds the current version; earlier ones are renamed to result_rows_<version>.
+VERSIONS_TABLE = "result_versions"
+ALL_VERSIONS_VIEW = "results_all_versions"
+VERSION_COLUMN = "SchemaVersion"
+
+
+def header_version(columns):
+    """Schema version of a CLI header
+
+    Headers with the same value columns share a version, whatever their order.
+
+    Args:
+        columns: CLI header columns (Seed first) or table columns (SeedId first)
+
+    Returns:
+        str: 8 hex digits
+    """
+    names = sorted(col for col in columns if col not in ("Seed", SEED_ID_COLUMN))
+    return hashlib.sha1("\n".join(names).encode("utf-8")).hexdigest()[:8]
+
+
+def archived_table(version):
+    """Table name a schema version's rows are kept in once it is no longer current"""
+    return f"{RESULT_ROWS_TABLE}_{version}"
+
+
+def create_versions_table(conn):
+    """Create the version catalog if it doesn't exist"""
+    conn.execute(
+        f'CREATE TABLE IF NOT EXISTS {VERSIONS_TABLE} ('
+        f'"Version" VARCHAR PRIMARY KEY, "Columns" VARCHAR[], "TableName" VARCHAR, '
+        f'"Created" TIMESTAMP DEFAULT current_timestamp, "Retired" TIMESTAMP)'
+    )
+
+
+def _table_names(conn):
+    """Base tables in the current schema"""
+    return {row[0] for row in conn.execute(
+        "SELECT table_name FROM information_schema.tables "
+        "WHERE table_catalog = current_database() AND table_schema = current_schema() "
+        "AND table_type = 'BASE TABLE'").fetchall()}
+
+
+def load_versions(conn):
+    """Read the version catalog
+
+    A results table from before versioning is listed as the current version
+    without being registered.
+
+    Returns:
+        list: Dicts with version, columns, table, created, retired (current version
+              first, then newest retired first); empty if there are no results
+    """
+    tables = _table_names(conn)
+    versions = []
+    if VERSIONS_TABLE in tables:
+        rows = conn.execute(
+            f'SELECT "Version", "Columns", "TableName", "Created", "Retired" FROM {VERSIONS_TABLE} '
+            f'ORDER BY "Retired" DESC NULLS FIRST, "Created" DESC').fetchall()
+        versions = [{"version": version, "columns": list(columns), "table": table, "created": created,
+                     "retired": retired} for version, columns, table, created, retired in rows if table in tables]
+    if RESULT_ROWS_TABLE in tables and not any(entry["table"] == RESULT_ROWS_TABLE for entry in versions):
+        columns = [row[1] for row in conn.execute(f"PRAGMA table_info({RESULT_ROWS_TABLE})").fetchall()
+                   if row[1] != SEED_ID_COLUMN]
+        versions.insert(0, {"version": header_version(columns), "columns": columns, "table": RESULT_ROWS_TABLE,
+                            "created": None, "retired": None})
+    return versions
+
+
+def current_version(conn):
+    """Schema version stored in result_rows, registering a table from before versioning
+
+    Returns:
+        str: Version, or None if there is no result_rows table
+    """
+    create_versions_table(conn)
+    if RESULT_ROWS_TABLE not in _table_names(conn):
+        conn.execute(f'DELETE FROM {VERSIONS_TABLE} WHERE "TableName" = ?', [RESULT_ROWS_TABLE])
+        return None
+    row = conn.execute(
+        f'SELECT "Version" FROM {VERSIONS_TABLE} WHERE "TableName" = ?', [RESULT_ROWS_TABLE]).fetchone()
+    if row:
+        return row[0]
+    columns = [row[1] for row in conn.execute(f"PRAGMA table_info({RESULT_ROWS_TABLE})").fetchall()]
+    version = header_version(columns)
+    _register(conn, version, columns, RESULT_ROWS_TABLE)
+    return version
+
+
+def _register(conn, version, columns, table):
+    """Record where a version's rows are; retired unless it's the current table"""
+    value_columns = [col for col in columns if col not in ("Seed", SEED_ID_COLUMN)]
+    retired = "NULL" if table == RESULT_ROWS_TABLE else "current_timestamp"
+    conn.execute(
+        f'INSERT INTO {VERSIONS_TABLE} ("Version", "Columns", "TableName", "Retired") '
+        f'VALUES (?, ?, ?, {retired}) ON CONFLICT ("Version") DO UPDATE SET '
+        f'"Columns" = excluded."Columns", "TableName" = excluded."TableName", "Retired" = excluded."Retired"',
+        [version, value_columns, table])
+
+
+def activate_version(conn, columns, columns_def):
+    """Make result_rows hold the schema version of a CLI header
+
+    The rows of the version it held are kept: the table is renamed to
+    result_rows_<version> (an empty one is dropped instead). A version that was
+    current before is renamed back, so going back to an earlier header picks up
+    its stored results again. Runs as one transaction on conn.
+
+    Args:
+        conn: Connection or cursor on the database (not inside a transaction)
+        columns: CLI header columns (Seed first)
+        columns_def: Column definitions for a new result_rows table
+
+    Returns:
+        str: The header's version, or None if result_rows already held it
+    """
+    version = header_version(columns)
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        current = current_version(conn)
+        if current == version:
+            conn.execute("ROLLBACK")
+            return None
+        tables = _table_names(conn)
+        if current is not None:
+            rows = conn.execute(f"SELECT COUNT(*) FROM {RESULT_ROWS_TABLE}").fetchone()[0]
+            retired = archived_table(current)
+            if rows == 0:
+                conn.execute(f"DROP TABLE {RESULT_ROWS_TABLE}")
+                conn.execute(f'DELETE FROM {VERSIONS_TABLE} WHERE "Version" = ?', [current])
+            elif retired in tables:
+                # Only a table from before versioning can collide with an archived version
+                conn.execute(f"INSERT OR REPLACE INTO {retired} BY NAME SELECT * FROM {RESULT_ROWS_TABLE}")
+                conn.execute(f"DROP TABLE {RESULT_ROWS_TABLE}")
+                _register(conn, current, [row[1] for row in conn.execute(
+                    f"PRAGMA table_info({retired})").fetchall()], retired)
+            else:
+                conn.execute(f"ALTER TABLE {RESULT_ROWS_TABLE} RENAME TO {retired}")
+                _register(conn, current, [row[1] for row in conn.execute(
+                    f"PRAGMA table_info({retired})").fetchall()], retired)
+
+        restored = archived_table(version)
+        if restored in tables:
+            conn.execute(f"ALTER TABLE {restored} RENAME TO {RESULT_ROWS_TABLE}")
+            conn.execute(RESULTS_VIEW_SQL)
+        else:
+            create_results_schema(conn, columns_def)
+        _register(conn, version, columns, RESULT_ROWS_TABLE)
+        create_all_versions_view(conn)
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    return version
+
+
+def all_versions_query(conn):
+    """Build a SELECT over every schema version's rows; pass the frame through seed_strings()
+
+    Rows are matched up by column name; a column a version doesn't have (a Want
+    added or removed since) is NULL in its rows. A seed found under several
+    versions appears once per version, tagged with SchemaVersion.
+
+    Returns:
+        str: SQL query returning SchemaVersion, SeedId and the union of the value
+             columns, or None if there are no results
+    """
+    selects = [f"""SELECT '{entry["version"]}' AS "{VERSION_COLUMN}", * FROM {entry["table"]}"""
+               for entry in load_versions(conn)]
+    return " UNION ALL BY NAME ".join(selects) if selects else None
+
+
+def create_all_versions_view(conn):
+    """(Re)create the results_all_versions view (Seed spelled out) over all_versions_query()"""
+    union = all_versions_query(conn)
+    if union is None:
+        conn.execute(f"DROP VIEW IF EXISTS {ALL_VERSIONS_VIEW}")
+        return
+    conn.execute(
+        f'CREATE OR REPLACE VIEW {ALL_VERSIONS_VIEW} AS '
+        f'SELECT {SEED_COLUMN_SQL}, * EXCLUDE ("{SEED_ID_COLUMN}") FROM ({union})')
+
+
+def archived_tables(conn):
+    """Tables holding earlier schema versions' rows"""
+    return [entry["table"] for entry in load_versions(conn) if entry["table"] != RESULT_ROWS_TABLE]
+
+
+def copy_versions(conn, source, target):
+    """Copy the version catalog and archived tables between attached databases
+
+    Used when a database file is rewritten, so earlier versions survive it.
+
+    Args:
+        conn: Connection with both databases attached, target in use
+        source: Quoted name of the database to copy from
+        target: Quoted name of the database to copy to
+
+    Returns:
+        int: Number of archived tables copied
+    """
+    conn.execute(f"USE {source}")
+    tables = archived_tables(conn)
+    definitions = {table: table_definition(conn, table) for table in tables}
+    has_catalog = VERSIONS_TABLE in _table_names(conn)
+    conn.execute(f"USE {target}")
+    if not has_catalog:
+        return 0
+    create_versions_table(conn)
+    conn.execute(f"INSERT OR REPLACE INTO {VERSIONS_TABLE} SELECT * FROM {source}.{VERSIONS_TABLE}")
+    for table, definition in definitions.items():
+        conn.execute(f"CREATE TABLE {table} ({definition})")
+        conn.execute(f'INSERT INTO {table} SELECT * FROM {source}.{table} ORDER BY "{SEED_ID_COLUMN}"')
+    create_all_versions_view(conn)
+    return len(tables)
+
+
+def drop_versions(conn):
+    """Drop every archived version, the catalog and the merged view"""
+    for table in archived_tables(conn):
+        conn.execute(f"DROP TABLE {table}")
+    conn.execute(f"DROP VIEW IF EXISTS {ALL_VERSIONS_VIEW}")
+    conn.execute(f"DROP TABLE IF EXISTS {VERSIONS_TABLE}")
@@ -0,0 +1,155 @@
+"""
+Results Pager - Keyset pagination over the results table with a small page cache
+"""
+
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+class ResultsPager:
+    """Pages through results ordered by Score DESC, Seed ASC
+
+    Each page is fetched with a keyset query that starts after the last
+    (Score, Seed) of the page before it, so reading page 500 costs the same as
+    reading page 1 and nothing above the requested window is scanned into
+    memory. Only the key before each visited page and the last few pages are
+    kept, so memory stays flat however many rows the table holds.
+
+    After a page is served its neighbours are fetched on a background thread.
+    Any write to the database (DatabaseModel.change_token) drops the cached
+    pages; the page keys stay valid positions and are reused.
+    """
+
+    MAX_CACHED_PAGES = 5
+
+    def __init__(self, db_model, page_size=1000):
+        """Initialize the pager
+
+        Args:
+            db_model: DatabaseModel to read from
+            page_size: Rows per page
+        """
+        self.db_model = db_model
+        self.page_size = page_size
+        self._lock = threading.Lock()
+        self._pages = OrderedDict()  # page index -> DataFrame, least recently used first
+        self._after_keys = {0: None}  # page index -> (Score, Seed) of the last row before it
+        self._token = None  # change_token the cached pages were read at
+        self._db_path = None
+        self._total_rows = None
+        self._prefetching = {}  # page index -> Future of its background fetch
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="OuijaResultsPager")
+
+        # Counters
+        self.fetches = 0
+        self.cache_hits = 0
+
+    def get_page(self, index):
+        """Get one page of results
+
+        Args:
+            index: Zero-based page number
+
+        Returns:
+            pandas.DataFrame: The page (empty past the end), or None if there is no results table
+        """
+        index = max(0, index)
+        self._sync()
+        with self._lock:
+            pending = self._prefetching.get(index)
+        if pending is not None:
+            # Already being fetched in the background; wait for it rather than querying twice
+            pending.result()
+        with self._lock:
+            frame = self._pages.get(index)
+            if frame is not None:
+                self._pages.move_to_end(index)
+                self.cache_hits += 1
+        if frame is None:
+            # Pages are keyed on the page before them; walk forward to the first unknown key
+            start = index
+            while start not in self._after_keys:
+                start -= 1
+            for page in range(start, index + 1):
+                if page not in self._after_keys:
+                    return frame.iloc[0:0]  # The page before was the last one
+                frame = self._fetch(page, self._token)
+                if frame is None:
+                    return None
+        self._prefetch(index + 1)
+        if index > 0:
+            self._prefetch(index - 1)
+        return frame
+
+    def total_rows(self):
+        """Number of rows in the results table (cached until the next write)"""
+        self._sync()
+        with self._lock:
+            if self._total_rows is None:
+                self._total_rows = self.db_model.count_results()
+            return self._total_rows
+
+    def page_count(self):
+        """Number of pages needed for all rows (at least 1)"""
+        return max(1, -(-self.total_rows() // self.page_size))
+
+    def reset(self):
+        """Forget cached pages and page keys (e.g. after switching databases)"""
+        with self._lock:
+            self._pages.clear()
+            self._after_keys = {0: None}
+            self._total_rows = None
+
+    def close(self):
+        """Stop the prefetch thread"""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def _sync(self):
+        """Drop cached pages if the database changed since they were read"""
+        db_path = self.db_model.current_db_path
+        token = self.db_model.change_token
+        if db_path != self._db_path:
+            self.reset()
+            self._db_path = db_path
+        elif token != self._token:
+            with self._lock:
+                self._pages.clear()
+                self._total_rows = None
+        self._token = token
+
+    def _fetch(self, index, token):
+        """Read a page from the database and cache it if nothing changed meanwhile"""
+        frame = self.db_model.query_results_after(self._after_keys.get(index), self.page_size)
+        self.fetches += 1
+        if frame is None:
+            return None
+        with self._lock:
+            if len(frame) == self.page_size:
+                self._after_keys[index + 1] = (int(frame["Score"].iloc[-1]), str(frame["Seed"].iloc[-1]))
+            if token == self.db_model.change_token:
+                self._pages[index] = frame
+                self._pages.move_to_end(index)
+                while len(self._pages) > self.MAX_CACHED_PAGES:
+                    self._pages.popitem(last=False)
+        return frame
+
+    def _prefetch(self, index):
+        """Fetch a page on the background thread if it isn't cached or reachable yet"""
+        with self._lock:
+            if index in self._pages or index in self._prefetching or index not in self._after_keys:
+                return
+
+            def run(token=self._token):
+                try:
+                    self._fetch(index, token)
+                except Exception as e:
+                    print(f"Error prefetching results page {index + 1}: {e}")
+                finally:
+                    with self._lock:
+                        self._prefetching.pop(index, None)
+
+            try:
+                self._prefetching[index] = self._executor.submit(run)
+            except RuntimeError:
+                pass  # Pager closed
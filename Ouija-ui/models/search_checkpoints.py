@@ -0,0 +1,182 @@
+"""
+Search Checkpoints - Where each search of a config got to, so it can be resumed at the exact next seed
+"""
+
+from models.seed_codec import LENGTH_OFFSETS, SEED_COUNT, decode_seed, encode_seed, seed_length
+
+# The CLI prints '#CKPT <start seed> <offset> <seeds>' after every batch: the -s it
+# was started with (the generated one for -s random), how many seeds it has finished
+# and its -n. Everything before the line is already on stdout.
+CHECKPOINT_MARKER = "#CKPT "
+CHECKPOINTS_TABLE = "search_checkpoints"
+
+
+def parse_checkpoint_line(line):
+    """Parse a '#CKPT <start seed> <offset> <seeds>' line
+
+    The start seed is empty when the CLI was started without one.
+
+    Returns:
+        tuple: (start seed, offset, seeds) or None if the line is not a checkpoint
+    """
+    if not line.startswith(CHECKPOINT_MARKER):
+        return None
+    parts = line[len(CHECKPOINT_MARKER):].split()
+    if len(parts) == 2:
+        parts.insert(0, "")
+    try:
+        start_seed, offset, seeds = parts
+        return start_seed.upper(), int(offset), int(seeds)
+    except ValueError:
+        return None
+
+
+def start_seed_id(start_seed):
+    """Seed id the kernel counts its offsets from; an empty start seed comes just before "1" (-1)"""
+    return encode_seed(start_seed) if start_seed else -1
+
+
+def within_one_length(start_seed, seeds):
+    """Whether the first seeds seeds from start_seed all have start_seed's length
+
+    CLI builds whose s_skip() predates the shortlex count step to the wrong seeds
+    once the length grows, so only such runs are counted by seed id.
+    """
+    if not start_seed:
+        return False
+    first_id = start_seed_id(start_seed)
+    return first_id + int(seeds) <= LENGTH_OFFSETS[seed_length(first_id) + 1]
+
+
+def seed_after(start_seed, offset):
+    """The seed offset places after start_seed, in shortlex order as s_skip() counts
+
+    Older CLI builds only agree within start_seed's length; see within_one_length().
+
+    Returns:
+        str: The seed, or None once the seed space is exhausted
+    """
+    target = start_seed_id(start_seed) + int(offset)
+    if not 0 <= target < SEED_COUNT:
+        return None
+    return decode_seed(target)
+
+
+class SearchRun:
+    """One search across every CLI process that worked on it
+
+    A fresh search starts at its first seed; a resumed one keeps the first seed
+    and seed count of the search it continues, and counts its CLI's offsets from
+    where that search stopped. Checkpoints are always relative to the first seed.
+    """
+
+    def __init__(self, first_seed=None, seeds=None, base_offset=0, config_hash=None, template=None):
+        """Initialize the run
+
+        Args:
+            first_seed: First seed of the search (None: taken from the CLI's first checkpoint)
+            seeds: Number of seeds in the whole search (None: the CLI's -n)
+            base_offset: Seeds already searched before this CLI process started
+            config_hash: config_hash() of the filter the CLI runs, for the coverage index
+            template: Filter template (-f) the CLI runs
+        """
+        self.first_seed = first_seed
+        self.seeds = seeds
+        self.base_offset = base_offset
+        self.config_hash = config_hash
+        self.template = template
+        self.resized_from = []  # Seed counts before each resize(); their checkpoint rows are replaced
+
+    def resize(self, seeds):
+        """Shrink the search to its first seeds (the rest was handed to another process)"""
+        if self.seeds is not None and self.seeds != seeds:
+            self.resized_from.append(self.seeds)
+        self.seeds = seeds
+
+    def checkpoint(self, start_seed, offset, seeds):
+        """Turn a CLI checkpoint into a checkpoint of the whole search
+
+        Returns:
+            dict: first_seed, seeds, offset, config_hash and template for the coverage index, and
+                  resized_from (earlier seed counts whose rows this one replaces)
+        """
+        if self.first_seed is None:
+            self.first_seed = start_seed
+        if self.seeds is None:
+            self.seeds = self.base_offset + seeds
+        return {"first_seed": self.first_seed, "seeds": self.seeds, "offset": self.base_offset + offset,
+                "config_hash": self.config_hash, "template": self.template, "resized_from": list(self.resized_from)}
+
+
+def create_checkpoints_table(conn):
+    """Create the checkpoint table if it doesn't exist (one row per search)"""
+    conn.execute(
+        f'CREATE TABLE IF NOT EXISTS {CHECKPOINTS_TABLE} ('
+        f'"FirstSeed" VARCHAR, "Seeds" BIGINT, "Offset" BIGINT, '
+        f'"Started" TIMESTAMP DEFAULT current_timestamp, "Updated" TIMESTAMP, '
+        f'PRIMARY KEY ("FirstSeed", "Seeds"))'
+    )
+
+
+def save_checkpoints(conn, checkpoints):
+    """Record how far searches got
+
+    Args:
+        conn: Connection or cursor on the config's database
+        checkpoints: Dicts from SearchRun.checkpoint()
+    """
+    create_checkpoints_table(conn)
+    conn.executemany(
+        f'INSERT INTO {CHECKPOINTS_TABLE} ("FirstSeed", "Seeds", "Offset", "Updated") '
+        f'VALUES (?, ?, ?, current_timestamp) ON CONFLICT ("FirstSeed", "Seeds") DO UPDATE SET '
+        f'"Offset" = excluded."Offset", "Updated" = excluded."Updated"',
+        [[c["first_seed"], c["seeds"], c["offset"]] for c in checkpoints])
+    # After the upsert: the same batch may still hold checkpoints from before the resize
+    resized = {(c["first_seed"], seeds) for c in checkpoints for seeds in c.get("resized_from") or []}
+    if resized:
+        conn.executemany(f'DELETE FROM {CHECKPOINTS_TABLE} WHERE "FirstSeed" = ? AND "Seeds" = ?',
+                         [list(key) for key in resized])
+
+
+def _table_exists(conn):
+    """Check whether the checkpoint table exists in the current database"""
+    return conn.execute(
+        "SELECT COUNT(*) FROM information_schema.tables WHERE table_catalog = current_database() "
+        "AND table_schema = current_schema() AND table_name = ?", [CHECKPOINTS_TABLE]).fetchone()[0] > 0
+
+
+def load_checkpoints(conn):
+    """Read every search's checkpoint, most recently updated first
+
+    Returns:
+        list: Dicts with first_seed, seeds, offset, started, updated, finished and
+              next_seed / remaining (the -s / -n that resume it; None once finished, or
+              when the search crosses a seed length and can't be resumed by offset)
+    """
+    if not _table_exists(conn):
+        return []
+    rows = conn.execute(
+        f'SELECT "FirstSeed", "Seeds", "Offset", "Started", "Updated" FROM {CHECKPOINTS_TABLE} '
+        f'ORDER BY "Updated" DESC').fetchall()
+    checkpoints = []
+    for first_seed, seeds, offset, started, updated in rows:
+        finished = offset >= seeds or seed_after(first_seed, offset) is None
+        next_seed = None
+        if not finished and within_one_length(first_seed, seeds):
+            next_seed = seed_after(first_seed, offset)
+        checkpoints.append({
+            "first_seed": first_seed,
+            "seeds": seeds,
+            "offset": offset,
+            "started": started,
+            "updated": updated,
+            "finished": finished,
+            "next_seed": next_seed,
+            "remaining": seeds - offset if next_seed is not None else None,
+        })
+    return checkpoints
+
+
+def drop_checkpoints(conn):
+    """Forget every search's checkpoint"""
+    conn.execute(f"DROP TABLE IF EXISTS {CHECKPOINTS_TABLE}")
@@ -0,0 +1,181 @@
+"""
+Search Coverage - Which seed ranges a config's filter has already searched
+"""
+
+import hashlib
+import json
+
+from models.search_checkpoints import start_seed_id
+from models.seed_codec import LENGTH_OFFSETS, MAX_SEED_LENGTH, SEED_COUNT, decode_seed, seed_length
+
+# Merged, non-adjacent half-open seed id ranges [FirstId, EndId) per filter.
+# Ids follow the CLI's enumeration order, so a run of -s S -n N covers one range.
+COVERAGE_TABLE = "search_coverage"
+
+# Searches are only started among the 8-character seeds: CLI builds from before
+# s_skip counted through shortlex ids can't step a run across a change of seed length
+GAP_SEARCH_START = LENGTH_OFFSETS[MAX_SEED_LENGTH]
+
+
+def config_hash(filter_config):
+    """Hash of the search criteria, so coverage of an edited filter starts over
+
+    Args:
+        filter_config: The config's "filter_config" dict
+
+    Returns:
+        str: 12 hex digits
+    """
+    text = json.dumps(filter_config or {}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
+
+
+def config_file_hash(config_path):
+    """config_hash() of a .ouija.json file's filter_config (None if it can't be read)"""
+    try:
+        with open(config_path, "r") as f:
+            return config_hash(json.load(f).get("filter_config"))
+    except (OSError, ValueError):
+        return None
+
+
+def create_coverage_table(conn):
+    """Create the coverage table if it doesn't exist"""
+    conn.execute(
+        f'CREATE TABLE IF NOT EXISTS {COVERAGE_TABLE} ('
+        f'"ConfigHash" VARCHAR, "Template" VARCHAR, "FirstId" UBIGINT, "EndId" UBIGINT, '
+        f'PRIMARY KEY ("ConfigHash", "Template", "FirstId"))'
+    )
+
+
+def add_range(conn, hash_value, template, first_id, end_id):
+    """Mark seed ids [first_id, end_id) as searched, merging with touching ranges
+
+    Runs as one transaction on conn.
+    """
+    first_id, end_id = max(int(first_id), 0), min(int(end_id), SEED_COUNT)
+    if first_id >= end_id:
+        return
+    key = [hash_value, template or ""]
+    touching = f'"ConfigHash" = ? AND "Template" = ? AND "EndId" >= ? AND "FirstId" <= ?'
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        low, high = conn.execute(
+            f'SELECT MIN("FirstId"), MAX("EndId") FROM {COVERAGE_TABLE} WHERE {touching}',
+            key + [first_id, end_id]).fetchone()
+        conn.execute(f"DELETE FROM {COVERAGE_TABLE} WHERE {touching}", key + [first_id, end_id])
+        conn.execute(
+            f"INSERT INTO {COVERAGE_TABLE} VALUES (?, ?, ?, ?)",
+            key + [min(first_id, low) if low is not None else first_id, max(end_id, high or 0)])
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+
+
+def record_checkpoints(conn, checkpoints):
+    """Add the ranges searched so far by each checkpoint's search to its filter's coverage
+
+    Only the part of a search within its start seed's length is recorded (nothing for
+    a blank start seed), as that is all a CLI of any build is known to have searched.
+
+    Args:
+        conn: Connection or cursor on the config's database (not inside a transaction)
+        checkpoints: Dicts from SearchRun.checkpoint(); ones without a config_hash are skipped
+    """
+    checkpoints = [c for c in checkpoints if c.get("config_hash")]
+    if not checkpoints:
+        return
+    create_coverage_table(conn)
+    for checkpoint in checkpoints:
+        if not checkpoint["first_seed"]:
+            continue
+        first_id = start_seed_id(checkpoint["first_seed"])
+        length_end = LENGTH_OFFSETS[seed_length(first_id) + 1]
+        add_range(conn, checkpoint["config_hash"], checkpoint["template"],
+                  first_id, min(first_id + checkpoint["offset"], length_end))
+
+
+def _table_exists(conn):
+    """Check whether the coverage table exists in the current database"""
+    return conn.execute(
+        "SELECT COUNT(*) FROM information_schema.tables WHERE table_catalog = current_database() "
+        "AND table_schema = current_schema() AND table_name = ?", [COVERAGE_TABLE]).fetchone()[0] > 0
+
+
+def load_ranges(conn, hash_value, template):
+    """Searched ranges of a filter
+
+    Returns:
+        list: (first id, end id) tuples in id order
+    """
+    if not _table_exists(conn):
+        return []
+    return [tuple(row) for row in conn.execute(
+        f'SELECT "FirstId", "EndId" FROM {COVERAGE_TABLE} WHERE "ConfigHash" = ? AND "Template" = ? '
+        f'ORDER BY "FirstId"', [hash_value, template or ""]).fetchall()]
+
+
+def gaps(ranges, start=0):
+    """Unsearched ranges between sorted, merged searched ranges
+
+    Args:
+        ranges: Searched ranges from load_ranges()
+        start: First seed id to consider
+
+    Returns:
+        list: (first id, end id) tuples covering the rest of [start, SEED_COUNT)
+    """
+    result = []
+    position = start
+    for first_id, end_id in ranges:
+        if first_id > position:
+            result.append((position, first_id))
+        position = max(position, end_id)
+    if position < SEED_COUNT:
+        result.append((position, SEED_COUNT))
+    return result
+
+
+def summarize(ranges):
+    """Share of the seed space a filter's searched ranges cover
+
+    Returns:
+        dict: ranges, seeds_covered, seed_space, percent_covered, largest_gap (seeds)
+    """
+    covered = sum(end_id - first_id for first_id, end_id in ranges)
+    open_ranges = gaps(ranges)
+    return {
+        "ranges": len(ranges),
+        "seeds_covered": covered,
+        "seed_space": SEED_COUNT,
+        "percent_covered": 100.0 * covered / SEED_COUNT,
+        "largest_gap": max((end_id - first_id for first_id, end_id in open_ranges), default=0),
+    }
+
+
+def pick_gap(ranges, seeds=None):
+    """Where to search next: the start of the largest unsearched range
+
+    Starting right after a searched range keeps the index merged into few ranges.
+    Only 8-character seeds are picked, so a run never crosses a seed length.
+
+    Args:
+        ranges: Searched ranges from load_ranges()
+        seeds: Seeds the next run should search (None: the whole gap)
+
+    Returns:
+        tuple: (start seed, seed count) with the count capped at the gap, or None if every
+               8-character seed is searched
+    """
+    open_ranges = gaps(ranges, GAP_SEARCH_START)
+    if not open_ranges:
+        return None
+    first_id, end_id = max(open_ranges, key=lambda gap: (gap[1] - gap[0], -gap[0]))
+    count = end_id - first_id if seeds is None else min(int(seeds), end_id - first_id)
+    return decode_seed(first_id), count
+
+
+def drop_coverage(conn):
+    """Forget every filter's coverage"""
+    conn.execute(f"DROP TABLE IF EXISTS {COVERAGE_TABLE}")
@@ -3,12 +3,22 @@ Search Model - Handles search process logic for Ouija seed finder
 """
 
 import os
-import signal
+import random
 import subprocess
+import tempfile
 import threading
 import time        
 import sys
 
+from models.cli_daemon import CliDaemon
+from models.cli_supervisor import CliSupervisor
+from models.result_ingest import IngestWriter
+from models.search_checkpoints import SearchRun
+from models.search_output import SearchOutputHandler
+from models.search_shards import ShardScheduler, ShardSlot, parse_device_list
+from models.seed_codec import LENGTH_OFFSETS, MAX_SEED_LENGTH, SEED_COUNT, decode_seed, encode_seed, seed_length
+from models.seed_lists import SEED_LIST_DTYPE, SEED_LIST_SUFFIX, seed_list_ids, write_seed_list
+
 
 class SearchModel:
     """Model for handling seed search operations"""
@@ -37,24 +47,40 @@ class SearchModel:
 
     def __init__(self):
         """Initialize the search model"""
-        self.active_processes = []
         self.results_callback = None
         self.console_callback = None
         self.process_finished_callback = None
         self.cutoff = None  # Add cutoff
         self.gpu_batch = None  # Add gpu_batch
         self.starting_seed = None  # Initialize starting_seed
+        self.ingest_batch_rows = 5000  # Flush buffered results every N rows...
+        self.ingest_flush_ms = 250  # ...or every T milliseconds
+        self.ingest_queue_size = 20000  # Readers stall once this many lines are waiting
+        self.ingest_writer = None  # Single writer thread shared by all CLI readers
+        self.ingest_stats_callback = None
+        self.supervisor = CliSupervisor()  # One event loop thread runs and reads every CLI job
+        self.last_job_id = None
+        self.scheduler = None  # ShardScheduler of the running sharded search
+        self.shard_min_steal_seconds = 30.0  # Only rebalance shards with at least this much work left...
+        self.shard_min_steal_seeds = 1000000  # ...and at least twice this many seeds
+        self.use_cli_daemon = True  # Run searches on one resident Ouija-CLI --daemon process
+        self.cli_daemon = None
+        self.cli_daemon_supported = None  # Whether the CLI build below has --daemon (None: not probed)
+        self.cli_auto_floor_supported = None  # Whether it takes -c auto:<N>
+        self._cli_daemon_build = None  # (path, mtime) of the CLI that was probed
 
     def set_callbacks(
             self,
             results_callback=None,
             console_callback=None,
             process_finished_callback=None,
+            ingest_stats_callback=None,
     ):
         """Set callbacks for handling search results and output"""
         self.results_callback = results_callback
         self.console_callback = console_callback
         self.process_finished_callback = process_finished_callback
+        self.ingest_stats_callback = ingest_stats_callback
 
     def set_seed(self, starting_seed):
         """Set the starting seed for the search process
@@ -73,224 +99,521 @@ class SearchModel:
         db_model,
         cutoff,
         gpu_batch,
-        template
+        template,
+        binary_results=False,
+        resume=None,
+        config_hash=None
     ):
-        """Start a new search process"""
+        """Start a new search process
+
+        With binary_results the CLI streams packed OuijaHostResult frames instead of
+        '|seed,...' text lines; the text protocol remains the default.
+
+        With resume (a checkpoint from DatabaseModel.get_resume_checkpoint()) the
+        search continues at the checkpoint's next seed: starting_seed and
+        number_of_seeds are replaced by its -s / -n, and its checkpoints keep
+        counting from where the earlier process stopped.
+
+        With config_hash (search_coverage.config_hash() of the filter) the seeds the
+        search gets through are added to the filter's coverage index.
+        """
         try:
-            # Build the command using consolidated logic
-            command_parts = [self._get_cli_path()]
-
-            # Add template filter
-            if template:
-                command_parts.extend(["-f", template])
-
-            # Add starting seed
-            print(f"DEBUG: Adding starting seed: {starting_seed}")
-            if starting_seed.lower() == "random":
-                command_parts.extend(["-s", "random"])
-            else:
-                command_parts.extend(["-s", starting_seed.upper()])
-
-            # Add thread groups
-            thread_groups_value = self.THREAD_GROUP_MAP.get(str(thread_groups), "32")
-            command_parts.extend(["-g", thread_groups_value])
-
-            # Add number of seeds
-            if number_of_seeds.lower() in ["all", "all seeds"]:
-                pass  # Don't add -n for "All Seeds"
-            else:
-                n_value = self.SEED_COUNT_MAP.get(number_of_seeds, number_of_seeds)
-                command_parts.extend(["-n", str(n_value)])
-
-            # Add config name
-            command_parts.extend(["--config", config_name_for_cli])
-
-            # Add cutoff score
-            if cutoff:
-                command_parts.extend(["-c", str(cutoff)])
-
-            # Add GPU batch size
-            if gpu_batch:
-                command_parts.extend(["-b", str(gpu_batch)])            # Log and execute the command
+            run = SearchRun(config_hash=config_hash, template=template)
+            if resume:
+                starting_seed = resume["next_seed"]
+                number_of_seeds = str(resume["remaining"])
+                run = SearchRun(resume["first_seed"], resume["seeds"], resume["offset"], config_hash, template)
+            cutoff = self._auto_cutoff(cutoff, db_model, self._get_cli_path())
+
+            command_parts = self._build_command(
+                config_name_for_cli, starting_seed, thread_groups, number_of_seeds,
+                cutoff, gpu_batch, template, binary_results)
+
+            # Log and execute the command
             command = " ".join(command_parts)
             if self.console_callback:
                 self.console_callback(f"{command}\n")     
-            process = subprocess.Popen(
-                command_parts,
-                shell=False,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                encoding='utf-8',
-                errors='ignore',
-                cwd=os.getcwd(),
-                startupinfo=self._get_startup_info()
-            )
-            self.active_processes.append(process)
-            threading.Thread(
-                target=self._read_process_output, args=(process, db_model), daemon=True
-            ).start()
+            # Both pipes are read on the shared supervisor loop; no thread per process
+            ingest_writer = self._get_ingest_writer(db_model)
+            handler = SearchOutputHandler(self, db_model, ingest_writer, run=run)
+
+            # Back-to-back searches reuse the resident CLI and skip its OpenCL setup
+            daemon = self._get_cli_daemon(thread_groups, gpu_batch, template, binary_results, command_parts)
+            if daemon is not None:
+                job = daemon.submit(
+                    config_name_for_cli,
+                    starting_seed if starting_seed.lower() == "random" else starting_seed.upper(),
+                    None if number_of_seeds.lower() in ["all", "all seeds"]
+                    else self.SEED_COUNT_MAP.get(number_of_seeds, number_of_seeds),
+                    cutoff,
+                    handler,
+                    label=config_name_for_cli,
+                    command_parts=command_parts,
+                )
+                self.last_job_id = job.job_id
+                if self.console_callback:
+                    self.console_callback(
+                        f"Started job {job.job_id} ({job.label}) on the resident CLI (pid {job.pid}, "
+                        f"{daemon.requests_run} earlier searches)\n")
+                return True
+
+            job = self._launch_process(command_parts, handler, config_name_for_cli)
+            if self.console_callback:
+                self.console_callback(f"Started job {job.job_id} ({job.label}, pid {job.pid})\n")
             return True        
         except Exception as e:
             if self.console_callback:
                 self.console_callback(f"Error starting search: {str(e)}\n")
             return False
       
-    def _get_cli_path(self):
-        """Retrieve the path to the Ouija-CLI executable"""
-        cli_path = "./Ouija-CLI.exe"
-        
-        if not os.path.exists(cli_path):
-            raise FileNotFoundError(f"Ouija-CLI executable not found at {cli_path}")
-        return cli_path
+    def _build_command(self, config_name_for_cli, starting_seed, thread_groups, number_of_seeds,
+                       cutoff, gpu_batch, template, binary_results=False, platform=None, device=None,
+                       seed_list=None):
+        """Build the Ouija-CLI command line for one process
 
-    def _read_process_output(self, process, db_model):
-        """Read and process output from the search command"""
-        header_columns = None
-        header_found = False
-        db_table_created = False
-        last_db_ping_time = time.time()
-        db_ping_interval = (
-            1.0  # Notify controller every 1 second that new data might be in DB
-        )        # If we already have results in the database, we don't need to load them here.
-        # The controller will handle refreshing from DB.
-        if db_model and db_model.conn and db_model.table_exists():
-            db_table_created = True  # Assume table structure is known if DB exists
-            # Try to get headers if table exists, to avoid issues if Ouija-CLI.exe doesn't print them
-            try:
-                existing_df = db_model.query_results(
-                    limit=1
-                )
-                if existing_df is not None and not existing_df.empty:
-                    existing_headers = existing_df.columns.tolist()
-                    # Don't automatically use existing headers - wait for CLI to send new ones
-                    # This prevents mismatch issues when the CLI config changes
-                    if self.console_callback:
-                        self.console_callback(f"Existing DB table has columns: {existing_headers}\n")
-            except Exception as e:
-                if self.console_callback:
-                    self.console_callback(
-                        f"Error getting headers from existing DB: {str(e)}\n"
-                    )
+        With seed_list (the path of a packed seed list) the CLI evaluates the listed
+        seeds instead of starting_seed; number_of_seeds should be the list's length.
+
+        Returns:
+            list: Command parts
+        """
+        # Build the command using consolidated logic
+        command_parts = [self._get_cli_path()]
+
+        # Add OpenCL platform and device (the CLI's defaults otherwise)
+        if platform is not None:
+            command_parts.extend(["-p", str(platform)])
+        if device is not None:
+            command_parts.extend(["-d", str(device)])
+
+        # Add template filter
+        if template:
+            command_parts.extend(["-f", template])
+
+        # Add starting seed
+        if seed_list:
+            command_parts.extend(["--seeds", seed_list])
+        elif starting_seed.lower() == "random":
+            command_parts.extend(["-s", "random"])
+        else:
+            command_parts.extend(["-s", starting_seed.upper()])
+
+        # Add thread groups
+        thread_groups_value = self.THREAD_GROUP_MAP.get(str(thread_groups), "32")
+        command_parts.extend(["-g", thread_groups_value])
+
+        # Add number of seeds
+        if number_of_seeds.lower() in ["all", "all seeds"]:
+            pass  # Don't add -n for "All Seeds"
+        else:
+            n_value = self.SEED_COUNT_MAP.get(number_of_seeds, number_of_seeds)
+            command_parts.extend(["-n", str(n_value)])
+
+        # Add config name
+        command_parts.extend(["--config", config_name_for_cli])
+
+        # Add cutoff score
+        if cutoff:
+            command_parts.extend(["-c", str(cutoff)])
+
+        # Add GPU batch size
+        if gpu_batch:
+            command_parts.extend(["-b", str(gpu_batch)])
+
+        # Opt-in binary result frames
+        if binary_results:
+            command_parts.append("--binary")
+        return command_parts
+
+    def _launch_process(self, command_parts, handler, label):
+        """Run one search as a CLI process of its own"""
+        job = self.supervisor.launch(
+            command_parts,
+            handler.on_stdout,
+            handler.on_stderr,
+            handler.on_exit,
+            label=label,
+            stdout_busy=self._ingest_congested,
+            cwd=os.getcwd(),
+            startupinfo=self._get_startup_info(),
+        )
+        self.last_job_id = job.job_id
+        return job
+
+    def _get_cli_daemon(self, thread_groups, gpu_batch, template, binary_results, command_parts):
+        """Get an idle resident CLI for these settings, starting one if needed
+
+        The daemon's kernel is built for one filter template, device and batch
+        size; searches with other settings replace it. Returns None (run a
+        process instead) when daemons are off or unsupported, or the daemon is
+        busy with another search.
+        """
+        if not self.use_cli_daemon or not self._cli_has_daemon(command_parts[0]):
+            return None
+        # Same command as a search, minus the per-search -s/-n/--config/-c
+        daemon_command = [command_parts[0]]
+        for flag in ("-p", "-d", "-f", "-g", "-b"):
+            if flag in command_parts:
+                index = command_parts.index(flag)
+                daemon_command.extend(command_parts[index:index + 2])
+        if binary_results:
+            daemon_command.append("--binary")
+        daemon_command.append("--daemon")
+
+        daemon = self.cli_daemon
+        if daemon and daemon.is_alive() and daemon.command_parts == daemon_command:
+            return None if daemon.is_busy() else daemon
+        if daemon and daemon.is_busy():
+            return None  # Leave it to finish; this search gets a process of its own
+        if daemon:
+            daemon.close()
+        self.cli_daemon = CliDaemon(
+            self.supervisor, daemon_command, on_unsupported=self._on_daemon_unsupported,
+            stdout_busy=self._ingest_congested, cwd=os.getcwd(), startupinfo=self._get_startup_info())
+        self.cli_daemon.start()
+        return self.cli_daemon
+
+    def probe_cli(self):
+        """Start checking whether the Ouija-CLI build has --daemon, so the first search needn't wait"""
         try:
-            while True:
-                # Check if process has terminated
-                if process.poll() is not None:
-                    break
-                try:
-                    line = process.stdout.readline()
-                    if isinstance(line, bytes):
-                        # Handle bytes with proper encoding, ignoring problematic characters
-                        line = line.decode('utf-8', errors='ignore')
-                except UnicodeDecodeError:
-                    # Skip lines that can't be decoded
-                    continue
-
-                  # Parse CSV header
-                if not header_found and line.strip().startswith("+Seed,"):
-                    # Validate headers to ensure they are distinct and valid
-                    header_columns = [
-                        col.strip()
-                        for col in line.replace("+Seed", "Seed")
-                        .strip()
-                        .replace("!", "")
-                        .split(",")
-                        if col.strip() != ""
-                    ]
-
-                    # Relax header validation to allow duplicates but log a warning
-                    if len(header_columns) != len(set(header_columns)):
-                        if self.console_callback:
-                            self.console_callback(
-                                f"Warning: Duplicate headers found: {header_columns}\n"
-                            )  # Validate header names but only warn about truly problematic ones
-
-                    header_found = True
-
-                    # Create table in database
-                    if db_model and db_model.conn and not db_table_created:
-                        db_model.create_table(header_columns)
-                        db_table_created = True
-
-                    continue                # Process result lines (those starting with '|')
-                if line.startswith("|"):
-                    if not header_columns:  # Wait for header
-                        if self.console_callback:
-                            self.console_callback(
-                                f"Skipping result line, header not yet found: {line.strip()}\n"
-                            )
-                        continue
-
-                    try:
-                        # Process the CSV line directly using DuckDB's CSV parser
-                        result = db_model.process_csv_line(line)
-
-                        if not result:
-                            continue
-
-                        # Unpack the result
-                        parsed_headers, parsed_values = result
-
-                        # If we didn't have headers before, use the ones from parsing (should not happen if logic above is correct)
-                        if not header_columns:
-                            header_columns = parsed_headers
-                            if db_model and db_model.conn and not db_table_created:
-                                db_model.create_table(header_columns)
-                                db_table_created = True
-
-                        # Store in database using upsert
-                        if db_model and db_model.conn and db_table_created:
-                            db_model.insert_result(header_columns, parsed_values)
-
-                        # Periodically notify controller to refresh from DB
-                        current_time = time.time()                        
-                        if (current_time - last_db_ping_time) >= db_ping_interval:
-                            if (self.results_callback):
-                                self.results_callback(None, None)
-                                last_db_ping_time = current_time
-                    except Exception as e:
-                        import traceback
-                        if self.console_callback:
-                            tb_str = traceback.format_exc()
-                            self.console_callback(
-                                f"Error processing CSV line for DB insertion: {str(e)}\nLine: {line.strip()}\nHeaders: {header_columns}\nTraceback:\n{tb_str}\n"
-                            )
-                # Handle status bar messages (lines starting with "$")
-                elif line.startswith("$") and line.strip() != "$":
-                    # Pass status messages to the application controller via console callback
-                    # with a special prefix that the controller will recognize
-                    if self.console_callback:
-                        status_message = line.strip()[1:].strip()
-                        self.console_callback(f"STATUS:{status_message}\n")
+            self._cli_has_daemon(self._get_cli_path())
+        except FileNotFoundError:
+            pass
 
-                else:
-                    # Display unprocessed CLI lines (mark as CLI messages, not UI messages)
-                    self.console_callback(f"CLI:{line.rstrip()}\n", color="blue")
+    def _cli_has_daemon(self, cli_path):
+        """Check once per CLI build whether it has --daemon, from the options its -h lists
 
-            # Make sure to send one final notification to controller after process ends
-            if self.results_callback:
-                self.results_callback(None, None)
+        An older Ouija-CLI only rejects --daemon after its full setup, which the
+        first search would then pay for twice. The -h probe runs on a worker
+        thread so the UI thread never waits on it; until it answers for a new
+        build, searches run as processes of their own.
+        """
+        self._probe_cli_options(cli_path)
+        return bool(self.cli_daemon_supported)
 
-            # Process stderr after stdout is done
-            for line in process.stderr:
+    def _probe_cli_options(self, cli_path):
+        """Start the -h probe if cli_path is a build that hasn't been probed yet"""
+        try:
+            build = (cli_path, os.path.getmtime(cli_path))
+        except OSError:
+            self._cli_daemon_build = None
+            self.cli_daemon_supported = self.cli_auto_floor_supported = False
+            return
+        if build != self._cli_daemon_build:
+            self._cli_daemon_build = build
+            self.cli_daemon_supported = self.cli_auto_floor_supported = None
+            threading.Thread(target=self._probe_cli_daemon, args=(build,),
+                             name="OuijaCliProbe", daemon=True).start()
+
+    def _probe_cli_daemon(self, build):
+        """Run the CLI's -h and record which optional options it lists (worker thread)"""
+        try:
+            completed = subprocess.run(
+                [build[0], "-h"], capture_output=True, text=True,
+                timeout=30, cwd=os.getcwd(), startupinfo=self._get_startup_info())
+            daemon, auto_floor = "--daemon" in completed.stdout, "auto:<N>" in completed.stdout
+        except Exception as e:
+            print(f"Error checking Ouija-CLI options: {e}")
+            daemon = auto_floor = False
+        if self._cli_daemon_build == build:  # Not replaced by a newer build meanwhile
+            self.cli_daemon_supported, self.cli_auto_floor_supported = daemon, auto_floor
+
+    def _auto_cutoff(self, cutoff, db_model, cli_path):
+        """Start an "auto" cutoff at the lowest score the results table still shows
+
+        The score is read from the stored histograms, so a search adding to a
+        full table doesn't first send back everything scoring above 1. Other
+        cutoffs, and CLI builds without -c auto:<N>, are passed through unchanged.
+        """
+        if str(cutoff).strip().lower() != "auto":
+            return cutoff
+        self._probe_cli_options(cli_path)
+        if not self.cli_auto_floor_supported:
+            return cutoff
+        floor = db_model.auto_cutoff_floor()
+        if floor is None or floor <= 1:
+            return cutoff
+        if self.console_callback:
+            self.console_callback(f"Auto cutoff starts at {floor}, the lowest score in the results table\n")
+        return f"auto:{floor}"
+
+    def _on_daemon_unsupported(self, request, handler):
+        """The CLI has no --daemon mode: run the search as a process and stop trying"""
+        self.cli_daemon_supported = False
+        if self.console_callback:
+            self.console_callback("This Ouija-CLI has no --daemon mode; starting a process per search\n")
+        try:
+            job = self._launch_process(request.command_parts, handler, request.label)
+            if self.console_callback:
+                self.console_callback(f"Started job {job.job_id} ({job.label}, pid {job.pid})\n")
+        except Exception as e:
+            if self.console_callback:
+                self.console_callback(f"Error starting search: {str(e)}\n")
+            handler.on_exit(request)
+
+    def start_seed_list_search(
+        self,
+        config_name_for_cli,
+        seeds,
+        thread_groups,
+        db_model,
+        cutoff,
+        gpu_batch,
+        template,
+        binary_results=False,
+        label=None
+    ):
+        """Evaluate an explicit list of seeds instead of a contiguous range
+
+        The seeds are written as sorted, distinct packed ids to a temporary .seeds
+        file (memory-mapped) that Ouija-CLI --seeds reads in GPU batches, so
+        scattered seeds cost one launch instead of one per seed or range. A ready
+        resident CLI takes the list as a request. Results go through the usual
+        output handler and ingest writer; there are no checkpoints or coverage,
+        since the seeds aren't a range.
+
+        Args:
+            seeds: Seed strings or an integer numpy array of seed ids (see seed_list_ids)
+            label: Display name of the job (default: the config name)
+
+        Returns:
+            bool: True if the evaluation started
+        """
+        path = None
+        try:
+            seed_ids, invalid = seed_list_ids(seeds)
+            if invalid and self.console_callback:
+                self.console_callback(f"Skipping {invalid:,} invalid seeds\n")
+            if len(seed_ids) == 0:
                 if self.console_callback:
-                    self.console_callback(f"ERROR: {line}")
+                    self.console_callback("No seeds to evaluate\n")
+                return False
+            handle, path = tempfile.mkstemp(prefix="ouija_", suffix=SEED_LIST_SUFFIX)
+            os.close(handle)
+            count = write_seed_list(path, seed_ids)
+            label = label or config_name_for_cli
+
+            # -n only keeps a CLI without --seeds from searching the whole pool
+            command_parts = self._build_command(
+                config_name_for_cli, "", thread_groups, str(count), cutoff, gpu_batch, template,
+                binary_results, seed_list=path)
+            if self.console_callback:
+                self.console_callback(
+                    f"{' '.join(command_parts)}\nEvaluating {count:,} listed seeds "
+                    f"({count * SEED_LIST_DTYPE.itemsize / 1e6:.1f} MB list)\n")
+            ingest_writer = self._get_ingest_writer(db_model)
+            list_path = path
+            handler = SearchOutputHandler(self, db_model, ingest_writer,
+                                          on_finished=lambda job: self._remove_seed_list(list_path))
+
+            daemon = self._get_cli_daemon(thread_groups, gpu_batch, template, binary_results, command_parts)
+            if daemon is not None and daemon.supports("seeds"):
+                job = daemon.submit(config_name_for_cli, f"@{list_path}", str(count), cutoff, handler,
+                                    label=label, command_parts=command_parts)
+                path = None  # Removed by the handler once the request ends
+                self.last_job_id = job.job_id
+                if self.console_callback:
+                    self.console_callback(f"Started job {job.job_id} ({job.label}) on the resident CLI\n")
+                return True
+
+            job = self._launch_process(command_parts, handler, label)
+            path = None
+            if self.console_callback:
+                self.console_callback(f"Started job {job.job_id} ({job.label}, pid {job.pid})\n")
+            return True
+        except Exception as e:
+            if path:
+                self._remove_seed_list(path)
+            if self.console_callback:
+                self.console_callback(f"Error starting seed list search: {str(e)}\n")
+            return False
 
-            # Remove process from active list
-            if process in self.active_processes:
-                self.active_processes.remove(process)
-            if self.process_finished_callback:
-                self.process_finished_callback()
+    @staticmethod
+    def _remove_seed_list(path):
+        """Delete a temporary seed list once its job has finished"""
+        try:
+            os.remove(path)
+        except OSError as e:
+            print(f"Error removing seed list {path}: {e}")
+
+    def list_devices(self):
+        """Ask Ouija-CLI which OpenCL devices it can run on
 
+        Returns:
+            list: Dicts with platform, device, name and compute_units (empty if the CLI failed)
+        """
+        try:
+            completed = subprocess.run(
+                [self._get_cli_path(), "--list_devices"], capture_output=True, text=True,
+                timeout=30, cwd=os.getcwd(), startupinfo=self._get_startup_info())
+            return parse_device_list(completed.stdout)
         except Exception as e:
-            import traceback
             if self.console_callback:
-                tb_str = traceback.format_exc()
-                self.console_callback(f"ERROR_MODEL: Error processing output: {str(e)}\nTraceback:\n{tb_str}\n")
+                self.console_callback(f"Error listing devices: {str(e)}\n")
+            return []
 
-            # Call process finished callback on error
-            if self.process_finished_callback:
-                self.process_finished_callback()
+    def start_sharded_search(
+        self,
+        config_name_for_cli,
+        starting_seed,
+        thread_groups,
+        number_of_seeds,
+        db_model,
+        cutoff,
+        gpu_batch,
+        template,
+        devices,
+        processes_per_device=1,
+        binary_results=False,
+        config_hash=None
+    ):
+        """Start one search split into shards over several devices and processes
+
+        The seed range is cut into one shard per process; a process that finishes
+        early takes over the tail of the slowest remaining shard (see
+        ShardScheduler). Every process writes to the same database through the
+        shared ingest writer, and each shard keeps its own checkpoint for Resume.
+
+        Args:
+            devices: (platform, device) pairs to run on; None runs on the CLI's default device
+            processes_per_device: CLI processes to run on each device at once
+
+        Returns:
+            bool: True if at least one shard started
+        """
+        try:
+            first_id, count = self._resolve_range(starting_seed, number_of_seeds)
+            cutoff = self._auto_cutoff(cutoff, db_model, self._get_cli_path())
+            slots = [ShardSlot(platform, device, index)
+                     for platform, device in (devices or [(None, None)])
+                     for index in range(max(int(processes_per_device), 1))]
+            ingest_writer = self._get_ingest_writer(db_model)
+
+            def launch(shard):
+                slot = shard.slot
+                command_parts = self._build_command(
+                    config_name_for_cli, decode_seed(shard.first_id), thread_groups,
+                    str(shard.end_id - shard.first_id), cutoff, gpu_batch, template, binary_results,
+                    platform=slot.platform, device=slot.device)
+                if self.console_callback:
+                    self.console_callback(f"{' '.join(command_parts)}\n")
+                handler = SearchOutputHandler(
+                    self, db_model, ingest_writer, run=shard.run,
+                    on_checkpoint=lambda start, offset, seeds: scheduler.checkpoint(shard, offset),
+                    on_finished=lambda job: scheduler.job_exited(shard, job))
+                job = self.supervisor.launch(
+                    command_parts,
+                    handler.on_stdout,
+                    handler.on_stderr,
+                    handler.on_exit,
+                    label=f"{config_name_for_cli} {slot.label}",
+                    stdout_busy=self._ingest_congested,
+                    cwd=os.getcwd(),
+                    startupinfo=self._get_startup_info(),
+                )
+                self.last_job_id = job.job_id
+                return job
+
+            scheduler = ShardScheduler(
+                launch, self.supervisor.request_stop, first_id, count, slots,
+                min_steal_seconds=self.shard_min_steal_seconds, min_steal_seeds=self.shard_min_steal_seeds,
+                config_hash=config_hash, template=template, on_finished=self._on_shards_finished)
+            self.scheduler = scheduler
+            if self.console_callback:
+                self.console_callback(
+                    f"Sharding {count:,} seeds from {decode_seed(first_id)} over {len(slots)} processes\n")
+            return scheduler.start() > 0
+        except Exception as e:
+            if self.console_callback:
+                self.console_callback(f"Error starting search: {str(e)}\n")
+            return False
+
+    def _resolve_range(self, starting_seed, number_of_seeds):
+        """Turn the UI's starting seed and seed count into a seed id range
+
+        The range never leaves the starting seed's length: shards are handed to the
+        CLI as -s / -n, and CLI builds from before s_skip counted through shortlex
+        ids step to the wrong seeds once the length grows.
+
+        Returns:
+            tuple: (first id, count)
+        """
+        if str(starting_seed).strip().lower() == "random":
+            # Like the CLI's -s random: somewhere among the 8-character seeds
+            first_id = random.randrange(LENGTH_OFFSETS[MAX_SEED_LENGTH], SEED_COUNT)
+        elif str(starting_seed).strip():
+            first_id = encode_seed(str(starting_seed).strip())
+        else:
+            first_id = LENGTH_OFFSETS[MAX_SEED_LENGTH]
+        available = LENGTH_OFFSETS[seed_length(first_id) + 1] - first_id
+        if str(number_of_seeds).lower() in ["all", "all seeds"]:
+            count = available
+        else:
+            count = int(self.SEED_COUNT_MAP.get(number_of_seeds, number_of_seeds))
+            if count > available:
+                if self.console_callback:
+                    self.console_callback(
+                        f"Only {available:,} seeds of length {seed_length(first_id)} follow "
+                        f"{decode_seed(first_id)}; searching those\n")
+                count = available
+        return first_id, count
+
+    def _on_shards_finished(self, scheduler):
+        """Report the sharded search once its last shard is done"""
+        if self.console_callback:
+            stats = scheduler.stats()
+            rates = ", ".join(f"{label} {rate / 1e6:.2f}M/s" for label, rate in stats["slots"].items() if rate)
+            self.console_callback(
+                f"Shards: {stats['seeds_done']:,} of {stats['seeds_total']:,} seeds in {stats['shards']} shards, "
+                f"{stats['steals']} rebalanced, {stats['seeds_per_second'] / 1e6:.2f}M seeds/s ({rates})\n")
+
+    def _get_cli_path(self):
+        """Retrieve the path to the Ouija-CLI executable"""
+        cli_path = "./Ouija-CLI.exe"
+        
+        if not os.path.exists(cli_path):
+            raise FileNotFoundError(f"Ouija-CLI executable not found at {cli_path}")
+        return cli_path
+
+    def _get_ingest_writer(self, db_model):
+        """Get the shared ingest writer for db_model, starting a new one if needed"""
+        writer = self.ingest_writer
+        if writer and writer.is_alive() and writer.db_model is db_model:
+            return writer
+        if writer:
+            writer.stop()
+        self.ingest_writer = IngestWriter(
+            db_model,
+            max_queue=self.ingest_queue_size,
+            batch_rows=self.ingest_batch_rows,
+            flush_ms=self.ingest_flush_ms,
+            stats_callback=self._on_ingest_stats,
+        )
+        db_model.on_before_close = self.ingest_writer.release
+        self.ingest_writer.start()
+        return self.ingest_writer
+
+    def _ingest_congested(self):
+        """Whether output handlers may stall on the ingest writer's queue (see CliSupervisor.launch)"""
+        writer = self.ingest_writer
+        return writer is not None and writer.congested()
+
+    def _on_ingest_stats(self, stats):
+        """Forward ingest writer counters to the controller"""
+        if self.ingest_stats_callback:
+            self.ingest_stats_callback(stats)
+
+    def stop_ingest_writer(self):
+        """Flush outstanding results and stop the writer thread"""
+        if self.ingest_writer:
+            self.ingest_writer.stop()
+            self.ingest_writer = None
+
+    def _on_job_exit(self, job):
+        """Called by the output handler once a job has exited and its output is drained"""
+        # With several jobs running, the search is only finished when the last one is
+        if self.process_finished_callback and not self.has_active_searches():
+            self.process_finished_callback()
 
     def _get_startup_info(self):
         """Get startup info to hide console windows on Windows"""
@@ -301,51 +624,62 @@ class SearchModel:
             return startupinfo
         return None
 
+    def stop_search(self, job_id):
+        """Stop one search job by id
+
+        Returns:
+            bool: True if the job is no longer running
+        """
+        daemon = self.cli_daemon
+        request = daemon.current_request() if daemon else None
+        if request is not None and request.job_id == job_id:
+            # A daemon search can only be interrupted with its process
+            return daemon.stop()
+        return self.supervisor.stop(job_id)
+
     def stop_all_searches(self):
-        """Stop all active search processes"""
-        # First try to stop the processes we're tracking
-        for process in self.active_processes:
-            try:
-                if process.poll() is None:  # If process is still running
-                    if os.name == "nt":  # Windows
-                        subprocess.call(
-                            ["taskkill", "/F", "/T", "/PID", str(process.pid)],
-                            startupinfo=self._get_startup_info()
-                        )
-                    else:  # Unix/Linux/Mac
-                        os.kill(process.pid, signal.SIGKILL)
-            except Exception as e:
-                print(f"Error stopping process: {e}")
-        
-        # Also look for any Ouija-CLI.exe processes that might have been left behind
-        try:
-            if os.name == "nt":  # Windows
-                # Kill any remaining Ouija-CLI.exe processes
-                subprocess.call(
-                    ["taskkill", "/F", "/IM", "Ouija-CLI.exe"], 
-                    stderr=subprocess.DEVNULL,
-                    startupinfo=self._get_startup_info()
-                )
-            else:  # Unix/Linux/Mac
-                # Find and kill any Ouija processes
-                subprocess.call(["pkill", "-f", "Ouija-CLI.exe"], stderr=subprocess.DEVNULL)
-        except Exception as e:
-                print(f"Error cleaning up Ouija-CLI processes: {e}")
+        """Stop every search job started by this model
 
-        # Clear the list
-        self.active_processes.clear()
+        Only our own jobs are stopped; other Ouija-CLI instances on the machine are left alone.
+        """
+        if self.scheduler:
+            self.scheduler.cancel()  # No new shards while the running ones stop
+        success = self.supervisor.stop_all()
 
         # Call process finished callback
         if self.process_finished_callback:
             self.process_finished_callback()
 
-        return True
+        return success
 
     def has_active_searches(self):
-        """Check if there are any active search processes"""
-        # Remove any completed processes
-        self.active_processes = [p for p in self.active_processes if p.poll() is None]
-        return len(self.active_processes) > 0
+        """Check if there are any active search jobs"""
+        if self.scheduler and self.scheduler.is_active():
+            return True
+        daemon = self.cli_daemon
+        if daemon and daemon.is_busy():
+            return True
+        # An idle resident CLI is not a search
+        daemon_job = daemon.job if daemon else None
+        return any(job is not daemon_job for job in self.supervisor.running_jobs())
+
+    def get_jobs(self):
+        """Get id, status, exit code, timings and throughput for every job
+
+        Returns:
+            list: One CliJob.stats() dict per job, oldest first
+        """
+        jobs = self.supervisor.jobs()
+        if self.cli_daemon:
+            jobs = sorted(jobs + self.cli_daemon.requests(), key=lambda job: job.job_id)
+        return [job.stats() for job in jobs]
+
+    def shutdown(self):
+        """Stop all jobs, commit queued results and stop the supervisor loop"""
+        if self.cli_daemon:
+            self.cli_daemon.close()
+        self.supervisor.shutdown()
+        self.stop_ingest_writer()
 
     def _handle_output_line(self, line: str, db_model):
         """Handle a line of stdout output from the CLI process"""
@@ -0,0 +1,204 @@
+"""
+Search Output - Turns one Ouija-CLI process's output into ingest batches and UI callbacks
+"""
+
+import time
+
+from models.cli_stream import CliStreamSplitter
+from models.result_codec import RECORD_SIZE, decode_results
+from models.search_checkpoints import CHECKPOINT_MARKER, SearchRun, parse_checkpoint_line
+
+
+class SearchOutputHandler:
+    """Per-process output state for a search started by SearchModel
+
+    on_stdout runs on a CliSupervisor worker thread and on_stderr on its loop thread;
+    neither writes to the database. Result blocks go to the shared IngestWriter, whose
+    bounded queue provides the backpressure by pausing this process's stdout only.
+    on_exit runs once both pipes are drained.
+    """
+
+    DB_PING_INTERVAL = 1.0  # Notify controller every 1 second that new data might be in DB
+
+    def __init__(self, search_model, db_model, ingest_writer, run=None, on_checkpoint=None, on_finished=None):
+        """Initialize the handler
+
+        Args:
+            search_model: SearchModel whose callbacks receive the output
+            db_model: DatabaseModel the results belong to
+            ingest_writer: Shared IngestWriter
+            run: SearchRun the process continues (default: a new search)
+            on_checkpoint: Optional callable(start seed, offset, seeds) for each CLI checkpoint
+            on_finished: Optional callable(job) once the job's rows are committed, before
+                         the search model checks for active searches
+        """
+        self.search_model = search_model
+        self.db_model = db_model
+        self.ingest_writer = ingest_writer
+        self.run = run or SearchRun()
+        self.on_checkpoint = on_checkpoint
+        self.on_finished = on_finished
+        self.splitter = CliStreamSplitter()
+        self.header_columns = None
+        self.db_table_created = False
+        self._early_frames = []  # Frame payloads that arrived before the header
+        self._last_db_ping_time = time.time()
+        self._check_existing_table()
+
+    def _console(self, message, **kwargs):
+        """Send a message to the console callback if one is set"""
+        if self.search_model.console_callback:
+            self.search_model.console_callback(message, **kwargs)
+
+    def _check_existing_table(self):
+        """Log the columns of an existing results table"""
+        db_model = self.db_model
+        # If we already have results in the database, we don't need to load them here.
+        # The controller will handle refreshing from DB.
+        if not (db_model and db_model.conn and db_model.table_exists()):
+            return
+        self.db_table_created = True  # Assume table structure is known if DB exists
+        try:
+            existing_df = db_model.query_results(limit=1)
+            if existing_df is not None and not existing_df.empty:
+                # Don't automatically use existing headers - wait for CLI to send new ones
+                # This prevents mismatch issues when the CLI config changes
+                self._console(f"Existing DB table has columns: {existing_df.columns.tolist()}\n")
+        except Exception as e:
+            self._console(f"Error getting headers from existing DB: {str(e)}\n")
+
+    def on_stdout(self, job, chunk):
+        """Handle a raw stdout chunk (b"" at EOF)"""
+        self.handle_events(job, self.splitter.feed(chunk) if chunk else self.splitter.finish())
+
+    def handle_events(self, job, events):
+        """Handle CliStreamSplitter events already split from stdout (e.g. by a CliDaemon)"""
+        for event in events:
+            kind = event[0]
+            if kind == "results":
+                job.rows += self._handle_results(event[1])
+            elif kind == "frame":
+                job.rows += self._handle_frame(event)
+            else:
+                self._handle_line(event[1])
+                if self._early_frames and self.header_columns:
+                    job.rows += self._submit_early_frames()
+
+        # Periodically notify controller to refresh from DB
+        current_time = time.time()
+        results_callback = self.search_model.results_callback
+        if results_callback and (current_time - self._last_db_ping_time) >= self.DB_PING_INTERVAL:
+            results_callback(None, None)
+            self._last_db_ping_time = current_time
+
+    def on_stderr(self, job, line):
+        """Handle one stderr line as soon as it arrives"""
+        self._console(f"ERROR: {line}")
+
+    def on_exit(self, job):
+        """Wait for this job's rows to be committed, then report completion"""
+        ingest_writer = self.ingest_writer
+        if self._early_frames:
+            dropped = sum(count for count, _ in self._early_frames)
+            self._console(f"Skipping {dropped} binary results, header not yet found\n")
+            self._early_frames = []
+        ingest_writer.sync()
+        if ingest_writer.rows_written():
+            self._console(f"Ingest: {ingest_writer.rows_written()} rows written ({ingest_writer.format_stats()})\n")
+        self._console(f"{job.format_stats()}\n")
+
+        # Make sure to send one final notification to controller after process ends
+        if self.search_model.results_callback:
+            self.search_model.results_callback(None, None)
+        if self.on_finished:
+            self.on_finished(job)
+        self.search_model._on_job_exit(job)
+
+    def _handle_results(self, block):
+        """Queue a block of result lines for the writer
+
+        Returns:
+            int: Number of result lines queued
+        """
+        if not self.header_columns:  # Wait for header
+            skipped = block.count(b"\n")
+            self._console(f"Skipping {skipped} result lines, header not yet found\n")
+            return 0
+        # Queue the raw block; the writer parses and commits it in a batch
+        if self.db_model and self.db_model.conn and self.db_table_created:
+            self.ingest_writer.submit_block(self.header_columns, block)
+            return block.count(b"\n")
+        return 0
+
+    def _handle_frame(self, event):
+        """Decode one ("frame", count, size, payload) event and queue it as a batch
+
+        Returns:
+            int: Number of records queued
+        """
+        _, count, record_size, payload = event
+        if record_size != RECORD_SIZE:
+            self._console(
+                f"Error: CLI result records are {record_size} bytes, expected {RECORD_SIZE}; skipping frame\n")
+            return 0
+        if not self.header_columns:
+            # Frames don't depend on the header to be read; decode them once it arrives
+            self._early_frames.append((count, payload))
+            return 0
+        self.ingest_writer.submit_frame(self.header_columns, decode_results(payload, self.header_columns))
+        return count
+
+    def _submit_early_frames(self):
+        """Queue the frames held back until the header arrived
+
+        Returns:
+            int: Number of records queued
+        """
+        frames, self._early_frames = self._early_frames, []
+        for _, payload in frames:
+            self.ingest_writer.submit_frame(self.header_columns, decode_results(payload, self.header_columns))
+        return sum(count for count, _ in frames)
+
+    def _handle_line(self, line):
+        """Handle a header, status or message line"""
+        # Parse CSV header
+        if not self.header_columns and line.strip().startswith("+Seed,"):
+            # Validate headers to ensure they are distinct and valid
+            header_columns = [
+                col.strip()
+                for col in line.replace("+Seed", "Seed")
+                .strip()
+                .replace("!", "")
+                .split(",")
+                if col.strip() != ""
+            ]
+
+            # Relax header validation to allow duplicates but log a warning
+            if len(header_columns) != len(set(header_columns)):
+                self._console(f"Warning: Duplicate headers found: {header_columns}\n")
+
+            self.header_columns = header_columns
+
+            # The writer creates/extends the table before any of its rows
+            if self.db_model and self.db_model.conn:
+                self.ingest_writer.submit_header(header_columns)
+                self.db_table_created = True
+
+        # Checkpoints are saved once the results printed before them are committed
+        elif line.startswith(CHECKPOINT_MARKER):
+            checkpoint = parse_checkpoint_line(line.strip())
+            if checkpoint and self.db_model and self.db_model.conn:
+                self.ingest_writer.submit_checkpoint(self.run.checkpoint(*checkpoint))
+            if checkpoint and self.on_checkpoint:
+                self.on_checkpoint(*checkpoint)
+
+        # Handle status bar messages (lines starting with "$")
+        elif line.startswith("$") and line.strip() != "$":
+            # Pass status messages to the application controller via console callback
+            # with a special prefix that the controller will recognize
+            status_message = line.strip()[1:].strip()
+            self._console(f"STATUS:{status_message}\n")
+
+        elif line.strip():
+            # Display unprocessed CLI lines (mark as CLI messages, not UI messages)
+            self._console(f"CLI:{line.rstrip()}\n", color="blue")
@@ -0,0 +1,353 @@
+"""
+Search Shards - Splits one seed range over several Ouija-CLI processes and devices, rebalancing as they finish
+"""
+
+import re
+import threading
+import time
+
+from models.search_checkpoints import SearchRun
+from models.seed_codec import decode_seed
+
+# Ouija-CLI --list_devices prints a block per device, starting with this line
+DEVICE_PATTERN = re.compile(r"Platform ID (\d+), Device ID (\d+)")
+
+
+def parse_device_list(text):
+    """Parse Ouija-CLI --list_devices output
+
+    Returns:
+        list: Dicts with platform, device, name and compute_units, in listing order
+    """
+    devices = []
+    for line in text.splitlines():
+        line = line.strip()
+        match = DEVICE_PATTERN.search(line)
+        if match:
+            devices.append({"platform": int(match.group(1)), "device": int(match.group(2)),
+                            "name": "", "compute_units": 0})
+        elif devices and line.startswith("Name:"):
+            devices[-1]["name"] = line[len("Name:"):].strip()
+        elif devices and line.startswith("Compute Units:"):
+            try:
+                devices[-1]["compute_units"] = int(line[len("Compute Units:"):].strip())
+            except ValueError:
+                pass
+    return devices
+
+
+class ShardSlot:
+    """One CLI process at a time on one device (a device may have several slots)"""
+
+    def __init__(self, platform=0, device=0, index=0):
+        """Initialize the slot
+
+        Args:
+            platform: OpenCL platform id (-p)
+            device: OpenCL device id (-d)
+            index: Which of the device's processes this is
+        """
+        self.platform = platform
+        self.device = device
+        self.index = index
+        self.seeds_done = 0
+        self.busy_seconds = 0.0
+        self.retired = False  # Set when a process failed here without getting anywhere
+
+    @property
+    def label(self):
+        """Short name for the console, e.g. p0d1 or p0d1#2"""
+        return f"p{self.platform}d{self.device}" + (f"#{self.index + 1}" if self.index else "")
+
+    def rate(self):
+        """Seeds per second over the shards this slot finished, or None before the first"""
+        return self.seeds_done / self.busy_seconds if self.busy_seconds > 0 else None
+
+
+class Shard:
+    """A contiguous seed id range [first_id, end_id) run by one CLI process"""
+
+    def __init__(self, first_id, end_id, slot, run, attempt=1):
+        """Initialize the shard
+
+        Args:
+            first_id: Id of its first seed
+            end_id: Id after its last seed (lowered when another slot takes over the tail)
+            slot: ShardSlot running it
+            run: SearchRun its checkpoints are saved under
+            attempt: 1 for a new range, more when re-running what a crashed process left
+        """
+        self.first_id = first_id
+        self.end_id = end_id
+        self.slot = slot
+        self.run = run
+        self.attempt = attempt
+        self.job = None
+        self.done = 0  # Seeds finished, from its latest checkpoint
+        self.started = time.monotonic()
+        self.checkpoint_time = None
+        self.stopping = False  # Stopped by the scheduler once it reached a lowered end_id
+
+    @property
+    def position(self):
+        """Id of the next seed it will search"""
+        return self.first_id + self.done
+
+    @property
+    def remaining(self):
+        """Seeds left before end_id"""
+        return max(self.end_id - self.position, 0)
+
+    def rate(self):
+        """Seeds per second since launch, or None before the first checkpoint"""
+        if not self.done or self.checkpoint_time is None:
+            return None
+        elapsed = self.checkpoint_time - self.started
+        return self.done / elapsed if elapsed > 0 else None
+
+
+class ShardScheduler:
+    """Runs one seed range as shards on every slot, stealing work for slots that run dry
+
+    The range starts as one shard per slot (more with shards_per_slot). When a
+    slot finishes and nothing is pending, it takes the tail of the running shard
+    that would take longest to finish, split by the two slots' rates so both end
+    at about the same time. The shard that gave up its tail keeps running until
+    its checkpoints pass the new end and is then stopped; the few seeds it
+    searched past the split are simply stored twice. What a crashed process
+    left is queued again, up to MAX_ATTEMPTS times.
+
+    launch(shard) must start a CLI for decode_seed(shard.first_id) and
+    shard.end_id - shard.first_id seeds on shard.slot, and route its checkpoints
+    to checkpoint(shard, offset) and its exit to job_exited(shard, job), the
+    latter before anything that checks is_active().
+    """
+
+    MAX_ATTEMPTS = 3
+
+    def __init__(self, launch, request_stop, first_id, count, slots, shards_per_slot=1,
+                 min_steal_seconds=30.0, min_steal_seeds=1000000, config_hash=None, template=None,
+                 on_finished=None):
+        """Initialize the scheduler
+
+        Args:
+            launch: Callable(shard) returning the started CliJob
+            request_stop: Callable(job_id) that stops a job without blocking
+            first_id: Id of the first seed of the range
+            count: Number of seeds in the range
+            slots: ShardSlots to run on
+            shards_per_slot: Initial shards per slot
+            min_steal_seconds: Leave a shard alone if it finishes sooner than this (a CLI takes
+                               a few seconds to start)
+            min_steal_seeds: Leave a shard alone if fewer seeds than this remain (before rates are known)
+            config_hash: Filter hash for the coverage index, see SearchRun
+            template: Filter template, see SearchRun
+            on_finished: Optional callable(scheduler) once every shard has finished
+        """
+        self.launch = launch
+        self.request_stop = request_stop
+        self.first_id = first_id
+        self.count = count
+        self.slots = list(slots)
+        self.min_steal_seconds = min_steal_seconds
+        self.min_steal_seeds = min_steal_seeds
+        self.config_hash = config_hash
+        self.template = template
+        self.on_finished = on_finished
+
+        self._lock = threading.RLock()
+        self._running = []
+        self._finished_shards = []
+        self._cancelled = False
+        self._finished = threading.Event()
+        self.steals = 0
+        self.started = None
+
+        pieces = max(len(self.slots) * max(int(shards_per_slot), 1), 1)
+        bounds = [first_id + count * i // pieces for i in range(pieces + 1)]
+        self._pending = [(low, high, 1) for low, high in zip(bounds, bounds[1:]) if high > low]  # (first, end, attempt)
+
+    # === Control (any thread) ===
+    def start(self):
+        """Launch a shard on every slot
+
+        Returns:
+            int: Number of shards launched
+        """
+        self.started = time.monotonic()
+        launched = self._fill_idle_slots()
+        self._check_finished()
+        return launched
+
+    def cancel(self):
+        """Stop handing out work; running shards are left to the caller to stop"""
+        with self._lock:
+            self._cancelled = True
+            self._pending = []
+
+    def is_active(self):
+        """Whether shards are still running or waiting"""
+        return not self._finished.is_set()
+
+    def wait(self, timeout=None):
+        """Block until every shard has finished
+
+        Returns:
+            bool: True if the scheduler finished before the timeout
+        """
+        return self._finished.wait(timeout)
+
+    # === Called by the shards' output handlers ===
+    def checkpoint(self, shard, offset):
+        """Record a shard's progress; stop it once it passed an end lowered by a steal"""
+        with self._lock:
+            shard.done = max(shard.done, offset)
+            shard.checkpoint_time = time.monotonic()
+            stop = shard.position >= shard.end_id and not shard.stopping and shard.job is not None
+            if stop:
+                shard.stopping = True
+        if stop:
+            self.request_stop(shard.job.job_id)
+
+    def job_exited(self, shard, job):
+        """Account for a finished shard and give its slot more work"""
+        slot = shard.slot
+        with self._lock:
+            if shard in self._running:
+                self._running.remove(shard)
+            self._finished_shards.append(shard)
+            slot.seeds_done += min(shard.done, shard.end_id - shard.first_id)
+            slot.busy_seconds += time.monotonic() - shard.started
+            if shard.remaining and not shard.stopping and not self._cancelled:
+                if job.stop_requested:
+                    # Stopped by hand: leave the rest to Resume rather than restarting it here
+                    print(f"Shard {decode_seed(shard.position)} on {slot.label} stopped, "
+                          f"{shard.remaining:,} seeds left")
+                elif shard.attempt < self.MAX_ATTEMPTS:
+                    self._pending.append((shard.position, shard.end_id, shard.attempt + 1))
+                    if shard.done == 0:
+                        slot.retired = True
+                else:
+                    print(f"Giving up on seeds {decode_seed(shard.position)}+{shard.remaining:,} "
+                          f"after {shard.attempt} failed attempts")
+        self._fill_idle_slots()
+        self._check_finished()
+
+    # === Scheduling ===
+    def _fill_idle_slots(self):
+        """Give work to every usable slot that isn't running a shard
+
+        Returns:
+            int: Number of shards launched
+        """
+        with self._lock:
+            busy = {id(shard.slot) for shard in self._running}
+            idle = [slot for slot in self.slots if id(slot) not in busy and not slot.retired]
+        return sum(1 for slot in idle if self._run_next(slot))
+
+    def _run_next(self, slot):
+        """Launch the next pending range, or a stolen tail, on a slot
+
+        Returns:
+            bool: True if a shard was launched
+        """
+        while True:
+            with self._lock:
+                if self._cancelled or slot.retired:
+                    return False
+                shard = self._take(slot)
+                if shard is None:
+                    return False
+                self._running.append(shard)
+            try:
+                shard.job = self.launch(shard)
+                return True
+            except Exception as e:
+                print(f"Error launching shard on {slot.label}: {e}")
+                with self._lock:
+                    self._running.remove(shard)
+                    self._pending.insert(0, (shard.first_id, shard.end_id, shard.attempt))
+                    slot.retired = True
+                return False
+
+    def _take(self, slot):
+        """Next shard for a slot: a pending range first, otherwise a steal (lock held)"""
+        if self._pending:
+            first_id, end_id, attempt = self._pending.pop(0)
+            return self._new_shard(first_id, end_id, slot, attempt)
+        return self._steal(slot)
+
+    def _new_shard(self, first_id, end_id, slot, attempt=1):
+        """Create a shard with its own SearchRun (lock held)"""
+        run = SearchRun(decode_seed(first_id), end_id - first_id,
+                        config_hash=self.config_hash, template=self.template)
+        return Shard(first_id, end_id, slot, run, attempt)
+
+    def _steal(self, thief):
+        """Take over the tail of the running shard that would take longest to finish (lock held)"""
+        candidates = []
+        for shard in self._running:
+            if shard.stopping or shard.job is None or shard.remaining < 2 * max(self.min_steal_seeds, 1):
+                continue
+            rate = shard.rate() or shard.slot.rate()
+            # Shards without a rate yet rank first; nothing is known about how slow they are
+            seconds = shard.remaining / rate if rate else float("inf")
+            if seconds >= self.min_steal_seconds:
+                candidates.append((seconds, shard.remaining, shard))
+        if not candidates:
+            return None
+        best = max(candidates, key=lambda candidate: candidate[:2])[2]
+
+        # Split so both slots finish together; halves while rates are unknown
+        victim_rate = best.rate() or best.slot.rate()
+        thief_rate = thief.rate() or victim_rate
+        victim_share = victim_rate / (victim_rate + thief_rate) if victim_rate and thief_rate else 0.5
+        split = best.position + int(best.remaining * victim_share)
+        if not best.position < split < best.end_id:
+            return None
+        stolen_end, best.end_id = best.end_id, split
+        best.run.resize(split - best.first_id)
+        self.steals += 1
+        print(f"{thief.label} takes {stolen_end - split:,} seeds from {decode_seed(split)} off {best.slot.label}")
+        return self._new_shard(split, stolen_end, thief)
+
+    def _check_finished(self):
+        """Signal completion once nothing is running or pending"""
+        with self._lock:
+            if self._running or self._finished.is_set():
+                return
+            if self._pending and not self._cancelled:
+                # Only reached when every slot was retired
+                print(f"No device left to run {len(self._pending)} shards")
+            self._finished.set()
+        if self.on_finished:
+            self.on_finished(self)
+
+    # === Reporting ===
+    def seeds_done(self):
+        """Seeds searched so far across all shards (each seed counted once)"""
+        with self._lock:
+            shards = self._running + self._finished_shards
+            return sum(min(shard.done, shard.end_id - shard.first_id) for shard in shards)
+
+    def stats(self):
+        """Get scheduler progress
+
+        Returns:
+            dict: seeds_total, seeds_done, running, pending, shards, steals, seeds_per_second
+                  and per-slot rates
+        """
+        with self._lock:
+            running, pending, shards = len(self._running), len(self._pending), len(self._finished_shards)
+        done = self.seeds_done()
+        elapsed = time.monotonic() - self.started if self.started else 0.0
+        return {
+            "seeds_total": self.count,
+            "seeds_done": done,
+            "running": running,
+            "pending": pending,
+            "shards": shards + running,
+            "steals": self.steals,
+            "seeds_per_second": done / elapsed if elapsed > 0 else 0.0,
+            "slots": {slot.label: slot.rate() for slot in self.slots},
+        }
@@ -0,0 +1,227 @@
+"""
+Seed Codec - Packs seeds into 64-bit integers in the order the CLI enumerates them
+"""
+
+import numpy as np
+import pandas as pd
+
+# Must match SEEDCHARS / NUM_CHARS in Ouija-cli/lib/seed.cl
+SEED_CHARS = "123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+NUM_CHARS = 35
+MAX_SEED_LENGTH = 8  # s_new_c8 reads at most 8 characters
+
+# LENGTH_OFFSETS[n] is the id of "1" * n: every shorter seed comes before it
+LENGTH_OFFSETS = [0, 0] + [(NUM_CHARS ** n - NUM_CHARS) // (NUM_CHARS - 1) for n in range(2, MAX_SEED_LENGTH + 2)]
+SEED_COUNT = LENGTH_OFFSETS[MAX_SEED_LENGTH + 1]  # Number of seeds of 1 to 8 characters
+INVALID_SEED_ID = np.iinfo(np.uint64).max  # Sorts after every valid id
+
+# Character code -> digit (255 for characters outside SEED_CHARS)
+_DIGITS = np.full(256, 255, dtype=np.uint8)
+for _digit, _char in enumerate(SEED_CHARS):
+    _DIGITS[ord(_char)] = _digit
+_CHAR_CODES = np.frombuffer(SEED_CHARS.encode("ascii"), dtype=np.uint8)
+_OFFSETS = np.array(LENGTH_OFFSETS, dtype=np.uint64)
+_POWERS = np.array([NUM_CHARS ** n for n in range(MAX_SEED_LENGTH)], dtype=np.uint64)
+
+# Every pair of seed characters, in digit order; ouija_seed() spells two digits per lookup
+_SEED_PAIRS = "".join([first + second for first in SEED_CHARS for second in SEED_CHARS])
+
+# SQL twins of encode_seed() / decode_seed(), stored in each results database
+# (SeedId columns are UBIGINT). String concatenation dominates ouija_seed(), so it
+# spells the 8-digit form two characters at a time and keeps the seed's last digits.
+SEED_MACROS = [
+    "CREATE OR REPLACE MACRO ouija_seed_id(seed) AS "
+    f"(CAST(pow({NUM_CHARS}, length(seed)) AS UBIGINT) - {NUM_CHARS}) // {NUM_CHARS - 1} + "
+    "list_reduce(list_transform(string_split(seed, ''), "
+    f"lambda c: CAST(instr('{SEED_CHARS}', c) - 1 AS UBIGINT)), lambda acc, d: acc * {NUM_CHARS} + d)",
+
+    "CREATE OR REPLACE MACRO ouija_seed_length(seed_id) AS CASE "
+    + " ".join([f"WHEN seed_id >= {LENGTH_OFFSETS[n]} THEN {n}" for n in range(MAX_SEED_LENGTH, 1, -1)])
+    + " ELSE 1 END",
+
+    "CREATE OR REPLACE MACRO ouija_seed_digits(seed_position) AS "
+    + " || ".join([f"substr('{_SEED_PAIRS}', CAST(seed_position // {NUM_CHARS ** (2 * k)}::UBIGINT "
+                   f"% {NUM_CHARS ** 2} AS INTEGER) * 2 + 1, 2)" for k in range(MAX_SEED_LENGTH // 2 - 1, -1, -1)]),
+
+    "CREATE OR REPLACE MACRO ouija_seed(seed_id) AS right(ouija_seed_digits(seed_id - "
+    f"(CAST(pow({NUM_CHARS}, ouija_seed_length(seed_id)) AS UBIGINT) - {NUM_CHARS}) // {NUM_CHARS - 1}), "
+    "ouija_seed_length(seed_id))",
+]
+
+
+def create_seed_macros(conn):
+    """Create ouija_seed_id(), ouija_seed() and their helpers in a database (idempotent)"""
+    for statement in SEED_MACROS:
+        conn.execute(statement)
+
+
+def char_num(char):
+    """Digit of a seed character, like s_char_num() (0 for '1', 34 for 'Z')
+
+    Raises:
+        ValueError: For a character outside SEED_CHARS
+    """
+    digit = _DIGITS[ord(char)] if len(char) == 1 and ord(char) < 256 else 255
+    if digit == 255:
+        raise ValueError(f"Invalid seed character: {char!r}")
+    return int(digit)
+
+
+def seed_digits(seed):
+    """Digits of a seed, most significant first, like s_new_c8()
+
+    Args:
+        seed: Seed string of 1 to 8 characters (case-insensitive)
+
+    Returns:
+        list: Digits 0-34
+
+    Raises:
+        ValueError: For an empty, too long or malformed seed
+    """
+    seed = str(seed).strip().upper()
+    if not 1 <= len(seed) <= MAX_SEED_LENGTH:
+        raise ValueError(f"Seeds have 1 to {MAX_SEED_LENGTH} characters: {seed!r}")
+    return [char_num(char) for char in seed]
+
+
+def encode_seed(seed):
+    """Pack a seed into its id: its position in the CLI's enumeration order
+
+    Seeds are counted in shortlex order: "1" ... "Z", then "11" ... "ZZ", and so
+    on, so the id of a seed is its position among seeds of its length plus the
+    number of shorter seeds. The seed-list kernel decodes these ids with
+    s_new_id(); a CLI's -s / -n stepping (s_skip()) only matches them within one
+    seed length unless the CLI was built with the shortlex s_skip(). Ids of
+    8-character seeds compare like the seeds themselves, and any run of
+    consecutive seeds is a contiguous id range.
+
+    Args:
+        seed: Seed string of 1 to 8 characters (case-insensitive)
+
+    Returns:
+        int: Seed id, 0 to SEED_COUNT - 1
+
+    Raises:
+        ValueError: For an empty, too long or malformed seed
+    """
+    digits = seed_digits(seed)
+    return LENGTH_OFFSETS[len(digits)] + tell_digits(digits)
+
+
+def tell_digits(digits):
+    """Position of a seed among seeds of its length"""
+    position = 0
+    for digit in digits:
+        position = position * NUM_CHARS + digit
+    return position
+
+
+def seed_length(seed_id):
+    """Number of characters of the seed behind an id"""
+    for length in range(1, MAX_SEED_LENGTH + 1):
+        if seed_id < LENGTH_OFFSETS[length + 1]:
+            return length
+    raise ValueError(f"Seed id out of range: {seed_id}")
+
+
+def decode_seed(seed_id):
+    """Unpack a seed id into its seed string
+
+    Args:
+        seed_id: Id from encode_seed()
+
+    Returns:
+        str: The seed
+
+    Raises:
+        ValueError: For an id outside 0 to SEED_COUNT - 1
+    """
+    seed_id = int(seed_id)
+    if seed_id < 0:
+        raise ValueError(f"Seed id out of range: {seed_id}")
+    length = seed_length(seed_id)
+    position = seed_id - LENGTH_OFFSETS[length]
+    chars = []
+    for _ in range(length):
+        position, digit = divmod(position, NUM_CHARS)
+        chars.append(SEED_CHARS[digit])
+    return "".join(reversed(chars))
+
+
+def skip_seed(seed, count):
+    """The seed count places further on in shortlex order (count may be negative)
+
+    Raises:
+        ValueError: For a malformed seed or when skipping past the first or last seed
+    """
+    target = encode_seed(seed) + int(count)
+    if not 0 <= target < SEED_COUNT:
+        raise ValueError(f"Skipping {count} from {seed} leaves the seed space")
+    return decode_seed(target)
+
+
+def seed_range(first, last):
+    """Inclusive id range of the seeds from first to last in enumeration order
+
+    Returns:
+        tuple: (low id, high id); swapped if last comes before first
+    """
+    low, high = encode_seed(first), encode_seed(last)
+    return (low, high) if low <= high else (high, low)
+
+
+def encode_seeds(seeds):
+    """Vectorized encode_seed()
+
+    Args:
+        seeds: Sequence or pandas.Series of seed strings
+
+    Returns:
+        tuple: (ids as uint64 numpy array, valid mask); invalid seeds get INVALID_SEED_ID
+    """
+    series = pd.Series(seeds, dtype=object).fillna("").astype(str).str.strip().str.upper()
+    count = len(series)
+    if count == 0:
+        return np.empty(0, dtype=np.uint64), np.empty(0, dtype=bool)
+    lengths = series.str.len().to_numpy(dtype=np.int64)
+    ascii_only = series.map(str.isascii).to_numpy(dtype=bool)
+    # Non-ASCII and over-long seeds are blanked out and flagged invalid below
+    packed = series.where(ascii_only, "").to_numpy(dtype=f"S{MAX_SEED_LENGTH}")
+    codes = np.frombuffer(packed.tobytes(), dtype=np.uint8).reshape(count, MAX_SEED_LENGTH)
+    digits = _DIGITS[codes]
+    in_seed = np.arange(MAX_SEED_LENGTH) < np.minimum(lengths, MAX_SEED_LENGTH)[:, None]
+    valid = (ascii_only & (lengths >= 1) & (lengths <= MAX_SEED_LENGTH)
+             & ~((digits == 255) & in_seed).any(axis=1))
+
+    positions = np.zeros(count, dtype=np.uint64)
+    for column in range(MAX_SEED_LENGTH):
+        step = positions * np.uint64(NUM_CHARS) + digits[:, column].astype(np.uint64)
+        positions = np.where(in_seed[:, column], step, positions)
+    ids = _OFFSETS[np.clip(lengths, 0, MAX_SEED_LENGTH + 1)] + positions
+    ids[~valid] = INVALID_SEED_ID
+    return ids, valid
+
+
+def decode_seeds(seed_ids):
+    """Vectorized decode_seed()
+
+    Args:
+        seed_ids: Sequence or numpy array of valid seed ids
+
+    Returns:
+        numpy.ndarray: Seed strings (object dtype)
+    """
+    ids = np.asarray(seed_ids, dtype=np.uint64)
+    if len(ids) == 0:
+        return np.empty(0, dtype=object)
+    lengths = np.searchsorted(_OFFSETS[2:], ids, side="right") + 1
+    positions = ids - _OFFSETS[lengths]
+    codes = np.zeros((len(ids), MAX_SEED_LENGTH), dtype=np.uint8)
+    for column in range(MAX_SEED_LENGTH):
+        exponent = lengths - 1 - column
+        present = exponent >= 0
+        digits = (positions // _POWERS[np.maximum(exponent, 0)]) % np.uint64(NUM_CHARS)
+        codes[:, column] = np.where(present, _CHAR_CODES[digits.astype(np.intp)], 0)
+    # Trailing NUL bytes are dropped by the bytes dtype, leaving each seed's own length
+    return np.char.decode(codes.view(f"S{MAX_SEED_LENGTH}").ravel(), "ascii").astype(object)
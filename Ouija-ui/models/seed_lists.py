@@ -0,0 +1,90 @@
+"""
+Seed Lists - Packed seed id files that Ouija-CLI --seeds evaluates in GPU batches
+"""
+
+import os
+
+import numpy as np
+
+from models.seed_codec import SEED_COUNT, encode_seeds
+
+# Ouija-CLI --seeds reads native little-endian uint64 seed ids (see openSeedList in ouija.c)
+SEED_LIST_DTYPE = np.dtype("<u8")
+SEED_LIST_SUFFIX = ".seeds"
+
+
+def seed_list_ids(seeds):
+    """Turn seeds into the sorted, distinct ids of a seed list
+
+    Args:
+        seeds: Seed strings (sequence or pandas Series), or an integer numpy array of seed ids
+
+    Returns:
+        tuple: (ids as a uint64 numpy array, number of invalid seeds dropped)
+    """
+    if isinstance(seeds, np.ndarray) and seeds.dtype.kind in "iu":
+        valid = seeds < SEED_COUNT
+        if seeds.dtype.kind == "i":
+            valid &= seeds >= 0
+        ids = seeds[valid].astype(np.uint64)
+    else:
+        ids, valid = encode_seeds(seeds)
+        ids = ids[valid]
+    # Sort, then drop repeats; np.unique is many times slower on large uint64 arrays
+    ids = np.sort(ids)
+    if len(ids) > 1:
+        ids = ids[np.concatenate(([True], ids[1:] != ids[:-1]))]
+    return ids, int(len(valid) - np.count_nonzero(valid))
+
+
+def write_seed_list(path, seed_ids):
+    """Write seed ids as a packed seed list through a memory map
+
+    Args:
+        path: File to (over)write
+        seed_ids: Ids from seed_list_ids()
+
+    Returns:
+        int: Number of ids written
+    """
+    ids = np.asarray(seed_ids, dtype=np.uint64)
+    if len(ids) == 0:
+        # An empty file can't be mapped
+        open(path, "wb").close()
+        return 0
+    mapped = np.memmap(path, dtype=SEED_LIST_DTYPE, mode="w+", shape=(len(ids),))
+    mapped[:] = ids
+    mapped.flush()
+    del mapped
+    return len(ids)
+
+
+def read_seed_list(path):
+    """Map a packed seed list read-only
+
+    Returns:
+        numpy.ndarray: The ids (a memmap; empty for an empty file)
+    """
+    count = os.path.getsize(path) // SEED_LIST_DTYPE.itemsize
+    if count == 0:
+        return np.empty(0, dtype=SEED_LIST_DTYPE)
+    return np.memmap(path, dtype=SEED_LIST_DTYPE, mode="r", shape=(count,))
+
+
+def load_seed_file(path):
+    """Load an imported seed list
+
+    A .seeds file is used as packed ids. Anything else is read as text with one
+    seed per line; a CSV (e.g. an export) contributes its first column, and a
+    "Seed" header line is skipped.
+
+    Returns:
+        tuple: (ids as a uint64 numpy array, number of invalid seeds dropped)
+    """
+    if path.lower().endswith(SEED_LIST_SUFFIX):
+        return seed_list_ids(np.asarray(read_seed_list(path)))
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        seeds = [line.split(",", 1)[0].strip().strip('"') for line in f]
+    if seeds and seeds[0] == "Seed":
+        seeds = seeds[1:]
+    return seed_list_ids([seed for seed in seeds if seed])
@@ -0,0 +1,224 @@
+"""
+Seen Results - Compact per-database set of stored rows used to skip duplicate upserts
+"""
+
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from models.result_schema import RESULT_ROWS_TABLE, SEED_ID_COLUMN
+
+# Stands in for NULL so a stored NULL never matches an incoming value
+NULL_SENTINEL = -(2 ** 62)
+
+
+def hash_rows(frame, columns):
+    """Key each row on its packed seed and hash its full contents
+
+    Args:
+        frame: pandas.DataFrame with a SeedId column and the value columns
+        columns: CLI header columns to include in the row hash (Seed first; the
+                 seed is hashed through SeedId)
+
+    Returns:
+        tuple: (seed ids, row hashes) as uint64 numpy arrays
+    """
+    seed_ids = frame[SEED_ID_COLUMN].to_numpy(dtype=np.uint64)
+    data = {SEED_ID_COLUMN: seed_ids}
+    for col in columns[1:]:
+        data[col] = pd.to_numeric(frame[col], errors="coerce").fillna(NULL_SENTINEL).astype(np.int64)
+    row_hashes = pd.util.hash_pandas_object(pd.DataFrame(data), index=False).to_numpy()
+    return seed_ids, row_hashes
+
+
+class SeenResults:
+    """Seed id -> row hash for every row stored in one results table
+
+    Restarted or overlapping searches re-emit seeds that are already stored.
+    screen() drops rows whose seed is stored with an identical row, so only new
+    or changed rows reach INSERT OR REPLACE.
+
+    Entries are keyed on the packed seed id (models.seed_codec), so lookups are
+    exact, and live in sorted uint64 numpy arrays (16 bytes per stored row): a large
+    main level and a small pending level that new rows are inserted into. The
+    pending level is folded into the main level once it grows past a fraction of
+    it, so each batch costs a copy of the small level, not of the whole set.
+
+    The set is loaded lazily from the table the first time a batch is screened.
+    """
+
+    MIN_PENDING = 1 << 16  # Fold pending into main once it has this many entries...
+    PENDING_FRACTION = 8  # ...or 1/8 of main, whichever is larger
+
+    def __init__(self):
+        """Initialize an empty, not yet loaded set"""
+        self._lock = threading.Lock()
+        self._columns = None  # Header the row hashes were computed for
+        self._loaded = False
+        self._main_keys = np.empty(0, dtype=np.uint64)
+        self._main_values = np.empty(0, dtype=np.uint64)
+        self._pending_keys = np.empty(0, dtype=np.uint64)
+        self._pending_values = np.empty(0, dtype=np.uint64)
+
+        # Counters
+        self.duplicates_avoided = 0
+        self.rows_screened = 0
+        self.load_seconds = 0.0
+
+    def __len__(self):
+        """Upper bound on the number of stored rows tracked"""
+        return len(self._main_keys) + len(self._pending_keys)
+
+    def reset(self):
+        """Forget everything; the next screen() reloads from the table"""
+        with self._lock:
+            self._loaded = False
+            self._clear()
+
+    def clear(self):
+        """Mark the table as empty (it was just dropped or recreated)"""
+        with self._lock:
+            self._clear()
+            self._loaded = True
+
+    def _clear(self):
+        """Drop all entries; caller holds the lock"""
+        self._columns = None
+        self._main_keys = np.empty(0, dtype=np.uint64)
+        self._main_values = np.empty(0, dtype=np.uint64)
+        self._pending_keys = np.empty(0, dtype=np.uint64)
+        self._pending_values = np.empty(0, dtype=np.uint64)
+
+    def screen(self, conn, columns, batch):
+        """Drop rows that are already stored unchanged
+
+        Args:
+            conn: Connection or cursor used to load the set on first use
+            columns: CLI header columns of the batch (Seed first)
+            batch: pandas.DataFrame with unique seeds and their SeedId column
+
+        Returns:
+            tuple: (rows to write, their seed ids, their row hashes); pass the
+                   ids and hashes to add() once the rows have been written
+        """
+        columns = list(columns)
+        keys, values = hash_rows(batch, columns)
+        with self._lock:
+            if not self._loaded or (self._columns is not None and columns != self._columns):
+                # Row hashes are only comparable over the same header; rehash the table for it
+                self._load(conn, columns)
+            elif self._columns is None:
+                self._columns = columns
+            self.rows_screened += len(batch)
+
+            stored = self._lookup(keys)
+            duplicate = stored == values
+            found = int(duplicate.sum())
+            if not found:
+                return batch, keys, values
+            self.duplicates_avoided += found
+            keep = ~duplicate
+            return batch[keep], keys[keep], values[keep]
+
+    def stored(self, keys):
+        """Which seed ids are recorded as stored (pruned rows may still be recorded)
+
+        Returns:
+            numpy.ndarray: bool mask over keys
+        """
+        with self._lock:
+            return self._lookup(keys) != 0
+
+    def add(self, keys, values):
+        """Record rows that were just written"""
+        if len(keys) == 0:
+            return
+        with self._lock:
+            if not self._loaded:
+                return  # The next load reads them back from the table
+            order = np.argsort(keys, kind="stable")
+            self._pending_keys, self._pending_values = self._upsert(
+                self._pending_keys, self._pending_values, keys[order], values[order])
+            if len(self._pending_keys) > max(self.MIN_PENDING, len(self._main_keys) // self.PENDING_FRACTION):
+                self._main_keys, self._main_values = self._upsert(
+                    self._main_keys, self._main_values, self._pending_keys, self._pending_values)
+                self._pending_keys = np.empty(0, dtype=np.uint64)
+                self._pending_values = np.empty(0, dtype=np.uint64)
+
+    def stats(self):
+        """Get the screening counters
+
+        Returns:
+            dict: Tracked rows, rows screened and duplicates avoided
+        """
+        return {
+            "tracked_rows": len(self),
+            "rows_screened": self.rows_screened,
+            "duplicates_avoided": self.duplicates_avoided,
+            "load_seconds": self.load_seconds,
+        }
+
+    def _load(self, conn, columns):
+        """Hash every stored row of the results table; caller holds the lock"""
+        start = time.perf_counter()
+        self._clear()
+        self._columns = columns
+        key_parts, value_parts = [], []
+        try:
+            column_names = ", ".join([f'"{SEED_ID_COLUMN}"'] + [f'"{col}"' for col in columns[1:]])
+            result = conn.execute(f"SELECT {column_names} FROM {RESULT_ROWS_TABLE}")
+            while True:
+                chunk = result.fetch_df_chunk(64)
+                if chunk is None or chunk.empty:
+                    break
+                keys, values = hash_rows(chunk, columns)
+                key_parts.append(keys)
+                value_parts.append(values)
+        except Exception as e:
+            # Missing table or columns: start empty, rows will simply not be screened
+            print(f"Seen results: could not load stored rows ({e}); starting empty")
+            key_parts, value_parts = [], []
+
+        if key_parts:
+            keys = np.concatenate(key_parts)
+            values = np.concatenate(value_parts)
+            order = np.argsort(keys, kind="stable")
+            self._main_keys, self._main_values = keys[order], values[order]
+        self._loaded = True
+        self.load_seconds += time.perf_counter() - start
+
+    def _lookup(self, keys):
+        """Stored row hash per seed id (0 where not stored); caller holds the lock"""
+        stored = np.zeros(len(keys), dtype=np.uint64)
+        for level_keys, level_values in ((self._main_keys, self._main_values),
+                                         (self._pending_keys, self._pending_values)):
+            if len(level_keys) == 0:
+                continue
+            pos = np.searchsorted(level_keys, keys)
+            pos_clipped = np.minimum(pos, len(level_keys) - 1)
+            hit = level_keys[pos_clipped] == keys
+            # Pending is newer, so it is applied last and wins
+            stored[hit] = level_values[pos_clipped[hit]]
+        return stored
+
+    @staticmethod
+    def _upsert(level_keys, level_values, keys, values):
+        """Merge sorted keys into a sorted level, replacing values of existing keys
+
+        Returns:
+            tuple: (keys, values) of the merged level
+        """
+        pos = np.searchsorted(level_keys, keys)
+        if len(level_keys):
+            pos_clipped = np.minimum(pos, len(level_keys) - 1)
+            exists = level_keys[pos_clipped] == keys
+            if exists.any():
+                level_values = level_values.copy()
+                level_values[pos_clipped[exists]] = values[exists]
+                new = ~exists
+                keys, values, pos = keys[new], values[new], pos[new]
+        if len(keys) == 0:
+            return level_keys, level_values
+        return np.insert(level_keys, pos, keys), np.insert(level_values, pos, values)
@@ -0,0 +1,240 @@
+"""
+Top Results - In-memory copy of the best results, kept current by the ingest path
+"""
+
+import threading
+from collections import deque
+
+import numpy as np
+import pandas as pd
+
+from models.seed_codec import encode_seeds
+
+
+def sort_top(frame, capacity):
+    """Sort like query_results(), drop duplicate seeds (last wins) and cut to capacity
+
+    Args:
+        frame: pandas.DataFrame with Seed and Score columns
+        capacity: Number of rows to keep
+
+    Returns:
+        pandas.DataFrame: Sorted top rows with a fresh index
+    """
+    if frame.empty or "Score" not in frame.columns:
+        return frame.reset_index(drop=True)
+    frame = frame.drop_duplicates(subset="Seed", keep="last")
+    # np.lexsort sorts by the last key first: Score descending, then packed seed ascending
+    # like the database (Score is unsigned there; negate it as int64 so it can't wrap)
+    order = np.lexsort((encode_seeds(frame["Seed"])[0], -frame["Score"].fillna(0).to_numpy(dtype=np.int64)))
+    return frame.iloc[order[:capacity]].reset_index(drop=True)
+
+
+def apply_top_delta(frame, rows, capacity):
+    """Merge rows from TopResults.changes_since() into a copy of an older top-K
+
+    Args:
+        frame: Top rows as of the delta's starting version
+        rows: Rows that entered the top-K since then
+        capacity: Number of rows to keep
+
+    Returns:
+        pandas.DataFrame: The top-K as of the delta's end version
+    """
+    if rows is None or rows.empty:
+        return frame
+    if frame.empty:
+        return sort_top(rows, capacity)
+    frame = frame.loc[~frame["Seed"].isin(rows["Seed"])]
+    missing = [col for col in rows.columns if col not in frame.columns]
+    if missing:
+        frame = frame.assign(**{col: 0 for col in missing})
+    return sort_top(pd.concat([frame, rows.reindex(columns=frame.columns)], ignore_index=True), capacity)
+
+
+class TopResults:
+    """Bounded top-K of the results table, ordered by Score then Seed
+
+    The database stays the durable store; this is what the results table shows.
+    It is loaded once from DuckDB (at connect or after invalidate()) and then every
+    upserted batch is merged in with vectorized pandas operations: rows that don't
+    beat the current K-th row are filtered out up front, the survivors are merged with the
+    current top and cut back to K. Batches arriving while a load is in flight are
+    replayed on top of the loaded rows; merging is idempotent, so a batch already
+    included in the load does no harm.
+
+    If an upsert lowers the score of a seed that is in the top-K, a row from
+    outside the top-K may now belong in it, so the copy is invalidated and the
+    next read reloads it from the database.
+
+    Every change bumps version. Merges also log the rows that entered the top-K,
+    so a reader holding the top-K at an older version can catch up with
+    changes_since() and apply_top_delta() instead of copying all K rows.
+    Loads, clears and invalidations start a new log; readers older than that
+    (or than the oldest logged merge) get a full snapshot instead.
+    """
+
+    DELTA_LOG_LIMIT = 256  # Merges kept for changes_since()
+
+    def __init__(self, capacity=1000):
+        """Initialize an empty, not yet loaded top-K
+
+        Args:
+            capacity: Number of results to keep (K)
+        """
+        self.capacity = capacity
+        self._frame = None  # None means "not loaded, ask DuckDB"
+        self._replay = None  # Batches seen while a load is in flight
+        self._lock = threading.Lock()
+
+        # Change tracking for incremental readers
+        self.version = 0
+        self._log = deque(maxlen=self.DELTA_LOG_LIMIT)  # (version, rows that entered)
+        self._log_base = 0  # Oldest version a delta can start from
+
+        # Counters for checking the cache does its job
+        self.loads = 0
+        self.merges = 0
+
+    def snapshot(self, limit=None):
+        """Get the current top rows
+
+        Args:
+            limit: Return at most this many rows (default: all K)
+
+        Returns:
+            pandas.DataFrame: Copy of the top rows, or None if not loaded
+        """
+        with self._lock:
+            if self._frame is None:
+                return None
+            frame = self._frame if limit is None else self._frame.head(limit)
+            return frame.copy()
+
+    def changes_since(self, version):
+        """Get what changed in the top-K after a given version
+
+        Args:
+            version: Version the caller's copy corresponds to (None for "no copy")
+
+        Returns:
+            tuple: (current version, rows, is_delta). With is_delta the rows are
+                   the ones that entered the top-K (possibly empty) and go through
+                   apply_top_delta(); otherwise rows is a full snapshot, or None
+                   if the top-K is not loaded.
+        """
+        with self._lock:
+            if self._frame is None:
+                return self.version, None, False
+            if version is not None and self._log_base <= version <= self.version and (
+                    not self._log or self._log[0][0] <= version + 1):
+                parts = [rows for logged, rows in self._log if logged > version]
+                if not parts:
+                    return self.version, self._frame.iloc[0:0].copy(), True
+                rows = parts[0] if len(parts) == 1 else pd.concat(parts, ignore_index=True)
+                return self.version, rows.drop_duplicates(subset="Seed", keep="last"), True
+            return self.version, self._frame.copy(), False
+
+    def _reset_log(self):
+        """Start a new change log after a non-incremental change; caller holds the lock"""
+        self.version += 1
+        self._log.clear()
+        self._log_base = self.version
+
+    def begin_load(self):
+        """Start collecting batches that must be replayed after the load"""
+        with self._lock:
+            self._replay = []
+
+    def finish_load(self, frame):
+        """Install rows read from the database and replay batches seen meanwhile
+
+        Args:
+            frame: Up to K rows in query_results() order (None for "no table")
+        """
+        with self._lock:
+            replay, self._replay = self._replay or [], None
+            self._frame = self._sorted(frame if frame is not None else pd.DataFrame())
+            self.loads += 1
+            self._reset_log()
+            for batch in replay:
+                self._merge(batch)
+
+    def clear(self):
+        """Reset to an empty, loaded top-K (the table was emptied)"""
+        with self._lock:
+            self._frame = pd.DataFrame()
+            self._replay = None
+            self._reset_log()
+
+    def invalidate(self):
+        """Forget the rows; the next read reloads them from the database"""
+        with self._lock:
+            self._frame = None
+            self._reset_log()
+
+    def update(self, batch):
+        """Merge an upserted batch (pandas.DataFrame with a Seed and Score column)"""
+        if batch is None or batch.empty or "Score" not in batch.columns:
+            return
+        with self._lock:
+            if self._frame is None:
+                if self._replay is not None:
+                    self._replay.append(batch)
+                return
+            self._merge(batch)
+
+    def _merge(self, batch):
+        """Merge a batch into the loaded frame; caller holds the lock"""
+        top = self._frame
+        self.merges += 1
+
+        if top.empty:
+            self._frame = self._sorted(batch)
+            self._log_entered(self._frame)
+            return
+
+        # New CLI columns were added with DEFAULT 0, so existing rows read back as 0
+        for col in batch.columns:
+            if col not in top.columns:
+                top[col] = 0
+
+        replaced = top["Seed"].isin(batch["Seed"])
+        if replaced.any():
+            old_scores = top.loc[replaced].set_index("Seed")["Score"]
+            hits = batch[batch["Seed"].isin(old_scores.index)].drop_duplicates(subset="Seed", keep="last")
+            new_scores = hits.set_index("Seed")["Score"]
+            if (new_scores.reindex(old_scores.index) < old_scores).any():
+                # A row from outside the top-K may now outrank this seed
+                self._frame = None
+                self._reset_log()
+                return
+
+        candidates = batch
+        if len(top) >= self.capacity:
+            # Only rows that beat or tie the current K-th row on (Score, Seed) can get in.
+            # Ties keep a replaced K-th seed, whose new row has the same score.
+            last_score = top["Score"].iloc[-1]
+            last_seed_id = encode_seeds(top["Seed"].iloc[-1:])[0][0]
+            scores = batch["Score"]
+            tied = (scores == last_score).to_numpy() & (encode_seeds(batch["Seed"])[0] <= last_seed_id)
+            candidates = batch[(scores > last_score).to_numpy() | tied]
+            if candidates.empty:
+                return
+        if replaced.any():
+            top = top.loc[~replaced]
+
+        merged = pd.concat([top, candidates.reindex(columns=top.columns)], ignore_index=True)
+        self._frame = self._sorted(merged)
+        self._log_entered(self._frame[self._frame["Seed"].isin(candidates["Seed"])])
+
+    def _log_entered(self, rows):
+        """Log rows that entered the top-K; caller holds the lock"""
+        if rows.empty:
+            return
+        self.version += 1
+        self._log.append((self.version, rows.reset_index(drop=True)))
+
+    def _sorted(self, frame):
+        """Sort like query_results(), drop duplicate seeds (last wins) and cut to K"""
+        return sort_top(frame, self.capacity)
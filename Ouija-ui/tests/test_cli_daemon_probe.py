@@ -0,0 +1,45 @@
+"""
+CLI daemon probe tests - The -h probe runs off the calling thread and is redone for a new CLI build
+"""
+
+import os
+import sys
+import time
+
+from models.search_model import SearchModel
+
+
+def _fake_cli(path, options, delay=0.0):
+    with open(path, "w") as f:
+        f.write(f"#!{sys.executable}\nimport time\ntime.sleep({delay})\nprint({options!r})\n")
+    os.chmod(path, 0o755)
+    return str(path)
+
+
+def _wait_probed(model, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while model.cli_daemon_supported is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return model.cli_daemon_supported
+
+
+def test_probe_does_not_block_the_caller(tmp_path):
+    model = SearchModel()
+    cli = _fake_cli(tmp_path / "Ouija-CLI", "--binary --daemon", delay=1.0)
+    started = time.monotonic()
+    assert model._cli_has_daemon(cli) is False  # Unknown yet: run this search as a process
+    assert time.monotonic() - started < 0.5
+    assert _wait_probed(model) is True
+    assert model._cli_has_daemon(cli) is True
+
+
+def test_new_build_is_probed_again(tmp_path):
+    model = SearchModel()
+    cli = _fake_cli(tmp_path / "Ouija-CLI", "--binary --daemon")
+    model._cli_has_daemon(cli)
+    assert _wait_probed(model) is True
+
+    _fake_cli(tmp_path / "Ouija-CLI", "--binary")
+    os.utime(cli, (time.time() + 10, time.time() + 10))
+    assert model._cli_has_daemon(cli) is False
+    assert _wait_probed(model) is False
@@ -0,0 +1,48 @@
+"""
+CLI stream tests - Result block parsing and stdout splitting
+"""
+
+from models.cli_stream import CliStreamSplitter, parse_result_block
+
+COLUMNS = ["Seed", "Score", "Perkeo", "Blueprint"]
+
+
+def test_full_rows():
+    frame = parse_result_block(b"AAAA1111,5,1,2\nNAN,3,0,1\n", COLUMNS)
+    assert list(frame.columns) == COLUMNS
+    assert frame["Seed"].tolist() == ["AAAA1111", "NAN"]
+    assert frame["Blueprint"].tolist() == [2, 1]
+
+
+def test_all_rows_shorter_than_header_are_padded():
+    frame = parse_result_block(b"AAAA1111,5\nBBBB2222,3\n", COLUMNS)
+    assert list(frame.columns) == COLUMNS
+    assert frame.values.tolist() == [["AAAA1111", 5, 0, 0], ["BBBB2222", 3, 0, 0]]
+
+
+def test_mixed_row_lengths():
+    frame = parse_result_block(b"AAAA1111,5\nBBBB2222,3,1,2,9\nCCCC3333\n", COLUMNS)
+    assert frame.values.tolist() == [
+        ["AAAA1111", 5, 0, 0],
+        ["BBBB2222", 3, 1, 2],
+        ["CCCC3333", 0, 0, 0],
+    ]
+
+
+def test_unparsable_and_decimal_fields():
+    frame = parse_result_block(b"AAAA1111,4.9,x,\n", COLUMNS)
+    assert frame.values.tolist() == [["AAAA1111", 4, 0, 0]]
+    assert all(frame[column].dtype.kind == "i" for column in COLUMNS[1:])
+
+
+def test_splitter_keeps_order_across_chunks():
+    splitter = CliStreamSplitter()
+    events = splitter.feed(b"+Seed,Score\n|AAAA1111,5\n|BB")
+    events += splitter.feed(b"BB2222,3\n$Search Complete!")
+    events += splitter.finish()
+    assert events == [
+        ("line", "+Seed,Score\n"),
+        ("results", b"AAAA1111,5\n"),
+        ("results", b"BBBB2222,3\n"),
+        ("line", "$Search Complete!\n"),
+    ]
@@ -0,0 +1,53 @@
+"""
+CLI supervisor tests - A job whose stdout handler blocks doesn't hold up other jobs, and
+stdout is handled on the loop thread while the handler can't block
+"""
+
+import sys
+import threading
+
+from models.cli_supervisor import CliSupervisor
+
+PRINT_LINES = [sys.executable, "-c", "import sys\nfor i in range(1000): sys.stdout.write(f'{i}\\n')"]
+
+
+def test_blocked_stdout_handler_pauses_only_its_job():
+    supervisor = CliSupervisor(read_chunk_size=256)
+    release = threading.Event()
+    blocked_chunks = []
+    other_output = []
+    try:
+        def blocking_stdout(job, chunk):
+            blocked_chunks.append(chunk)
+            release.wait(10)
+
+        blocked = supervisor.launch(PRINT_LINES, blocking_stdout, lambda job, line: None, lambda job: None)
+        other = supervisor.launch(PRINT_LINES, lambda job, chunk: other_output.append(chunk),
+                                  lambda job, line: None, lambda job: None, timeout=2.0)
+        assert other.wait(5)
+        assert b"".join(other_output).split() == [str(i).encode() for i in range(1000)]
+        assert not blocked.finished.is_set() and len(blocked_chunks) == 1
+
+        release.set()
+        assert blocked.wait(5)
+        assert b"".join(blocked_chunks).split() == [str(i).encode() for i in range(1000)]
+    finally:
+        release.set()
+        supervisor.shutdown()
+
+
+def test_stdout_handler_thread_follows_stdout_busy():
+    supervisor = CliSupervisor()
+    threads = {True: set(), False: set()}
+    try:
+        for busy in (True, False):
+            def on_stdout(job, chunk, busy=busy):
+                threads[busy].add(threading.current_thread().name)
+
+            job = supervisor.launch(PRINT_LINES, on_stdout, lambda job, line: None, lambda job: None,
+                                    stdout_busy=lambda busy=busy: busy)
+            assert job.wait(5)
+        assert threads[False] == {"OuijaCliSupervisor"}
+        assert "OuijaCliSupervisor" not in threads[True]
+    finally:
+        supervisor.shutdown()
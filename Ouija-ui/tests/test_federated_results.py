@@ -0,0 +1,60 @@
+"""
+Federated results tests - The controller queries every config's database, open or not, by config name
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from controllers.database_controller import DatabaseController
+from models.connection_manager import connection_manager
+from models.database_model import DatabaseModel
+
+COLUMNS = ["Seed", "Score", "Perkeo"]
+
+
+def _fill(db_dir, name, rows):
+    model = DatabaseModel()
+    model.DB_DIR = str(db_dir)
+    model.connect(os.path.join(db_dir, f"{name}.ouija.json"))
+    model.prepare_results_table(COLUMNS)
+    model.insert_result_frame(COLUMNS, pd.DataFrame(rows, columns=COLUMNS))
+    return model
+
+
+@pytest.fixture
+def controller(tmp_path):
+    _fill(tmp_path, "eggs", [["AAAAAAAA", 10, 1], ["BBBBBBBB", 4, 0]]).close()
+    _fill(tmp_path, "kings", [["AAAAAAAA", 7, 0], ["CCCCCCCC", 9, 1]]).close()
+    # The third config stays open for writing, so it's read through the app's connection
+    open_model = _fill(tmp_path, "yorick", [["AAAAAAAA", 2, 0], ["BBBBBBBB", 6, 1]])
+    controller = DatabaseController(open_model)
+    yield controller
+    controller.results_pager.close()
+    controller.federated_results.close()
+    open_model.close()
+    connection_manager.close_all()
+
+
+def test_catalog_lists_every_config(controller):
+    catalog = controller.get_results_catalog().data
+    assert [(e["config"], e["rows"], e["max_score"], e["error"]) for e in catalog] == \
+        [("eggs", 2, 10, None), ("kings", 2, 9, None), ("yorick", 2, 6, None)]
+
+
+def test_seeds_across_configs(controller):
+    across = controller.get_cross_config_results().data
+    assert list(across["Seed"]) == ["AAAAAAAA", "BBBBBBBB"]
+    assert across.iloc[0][["Configs", "Total Score", "eggs", "kings", "yorick"]].tolist() == [3, 19, 10, 7, 2]
+
+    strict = controller.get_cross_config_results(configs=["eggs", "kings"], min_score=5).data
+    assert list(strict["Seed"]) == ["AAAAAAAA"]
+
+
+def test_query_all_results(controller):
+    frame = controller.query_all_results(
+        'SELECT config, "SeedId", "Score" FROM all_results WHERE "Score" >= ? ORDER BY "Score" DESC', [7]).data
+    assert frame[["config", "Seed", "Score"]].values.tolist() == \
+        [["eggs", "AAAAAAAA", 10], ["kings", "CCCCCCCC", 9], ["kings", "AAAAAAAA", 7]]
+    assert not controller.query_all_results("SELECT * FROM no_such_table")
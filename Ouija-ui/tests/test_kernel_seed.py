@@ -0,0 +1,98 @@
+"""
+Kernel seed tests - The seed-list kernel spells seed ids like seed_codec
+
+lib/seed.cl is compiled as C++ with small stand-ins for the OpenCL vector
+types, so s_new_id() and s_skip() run on the host. Skipped without a C++ compiler.
+"""
+
+import os
+import shutil
+import subprocess
+
+import numpy as np
+import pytest
+
+from models.search_checkpoints import seed_after
+from models.seed_codec import LENGTH_OFFSETS, SEED_COUNT, decode_seed
+
+CLI_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "Ouija-cli")
+COMPILER = shutil.which("g++") or shutil.which("clang++")
+
+HARNESS = r"""
+#include <cstdio>
+#include <cstring>
+#define __constant const
+typedef unsigned long ulong;
+struct ulong8 {
+    ulong v[8];
+    ulong8() {}
+    ulong8(int x) { for (int i = 0; i < 8; i++) v[i] = (ulong)x; }
+    ulong &operator[](long i) { return v[i]; }
+};
+struct char8 {
+    char v[8];
+    char &operator[](long i) { return v[i]; }
+};
+typedef struct Text { char str[256]; int len; } text;
+static void set_text_length(text *t, int len) { t->len = len; t->str[len] = '\0'; }
+#include "lib/seed.cl"
+int main() {
+    char mode[2], start[16];
+    unsigned long long id;
+    long n;
+    while (std::scanf("%1s", mode) == 1) {
+        seed s;
+        if (mode[0] == 'd') {
+            std::scanf("%llu", &id);
+            s = s_new_id((ulong)id);
+        } else {
+            std::scanf("%15s %ld", start, &n);
+            char8 c;
+            std::memset(c.v, 0, sizeof(c.v));
+            if (std::strcmp(start, "-") != 0) std::strncpy(c.v, start, 8);
+            s = s_new_c8(c);
+            s_skip(&s, n);
+        }
+        text t = s_to_string(&s);
+        std::printf("[%s]\n", t.str);
+    }
+    return 0;
+}
+"""
+
+
+@pytest.fixture(scope="module")
+def kernel(tmp_path_factory):
+    if COMPILER is None:
+        pytest.skip("no C++ compiler")
+    directory = tmp_path_factory.mktemp("kernel_seed")
+    source = directory / "harness.cpp"
+    source.write_text(HARNESS)
+    binary = str(directory / "harness")
+    subprocess.run([COMPILER, "-w", "-I", CLI_DIR, str(source), "-o", binary], check=True)
+
+    def run(lines):
+        completed = subprocess.run([binary], input="\n".join(lines), capture_output=True, text=True, check=True)
+        return [line[1:-1] for line in completed.stdout.splitlines()]
+
+    return run
+
+
+def test_kernel_decode_matches_codec(kernel):
+    ids = [0, 34, 35, SEED_COUNT - 1]
+    for offset in LENGTH_OFFSETS[2:9]:
+        ids += [offset - 1, offset, offset + 1, offset + 34, offset + 35]
+    rng = np.random.default_rng(25)
+    ids += rng.integers(0, SEED_COUNT, 5000, dtype=np.uint64).tolist()
+    ids += rng.integers(LENGTH_OFFSETS[8], SEED_COUNT, 5000, dtype=np.uint64).tolist()
+    assert kernel([f"d {int(i)}" for i in ids]) == [decode_seed(int(i)) for i in ids]
+
+
+def test_kernel_skip_matches_seed_after(kernel):
+    rng = np.random.default_rng(21)
+    cases = []
+    for start in ["", "1", "Z", "AB", "ZZ", "11111", "ZZZZZZZ", "11111111", "ABCDEFGH"]:
+        offsets = list(range(1, 80)) + rng.integers(0, 35 ** 5, 500).tolist()
+        cases += [(start, int(offset)) for offset in offsets]
+    results = kernel([f"s {start or '-'} {offset}" for start, offset in cases])
+    assert results == [seed_after(start, offset) for start, offset in cases]
@@ -0,0 +1,66 @@
+"""
+Result ingest tests - Rows queued by the writer stay with the database they were searched for
+"""
+
+import os
+
+import pytest
+
+from models.database_model import DatabaseModel
+from models.result_ingest import IngestWriter
+
+COLUMNS = ["Seed", "Score", "Perkeo"]
+
+
+@pytest.fixture
+def db_model(tmp_path):
+    model = DatabaseModel()
+    model.DB_DIR = str(tmp_path)
+    yield model
+    model.close()
+
+
+def _stored_seeds(db_model):
+    with db_model.reader_cursor() as cursor:
+        return sorted(row[0] for row in cursor.execute('SELECT "Seed" FROM results').fetchall())
+
+
+def _start_writer(db_model):
+    writer = IngestWriter(db_model, flush_ms=50)
+    db_model.on_before_close = writer.release
+    writer.start()
+    return writer
+
+
+def test_switching_databases_commits_to_the_old_one(db_model, tmp_path):
+    db_model.connect(os.path.join(tmp_path, "first.ouija.json"))
+    writer = _start_writer(db_model)
+    writer.submit_header(COLUMNS)
+    writer.submit_block(COLUMNS, b"AAAA1111,5,1\nBBBB2222,3,0\n")
+    writer.sync()
+    writer.submit_block(COLUMNS, b"CCCC3333,4,2\n")
+
+    db_model.connect(os.path.join(tmp_path, "second.ouija.json"))
+    assert writer._conn is None and not writer._buffers
+    writer.submit_header(COLUMNS)
+    writer.submit_block(COLUMNS, b"DDDD4444,6,1\n")
+    writer.sync()
+    assert _stored_seeds(db_model) == ["DDDD4444"]
+    assert writer.rows_written() == 4
+    writer.stop()
+
+    db_model.connect(os.path.join(tmp_path, "first.ouija.json"))
+    assert _stored_seeds(db_model) == ["AAAA1111", "BBBB2222", "CCCC3333"]
+
+
+def test_rows_for_a_closed_database_are_dropped(db_model, tmp_path):
+    db_model.connect(os.path.join(tmp_path, "first.ouija.json"))
+    writer = _start_writer(db_model)
+    writer.submit_header(COLUMNS)
+    db_model.on_before_close = None  # Switch without letting the writer catch up
+    writer.queue.put(("block", (db_model.current_db_path, tuple(COLUMNS)), b"AAAA1111,5,1\n"))
+    db_model.connect(os.path.join(tmp_path, "second.ouija.json"))
+    writer.sync()
+    assert writer.drops == 1
+    assert _stored_seeds(db_model) == []
+    writer.stop()
@@ -0,0 +1,113 @@
+"""
+Result retention tests - keep_top cuts ties by seed id, and the survivor copy keeps rows written while it ran
+"""
+
+import os
+
+import duckdb
+import pandas as pd
+import pytest
+
+from models.database_model import DatabaseModel
+from models.result_retention import ResultPruner, RetentionPolicy, prune_condition
+from models.result_schema import RESULT_ROWS_TABLE
+
+COLUMNS = ["Seed", "Score", "Perkeo"]
+
+
+@pytest.fixture
+def db_model(tmp_path):
+    model = DatabaseModel()
+    model.DB_DIR = str(tmp_path)
+    model.connect(os.path.join(tmp_path, "retention.ouija.json"))
+    model.prepare_results_table(COLUMNS)
+    yield model
+    model.close()
+
+
+def _rows_table(scores):
+    conn = duckdb.connect()
+    conn.execute(f'CREATE TABLE {RESULT_ROWS_TABLE} ("SeedId" UBIGINT PRIMARY KEY, "Score" USMALLINT)')
+    conn.executemany(f"INSERT INTO {RESULT_ROWS_TABLE} VALUES (?, ?)", list(enumerate(scores)))
+    return conn
+
+
+def _kept(conn, policy):
+    condition = prune_condition(conn, policy)
+    where = f"WHERE NOT ({condition})" if condition else ""
+    return [row[0] for row in conn.execute(
+        f'SELECT "SeedId" FROM {RESULT_ROWS_TABLE} {where} ORDER BY "SeedId"').fetchall()]
+
+
+def test_keep_top_breaks_score_ties_by_seed_id():
+    # Seeds 0-9 score 5, seeds 10-12 score 9
+    conn = _rows_table([5] * 10 + [9] * 3)
+    assert _kept(conn, RetentionPolicy(keep_top=5)) == [0, 1, 10, 11, 12]
+    assert _kept(conn, RetentionPolicy(keep_top=3)) == [10, 11, 12]
+    assert _kept(conn, RetentionPolicy(keep_top=13)) == list(range(13))
+    assert _kept(conn, RetentionPolicy(keep_top=5, min_score=6)) == [10, 11, 12]
+    assert prune_condition(conn, RetentionPolicy(keep_top=100)) is None
+
+
+def _frame(rows):
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+
+def _stored(db_model):
+    with db_model.reader_cursor() as cursor:
+        return dict(cursor.execute('SELECT "Seed", "Score" FROM results').fetchall())
+
+
+class _CopyHook:
+    """Cursor that runs hook() right after the survivor copy, like a writer batch landing meanwhile"""
+
+    def __init__(self, conn, hook):
+        self.conn = conn
+        self.hook = hook
+
+    def execute(self, sql, *args):
+        result = self.conn.execute(sql, *args)
+        if sql.startswith(f"INSERT INTO {RESULT_ROWS_TABLE}_rebuild SELECT"):
+            self.hook()
+        return result
+
+    def __getattr__(self, name):
+        return getattr(self.conn, name)
+
+
+def test_survivor_copy_keeps_rows_written_during_the_copy(db_model):
+    db_model.insert_result_frame(COLUMNS, _frame([[f"1111111{i}", i, 0] for i in range(1, 10)]))
+    db_model.retention = RetentionPolicy(keep_top=3)
+    pruner = db_model.pruner = ResultPruner(db_model)  # Not started; the copy is run by hand
+    conn = db_model.writer_cursor()
+    writer = db_model.writer_cursor()
+    try:
+        condition = prune_condition(conn, db_model.retention)
+
+        def write_meanwhile():
+            # A new best seed, a new seed below the cut and a kept seed whose row changed
+            db_model.insert_result_frame(
+                COLUMNS, _frame([["AAAAAAAA", 50, 1], ["BBBBBBBB", 0, 1], ["11111119", 9, 1]]), conn=writer)
+
+        removed = pruner._copy_survivors(_CopyHook(conn, write_meanwhile), condition)
+    finally:
+        conn.close()
+        writer.close()
+    assert _stored(db_model) == {"AAAAAAAA": 50, "11111119": 9, "11111118": 8, "11111117": 7}
+    assert removed == 7
+    with db_model.reader_cursor() as cursor:
+        assert cursor.execute('SELECT "Perkeo" FROM results WHERE "Seed" = \'11111119\'').fetchone()[0] == 1
+    assert db_model._row_log is None
+
+
+def test_survivor_copy_gives_up_after_a_schema_change(db_model):
+    db_model.insert_result_frame(COLUMNS, _frame([[f"1111111{i}", i, 0] for i in range(1, 10)]))
+    pruner = ResultPruner(db_model)
+    conn = db_model.writer_cursor()
+    try:
+        condition = prune_condition(conn, RetentionPolicy(keep_top=3))
+        removed = pruner._copy_survivors(_CopyHook(conn, db_model._invalidate_schema_cache), condition)
+    finally:
+        conn.close()
+    assert removed is None
+    assert len(_stored(db_model)) == 9
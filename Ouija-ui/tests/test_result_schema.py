@@ -0,0 +1,59 @@
+"""
+Result schema tests - Compacting an old database keeps every result, and seed ids read back as strings
+"""
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+from models.result_schema import (SCALAR_DECODE_ROWS, column_types, compact_database_file, format_report,
+                                  needs_compaction, seed_strings)
+from models.seed_codec import LENGTH_OFFSETS, decode_seeds
+
+
+def _old_database(path):
+    conn = duckdb.connect(path)
+    conn.execute('CREATE TABLE results ("Seed" VARCHAR PRIMARY KEY, "Score" INTEGER, "Perkeo" INTEGER, '
+                 '"Yorick" INTEGER)')
+    conn.execute('CREATE INDEX idx_score ON results ("Score")')
+    conn.execute("INSERT INTO results SELECT replace(printf('%08X', range * 7919), '0', 'Z'), "
+                 "(range % 61)::INTEGER, (range % 3)::INTEGER, (range % 2)::INTEGER FROM range(5000)")
+    conn.execute("INSERT INTO results VALUES ('1', 300, 1, 0), ('zzzzzzz', 2, 0, 1), ('NOT-A-SEED', 9, 9, 9), "
+                 "('TOOLONGSEED1', 1, 1, 1)")
+    rows = conn.execute('SELECT upper("Seed"), "Score", "Perkeo", "Yorick" FROM results '
+                        "WHERE \"Seed\" NOT IN ('NOT-A-SEED', 'TOOLONGSEED1') ORDER BY 1").fetchall()
+    conn.close()
+    return rows
+
+
+def test_compaction_preserves_rows(tmp_path):
+    path = str(tmp_path / "old.duckdb")
+    expected = _old_database(path)
+
+    report = compact_database_file(path)
+    assert report["rows"] == len(expected) + 2
+    assert (report["rows_malformed"], report["rows_merged"]) == (2, 0)
+    assert "2 malformed seeds dropped" in format_report(report)
+
+    conn = duckdb.connect(path)
+    try:
+        rows = conn.execute('SELECT "Seed", "Score", "Perkeo", "Yorick" FROM results ORDER BY 1').fetchall()
+        assert rows == expected
+        types = column_types(conn)
+        assert types["SeedId"] == "UBIGINT"
+        assert types["Score"] == "USMALLINT" and types["Perkeo"] == "UTINYINT"
+        assert not needs_compaction(conn)
+    finally:
+        conn.close()
+
+    assert compact_database_file(path) is None
+
+
+def test_seed_strings_small_and_large_frames():
+    for count in (1, SCALAR_DECODE_ROWS + 5):
+        ids = np.arange(count, dtype=np.uint64) * 977 + LENGTH_OFFSETS[7]
+        frame = pd.DataFrame({"Score": np.arange(count, dtype=np.uint16), "SeedId": ids})
+        converted = seed_strings(frame)
+        assert list(converted.columns) == ["Seed", "Score"]
+        assert converted["Seed"].tolist() == list(decode_seeds(ids))
+        assert converted["Score"].tolist() == list(range(count))
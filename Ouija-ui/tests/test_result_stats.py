@@ -0,0 +1,118 @@
+"""
+Result stats tests - Batch counts fold into one row per value and match a full GROUP BY, and start auto cutoffs
+"""
+
+import os
+import sys
+import time
+
+import duckdb
+import pandas as pd
+
+from models.database_model import DatabaseModel
+from models.result_schema import RESULT_ROWS_TABLE, SEED_ID_COLUMN
+from models.result_stats import (HISTOGRAM_TABLE, ResultStats, cutoff_for_rows, histogram_deltas, read_histogram,
+                                 read_score_cutoffs, rows_at_or_above)
+from models.search_model import SearchModel
+from models.seed_codec import LENGTH_OFFSETS, decode_seed
+
+COLUMNS = ["Seed", "Score", "Perkeo"]
+
+
+def _rows_table():
+    conn = duckdb.connect()
+    conn.execute(f'CREATE TABLE {RESULT_ROWS_TABLE} ("{SEED_ID_COLUMN}" UBIGINT PRIMARY KEY, '
+                 f'"Score" USMALLINT, "Perkeo" UTINYINT)')
+    return conn
+
+
+def _upsert(conn, stats, rows):
+    """Write rows like the bulk upsert does, counting them and the rows they replace"""
+    batch = pd.DataFrame(rows, columns=[SEED_ID_COLUMN, "Score", "Perkeo"])
+    conn.register("_batch", batch)
+    removed = conn.execute(f'SELECT * FROM {RESULT_ROWS_TABLE} WHERE "{SEED_ID_COLUMN}" IN '
+                           f'(SELECT "{SEED_ID_COLUMN}" FROM _batch)').fetch_df()
+    conn.execute(f"INSERT OR REPLACE INTO {RESULT_ROWS_TABLE} SELECT * FROM _batch")
+    conn.unregister("_batch")
+    stats.update(conn, COLUMNS, batch, removed)
+
+
+def _group_by(conn, column):
+    return conn.execute(f'SELECT "{column}" AS "Value", COUNT(*)::BIGINT AS "Rows" FROM {RESULT_ROWS_TABLE} '
+                        f'GROUP BY "{column}" ORDER BY "{column}"').fetch_df()
+
+
+def test_histogram_deltas():
+    frame = pd.DataFrame({"Score": [3, 5, 3, 3], "Perkeo": [0, None, 1, 1]})
+    deltas = histogram_deltas(frame, COLUMNS, -1)
+    assert sorted(map(tuple, deltas.values.tolist())) == \
+        [("Perkeo", 0, -1), ("Perkeo", 1, -2), ("Score", 3, -3), ("Score", 5, -1)]
+
+
+def test_counts_fold_and_match_the_table():
+    conn = _rows_table()
+    stats = ResultStats()
+    stats.FLUSH_SECONDS = 0
+    stats.FOLD_FLUSHES = 3
+    assert stats.prepare(conn)  # Empty table: counting starts from zero
+
+    for start in range(0, 50, 10):
+        _upsert(conn, stats, [(i, i % 7, i % 2) for i in range(start, start + 10)])
+    _upsert(conn, stats, [(i, 20, 1) for i in range(5)])  # Replaced rows are taken off their old values
+    assert stats.batches_counted == 6
+    # Six appends with a fold after the third and sixth: one row per value left
+    distinct = conn.execute(
+        f'SELECT COUNT(*) FROM (SELECT DISTINCT "Column", "Value" FROM {HISTOGRAM_TABLE})').fetchone()[0]
+    assert conn.execute(f"SELECT COUNT(*) FROM {HISTOGRAM_TABLE}").fetchone()[0] == distinct
+
+    assert stats.ensure(conn) and stats.rebuilds == 0
+    for column in ("Score", "Perkeo"):
+        pd.testing.assert_frame_equal(read_histogram(conn, column), _group_by(conn, column), check_dtype=False)
+    assert rows_at_or_above(conn, 6) == 7 + 5  # Seven ids score 6, the five replaced ones score 20
+    cutoffs = read_score_cutoffs(conn)
+    assert cutoffs["Rows At Or Above"].iloc[-1] == 50
+    assert cutoff_for_rows(conn, 10) == 20 and cutoff_for_rows(conn, 12) == 6
+
+
+def test_stale_table_is_rebuilt():
+    conn = _rows_table()
+    stats = ResultStats()
+    stats.prepare(conn)
+    _upsert(conn, stats, [(i, i % 3, 0) for i in range(10)])
+    stats.flush(conn)
+    conn.execute(f'DELETE FROM {RESULT_ROWS_TABLE} WHERE "Score" = 0')  # Behind update()'s back, like a crash
+
+    reopened = ResultStats()
+    assert not reopened.prepare(conn)
+    assert reopened.ensure(conn) and reopened.rebuilds == 1
+    pd.testing.assert_frame_equal(read_histogram(conn), _group_by(conn, "Score"), check_dtype=False)
+
+
+def test_auto_cutoff_starts_at_the_lowest_shown_score(tmp_path):
+    db_model = DatabaseModel()
+    db_model.DB_DIR = str(tmp_path)
+    db_model.TOP_RESULTS_LIMIT = 10
+    db_model.connect(os.path.join(tmp_path, "floor.ouija.json"))
+    db_model.prepare_results_table(COLUMNS)
+    search_model = SearchModel()
+    cli = tmp_path / "Ouija-CLI"
+    cli.write_text(f"#!{sys.executable}\nprint(\"-c <C>  'auto:<N>' starts the dynamic cutoff at N\")\n")
+    cli.chmod(0o755)
+    try:
+        def insert(rows):
+            db_model.insert_result_frame(COLUMNS, pd.DataFrame(rows, columns=COLUMNS))
+
+        insert([[decode_seed(LENGTH_OFFSETS[8] + i), i % 5 + 1, 0] for i in range(8)])
+        assert search_model._auto_cutoff("auto", db_model, str(cli)) == "auto"  # Probe still running
+        deadline = time.monotonic() + 5
+        while search_model.cli_auto_floor_supported is None and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert search_model._auto_cutoff("auto", db_model, str(cli)) == "auto"  # Fewer rows than the table shows
+
+        insert([[decode_seed(LENGTH_OFFSETS[8] + i), i % 5 + 1, 0] for i in range(8, 25)])
+        db_model.result_stats.flush(db_model.conn)
+        # 25 rows, five per score 1-5: the top 10 are scores 4 and 5
+        assert search_model._auto_cutoff("auto", db_model, str(cli)) == "auto:4"
+        assert search_model._auto_cutoff("12", db_model, str(cli)) == "12"
+    finally:
+        db_model.close()
@@ -0,0 +1,79 @@
+"""
+Result versions tests - Switching CLI headers archives the old rows and switching back restores them
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from controllers.database_controller import DatabaseController
+from models.database_model import DatabaseModel
+from models.result_versions import archived_table, header_version
+
+OLD_HEADER = ["Seed", "Score", "Perkeo"]
+NEW_HEADER = ["Seed", "Score", "Perkeo", "Blueprint"]
+
+
+@pytest.fixture
+def db_model(tmp_path):
+    model = DatabaseModel()
+    model.DB_DIR = str(tmp_path)
+    model.connect(os.path.join(tmp_path, "versions.ouija.json"))
+    yield model
+    model.close()
+
+
+def _insert(db_model, columns, rows):
+    db_model.prepare_results_table(columns)
+    db_model.insert_result_frame(columns, pd.DataFrame(rows, columns=columns))
+
+
+def _stored(db_model):
+    with db_model.reader_cursor() as cursor:
+        return sorted(cursor.execute('SELECT "Seed", "Score" FROM results').fetchall())
+
+
+def test_header_version_ignores_column_order():
+    assert header_version(["Seed", "Score", "Perkeo"]) == header_version(["SeedId", "Perkeo", "Score"])
+    assert header_version(OLD_HEADER) != header_version(NEW_HEADER)
+
+
+def test_switching_back_restores_the_old_rows(db_model):
+    old, new = header_version(OLD_HEADER), header_version(NEW_HEADER)
+    _insert(db_model, OLD_HEADER, [["AAAAAAAA", 5, 1], ["BBBBBBBB", 3, 0]])
+    _insert(db_model, NEW_HEADER, [["CCCCCCCC", 7, 0, 1]])
+    assert _stored(db_model) == [("CCCCCCCC", 7)]
+    versions = db_model.get_schema_versions()
+    assert [(v["version"], v["table"], v["rows"]) for v in versions] == \
+        [(new, "result_rows", 1), (old, archived_table(old), 2)]
+    assert versions[0]["retired"] is None and versions[1]["retired"] is not None
+
+    _insert(db_model, OLD_HEADER, [["DDDDDDDD", 1, 0]])
+    assert _stored(db_model) == [("AAAAAAAA", 5), ("BBBBBBBB", 3), ("DDDDDDDD", 1)]
+    assert [(v["version"], v["rows"]) for v in db_model.get_schema_versions()] == [(old, 3), (new, 1)]
+
+    every = db_model.query_all_versions()
+    assert list(every["Seed"]) == ["CCCCCCCC", "AAAAAAAA", "BBBBBBBB", "DDDDDDDD"]
+    assert list(every["SchemaVersion"]) == [new, old, old, old]
+    assert every["Blueprint"].isna().tolist() == [False, True, True, True]
+
+
+def test_empty_version_is_dropped_not_archived(db_model):
+    db_model.prepare_results_table(OLD_HEADER)
+    _insert(db_model, NEW_HEADER, [["CCCCCCCC", 7, 0, 1]])
+    assert [v["version"] for v in db_model.get_schema_versions()] == [header_version(NEW_HEADER)]
+
+
+def test_controller_lists_and_reads_every_version(db_model):
+    _insert(db_model, OLD_HEADER, [["AAAAAAAA", 5, 1]])
+    _insert(db_model, NEW_HEADER, [["CCCCCCCC", 7, 0, 1]])
+    controller = DatabaseController(db_model)
+    try:
+        versions = controller.get_schema_versions().data
+        assert [v["version"] for v in versions] == [header_version(NEW_HEADER), header_version(OLD_HEADER)]
+        every = controller.get_all_versions_results(sort_column="Score", descending=False).data
+        assert list(every["Seed"]) == ["AAAAAAAA", "CCCCCCCC"]
+    finally:
+        controller.results_pager.close()
+        controller.federated_results.close()
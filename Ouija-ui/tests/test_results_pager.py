@@ -0,0 +1,68 @@
+"""
+Results pager tests - Keyset pages cover every row once in Score, seed order and follow writes
+"""
+
+import os
+
+import pandas as pd
+import pytest
+
+from models.database_model import DatabaseModel
+from models.results_pager import ResultsPager
+from models.seed_codec import LENGTH_OFFSETS, decode_seed, encode_seed
+
+COLUMNS = ["Seed", "Score", "Perkeo"]
+
+
+@pytest.fixture
+def db_model(tmp_path):
+    model = DatabaseModel()
+    model.DB_DIR = str(tmp_path)
+    model.connect(os.path.join(tmp_path, "pager.ouija.json"))
+    model.prepare_results_table(COLUMNS)
+    # Four scores, so most pages start and end inside a run of tied scores
+    rows = [[decode_seed(LENGTH_OFFSETS[8] + i * 7), i % 4, 0] for i in range(25)]
+    model.insert_result_frame(COLUMNS, pd.DataFrame(rows, columns=COLUMNS))
+    yield model
+    model.close()
+
+
+@pytest.fixture
+def pager(db_model):
+    pager = ResultsPager(db_model, page_size=10)
+    yield pager
+    pager.close()
+
+
+def _expected(db_model):
+    with db_model.reader_cursor() as cursor:
+        rows = cursor.execute('SELECT "Seed", "Score" FROM results').fetchall()
+    return sorted(rows, key=lambda row: (-row[1], encode_seed(row[0])))
+
+
+def _seeds(frame):
+    return list(zip(frame["Seed"], frame["Score"]))
+
+
+def test_pages_cover_every_row_in_order(db_model, pager):
+    pages = [pager.get_page(index) for index in range(pager.page_count())]
+    assert pager.page_count() == 3 and [len(page) for page in pages] == [10, 10, 5]
+    assert sum((_seeds(page) for page in pages), []) == _expected(db_model)
+    assert pager.get_page(3).empty
+
+
+def test_jumping_ahead_walks_the_page_keys(db_model, pager):
+    assert _seeds(pager.get_page(2)) == _expected(db_model)[20:]
+    assert _seeds(pager.get_page(1)) == _expected(db_model)[10:20]
+
+
+def test_write_drops_cached_pages(db_model, pager):
+    pager.get_page(0)
+    hits = pager.cache_hits
+    pager.get_page(0)
+    assert pager.cache_hits == hits + 1
+
+    db_model.insert_result_frame(COLUMNS, pd.DataFrame([["AAAAAAAA", 9, 1]], columns=COLUMNS))
+    first = pager.get_page(0)
+    assert _seeds(first)[0] == ("AAAAAAAA", 9)
+    assert pager.total_rows() == 26 and pager.page_count() == 3
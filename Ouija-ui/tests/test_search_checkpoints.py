@@ -0,0 +1,60 @@
+"""
+Search checkpoint tests - '#CKPT' lines, whole-search offsets and which searches can be resumed
+"""
+
+import duckdb
+
+from models.search_checkpoints import (SearchRun, load_checkpoints, parse_checkpoint_line, save_checkpoints,
+                                       seed_after, within_one_length)
+from models.seed_codec import LENGTH_OFFSETS, SEED_COUNT, decode_seed
+
+
+def test_parse_checkpoint_line():
+    assert parse_checkpoint_line("#CKPT abcd1234 1000 5000") == ("ABCD1234", 1000, 5000)
+    assert parse_checkpoint_line("#CKPT 1000 5000") == ("", 1000, 5000)
+    assert parse_checkpoint_line("#CKPT ABCD1234 lots 5000") is None
+    assert parse_checkpoint_line("#CKPT ABCD1234") is None
+    assert parse_checkpoint_line("|ABCD1234,1,2") is None
+
+
+def test_seed_after_counts_across_lengths():
+    assert seed_after("", 1) == "1"
+    assert seed_after("", 35) == "Z"
+    assert seed_after("Z", 1) == "11"
+    assert seed_after("ZZZZZZZ", 1) == "11111111"
+    assert seed_after(decode_seed(SEED_COUNT - 1), 1) is None
+
+
+def test_within_one_length():
+    assert within_one_length("11111111", SEED_COUNT - LENGTH_OFFSETS[8])
+    assert not within_one_length("11111111", SEED_COUNT - LENGTH_OFFSETS[8] + 1)
+    assert within_one_length("AB", 35 * 35 - 9 * 35 - 10)
+    assert not within_one_length("AB", 35 * 35)
+    assert not within_one_length("", 10)
+
+
+def test_search_run_offsets_after_resume():
+    run = SearchRun("11111111", 10000, base_offset=4000)
+    checkpoint = run.checkpoint("1111115K", 500, 6000)
+    assert (checkpoint["first_seed"], checkpoint["seeds"], checkpoint["offset"]) == ("11111111", 10000, 4500)
+
+    fresh = SearchRun()
+    assert fresh.checkpoint("", 10, 100)["first_seed"] == ""
+    fresh.resize(50)
+    assert fresh.checkpoint("", 20, 100)["resized_from"] == [100]
+
+
+def test_resume_only_within_one_length():
+    conn = duckdb.connect()
+    save_checkpoints(conn, [{"first_seed": "11111111", "seeds": 1000, "offset": 400},
+                            {"first_seed": "", "seeds": 1000, "offset": 400},
+                            {"first_seed": "ZZ", "seeds": 100, "offset": 10},
+                            {"first_seed": "11111112", "seeds": 50, "offset": 50}])
+    checkpoints = {(c["first_seed"], c["seeds"]): c for c in load_checkpoints(conn)}
+
+    resumable = checkpoints[("11111111", 1000)]
+    assert (resumable["next_seed"], resumable["remaining"]) == (seed_after("11111111", 400), 600)
+    assert not resumable["finished"]
+    for key in [("", 1000), ("ZZ", 100)]:
+        assert checkpoints[key]["next_seed"] is None and not checkpoints[key]["finished"]
+    assert checkpoints[("11111112", 50)]["finished"]
@@ -0,0 +1,73 @@
+"""
+Search coverage tests - Gaps picked for new runs stay among the 8-character seeds, and
+recorded runs never cover seeds of another length, and the controller reports a filter's coverage
+"""
+
+import json
+
+import duckdb
+
+from controllers.database_controller import DatabaseController
+from models.database_model import DatabaseModel
+from models.search_checkpoints import SearchRun
+from models.search_coverage import (GAP_SEARCH_START, config_file_hash, gaps, load_ranges, pick_gap,
+                                    record_checkpoints)
+from models.seed_codec import LENGTH_OFFSETS, SEED_COUNT, decode_seed, encode_seed
+
+
+def test_no_coverage_starts_at_first_8_character_seed():
+    assert GAP_SEARCH_START == LENGTH_OFFSETS[8]
+    assert pick_gap([]) == ("11111111", SEED_COUNT - LENGTH_OFFSETS[8])
+    assert pick_gap([], seeds=1000) == ("11111111", 1000)
+
+
+def test_short_seed_coverage_is_ignored():
+    # Ranges over shorter seeds neither shift nor split the 8-character gap
+    ranges = [(0, 35), (LENGTH_OFFSETS[5], LENGTH_OFFSETS[8] + 10)]
+    assert pick_gap(ranges, seeds=5) == (decode_seed(LENGTH_OFFSETS[8] + 10), 5)
+
+
+def test_largest_gap_and_count_cap():
+    middle = (LENGTH_OFFSETS[8] + SEED_COUNT) // 2
+    ranges = [(LENGTH_OFFSETS[8], LENGTH_OFFSETS[8] + 100), (middle, SEED_COUNT - 50)]
+    start, count = pick_gap(ranges)
+    assert encode_seed(start) == LENGTH_OFFSETS[8] + 100
+    assert count == middle - LENGTH_OFFSETS[8] - 100
+    assert pick_gap([(LENGTH_OFFSETS[8], SEED_COUNT - 50)], seeds=1000) == (decode_seed(SEED_COUNT - 50), 50)
+
+
+def test_fully_searched():
+    assert pick_gap([(LENGTH_OFFSETS[8], SEED_COUNT)]) is None
+    assert gaps([(LENGTH_OFFSETS[8], SEED_COUNT)]) == [(0, LENGTH_OFFSETS[8])]
+
+
+def test_recorded_ranges_stay_within_start_length():
+    conn = duckdb.connect()
+    record_checkpoints(conn, [
+        {"first_seed": "", "offset": 5000, "config_hash": "abc", "template": "t"},
+        {"first_seed": "ZY", "offset": 10, "config_hash": "abc", "template": "t"},
+        {"first_seed": "11111111", "offset": 100, "config_hash": "abc", "template": "t"},
+        {"first_seed": "11111111", "offset": 100, "config_hash": None, "template": "other"},
+    ])
+    assert load_ranges(conn, "abc", "t") == [(encode_seed("ZY"), LENGTH_OFFSETS[3]),
+                                             (LENGTH_OFFSETS[8], LENGTH_OFFSETS[8] + 100)]
+    assert load_ranges(conn, "abc", "other") == []
+
+
+def test_controller_reports_coverage_of_the_config_filter(tmp_path):
+    config_path = tmp_path / "coverage.ouija.json"
+    config_path.write_text(json.dumps({"name": "coverage", "filter_config": {"Needs": [], "Wants": []}}))
+    db_model = DatabaseModel()
+    db_model.DB_DIR = str(tmp_path)
+    controller = DatabaseController(db_model)
+    try:
+        run = SearchRun("11111111", 1000, config_hash=config_file_hash(str(config_path)), template="ouija_template")
+        db_model.connect(str(config_path))
+        db_model.save_search_checkpoints([run.checkpoint("11111111", 400, 1000)])
+
+        coverage = controller.get_search_coverage(str(config_path), "ouija_template").data
+        assert (coverage["ranges"], coverage["seeds_covered"]) == (1, 400)
+        assert controller.get_search_coverage(str(config_path), "other_template").data["ranges"] == 0
+    finally:
+        controller.results_pager.close()
+        db_model.close()
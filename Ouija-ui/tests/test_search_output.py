@@ -0,0 +1,62 @@
+"""
+Search output tests - Binary frames that arrive before the CLI header
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+
+from models.result_codec import OUIJA_HOST_RESULT_DTYPE, RECORD_SIZE
+from models.search_output import SearchOutputHandler
+
+
+class _Writer:
+    """Collects the frames a handler queues"""
+
+    def __init__(self):
+        self.frames = []
+
+    def submit_frame(self, columns, frame):
+        self.frames.append(frame)
+
+    def sync(self):
+        pass
+
+    def rows_written(self):
+        return 0
+
+
+def _handler():
+    messages = []
+    search_model = SimpleNamespace(console_callback=lambda message, **kwargs: messages.append(message),
+                                   results_callback=None, _on_job_exit=lambda job: None)
+    handler = SearchOutputHandler(search_model, None, _Writer())
+    job = SimpleNamespace(rows=0, format_stats=lambda: "")
+    return handler, job, messages
+
+
+def _frame_event(seeds, score):
+    records = np.zeros(len(seeds), dtype=OUIJA_HOST_RESULT_DTYPE)
+    records["seed"] = seeds
+    records["TotalScore"] = score
+    return ("frame", len(seeds), RECORD_SIZE, records.tobytes())
+
+
+def test_frames_before_header_are_kept():
+    handler, job, _ = _handler()
+    handler.handle_events(job, [_frame_event([b"AAAA1111", b"BBBB2222"], 3)])
+    assert job.rows == 0 and not handler.ingest_writer.frames
+
+    handler.handle_events(job, [("line", "+Seed,Score\n"), _frame_event([b"CCCC3333"], 5)])
+    assert job.rows == 3
+    frames = handler.ingest_writer.frames
+    assert [frame["Seed"].tolist() for frame in frames] == [["AAAA1111", "BBBB2222"], ["CCCC3333"]]
+    assert frames[0]["Score"].tolist() == [3, 3]
+
+
+def test_frames_without_header_are_reported():
+    handler, job, messages = _handler()
+    handler.handle_events(job, [_frame_event([b"AAAA1111"], 3)])
+    handler.on_exit(job)
+    assert not handler.ingest_writer.frames
+    assert "Skipping 1 binary results, header not yet found\n" in messages
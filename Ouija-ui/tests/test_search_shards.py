@@ -0,0 +1,112 @@
+"""
+Search shard tests - Shard ranges stay within one seed length, and the scheduler steals and retries
+"""
+
+from types import SimpleNamespace
+
+from models.search_model import SearchModel
+from models.search_shards import ShardScheduler, ShardSlot
+from models.seed_codec import LENGTH_OFFSETS, SEED_COUNT, encode_seed
+
+
+class FakeLauncher:
+    """Records launched shards in place of CLI processes"""
+
+    def __init__(self, fail_on=()):
+        self.shards = []
+        self.stopped = []
+        self.fail_on = set(fail_on)
+
+    def launch(self, shard):
+        if shard.slot.label in self.fail_on:
+            raise OSError("no such device")
+        self.shards.append(shard)
+        return SimpleNamespace(job_id=len(self.shards), stop_requested=False)
+
+    def request_stop(self, job_id):
+        self.stopped.append(job_id)
+
+
+def _scheduler(launcher, count, devices, **kwargs):
+    slots = [ShardSlot(0, device) for device in range(devices)]
+    kwargs.setdefault("min_steal_seconds", 0)
+    kwargs.setdefault("min_steal_seeds", 10)
+    return ShardScheduler(launcher.launch, launcher.request_stop, LENGTH_OFFSETS[8], count, slots, **kwargs)
+
+
+def _finish(scheduler, shard, done=None):
+    scheduler.checkpoint(shard, shard.end_id - shard.first_id if done is None else done)
+    scheduler.job_exited(shard, shard.job)
+
+
+def test_resolve_range_stays_within_one_length():
+    model = SearchModel()
+    assert model._resolve_range("", "All") == (LENGTH_OFFSETS[8], SEED_COUNT - LENGTH_OFFSETS[8])
+    assert model._resolve_range("ZZ", "1K") == (encode_seed("ZZ"), 1)
+    assert model._resolve_range("AB", "100") == (encode_seed("AB"), 100)
+    first_id, count = model._resolve_range("random", "All")
+    assert first_id >= LENGTH_OFFSETS[8] and first_id + count == SEED_COUNT
+
+
+def test_range_split_over_slots():
+    launcher = FakeLauncher()
+    scheduler = _scheduler(launcher, 1000, 2)
+    assert scheduler.start() == 2
+    assert [(s.first_id - LENGTH_OFFSETS[8], s.end_id - LENGTH_OFFSETS[8]) for s in launcher.shards] == \
+        [(0, 500), (500, 1000)]
+
+
+def test_idle_slot_steals_tail_and_victim_stops_at_split():
+    launcher = FakeLauncher()
+    scheduler = _scheduler(launcher, 1000, 2)
+    scheduler.start()
+    fast, slow = launcher.shards
+    _finish(scheduler, fast)
+
+    assert scheduler.steals == 1
+    stolen = launcher.shards[2]
+    assert stolen.slot is fast.slot and stolen.end_id == 1000 + LENGTH_OFFSETS[8]
+    assert slow.end_id == stolen.first_id and slow.run.seeds == slow.end_id - slow.first_id
+
+    scheduler.checkpoint(slow, slow.end_id - slow.first_id + 5)
+    assert launcher.stopped[-1] == slow.job.job_id
+    _finish(scheduler, stolen)
+    _finish(scheduler, slow, slow.done)
+    assert not scheduler.is_active()
+    assert scheduler.seeds_done() == 1000
+
+
+def test_crashed_shard_is_retried_from_its_position():
+    launcher = FakeLauncher()
+    scheduler = _scheduler(launcher, 1000, 1)
+    scheduler.start()
+    for attempt in range(1, ShardScheduler.MAX_ATTEMPTS + 1):
+        shard = launcher.shards[-1]
+        assert shard.attempt == attempt
+        _finish(scheduler, shard, 100)
+    assert len(launcher.shards) == ShardScheduler.MAX_ATTEMPTS
+    assert launcher.shards[1].first_id == LENGTH_OFFSETS[8] + 100
+    assert not scheduler.is_active()
+    assert scheduler.seeds_done() == 300
+
+
+def test_stopped_shard_is_left_for_resume():
+    launcher = FakeLauncher()
+    scheduler = _scheduler(launcher, 1000, 1)
+    scheduler.start()
+    shard = launcher.shards[0]
+    shard.job.stop_requested = True
+    _finish(scheduler, shard, 100)
+    assert len(launcher.shards) == 1 and not scheduler.is_active()
+
+
+def test_failed_launch_retires_slot_and_keeps_range():
+    launcher = FakeLauncher(fail_on={"p0d0"})
+    scheduler = _scheduler(launcher, 1000, 2)
+    assert scheduler.start() == 1
+    first = launcher.shards[0]
+    assert first.slot.label == "p0d1"
+    _finish(scheduler, first)
+    assert launcher.shards[1].slot.label == "p0d1"
+    _finish(scheduler, launcher.shards[1])
+    assert scheduler.seeds_done() == 1000 and not scheduler.is_active()
@@ -0,0 +1,74 @@
+"""
+Seed codec tests - Seed ids follow shortlex order and round-trip through every encoder
+"""
+
+import duckdb
+import numpy as np
+import pytest
+
+from models.seed_codec import (INVALID_SEED_ID, LENGTH_OFFSETS, MAX_SEED_LENGTH, SEED_CHARS, SEED_COUNT,
+                               create_seed_macros, decode_seed, decode_seeds, encode_seed, encode_seeds,
+                               seed_range, skip_seed)
+
+# Every length boundary and the first/last seed of each length
+EDGE_IDS = sorted({0, 1, 34, SEED_COUNT - 1}
+                  | {LENGTH_OFFSETS[n] + d for n in range(2, MAX_SEED_LENGTH + 1) for d in (-1, 0, 1)})
+
+
+def test_enumeration_order():
+    assert [decode_seed(i) for i in range(36)] == list(SEED_CHARS) + ["11"]
+    assert encode_seed("Z") == 34
+    assert encode_seed("11") == 35
+    assert encode_seed("ZZ") == LENGTH_OFFSETS[3] - 1
+    assert encode_seed("11111111") == LENGTH_OFFSETS[8]
+    assert encode_seed("ZZZZZZZZ") == SEED_COUNT - 1
+
+
+def test_round_trip_edges_and_random():
+    rng = np.random.default_rng(0)
+    ids = EDGE_IDS + [int(i) for i in rng.integers(0, SEED_COUNT, 2000)]
+    for seed_id in ids:
+        assert encode_seed(decode_seed(seed_id)) == seed_id
+
+
+def test_vectorized_matches_scalar():
+    rng = np.random.default_rng(1)
+    ids = np.array(EDGE_IDS + [int(i) for i in rng.integers(0, SEED_COUNT, 5000)], dtype=np.uint64)
+    seeds = decode_seeds(ids)
+    assert list(seeds) == [decode_seed(int(i)) for i in ids]
+    encoded, valid = encode_seeds(seeds)
+    assert valid.all()
+    assert np.array_equal(encoded, ids)
+
+
+def test_invalid_seeds():
+    encoded, valid = encode_seeds(["", "ABCDEFGHI", "A0", "é", None, "zz"])
+    assert valid.tolist() == [False, False, False, False, False, True]
+    assert (encoded[:5] == INVALID_SEED_ID).all()
+    assert encoded[5] == encode_seed("ZZ")
+    for seed in ("", "ABCDEFGHI", "A0"):
+        with pytest.raises(ValueError):
+            encode_seed(seed)
+    with pytest.raises(ValueError):
+        decode_seed(SEED_COUNT)
+
+
+def test_skip_and_range():
+    assert skip_seed("Z", 1) == "11"
+    assert skip_seed("11111111", 35) == "11111121"
+    assert skip_seed("11", -1) == "Z"
+    with pytest.raises(ValueError):
+        skip_seed("ZZZZZZZZ", 1)
+    assert seed_range("AAAZ", "AAAA") == (encode_seed("AAAA"), encode_seed("AAAZ"))
+
+
+def test_sql_macros_match_python():
+    conn = duckdb.connect()
+    create_seed_macros(conn)
+    rng = np.random.default_rng(2)
+    ids = EDGE_IDS + [int(i) for i in rng.integers(0, SEED_COUNT, 500)]
+    rows = conn.execute("SELECT i, ouija_seed(i), ouija_seed_id(ouija_seed(i)) "
+                        "FROM (SELECT UNNEST(?::UBIGINT[]) AS i)", [ids]).fetchall()
+    for seed_id, seed, round_trip in rows:
+        assert seed == decode_seed(seed_id)
+        assert round_trip == seed_id
@@ -0,0 +1,62 @@
+"""
+Seen results tests - Stored rows are screened out unless their values changed, across pending folds and header changes
+"""
+
+import duckdb
+import numpy as np
+import pandas as pd
+
+from models.result_schema import RESULT_ROWS_TABLE, SEED_ID_COLUMN
+from models.seen_results import SeenResults
+
+COLUMNS = ["Seed", "Score", "Perkeo"]
+
+
+def _stored_table(rows):
+    conn = duckdb.connect()
+    conn.execute(f'CREATE TABLE {RESULT_ROWS_TABLE} ("{SEED_ID_COLUMN}" UBIGINT PRIMARY KEY, '
+                 f'"Score" USMALLINT, "Perkeo" UTINYINT)')
+    conn.executemany(f"INSERT INTO {RESULT_ROWS_TABLE} VALUES (?, ?, ?)", rows)
+    return conn
+
+
+def _batch(rows):
+    return pd.DataFrame(rows, columns=[SEED_ID_COLUMN, "Score", "Perkeo"])
+
+
+def _screened(seen, conn, rows, columns=COLUMNS):
+    batch, keys, values = seen.screen(conn, columns, _batch(rows))
+    seen.add(keys, values)
+    return list(batch[SEED_ID_COLUMN])
+
+
+def test_unchanged_rows_are_screened_out():
+    conn = _stored_table([(1, 10, 0), (2, 20, 1)])
+    seen = SeenResults()
+    assert _screened(seen, conn, [(1, 10, 0), (2, 21, 1), (3, 5, None)]) == [2, 3]
+    assert seen.duplicates_avoided == 1
+    # Rows written through add() are screened too, including a NULL want
+    assert _screened(seen, conn, [(2, 21, 1), (3, 5, None)]) == []
+    assert _screened(seen, conn, [(3, 5, 0)]) == [3]
+    assert list(seen.stored(np.array([1, 3, 4], dtype=np.uint64))) == [True, True, False]
+
+
+def test_pending_level_folds_into_main():
+    conn = _stored_table([(i, 1, 0) for i in range(100)])
+    seen = SeenResults()
+    seen.MIN_PENDING = 4
+    seen.PENDING_FRACTION = 1000
+    for start in range(100, 120, 3):
+        assert _screened(seen, conn, [(i, 2, 0) for i in range(start, start + 3)]) == list(range(start, start + 3))
+    assert len(seen._pending_keys) < 4 and len(seen) == 121
+    assert _screened(seen, conn, [(i, 2, 0) for i in range(100, 121)] + [(5, 1, 0), (6, 3, 0)]) == [6]
+    assert np.all(np.diff(seen._main_keys.astype(np.int64)) > 0)
+
+
+def test_header_change_rehashes_the_table():
+    conn = _stored_table([(1, 10, 0)])
+    seen = SeenResults()
+    assert _screened(seen, conn, [(1, 10, 0)]) == []
+    # Over the new header the stored row hashes differently, so it is compared again from the table
+    assert _screened(seen, conn, [(1, 10, 0)], columns=["Seed", "Score"]) == []
+    assert _screened(seen, conn, [(1, 11, 0)], columns=["Seed", "Score"]) == [1]
@@ -0,0 +1,62 @@
+"""
+Top results tests - Readers catch up with changes_since() deltas and land on the same top-K as a snapshot
+"""
+
+import pandas as pd
+
+from models.top_results import TopResults, apply_top_delta
+
+
+def _frame(rows):
+    return pd.DataFrame(rows, columns=["Seed", "Score", "Perkeo"])
+
+
+def _loaded(capacity=3):
+    top = TopResults(capacity)
+    top.begin_load()
+    top.finish_load(_frame([["AAAAAAAA", 30, 0], ["BBBBBBBB", 20, 0], ["CCCCCCCC", 10, 0]]))
+    return top
+
+
+def _catch_up(top, shown, version):
+    version, rows, is_delta = top.changes_since(version)
+    return version, (apply_top_delta(shown, rows, top.capacity) if is_delta else rows), is_delta
+
+
+def test_delta_matches_snapshot():
+    top = _loaded()
+    version, shown, is_delta = _catch_up(top, None, None)
+    assert not is_delta
+
+    top.update(_frame([["DDDDDDDD", 25, 1], ["EEEEEEEE", 5, 1]]))  # EEEEEEEE doesn't make the top 3
+    top.update(_frame([["AAAAAAAA", 40, 1]]))  # A raised score replaces the seed's row
+    version, shown, is_delta = _catch_up(top, shown, version)
+    assert is_delta
+    pd.testing.assert_frame_equal(shown, top.snapshot())
+    assert list(shown["Seed"]) == ["AAAAAAAA", "DDDDDDDD", "BBBBBBBB"]
+
+
+def test_no_change_is_an_empty_delta():
+    top = _loaded()
+    version, _, _ = top.changes_since(None)
+    top.update(_frame([["EEEEEEEE", 1, 0]]))
+    current, rows, is_delta = top.changes_since(version)
+    assert current == version and is_delta and rows.empty
+
+
+def test_lowered_score_forces_a_reload():
+    top = _loaded()
+    version, _, _ = top.changes_since(None)
+    top.update(_frame([["AAAAAAAA", 1, 0]]))  # Something outside the top-K may now belong in it
+    assert top.snapshot() is None
+    assert top.changes_since(version) == (top.version, None, False)
+
+
+def test_reader_older_than_the_log_gets_a_snapshot():
+    top = _loaded(capacity=1000)
+    version, shown, _ = top.changes_since(None)
+    for score in range(TopResults.DELTA_LOG_LIMIT + 1):
+        top.update(_frame([[f"{score:08d}".replace("0", "A"), 100 + score, 0]]))
+    _, rows, is_delta = top.changes_since(version)
+    assert not is_delta
+    pd.testing.assert_frame_equal(rows, top.snapshot())
@@ -149,6 +149,11 @@ class StatusBar(tk.Frame):
                                       bg=DARK_BACKGROUND, fg=LIGHT_TEXT, width=12, font=("m6x11", 12), pady=4)
         self.metrics_label.pack(side=tk.RIGHT, fill=tk.NONE)
 
+        # Ingest queue depth and stall/drop counters, shown while results are being written
+        self.ingest_label = tk.Label(self, bd=1, relief=tk.SUNKEN, anchor=tk.E,
+                                     bg=DARK_BACKGROUND, fg=LIGHT_TEXT, font=("m6x11", 12), pady=4)
+        self.ingest_label.pack(side=tk.RIGHT, fill=tk.NONE)
+
         # Initialize with default values
         self.set_status("Ready")
         self.set_metrics("⏱️Ready!")
@@ -170,3 +175,11 @@ class StatusBar(tk.Frame):
         """
         self.metrics_label.config(text=text)
         self.update_idletasks()
+
+    def set_ingest(self, text):
+        """Set the ingest queue text (right-aligned, left of the metrics)
+
+        Args:
+            text: Queue depth and stall/drop counters to display
+        """
+        self.ingest_label.config(text=text)
@@ -143,6 +143,13 @@ class MainWindow:
     def set_metrics(self, text):
         """Set metrics text in the status bar"""
         self.status_bar.set_metrics(text)
+
+    def set_ingest_stats(self, text):
+        """Set ingest queue stats in the status bar (safe to call from worker threads)"""
+        try:
+            self.root.after(0, self.status_bar.set_ingest, text)
+        except RuntimeError as e:
+            print(f"Error scheduling set_ingest_stats: {e}")
     
     def update_config_display(self):
         """Update the configuration display with current settings"""
@@ -7,8 +7,8 @@ from tkinter import ttk, messagebox
 import pandas as pd
 from pandastable import Table
 from utils.ui_utils import (BLUE, RED, GREEN, BACKGROUND, DARK_BACKGROUND, LIGHT_TEXT)
+from models.top_results import apply_top_delta
 from tkinter import filedialog
-from models.database_model import DatabaseModel
 
 class ResultsWidget:
     """Widget for displaying search results and action buttons"""
@@ -28,6 +28,10 @@ class ResultsWidget:
         
         # Initialize table-related attributes
         self.latest_df = None
+        self.latest_change_token = None  # Database change token latest_df was read at
+        self.latest_top_version = None  # Top results version latest_df matches, if known
+        self.page_index = 0  # Page of results shown; page 0 is the live top results
+        self._export_job = None  # Running ExportJob, if any
         self.pt = None
         self._refresh_timer_id = None
           # Create the widget
@@ -61,17 +65,38 @@ class ResultsWidget:
             fg=LIGHT_TEXT,
             font=("m6x11", 12),
             width=10,
-            command=self.refresh_results_table,
+            command=lambda: self.refresh_results_table(force=True),
         ).pack(side=tk.LEFT, padx=(0, 4))
 
-        tk.Button(
+        self.export_button = tk.Button(
             left_buttons,
             text="Export...",
             bg=BLUE,
             fg=LIGHT_TEXT,
             font=("m6x11", 12),
-            width=10,
+            width=12,
             command=self.on_export_results,
+        )
+        self.export_button.pack(side=tk.LEFT, padx=(4, 4))
+
+        tk.Button(
+            left_buttons,
+            text="Re-score",
+            bg=BLUE,
+            fg=LIGHT_TEXT,
+            font=("m6x11", 12),
+            width=10,
+            command=self.on_rescore_results,
+        ).pack(side=tk.LEFT, padx=(4, 4))
+
+        tk.Button(
+            left_buttons,
+            text="Seed List...",
+            bg=BLUE,
+            fg=LIGHT_TEXT,
+            font=("m6x11", 12),
+            width=12,
+            command=self.on_evaluate_seed_list,
         ).pack(side=tk.LEFT, padx=(4, 4))
 
         tk.Button(
@@ -90,8 +115,57 @@ class ResultsWidget:
         # Create secret/fun buttons
         self.create_fun_buttons(button_row)
 
+        # Create the page controls below the table
+        self.create_page_controls()
+
         # Create the results table
         self.create_results_table()
+
+    def create_page_controls(self):
+        """Create Prev/Next buttons and the page indicator under the table"""
+        page_row = tk.Frame(self.results_frame, bg=BACKGROUND)
+        page_row.pack(side=tk.BOTTOM, fill=tk.X, pady=(5, 0))
+
+        self.prev_page_button = tk.Button(
+            page_row,
+            text="< Prev",
+            bg=BLUE,
+            fg=LIGHT_TEXT,
+            font=("m6x11", 12),
+            width=8,
+            state="disabled",
+            command=lambda: self.on_page_changed(-1),
+        )
+        self.prev_page_button.pack(side=tk.LEFT, padx=(0, 4))
+
+        self.page_label = tk.Label(page_row,
+                                   text="Page 1 of 1",
+                                   bg=BACKGROUND,
+                                   fg=LIGHT_TEXT,
+                                   font=("m6x11", 12))
+        self.page_label.pack(side=tk.LEFT, padx=(4, 4))
+
+        self.next_page_button = tk.Button(
+            page_row,
+            text="Next >",
+            bg=BLUE,
+            fg=LIGHT_TEXT,
+            font=("m6x11", 12),
+            width=8,
+            command=lambda: self.on_page_changed(1),
+        )
+        self.next_page_button.pack(side=tk.LEFT, padx=(4, 0))
+
+    def on_page_changed(self, step):
+        """Handle Prev/Next button clicks"""
+        self.page_index = max(0, self.page_index + step)
+        self.refresh_results_table(force=True)
+
+    def update_page_controls(self, page_count, total_rows):
+        """Show the current page and enable the buttons that lead somewhere"""
+        self.page_label.config(text=f"Page {self.page_index + 1} of {page_count} ({total_rows:,} results)")
+        self.prev_page_button.config(state="normal" if self.page_index > 0 else "disabled")
+        self.next_page_button.config(state="normal" if self.page_index + 1 < page_count else "disabled")
         
     def create_cutoff_controls(self, parent):
         """Create cutoff score entry and auto checkbox"""
@@ -273,6 +347,7 @@ class ResultsWidget:
     def update_results_table(self, dataframe):
         """Update results table with new data"""
         self.latest_df = dataframe
+        self.latest_top_version = None  # Unknown until refresh_results_table records it
         if dataframe is not None and not dataframe.empty:
             # Ensure all columns are of a robust type for display
             display_df = dataframe.copy()
@@ -296,40 +371,72 @@ class ResultsWidget:
             # Handle errors when clicking on empty table
             pass
 
-    def refresh_results_table(self):
-        """Reload the results table from the database and update the UI."""
-        from models.database_model import DatabaseModel
-        db_model = DatabaseModel()
+    def refresh_results_table(self, force=False):
+        """Reload the results table from the database and update the UI.
 
-        # Try to get the current config path from the controller first
+        Args:
+            force: Query even if the database reports no writes since the last refresh
+        """
+        # Read through the controller's database model; the config model already
+        # restored the last config from user.ouija.conf at startup
         config_path = self.controller.get_current_config_path()
+        database_controller = self.controller.database_controller
 
-        # Fall back to last saved config if needed
-        if not config_path:
-            try:
-                import json
+        # Skip the query entirely while nothing has been written
+        token = database_controller.get_change_token(config_path)
+        if not force and token is not None and token == self.latest_change_token:
+            return
+        self.latest_change_token = token
 
-                with open('user.ouija.conf', 'r') as f:
-                    user_conf = json.load(f)
-                config_path = user_conf.get('last_config_path')
-            except Exception:
-                config_path = None
+        if self.page_index > 0:
+            self._refresh_results_page(config_path)
+            return
 
-        if config_path and db_model.connect(config_path) and db_model.table_exists():
-            df = db_model.get_dataframe()
-            if df is not None and (self.latest_df is None or not df.equals(self.latest_df)):
-                self.update_results_table(df)
+        # Fetch only the rows that entered the top results since the last refresh
+        since_version = self.latest_top_version if self.latest_df is not None and not force else None
+        version, rows, is_delta = database_controller.get_results_delta(config_path, since_version)
+
+        if rows is not None:
+            if is_delta:
+                if not rows.empty:
+                    capacity = self.controller.database_model.TOP_RESULTS_LIMIT
+                    self.update_results_table(apply_top_delta(self.latest_df, rows, capacity))
+            elif self.latest_df is None or not rows.equals(self.latest_df):
+                self.update_results_table(rows)
+            self.latest_top_version = version
         else:
             if self.latest_df is not None:
                 self.update_results_table(pd.DataFrame())
+        self.update_page_controls(*database_controller.get_results_page_count(config_path))
+
+    def _refresh_results_page(self, config_path):
+        """Show the current page of results past the top results"""
+        database_controller = self.controller.database_controller
+        rows, page_count, total_rows = database_controller.get_results_page(config_path, self.page_index)
+        if rows is not None and rows.empty and self.page_index >= page_count:
+            # Rows were deleted under us; go to the last page that still exists
+            self.page_index = page_count - 1
+            rows, page_count, total_rows = database_controller.get_results_page(config_path, self.page_index)
+
+        if rows is None:
+            rows = pd.DataFrame()
+        if self.latest_df is None or not rows.equals(self.latest_df):
+            self.update_results_table(rows)
+        self.update_page_controls(page_count, total_rows)
 
     def cleanup(self):
         """Clean up resources when widget is destroyed"""
         if hasattr(self, '_refresh_timer_id') and self._refresh_timer_id:
             self.main_window.root.after_cancel(self._refresh_timer_id)
+        if self._export_job is not None:
+            self._export_job.cancel()
 
     def on_export_results(self):
-        """Handle export results button clicks"""
+        """Handle export results button clicks (cancels a running export)"""
+        if self._export_job is not None:
+            self._export_job.cancel()
+            return
+
         # Get the current config path from the controller first
         config_path = self.controller.get_current_config_path()
 
@@ -349,28 +456,56 @@ class ResultsWidget:
         # Construct default filename from config name
         filename = config_path.replace(".ouija.conf", ".ouija.csv")
 
-        # Show save file dialog
+        # Show save file dialog; the extension picks the format
         filepath = filedialog.asksaveasfilename(
             initialfile=filename,
             defaultextension=".ouija.csv",
             filetypes=[("Ouija CSV", "*.ouija.csv"), ("CSV Files", "*.csv"),
+                   ("Parquet Files", "*.parquet"), ("JSON Lines", "*.jsonl *.json"),
                    ("All Files", "*.*")],
         )
 
         if filepath:
-            # Export the results to CSV
-
-            db_model = DatabaseModel()
-            if db_model.connect(config_path) and db_model.table_exists():
-                df = db_model.get_dataframe()
-                if df is not None and not df.empty:
-                    df.to_csv(filepath, index=False)
-                    messagebox.showinfo("Export Successful",
-                            f"Results exported to {filepath}")
-                else:
-                    messagebox.showinfo("Export Failed", "No results to export.")
-            else:
-                messagebox.showerror("Error", "Could not connect to database.")
+            # Stream the whole table from DuckDB on a worker thread
+            result = self.controller.database_controller.start_export(filepath, config_path)
+            if not result:
+                messagebox.showinfo("Export Failed", result.error)
+                return
+            self._export_job = result.data
+            self.export_button.config(text="Cancel Export")
+            self._poll_export()
+
+    def _poll_export(self):
+        """Show export progress until the worker finishes"""
+        job = self._export_job
+        if job is None:
+            return
+        self.main_window.set_status(job.format_status())
+        if job.is_running:
+            self.main_window.root.after(200, self._poll_export)
+            return
+
+        self._export_job = None
+        self.export_button.config(text="Export...")
+        if job.status == "done":
+            messagebox.showinfo("Export Successful",
+                                f"Exported {job.rows:,} results to {job.file_path}")
+        elif job.status == "failed":
+            messagebox.showerror("Export Failed", job.error)
+
+    def on_rescore_results(self):
+        """Handle Re-score button clicks: evaluate every stored seed with the current config"""
+        if messagebox.askyesno("Confirm Re-score",
+                               "Evaluate every stored seed again with the current config?"):
+            self.controller.rescore_results()
+
+    def on_evaluate_seed_list(self):
+        """Handle Seed List button clicks: evaluate the seeds in a chosen file"""
+        filepath = filedialog.askopenfilename(
+            filetypes=[("Seed Lists", "*.seeds *.txt *.csv"), ("All Files", "*.*")],
+        )
+        if filepath:
+            self.controller.evaluate_seed_file(filepath)
 
     def on_delete_all_results(self):
         """Handle delete all results button clicks"""
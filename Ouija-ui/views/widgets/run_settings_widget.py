@@ -119,6 +119,10 @@ class RunSettingsWidget:
                                     command=self.on_random_seed, font=("m6x11", 12))
         random_seed_button.grid(row=0, column=1, padx=(2, 2))
 
+        gap_seed_button = tk.Button(seed_frame, text="🧭", bg=GREEN, fg=LIGHT_TEXT,
+                                    command=self.on_gap_seed, font=("m6x11", 12))
+        gap_seed_button.grid(row=0, column=2, padx=(0, 2))
+
         tk.Label(gpu_frame, text="Search Size:", bg=BACKGROUND, fg=LIGHT_TEXT,
                 font=("m6x11", 12)).grid(row=1, column=2, sticky="w", pady=4, padx=(15, 5))
         self.number_of_seeds_var = tk.StringVar()
@@ -135,6 +139,12 @@ class RunSettingsWidget:
                                     font=("m6x11", 16), height=2)
         self.run_button.pack(fill=tk.X, padx=4, pady=(5, 5))
 
+        # Continues the config's last stopped/crashed search at the exact next seed
+        self.resume_button = tk.Button(self.run_settings_frame, text="Resume Last Search",
+                                       command=self.on_resume_search, bg=GREEN, fg=LIGHT_TEXT,
+                                       font=("m6x11", 12))
+        self.resume_button.pack(fill=tk.X, padx=4, pady=(0, 5))
+
     def write_to_console(self, text, color=None):
         """Write text to the console output with optional color coding
 
@@ -205,6 +215,7 @@ class RunSettingsWidget:
     def update_kernel_button_state(self, search_running):
         """Update the run button state based on kernel status"""
         self.search_running = search_running
+        self.resume_button.config(state="disabled" if search_running else "normal")
         if search_running:
             self.run_button.config(text="STOP SEARCH", bg=RED)
         else:
@@ -240,6 +251,11 @@ class RunSettingsWidget:
         self.starting_seed_entry.delete(0, tk.END)
         self.starting_seed_entry.insert(0, "random")
 
+    def on_gap_seed(self):
+        """Start at the largest seed range this filter hasn't searched yet, picked at launch"""
+        self.starting_seed_entry.delete(0, tk.END)
+        self.starting_seed_entry.insert(0, "gap")
+
     def on_number_of_seeds_changed(self, event=None):
         """Handle number of seeds selection changes"""
         self.controller.set_setting('number_of_seeds', self.number_of_seeds_var.get())
@@ -254,3 +270,11 @@ class RunSettingsWidget:
             # Pass the starting seed value to the controller
             starting_seed = self.starting_seed_var.get()
             self.controller.run_search(starting_seed=starting_seed)
+
+    def on_resume_search(self):
+        """Handle resume button clicks"""
+        if self.search_running:
+            return
+        # Save the current configuration before resuming, like a new search
+        self.controller.save_config()
+        self.controller.resume_search()